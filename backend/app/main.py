@@ -1,13 +1,21 @@
-from fastapi import FastAPI, HTTPException, Depends, Query
+import logging
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 import app.firebase_init  # noqa: F401 — 초기화 먼저!
+from app import metrics
 from app.text_utils import with_display_titles
-from services.summary_service import save_summary, fetch_summaries_by_user
+from services.summary_service import save_summary, fetch_summaries_by_keyword, fetch_summaries_by_user, search_summaries
 from services.auth_service import verify_firebase_token
 from models.summary_model import NewsSummary 
-from models.keyword_model import KeywordCreate, KeywordItem
-from services.keyword_service import add_keyword, get_keywords, delete_keyword
+from models.keyword_model import KeywordBatchCreate, KeywordBatchDelete, KeywordCreate, KeywordItem
+from services.keyword_service import add_keyword, add_keywords, get_keywords, delete_keyword, delete_keywords
+from services.keyword_index import normalize_keyword
 from services.summary_service import summarize_and_store
+from services.summary_jobs import queue_first_summaries
+from services.clients import on_firestore_client
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
@@ -17,17 +25,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+if metrics.METRICS_ENABLED:
+    metrics.install(app)
+    verify_firebase_token = metrics.timed(metrics.AUTH_VERIFY_LATENCY, verify_firebase_token)
+
+    # Firestore client 는 첫 요청 때 만들어진다 — 그때 계측한다.
+    def _instrument_firestore(client):
+        try:
+            metrics.instrument_firestore(client)
+        except Exception as e:
+            logger.warning(f"Firestore call metrics disabled: {e}")
+
+    on_firestore_client(_instrument_firestore)
+
 @app.get("/")
 def root():
     return {"message": "API is running"}
 
 @app.get("/summaries")
-def get_summaries(user_id: str = Depends(verify_firebase_token)):
+def get_summaries(
+    response: Response,
+    user_id: str = Depends(verify_firebase_token),
+    keyword: Optional[str] = Query(None, description="Only summaries for this keyword"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (with keyword)"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items to return"),
+):
+    if cursor and not keyword:
+        raise HTTPException(status_code=400, detail="cursor requires keyword")
     try:
-        results = with_display_titles(fetch_summaries_by_user(user_id))
-        return results
+        if keyword is None:
+            return with_display_titles(fetch_summaries_by_user(user_id, limit=limit))
+
+        # 키워드별 목록은 커서 페이지네이션: 다음 페이지 커서는 헤더로 준다(본문은 기존과 같은 리스트).
+        results, next_cursor = fetch_summaries_by_keyword(user_id, keyword, cursor=cursor, limit=limit)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return with_display_titles(results)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/summaries/search")
+def get_summaries_search(
+    user_id: str = Depends(verify_firebase_token),
+    q: str = Query(..., min_length=1, max_length=100, description="Search words (title and summary)"),
+    limit: int = Query(10, ge=1, le=50, description="Number of items to return"),
+):
+    try:
+        return with_display_titles(search_summaries(user_id, q, limit=limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -49,11 +100,44 @@ def get_summaries_paginated(
 def post_keyword(data: KeywordCreate, user_id: str = Depends(verify_firebase_token)):
     try:
         keyword_id = add_keyword(user_id, data.keyword)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # 🔽 추가: 키워드로 뉴스 수집 및 요약 생성 (저장된 정규화 키워드와 같은 값으로).
+    # 키워드는 이미 저장됐다 — 요약이 실패해도(업스트림 circuit open 등) 성공으로 응답하고
+    # 요약은 다음 스케줄 실행에 맡긴다. 500 을 주면 재시도가 "already exists" 가 된다.
+    try:
+        summarize_and_store(user_id, normalize_keyword(data.keyword))
+    except Exception as e:
+        logger.warning(f"first-run summary deferred for {data.keyword!r}: {e}")
+        return {"status": "keyword added, summary deferred", "id": keyword_id, "summary": "deferred"}
 
-        # 🔽 추가: 키워드로 뉴스 수집 및 요약 생성.
-        summarize_and_store(user_id, data.keyword)
+    return {"status": "keyword added and summary saved", "id": keyword_id, "summary": "saved"}
 
-        return {"status": "keyword added and summary saved", "id": keyword_id}
+@app.post("/keywords:batch")
+def post_keywords_batch(data: KeywordBatchCreate, user_id: str = Depends(verify_firebase_token)):
+    try:
+        result = add_keywords(user_id, data.keywords)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # 🔽 새 키워드의 첫 요약은 worker 토픽에 job 으로 넘긴다(응답 뒤 인스턴스 안에서 돌리지 않는다).
+    # 키워드는 이미 저장됐다 — 발행이 실패해도 성공으로 응답하고 요약은 다음 스케줄 실행에 맡긴다.
+    summary = queue_first_summaries(user_id, [item["keyword"] for item in result["added"]])
+    if summary["summary"] == "none":
+        return {"status": "no new keywords", **result, **summary}
+    return {"status": f"keywords added, summary {summary['summary']}", **result, **summary}
+
+@app.delete("/keywords:batch")
+def remove_keywords_batch(data: KeywordBatchDelete, user_id: str = Depends(verify_firebase_token)):
+    try:
+        return {"status": "keywords deleted", **delete_keywords(user_id, data.ids)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,223 @@
+"""요청 메트릭 수집 + Prometheus text exposition.
+
+외부 의존 없음(prometheus_client 미사용) — 프로세스 메모리 안의 작은 레지스트리.
+Cloud Run 인스턴스별 값이므로 스크레이퍼가 인스턴스마다 긁어 합산하는 전제다.
+
+수집 항목:
+    - http_request_duration_seconds{method,route}   지연 히스토그램
+    - http_requests_total{method,route,status}      상태 코드별 카운터
+    - firestore_calls_per_request{method,route}     요청당 Firestore RPC 수
+    - auth_verify_duration_seconds                  토큰 검증 시간
+
+기본은 꺼져 있다 — `METRICS_ENABLED=true` 일 때만 미들웨어·`/metrics` 를 등록한다.
+backend 는 공개(`--allow-unauthenticated`)로 배포되므로, 켤 때는 `METRICS_TOKEN` 을 함께
+설정해 `/metrics` 가 `Authorization: Bearer <METRICS_TOKEN>` 요청에만 응답하게 한다.
+"""
+
+import functools
+import hmac
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi import FastAPI, Request, Response
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on")
+# 설정하면 `/metrics` 는 이 bearer 토큰을 가진 요청에만 응답한다(스크레이퍼 설정과 같은 값).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CALL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Firestore gapic 클라이언트의 RPC 메서드 — 요청 하나가 실제로 몇 번 왕복했는지 센다.
+_FIRESTORE_RPCS = (
+    "get_document",
+    "list_documents",
+    "run_query",
+    "run_aggregation_query",
+    "batch_get_documents",
+    "commit",
+    "begin_transaction",
+    "rollback",
+    "batch_write",
+)
+
+_firestore_calls: ContextVar[Optional[Dict[str, int]]] = ContextVar("firestore_calls", default=None)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """단조 증가 카운터."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, count in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {_format_value(count)}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus `le` 규약)."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[label_values] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return series["count"] if series else 0
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, series in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, series["counts"]):
+                    le = _format_labels(self.labels, values, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{le} {bucket_count}")
+                inf = _format_labels(self.labels, values, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {series['count']}")
+                label_str = _format_labels(self.labels, values)
+                lines.append(f"{self.name}_sum{label_str} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{label_str} {series['count']}")
+        return "\n".join(lines)
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("method", "route")
+)
+REQUEST_COUNT = Counter(
+    "http_requests_total", "Requests by route and status code.", ("method", "route", "status")
+)
+FIRESTORE_CALLS = Histogram(
+    "firestore_calls_per_request", "Firestore RPCs issued per request.", ("method", "route"), CALL_COUNT_BUCKETS
+)
+AUTH_VERIFY_LATENCY = Histogram(
+    "auth_verify_duration_seconds", "Firebase ID token verification time."
+)
+
+REGISTRY = (REQUEST_LATENCY, REQUEST_COUNT, FIRESTORE_CALLS, AUTH_VERIFY_LATENCY)
+
+
+def render_metrics() -> str:
+    """레지스트리 전체를 Prometheus text format 으로 직렬화한다."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+def timed(histogram: Histogram, fn: Callable) -> Callable:
+    """fn 호출 시간을 histogram 에 기록하는 래퍼.
+
+    `functools.wraps` 로 시그니처를 보존하므로 FastAPI 의존성(`Depends`)에도 쓸 수 있다.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+    return wrapper
+
+
+def _count_firestore_call(fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        calls = _firestore_calls.get()
+        if calls is not None:
+            calls["count"] += 1
+        return fn(*args, **kwargs)
+    wrapper._metrics_wrapped = True
+    return wrapper
+
+
+def instrument_firestore(client) -> None:
+    """Firestore client 의 gapic RPC 메서드를 감싸 요청별 호출 수를 센다.
+
+    `firestore.Client._firestore_api` 는 모든 RPC 가 지나는 단일 지점이라
+    reference/query 객체를 감싸지 않고도 실제 왕복 횟수를 정확히 셀 수 있다.
+    """
+    api = client._firestore_api
+    for name in _FIRESTORE_RPCS:
+        fn = getattr(api, name, None)
+        if fn is not None and not getattr(fn, "_metrics_wrapped", False):
+            setattr(api, name, _count_firestore_call(fn))
+
+
+def _route_label(request: Request) -> str:
+    # 경로 템플릿(`/keywords/{keyword_id}`)으로 라벨링해 cardinality 를 묶는다.
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def install(app: FastAPI) -> None:
+    """미들웨어와 내부 `/metrics` 엔드포인트를 app 에 등록한다."""
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+        calls = {"count": 0}
+        token = _firestore_calls.set(calls)
+        start = time.perf_counter()
+        status = "500"
+        try:
+            response = await call_next(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            _firestore_calls.reset(token)
+            method, route = request.method, _route_label(request)
+            REQUEST_LATENCY.observe(elapsed, method, route)
+            REQUEST_COUNT.inc(method, route, status)
+            FIRESTORE_CALLS.observe(calls["count"], method, route)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics(request: Request):
+        if METRICS_TOKEN is not None:
+            expected = f"Bearer {METRICS_TOKEN}"
+            if not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+                return Response(status_code=401)
+        return Response(render_metrics(), media_type="text/plain; version=0.0.4")
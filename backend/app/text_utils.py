@@ -1,43 +1,55 @@
 """표시용 텍스트 정규화 유틸 (US-007).
 
 순수 함수 — 외부 의존 없음. 저장 데이터는 건드리지 않고 응답 계층에서만 쓴다.
+`truncate_middle` 본체는 worker 와 공유하는 `services.text_utils` 에 있다.
 """
 
-_DEFAULT_MAX_LEN = 60
-_ELLIPSIS = " … "
+from functools import lru_cache
 
+from services.text_utils import DISPLAY_TITLE_MAX_LEN, truncate_middle  # noqa: F401 — re-export
 
-def truncate_middle(text, max_len=_DEFAULT_MAX_LEN, ellipsis=_ELLIPSIS, tail_ratio=0.35):
-    """길이 초과 시 앞 head + 중간 생략 + 뒤 tail 로 제목을 정규화한다.
+_DEFAULT_MAX_LEN = DISPLAY_TITLE_MAX_LEN
+# (title, max_len) → 표시 제목 memo. 캐시된 피드가 같은 제목을 반복해서 내려주므로
+# 인스턴스당 최근 제목 몇 천 개면 충분하다(항목당 수백 바이트).
+_DISPLAY_TITLE_CACHE_SIZE = 4096
 
-    - "헤드라인 - 출처" 형태에서 앞(주제)과 뒤(출처)를 보존한다.
-    - 문자(code point) 단위 슬라이스라 CJK 문자 중간이 깨지지 않는다.
-    - text 가 None 이면 그대로, max_len 이하면 trim 만 하여 반환한다.
-    - 결과 길이는 항상 max_len 이하다.
+
+@lru_cache(maxsize=_DISPLAY_TITLE_CACHE_SIZE)
+def _cached_display_title(title, max_len):
+    return truncate_middle(title, max_len)
+
+
+def display_title(title, max_len=_DEFAULT_MAX_LEN):
+    """`truncate_middle` 의 bulk 경로용 변형(기본 ellipsis/ratio 고정).
+
+    - 이미 max_len 이하이고 앞뒤 공백이 없으면 새 문자열을 만들지 않고 그대로 반환.
+    - 그 외에는 (title, max_len) 단위 LRU memo 를 거친다.
     """
-    if text is None:
-        return text
-    text = text.strip()
-    if len(text) <= max_len:
-        return text
-    budget = max_len - len(ellipsis)
-    if budget <= 0:
-        return text[:max_len]
-    tail_len = max(1, int(budget * tail_ratio))
-    head_len = max(1, budget - tail_len)
-    head = text[:head_len].rstrip()
-    tail = text[-tail_len:].lstrip()
-    return f"{head}{ellipsis}{tail}"
+    if title is None:
+        return title
+    if len(title) <= max_len and not title[:1].isspace() and not title[-1:].isspace():
+        return title
+    return _cached_display_title(title, max_len)
 
 
 def with_display_titles(results, max_len=_DEFAULT_MAX_LEN):
     """조회 결과 리스트의 title 을 표시용으로 정규화한다(응답 계층 전용).
 
+    worker 가 저장한 `display_title` 이 같은 max_len 기준이면 그대로 쓰고, 레거시
+    문서나 다른 max_len 요청만 런타임에 계산한다. 저장용 보조 필드
+    (`display_title`, `display_title_max_len`)는 응답에서 뺀다.
     응답 dict 만 정규화하며 저장 데이터/원본은 변경하지 않는다.
     """
     if not results:
         return results
     for item in results:
-        if isinstance(item, dict) and item.get("title") is not None:
-            item["title"] = truncate_middle(item["title"], max_len)
+        if isinstance(item, dict):
+            stored = item.pop("display_title", None)
+            stored_max_len = item.pop("display_title_max_len", None)
+            if stored is not None and stored_max_len == max_len:
+                item["title"] = stored
+                continue
+            title = item.get("title")
+            if title is not None:
+                item["title"] = display_title(title, max_len)
     return results
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+# Gemini `generation_config["response_schema"]` — ArticleAnalysis 와 같은 모양.
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "published_at": {"type": "string", "nullable": True},
+    },
+    "required": ["summary"],
+}
+
+class ArticleAnalysis(BaseModel):
+    """Gemini 기사 분석 결과 (모델이 생성하는 필드만)."""
+    summary: str = Field(..., min_length=1)
+    published_at: Optional[str] = None
@@ -1,3 +1,4 @@
+from typing import List
 from pydantic import BaseModel
 
 class KeywordCreate(BaseModel):
@@ -6,4 +7,10 @@ class KeywordCreate(BaseModel):
 class KeywordItem(BaseModel):
     id: str
     keyword: str
-    created_at: str
\ No newline at end of file
+    created_at: str
+
+class KeywordBatchCreate(BaseModel):
+    keywords: List[str]
+
+class KeywordBatchDelete(BaseModel):
+    ids: List[str]
@@ -0,0 +1,184 @@
+"""Gemini 호출 기한과 hedged request.
+
+느린 응답 하나가 job 전체를 잡아 두지 않도록 한다.
+
+    - JobBudget : job 하나의 시간 예산(JOB_BUDGET_SECONDS). 호출마다 남은 예산을 남은 기사
+                  수로 나눠(CALL_TIMEOUT_MAX 이하) 호출 기한으로 준다 — 앞 호출이 빨리
+                  끝나면 남은 시간은 뒤 호출이 쓴다. 남은 몫이 CALL_TIMEOUT_MIN 보다
+                  적으면 호출하지 않는다(실패로 처리 → 재시도 큐).
+    - Hedger    : 최근 호출 지연의 p95 가 지나도 응답이 없으면 같은 요청을 한 번 더 보내고
+                  먼저 성공한 응답을 쓴다. hedge 는 호출 수의 HEDGE_MAX_RATIO 까지만
+                  보낸다(token bucket) — 모델 비용 상한.
+
+늦게 끝난 쪽 요청은 취소할 수 없다(SDK 호출이 blocking). 같은 호출 기한
+(`request_options.timeout`)을 받으므로 기한 안에 스스로 끝난다.
+
+Gemini/SDK 에 의존하지 않는다 — 호출은 인자 없는 함수로 받는다.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+
+# job 하나(RSS + 기사 분석)의 시간 예산(초). 함수 최대 실행 시간(540초)과 batch worker 의
+# 키워드 묶음(사용자 여러 명)이 이 안에 여러 job 을 돌릴 수 있게 잡는다.
+JOB_BUDGET_SECONDS = 120.0
+# 호출 하나의 기한 상·하한(초)
+CALL_TIMEOUT_MAX = 30.0
+CALL_TIMEOUT_MIN = 3.0
+
+# hedge 지연 = 최근 LATENCY_WINDOW 개 성공 호출 지연의 HEDGE_PERCENTILE 분위.
+# 표본이 HEDGE_MIN_SAMPLES 보다 적으면 hedge 하지 않는다.
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+# hedge 요청 수 / 호출 수 상한. 호출마다 HEDGE_MAX_RATIO 만큼 쌓이고 hedge 하나에 1 을 쓴다.
+# 쌓아 둘 수 있는 양은 HEDGE_BURST 까지 — 느린 호출이 몰려도 잠깐은 모두 hedge 한다.
+HEDGE_MAX_RATIO = 0.1
+HEDGE_BURST = 5.0
+# 동시에 보낼 Gemini 요청 수(worker 스레드 × 2)
+_POOL_SIZE = 16
+
+
+class JobBudget:
+    """job 시작 시각부터 seconds 초(None 이면 JOB_BUDGET_SECONDS). 호출 기한을 나눠 준다."""
+
+    def __init__(self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.seconds = JOB_BUDGET_SECONDS if seconds is None else seconds
+        self._clock = clock
+        self._started = clock()
+
+    def remaining(self) -> float:
+        return max(self.seconds - (self._clock() - self._started), 0.0)
+
+    def call_timeout(self, calls_left: int = 1) -> Optional[float]:
+        """이번 호출의 기한(초). 예산이 CALL_TIMEOUT_MIN 보다 적게 남았으면 None(호출하지 않는다)."""
+        share = self.remaining() / max(calls_left, 1)
+        if share < CALL_TIMEOUT_MIN:
+            return None
+        return min(share, CALL_TIMEOUT_MAX)
+
+
+class LatencyWindow:
+    """최근 성공 호출 지연(초)의 분위수."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self.size = size
+        self._samples: List[float] = []
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            if len(self._samples) > self.size:
+                del self._samples[0]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+class Hedger:
+    """기한 안의 호출, 필요하면 hedge 요청 하나를 더 보낸다 (프로세스 전역 재사용).
+
+    trace 가 주어지면 `gemini_hedged`(hedge 를 보낸 호출), `gemini_hedge_won`(hedge 응답을
+    쓴 호출), `gemini_timeout`(기한 초과) 카운터를 남긴다.
+    """
+
+    def __init__(self, max_ratio: float = HEDGE_MAX_RATIO, window: Optional[LatencyWindow] = None):
+        self.max_ratio = max_ratio
+        self.latencies = window or LatencyWindow()
+        self.calls = 0
+        self.hedges = 0
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def delay(self) -> Optional[float]:
+        """hedge 를 보낼 시점(호출 후 초). 표본이 모자라면 None."""
+        return self.latencies.percentile(HEDGE_PERCENTILE)
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self.hedges += 1
+            return True
+
+    def _timed(self, fn: Callable[[], Any]) -> Callable[[], Any]:
+        def run():
+            start = time.perf_counter()
+            result = fn()
+            self.latencies.add(time.perf_counter() - start)
+            return result
+
+        return run
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=_POOL_SIZE, thread_name_prefix="gemini-hedge")
+            return self._pool
+
+    def call(self, fn: Callable[[], Any], timeout: Optional[float], hedge: bool = False, trace=None) -> Any:
+        """fn() 결과. hedge 가 참이면 p95 가 지나도 안 끝난 호출에 hedge 를 보낸다.
+
+        fn 은 스스로 timeout 안에 끝나야 한다(SDK `request_options.timeout`). 기한 안에
+        성공한 응답이 없으면 마지막 예외(없으면 TimeoutError)를 던진다.
+        """
+        with self._lock:
+            self.calls += 1
+            self._tokens = min(self._tokens + self.max_ratio, HEDGE_BURST)
+        timed = self._timed(fn)
+        delay = self.delay() if hedge else None
+        if delay is None or timeout is None or delay >= timeout:
+            try:
+                return timed()
+            except Exception as e:
+                if is_timeout(e):
+                    _incr(trace, "gemini_timeout")
+                raise
+
+        deadline = time.monotonic() + timeout
+        pool = self._executor()
+        pending = {pool.submit(timed)}
+        done, _ = wait(pending, timeout=delay)
+        if not done and self._acquire():
+            _incr(trace, "gemini_hedged")
+            hedge_future = pool.submit(timed)
+            pending.add(hedge_future)
+        else:
+            hedge_future = None
+
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0.0), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge_future:
+                        _incr(trace, "gemini_hedge_won")
+                    return future.result()
+                error = future.exception()
+        if error is None or is_timeout(error):
+            _incr(trace, "gemini_timeout")
+        raise error or TimeoutError(f"no response within {timeout:.1f}s")
+
+
+def is_timeout(error: BaseException) -> bool:
+    """기한 초과 예외인가 — SDK 는 `google.api_core.exceptions.DeadlineExceeded`(504)를 던진다."""
+    return isinstance(error, TimeoutError) or type(error).__name__ == "DeadlineExceeded"
+
+
+def _incr(trace, counter: str) -> None:
+    if trace is not None:
+        trace.incr(counter)
@@ -1,57 +1,286 @@
-
-import google.generativeai as genai
+import functools
 import os
-import json
 import requests
+import threading
 import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from models.analysis_model import RESPONSE_SCHEMA, ArticleAnalysis
+from services.analysis_retry import DEAD, MAX_ATTEMPTS, RetryQueue
+from services.circuit_breaker import GEMINI, GOOGLE_NEWS, CircuitOpenError, check_status, circuit, ensure_closed
+from services.deadlines import Hedger, JobBudget
+from services.feed_cursor import FeedCursor, parse_pub_date
+from services.instrumentation import JobTrace
+from services.json_repair import loads_with_repair
+from services.prompt_cache import CachedContentBackend, InstructionCache, SystemInstructionBackend
+from services.ranking import RANKING_CANDIDATE_FACTOR, select_candidates
 
-# Initialize Gemini API
 api_key = os.getenv("GEMINI_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
+
+# `google.generativeai` — import 와 configure 는 첫 모델 호출 때 한다(cold start 단축).
+# 테스트/벤치마크는 이 속성을 바꿔 끼운다.
+genai = None
 
 # Summarization model pin. 변경은 여기서 (리뷰 + 배포 경로로).
 GEMINI_MODEL = "gemini-3.1-flash-lite"
 
-def fetch_grounded_news(keyword: str, max_results: int = 5):
+# 분석 지시문 — 모든 기사에 같은 정적 부분. 기사마다 보내지 않고 모델에 한 번 붙여
+# 재사용한다(services/prompt_cache.py). 기사별 프롬프트는 링크/제목/출처/시각만.
+ANALYSIS_INSTRUCTION = """You are a professional news analyst.
+Summarize the news article at the given link in Korean.
+Return JSON: {"summary": "Korean summary", "published_at": null}
+Set "published_at" ('YYYY-MM-DD HH:MM', KST) only if the article's actual publication time differs from the given one.
+"""
+
+# True 면 지시문을 Gemini context cache 로 올린다. 모델별 최소 캐시 크기보다 짧은
+# 지시문은 거절되므로(→ system instruction 으로 대체) 지시문이 길어질 때 켠다.
+GEMINI_CONTEXT_CACHE = False
+
+_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": RESPONSE_SCHEMA,
+}
+
+_instruction_cache: Optional[InstructionCache] = None
+
+# True 면 p95 지연이 지나도 응답이 없는 호출에 같은 요청을 한 번 더 보낸다(hedged request,
+# services/deadlines.py). hedge 는 호출 수의 HEDGE_MAX_RATIO 까지만 — 그만큼 모델 비용이 는다.
+GEMINI_HEDGE = False
+
+# 호출 지연 분포와 hedge 예산 (프로세스 전역). hedge 를 꺼 둬도 지연 표본은 모은다.
+_hedger = Hedger()
+
+# Google News RSS 검색 엔드포인트 (벤치마크는 로컬 RSS 서버로 교체한다).
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss/search"
+
+# published_at 저장 형식 (KST)
+KST = timezone(timedelta(hours=9))
+KST_FORMAT = "%Y-%m-%d %H:%M"
+
+class SharedFetch:
+    """한 키워드를 여러 사용자에게 처리할 때 RSS 응답과 기사 분석을 재사용한다 (batch worker).
+
+    키워드 묶음 하나 동안만 쓴다(피드가 바뀌기 전). 분석은 기사 링크 기준이고, 실패(None)도
+    재사용한다 — 사용자 커서는 그 기사를 잡아 둬 다음 실행에서 다시 시도한다.
+    """
+
+    def __init__(self):
+        self._feeds: Dict[Tuple[str, int], List[dict]] = {}
+        self._analyses: Dict[str, Optional[dict]] = {}
+        self._lock = threading.Lock()
+
+    def feed(self, keyword: str, max_results: int, trace: JobTrace) -> List[dict]:
+        key = (keyword, max_results)
+        with self._lock:
+            cached = self._feeds.get(key)
+        if cached is None:
+            cached = _get_google_news_rss(keyword, max_results)
+            with self._lock:
+                self._feeds[key] = cached
+        else:
+            trace.incr("rss_reused")
+        return [dict(article) for article in cached]
+
+    def analyze(self, article: dict, trace: JobTrace, timeout: Optional[float] = None) -> Optional[dict]:
+        link = article["link"]
+        with self._lock:
+            hit = link in self._analyses
+            result = self._analyses.get(link)
+        if not hit:
+            result = _analyze_article_with_gemini(article, trace, timeout=timeout)
+            with self._lock:
+                self._analyses[link] = result
+        else:
+            trace.incr("analysis_reused")
+        return dict(result) if result else None
+
+
+def fetch_grounded_news(
+    keyword: str,
+    max_results: int = 5,
+    trace: Optional[JobTrace] = None,
+    seen_links: Optional[Callable[[List[str]], Set[str]]] = None,
+    cursor: Optional[FeedCursor] = None,
+    known_story: Optional[Callable[[dict], bool]] = None,
+    shared: Optional[SharedFetch] = None,
+    retries: Optional[RetryQueue] = None,
+    budget: Optional[JobBudget] = None,
+):
     """
     Hybrid approach:
     1. Fetch news links via Google News RSS.
     2. Use Gemini 2.5 Flash to analyze each link and format as JSON.
+
+    trace 가 주어지면 단계별 타이밍/토큰을 그 job 에 기록한다.
+    seen_links 가 주어지면 RSS 링크 목록을 한 번에 넘겨 이미 저장된 링크 집합을 받고,
+    그 기사들은 Gemini 분석 전에 제외한다(모델 호출 절감).
+    cursor 가 주어지면 커서 이후 항목만 처리하고, 처리한 항목을 커서에 반영한다
+    (저장은 호출 측). 새 항목이 없으면 dedup/Gemini 없이 바로 끝난다.
+    RSS 는 max_results 의 RANKING_CANDIDATE_FACTOR 배를 받아 로컬 랭킹
+    (관련도 + near-duplicate 제거 + 다양성)으로 max_results 개만 분석한다.
+    known_story 가 주어지면 이미 저장된 다른 매체의 같은 기사(제목 SimHash)를
+    분석 전에 제외한다 — 출처 첨부는 호출 측이 한다.
+    shared 가 주어지면 같은 키워드의 다른 사용자 처리에서 받은 RSS 응답과 분석 결과를
+    재사용한다(사용자별 dedup/커서/랭킹은 그대로).
+    retries 가 주어지면 분석에 실패한 기사를 재시도 큐에 넣고(커서는 전진), 새 기사를
+    고르고 남은 분석 자리(max_results 중)로 시도 시각이 된 재시도 항목을 함께 분석한다.
+    budget 은 job 의 시간 예산(없으면 지금부터 JOB_BUDGET_SECONDS)이다. Gemini 호출마다
+    남은 예산을 남은 기사 수로 나눈 기한을 주고, 예산이 모자라면 남은 기사는 분석하지 않고
+    실패로 처리한다(재시도 큐 / 커서 보류).
+    Gemini 나 Google News 의 circuit breaker 가 open 이면 아무것도 호출하지 않고
+    CircuitOpenError 를 던진다(호출 측이 job 을 미룬다). 분석 도중 open 되면 남은 기사는
+    분석하지 않고 커서를 보류해 다음 실행으로 넘긴다(재시도 큐에 넣지 않는다).
     """
     if not api_key:
         print("GEMINI_API_KEY not found.")
         return []
 
-    print(f"[Phase 1] Fetching RSS for: {keyword}")
-    articles = _get_google_news_rss(keyword, max_results)
-    
+    trace = trace or JobTrace(keyword)
+    ensure_closed(GOOGLE_NEWS, GEMINI)
+    budget = budget or JobBudget()
+
+    articles = _select_articles(keyword, max_results, trace, seen_links, cursor, known_story, shared)
+
+    if retries is not None:
+        due = retries.due(max_results - len(articles), exclude=[article["link"] for article in articles])
+        if due:
+            print(f"[Phase 2] Retry {len(due)} previously failed articles")
+            trace.incr("retry_attempted", len(due))
+            articles = articles + due
     if not articles:
-        print("[Phase 1] No articles found.")
         return []
 
     print(f"[Phase 2] Analyzing {len(articles)} articles with Gemini...")
     final_news = []
     
-    for article in articles:
+    for n, article in enumerate(articles):
+        # Individual analysis for better quality
         try:
-            # Individual analysis for better quality
-            json_result = _analyze_article_with_gemini(article)
-            if json_result:
-                final_news.append(json_result)
-        except Exception as e:
-            print(f"[Phase 2 Error] Failed to process article: {e}")
-            continue
+            json_result, error = _analyze_within_budget(article, trace, shared, budget.call_timeout(len(articles) - n))
+        except CircuitOpenError as e:
+            print(f"[Phase 2] {e}: defer {len(articles) - n} articles to the next run")
+            trace.incr("circuit_deferred", len(articles) - n)
+            if cursor is not None:
+                cursor.hold_date()
+            break
+
+        if json_result:
+            final_news.append(json_result)
+            if cursor is not None:
+                cursor.mark_processed([article])
+            if retries is not None:
+                retries.succeeded(article)
+        elif retries is not None:
+            # 재시도 큐가 맡으므로 커서는 전진시킨다(다음 실행이 키워드 전체를 다시 보지 않는다)
+            state = retries.failed(article, error)
+            trace.incr("retry_dead" if state == DEAD else "retry_queued")
+            if state == DEAD:
+                print(f"[Phase 2] Giving up after {MAX_ATTEMPTS} attempts: {article['link']}")
+            if cursor is not None:
+                cursor.mark_processed([article])
+        elif cursor is not None:
+            cursor.hold_date()
             
     return final_news
 
+def _analyze_within_budget(
+    article: dict, trace: JobTrace, shared: Optional[SharedFetch], timeout: Optional[float]
+) -> Tuple[Optional[dict], Optional[str]]:
+    """(분석 결과, 실패 사유). timeout 이 None 이면 job 예산이 바닥나 호출하지 않는다."""
+    if timeout is None:
+        print(f"[Phase 2] Job budget exhausted, skip: {article['link']}")
+        trace.incr("deadline_skipped")
+        return None, "deadline"
+    try:
+        if shared is not None:
+            json_result = shared.analyze(article, trace, timeout)
+        else:
+            json_result = _analyze_article_with_gemini(article, trace, timeout=timeout)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        print(f"[Phase 2 Error] Failed to process article: {e}")
+        return None, type(e).__name__
+    return json_result, None if json_result else "analysis_failed"
+
+def _select_articles(
+    keyword: str,
+    max_results: int,
+    trace: JobTrace,
+    seen_links: Optional[Callable[[List[str]], Set[str]]],
+    cursor: Optional[FeedCursor],
+    known_story: Optional[Callable[[dict], bool]],
+    shared: Optional[SharedFetch],
+) -> List[dict]:
+    """RSS → 커서 → 저장 여부 → 같은 기사 → 랭킹을 거쳐 분석할 새 기사를 고른다."""
+    print(f"[Phase 1] Fetching RSS for: {keyword}")
+    with trace.phase("rss_fetch") as record:
+        if shared is not None:
+            articles = shared.feed(keyword, max_results * RANKING_CANDIDATE_FACTOR, trace)
+        else:
+            articles = _get_google_news_rss(keyword, max_results * RANKING_CANDIDATE_FACTOR)
+        record["items"] = len(articles)
+    
+    if not articles:
+        print("[Phase 1] No articles found.")
+        return []
+
+    if cursor is not None:
+        fresh = cursor.filter_new(articles)
+        trace.incr("skipped_by_cursor", len(articles) - len(fresh))
+        articles = fresh
+        if not articles:
+            print("[Phase 1] No new articles since last run.")
+            return []
+
+    stored: List[dict] = []
+    if seen_links is not None:
+        articles, stored = _exclude_seen(articles, seen_links)
+        if cursor is not None:
+            cursor.mark_processed(stored)
+        if not articles:
+            print("[Phase 1] All articles already stored.")
+            return []
+
+    if known_story is not None:
+        attached = [article for article in articles if known_story(article)]
+        if attached:
+            print(f"[Phase 1] Attach {len(attached)} syndicated articles to stored stories")
+            articles = [article for article in articles if article not in attached]
+            trace.incr("attached_before_analysis", len(attached))
+            if cursor is not None:
+                cursor.mark_processed(attached)
+        if not articles:
+            return []
+
+    with trace.phase("rank", items=len(articles)) as record:
+        articles, duplicates = select_candidates(keyword, articles, max_results, already=stored)
+        record["selected"] = len(articles)
+        record["near_duplicates"] = len(duplicates)
+    trace.incr("skipped_near_duplicate", len(duplicates))
+    if cursor is not None:
+        cursor.mark_processed(duplicates)
+    return articles
+
+def _exclude_seen(articles: List[dict], seen_links: Callable[[List[str]], Set[str]]):
+    """(미저장 기사, 이미 저장된 기사) 로 나눈다."""
+    known = seen_links([article["link"] for article in articles])
+    fresh = [article for article in articles if article["link"] not in known]
+    stored = [article for article in articles if article["link"] in known]
+    if stored:
+        print(f"[Phase 1] Skip {len(stored)} already-stored articles before analysis")
+    return fresh, stored
+
 def _get_google_news_rss(keyword: str, max_results: int):
+    """Google News RSS 검색 결과. 실패하면 빈 목록, circuit 이 open 이면 CircuitOpenError."""
     # RSS URL construction
     processed_keyword = keyword.replace(" ", "+")
-    rss_url = f"https://news.google.com/rss/search?q={processed_keyword}&hl=ko&gl=KR&ceid=KR:ko"
+    rss_url = f"{GOOGLE_NEWS_RSS_URL}?q={processed_keyword}&hl=ko&gl=KR&ceid=KR:ko"
     
     try:
-        response = requests.get(rss_url, timeout=10)
+        with circuit(GOOGLE_NEWS).guard():
+            response = requests.get(rss_url, timeout=10)
+            check_status(response.status_code)
         if response.status_code == 200:
             root = ET.fromstring(response.content)
             items = []
@@ -71,46 +300,116 @@ def _get_google_news_rss(keyword: str, max_results: int):
         else:
             print(f"[RSS Error] Status Code: {response.status_code}")
             return []
+    except CircuitOpenError:
+        raise
     except Exception as e:
         print(f"[RSS Error] Exception: {e}")
         return []
 
-def _analyze_article_with_gemini(article):
-    model = genai.GenerativeModel(
-        GEMINI_MODEL,
-        generation_config={"response_mime_type": "application/json"}
-    )
-    
+def _get_genai():
+    global genai
+    if genai is None:
+        import google.generativeai as sdk
+
+        sdk.configure(api_key=api_key)
+        genai = sdk
+    return genai
+
+def _analysis_model():
+    """지시문이 붙은 분석 모델 (프로세스 전역 재사용, SDK 가 바뀌면 새로 만든다)."""
+    global _instruction_cache
+    sdk = _get_genai()
+    if _instruction_cache is None or _instruction_cache.backend.sdk is not sdk:
+        backend = CachedContentBackend if GEMINI_CONTEXT_CACHE else SystemInstructionBackend
+        _instruction_cache = InstructionCache(
+            backend(sdk, GEMINI_MODEL, ANALYSIS_INSTRUCTION, _GENERATION_CONFIG)
+        )
+    return _instruction_cache.model()
+
+def _analyze_article_with_gemini(article, trace: Optional[JobTrace] = None, timeout: Optional[float] = None):
+    """기사 하나를 요약한다.
+
+    모델은 `summary` 와 (RSS 날짜가 틀렸을 때만) `published_at` 만 생성한다.
+    제목/URL/출처/KST 발행 시각은 RSS 에서 결정적으로 채운다.
+    응답은 `RESPONSE_SCHEMA` 로 제약하고, 깨진 JSON 은 로컬 수리 후 검증한다.
+    실패 사유는 job 카운터(`gemini_error`, `parse_failed`, `parse_repaired`)로 남는다.
+    정적 지시문(`ANALYSIS_INSTRUCTION`)은 모델에 붙어 있고 프롬프트는 기사 정보만 담는다.
+    timeout(초)은 호출 기한이다(`request_options.timeout`, 넘기면 `gemini_timeout`).
+    GEMINI_HEDGE 면 p95 지연이 지나도 응답이 없을 때 hedge 요청을 보낸다(`gemini_hedged`).
+    Gemini circuit 이 open 이면 호출하지 않고 CircuitOpenError 를 던진다(`circuit_open`).
+    """
+    model = _analysis_model()
+
+    rss_published_at = pub_date_to_kst(article['pub_date'])
+
     prompt = f"""
-    You are a professional news analyst.
-    Please analyze the following news article found at this link: {article['link']}
-    
-    Base Information from RSS:
+    Link: {article['link']}
     - Title: {article['title']}
-    - RSS PubDate: {article['pub_date']}
     - Source: {article['source']}
-    
-    Task:
-    1. Visit the link or use your knowledge to understand the content.
-    2. Extract the exact publication date.
-       - IMPORTANT: Convert the date to **KST (Korea Standard Time, UTC+9)**.
-       - Format must be 'YYYY-MM-DD HH:MM'.
-       - If only RSS date is available, convert '{article['pub_date']}' to KST.
-    3. Generate a concise summary in Korean.
-    4. Return the result in the following JSON format:
-    
-    {{
-        "title": "{article['title']}",
-        "source_name": "{article['source']}",
-        "published_at": "YYYY-MM-DD HH:MM", 
-        "url": "{article['link']}",
-        "summary": "Korean summary here..."
-    }}
+    - Published (KST): {rss_published_at or 'unknown'}
     """
-    
+
+    trace = trace or JobTrace(keyword=None)
     try:
-        response = model.generate_content(prompt)
-        return json.loads(response.text)
+        with circuit(GEMINI).guard(), trace.phase("gemini_analyze", url=article['link']) as record:
+            response = _generate(model, prompt, timeout, trace)
+            trace.add_usage(record, response)
+        # 차단된 응답은 `.text` 가 ValueError — 응답은 왔으니 circuit 밖에서 읽는다
+        text = response.text
+    except CircuitOpenError:
+        trace.incr("circuit_open")
+        raise
     except Exception as e:
         print(f"[Gemini Error] {e}")
+        trace.incr("gemini_error")
+        if GEMINI_CONTEXT_CACHE and _instruction_cache is not None:
+            _instruction_cache.invalidate()  # 서버에서 캐시가 사라졌을 수 있다
+        return None
+
+    analysis = _parse_analysis(text, trace)
+    if analysis is None:
+        return None
+
+    return {
+        "title": article['title'],
+        "source_name": article['source'],
+        "published_at": _valid_kst(analysis.published_at) or rss_published_at,
+        "url": article['link'],
+        "summary": analysis.summary,
+    }
+
+def _generate(model, prompt: str, timeout: Optional[float], trace: JobTrace):
+    """기한(timeout) 안의 `generate_content`. 기한이 없으면 SDK 기본값."""
+    options = {} if timeout is None else {"request_options": {"timeout": timeout}}
+    call = functools.partial(model.generate_content, prompt, **options)
+    return _hedger.call(call, timeout, hedge=GEMINI_HEDGE, trace=trace)
+
+def _parse_analysis(text: str, trace: JobTrace) -> Optional[ArticleAnalysis]:
+    """모델 응답 → ArticleAnalysis. 수리로도 안 되거나 스키마에 안 맞으면 None."""
+    try:
+        data, repaired = loads_with_repair(text)
+        if not isinstance(data, dict):
+            raise ValueError(f"expected JSON object, got {type(data).__name__}")
+        analysis = ArticleAnalysis(**data)
+    except ValueError as e:
+        print(f"[Gemini Parse Error] {e}")
+        trace.incr("parse_failed")
+        return None
+    if repaired:
+        trace.incr("parse_repaired")
+    return analysis
+
+def pub_date_to_kst(pub_date: Optional[str]) -> Optional[str]:
+    """RSS `pubDate`(RFC 822) → KST 'YYYY-MM-DD HH:MM'. 파싱 실패 시 None."""
+    published = parse_pub_date(pub_date)
+    return published.astimezone(KST).strftime(KST_FORMAT) if published else None
+
+def _valid_kst(value) -> Optional[str]:
+    """모델이 돌려준 보정 날짜가 'YYYY-MM-DD HH:MM' 형식일 때만 채택한다."""
+    if not isinstance(value, str):
+        return None
+    try:
+        datetime.strptime(value.strip(), KST_FORMAT)
+    except ValueError:
         return None
+    return value.strip()
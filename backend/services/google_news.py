@@ -3,6 +3,7 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import os
 import json
+from services.circuit_breaker import GEMINI, GOOGLE_NEWS, check_status, circuit
 
 # 전역 디버그 설정
 DEBUG_MODE = False
@@ -28,7 +29,10 @@ def get_google_news(query, max_results=3):
                       "AppleWebKit/537.36 (KHTML, like Gecko) "
                       "Chrome/113.0.0.0 Safari/537.36"
     }
-    res = requests.get(url, headers=headers)
+    # Google News 장애 중에는 요청하지 않고 CircuitOpenError (run_news_summary 가 수집 실패로 남긴다)
+    with circuit(GOOGLE_NEWS).guard():
+        res = requests.get(url, headers=headers)
+        check_status(res.status_code)
 
     soup = BeautifulSoup(res.text, "html.parser")
     items = soup.select("a.JtKRv")[:max_results]
@@ -105,7 +109,10 @@ def summarize_with_gemini(title: str, url: str) -> str:
     }
 
     try:
-        response = requests.post(API_URL, headers=_gemini_headers, params=params, data=json.dumps(data))
+        # Gemini 장애 중에는 요청하지 않고 바로 실패 문구를 돌려준다
+        with circuit(GEMINI).guard():
+            response = requests.post(API_URL, headers=_gemini_headers, params=params, data=json.dumps(data))
+            check_status(response.status_code)
         response.raise_for_status()
         result = response.json()
         summary_text = result["candidates"][0]["content"]["parts"][0]["text"]
@@ -0,0 +1,118 @@
+"""워커 단계별 계측 — structured JSON log.
+
+한 (user, keyword) job 안의 RSS 수집, Gemini 호출, dedup 조회, Firestore 쓰기를
+context-manager 타이머로 감싸고, 단계마다 JSON 한 줄을 stdout 으로 남긴다.
+Cloud Logging 은 stdout 의 JSON 줄을 jsonPayload 로 파싱하므로 별도 exporter 없이
+로그 쿼리로 지연/토큰 분포를 볼 수 있다. job 종료 시 run-level 요약 레코드를 1건 남긴다.
+"""
+
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_USAGE_FIELDS = {
+    "prompt_token_count": "prompt_tokens",
+    "candidates_token_count": "output_tokens",
+    "total_token_count": "total_tokens",
+    "cached_content_token_count": "cached_tokens",
+}
+
+
+def usage_from_response(response: Any) -> Dict[str, int]:
+    """Gemini 응답의 `usage_metadata` 에서 토큰 사용량을 뽑는다(없으면 빈 dict)."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    tokens = {}
+    for attr, key in _USAGE_FIELDS.items():
+        value = getattr(usage, attr, None)
+        if isinstance(value, int):
+            tokens[key] = value
+    return tokens
+
+
+class JobTrace:
+    """한 job 의 단계별 지연·건수·토큰을 모으고 JSON 레코드로 내보낸다.
+
+    Args:
+        keyword: 처리 중인 키워드(단독 Gemini 호출 등 모르면 None).
+        user_id: 대상 사용자(없으면 None — 예: 단독 fetch 호출).
+    """
+
+    def __init__(self, keyword: Optional[str], user_id: Optional[str] = None):
+        self.keyword = keyword
+        self.user_id = user_id
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.tokens: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """단계 하나를 타이밍한다.
+
+        yield 되는 dict 에 `items` 등 필드를 채우면 레코드에 그대로 실린다.
+        예외는 `error` 필드로 기록한 뒤 다시 던진다.
+        """
+        record: Dict[str, Any] = dict(fields)
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            record["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            self._accumulate(name, record)
+            self._emit("phase", phase=name, **record)
+
+    def add_usage(self, record: Dict[str, Any], response: Any) -> None:
+        """Gemini 응답의 토큰 사용량을 단계 레코드와 job 합계에 더한다."""
+        tokens = usage_from_response(response)
+        record.update(tokens)
+        for key, value in tokens.items():
+            self.tokens[key] = self.tokens.get(key, 0) + value
+
+    def incr(self, name: str, n: int = 1) -> None:
+        """job 단위 카운터(saved/skipped 등)를 올린다."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self, **fields: Any) -> Dict[str, Any]:
+        """run-level 요약 레코드를 남기고 그 dict 를 반환한다."""
+        record = {
+            "latency_ms": round((time.perf_counter() - self._started) * 1000, 2),
+            "phases": self.phases,
+            "tokens": self.tokens,
+            "counters": self.counters,
+            **fields,
+        }
+        self._emit("job_summary", **record)
+        return record
+
+    def _accumulate(self, name: str, record: Dict[str, Any]) -> None:
+        agg = self.phases.setdefault(name, {"calls": 0, "latency_ms": 0.0, "errors": 0})
+        agg["calls"] += 1
+        agg["latency_ms"] = round(agg["latency_ms"] + record["latency_ms"], 2)
+        if "error" in record:
+            agg["errors"] += 1
+
+    def _emit(self, event: str, **fields: Any) -> None:
+        payload = {
+            "severity": "ERROR" if "error" in fields else "INFO",
+            "event": event,
+            "keyword": self.keyword,
+            "user_id": self.user_id,
+            **fields,
+        }
+        logger.info(json.dumps(payload, ensure_ascii=False, default=str))
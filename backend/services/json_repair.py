@@ -0,0 +1,70 @@
+"""LLM JSON 출력의 흔한 결함을 로컬에서 고친다.
+
+다루는 결함:
+    - 코드 펜스(```json ... ```) / 앞뒤 설명 문장
+    - 닫는 괄호 앞의 trailing comma
+    - 출력 한도에 잘린 응답(닫히지 않은 문자열·객체, 값 없는/잘린 키)
+
+고칠 수 없으면 `json.JSONDecodeError`(ValueError) 를 그대로 던진다.
+"""
+
+import json
+import re
+from typing import Any, Tuple
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```\s*$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_DANGLING_KEY = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*$')
+
+
+def loads_with_repair(text: str) -> Tuple[Any, bool]:
+    """(파싱 결과, 수리 여부). 원문이 유효한 JSON 이면 수리하지 않는다."""
+    try:
+        return json.loads(text), False
+    except ValueError:
+        return json.loads(repair_json(text)), True
+
+
+def repair_json(text: str) -> str:
+    s = _FENCE.sub("", (text or "").strip())
+    start = s.find("{")
+    if start > 0:
+        s = s[start:]
+    s = _close_truncated(s)
+    return _TRAILING_COMMA.sub(r"\1", s)
+
+
+def _close_truncated(s: str) -> str:
+    """첫 최상위 값이 끝나는 곳에서 자르고, 잘린 문자열/괄호는 닫는다."""
+    stack = []
+    in_string = escaped = False
+    for i, ch in enumerate(s):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+            if not stack:
+                return s[:i + 1]
+
+    if in_string:
+        if escaped:
+            s = s[:-1]
+        s += '"'
+    s = s.rstrip()
+    if stack and stack[-1] == "}":
+        s = _DANGLING_KEY.sub(r"\1", s)
+    if s.endswith(":"):
+        s += " null"
+    elif s.endswith(","):
+        s = s[:-1]
+    return s + "".join(reversed(stack))
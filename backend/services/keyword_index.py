@@ -0,0 +1,44 @@
+"""키워드 → 구독자 역색인.
+
+최상위 `keyword_index/{keyword_index_id(keyword)}` 문서 하나에 그 키워드를 구독한
+사용자 uid 집합과 수를 보관한다. backend 의 키워드 추가/삭제가 트랜잭션으로 갱신하고,
+trigger 는 사용자 전체를 훑는 대신 이 컬렉션만 읽는다 — 읽기 수가 사용자 수가 아니라
+고유 키워드 수에 비례한다.
+
+문서 ID 는 정규화한 키워드의 해시다(키워드에 '/' 가 들어가도 안전). 원문은 `keyword`
+필드에 둔다.
+
+Firestore 에 의존하지 않는다 — 문서 dict 변환만 하고 읽기/쓰기는 호출 측이 한다.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+KEYWORD_INDEX_COLLECTION = "keyword_index"
+
+
+def normalize_keyword(keyword: str) -> str:
+    """앞뒤 공백 제거 + 연속 공백을 하나로. 대소문자는 그대로 둔다(검색어 의미 보존)."""
+    return " ".join(keyword.split())
+
+
+def keyword_index_id(keyword: str) -> str:
+    """키워드 → 역색인 문서 ID (정규화 후 고정 길이 해시)."""
+    return hashlib.sha1(normalize_keyword(keyword).encode("utf-8")).hexdigest()[:20]
+
+
+def subscribers(data: Optional[Dict[str, Any]]) -> List[str]:
+    """역색인 문서 dict → 구독자 uid 목록 (문서가 없으면 빈 목록)."""
+    return list((data or {}).get("subscribers") or [])
+
+
+def index_entry(keyword: str, uids: Iterable[str]) -> Dict[str, Any]:
+    """역색인 문서 dict. uid 는 정렬해 두어 같은 집합이면 같은 문서가 된다."""
+    members = sorted(set(uids))
+    return {
+        "keyword": normalize_keyword(keyword),
+        "subscribers": members,
+        "count": len(members),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
@@ -1,33 +1,251 @@
-from google.cloud import firestore
 from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Set
+from services.clients import firestore_client
+from services.feed_cursor import CURSOR_COLLECTION, cursor_id
+from services.keyword_index import KEYWORD_INDEX_COLLECTION, keyword_index_id, normalize_keyword
 
-db = firestore.Client()
+# 첫 사용 때 만든다(cold start 단축). 테스트/벤치마크는 이 속성을 바꿔 끼운다.
+db = None
+firestore = None
 
-def add_keyword(user_id: str, keyword: str) -> str:
-    # ✅ 상위 user 문서가 없다면 빈 문서라도 생성 (merge=True)
-    db.collection("users").document(user_id).set({}, merge=True)
-    
-    keyword_ref = db.collection("users").document(user_id).collection("keywords")
-    existing = keyword_ref.where("keyword", "==", keyword).limit(1).stream()
-    if any(existing):
-        raise ValueError("Keyword already exists")
-
-    doc_ref = keyword_ref.document()
-    doc_ref.set({
+# google.api_core.exceptions 의 HTTP code (AlreadyExists / NotFound·precondition 실패)
+_CONFLICT = 409
+_NOT_FOUND = 404
+
+# 일괄 요청 한 번에 다루는 키워드 수 상한. Firestore batch 는 쓰기 500 건까지이고
+# 키워드당 최대 3 건(키워드 문서, 색인, 커서)을 쓴다.
+KEYWORD_BATCH_LIMIT = 100
+# 확인(get_all)과 commit 사이에 같은 키워드가 바뀌어 commit 이 실패했을 때 재시도 횟수
+_BATCH_ATTEMPTS = 3
+
+
+def get_db():
+    global db
+    if db is None:
+        db = firestore_client()
+    return db
+
+
+def _firestore():
+    """ArrayUnion / ArrayRemove / Increment sentinel 을 가진 `google.cloud.firestore` 모듈."""
+    global firestore
+    if firestore is None:
+        from google.cloud import firestore as firestore_module
+
+        firestore = firestore_module
+    return firestore
+
+
+def _status(error: Exception):
+    return getattr(error, "code", None)
+
+
+def _queue_add(batch, user_ref, keyword_id: str, keyword: str) -> None:
+    fs = _firestore()
+    batch.create(user_ref.collection("keywords").document(keyword_id), {
         "keyword": keyword,
         "created_at": datetime.now(timezone.utc).isoformat()
     })
-    return doc_ref.id
+    batch.set(get_db().collection(KEYWORD_INDEX_COLLECTION).document(keyword_id), {
+        "keyword": keyword,
+        "subscribers": fs.ArrayUnion([user_ref.id]),
+        "count": fs.Increment(1),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }, merge=True)
+
+
+def add_keyword(user_id: str, keyword: str) -> str:
+    """키워드 문서를 만들고 역색인에 구독자로 넣는다(batch commit 1회).
+
+    키워드 문서 ID 는 정규화 키워드의 해시라 `create()` 충돌이 곧 중복 검사다 — 조회 후
+    쓰기 사이의 경합이 없다. batch 는 원자적이라 중복이면 역색인도 바뀌지 않는다.
+    정규화하면 빈 문자열인 키워드는 ValueError.
+    """
+    keyword = normalize_keyword(keyword)
+    if not keyword:
+        raise ValueError("Keyword is empty")
+    keyword_id = keyword_index_id(keyword)
+    user_ref = get_db().collection("users").document(user_id)
+
+    batch = get_db().batch()
+    # ✅ 상위 user 문서가 없다면 빈 문서라도 생성 (merge=True)
+    batch.set(user_ref, {}, merge=True)
+    _queue_add(batch, user_ref, keyword_id, keyword)
+    try:
+        batch.commit()
+    except Exception as e:
+        if _status(e) == _CONFLICT:
+            raise ValueError("Keyword already exists")
+        raise
+    return keyword_id
+
+
+def add_keywords(user_id: str, keywords: Iterable[str]) -> Dict[str, List[dict]]:
+    """여러 키워드를 정규화·중복 제거해 batch 한 번으로 추가한다.
+
+    이미 있는 키워드는 `get_all` 한 번으로 확인해 건너뛴다(오류가 아니다). 확인과 commit
+    사이에 다른 요청이 같은 키워드를 넣으면 `create()` 충돌로 batch 전체가 실패하므로
+    다시 확인하고 재시도한다.
+
+    Returns:
+        {"added": [{"id", "keyword"}], "existing": [{"id", "keyword"}]}
+    """
+    unique: Dict[str, str] = {}
+    for keyword in keywords:
+        keyword = normalize_keyword(keyword)
+        if keyword:
+            unique.setdefault(keyword_index_id(keyword), keyword)
+    if len(unique) > KEYWORD_BATCH_LIMIT:
+        raise ValueError(f"At most {KEYWORD_BATCH_LIMIT} keywords per request")
+    if not unique:
+        return {"added": [], "existing": []}
+
+    user_ref = get_db().collection("users").document(user_id)
+    keywords_ref = user_ref.collection("keywords")
+    for _attempt in range(_BATCH_ATTEMPTS):
+        snapshots = get_db().get_all([keywords_ref.document(keyword_id) for keyword_id in unique])
+        existing = {snapshot.id for snapshot in snapshots if snapshot.exists}
+        new = [keyword_id for keyword_id in unique if keyword_id not in existing]
+        if new:
+            batch = get_db().batch()
+            batch.set(user_ref, {}, merge=True)
+            for keyword_id in new:
+                _queue_add(batch, user_ref, keyword_id, unique[keyword_id])
+            try:
+                batch.commit()
+            except Exception as e:
+                if _status(e) == _CONFLICT:
+                    continue
+                raise
+        return {
+            "added": [{"id": keyword_id, "keyword": unique[keyword_id]} for keyword_id in new],
+            "existing": [
+                {"id": keyword_id, "keyword": keyword}
+                for keyword_id, keyword in unique.items() if keyword_id in existing
+            ],
+        }
+    raise RuntimeError("Keywords changed concurrently, please retry")
 
 def get_keywords(user_id: str):
-    docs = db.collection("users").document(user_id).collection("keywords").stream()
+    docs = get_db().collection("users").document(user_id).collection("keywords").stream()
     return [
         {"id": doc.id, **doc.to_dict()} for doc in docs
     ]
 
+def _queue_delete(
+    batch, user_ref, keyword_id: str, index_id: str, feed_cursor_id: str, indexed: bool = True
+) -> None:
+    fs = _firestore()
+    batch.delete(
+        user_ref.collection("keywords").document(keyword_id),
+        option=get_db().write_option(exists=True),
+    )
+    # 키워드를 다시 추가하면 처음부터 수집하도록 RSS 커서도 지운다.
+    batch.delete(user_ref.collection(CURSOR_COLLECTION).document(feed_cursor_id))
+    # merge 가 아닌 update: 색인 문서가 없으면(색인 이전 키워드) count=-1 문서를 만드는 대신
+    # batch 가 NOT_FOUND 로 실패한다. 호출자가 색인 문서를 확인하고 indexed=False 로 다시 쓴다.
+    if indexed:
+        batch.update(get_db().collection(KEYWORD_INDEX_COLLECTION).document(index_id), {
+            "subscribers": fs.ArrayRemove([user_ref.id]),
+            "count": fs.Increment(-1),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+
+def _missing_index_ids(index_ids: Iterable[str]) -> Set[str]:
+    """없는 색인 문서 ID (`get_all` 1회)."""
+    refs = [get_db().collection(KEYWORD_INDEX_COLLECTION).document(index_id) for index_id in set(index_ids)]
+    return {snapshot.id for snapshot in get_db().get_all(refs) if not snapshot.exists}
+
+
+def _is_keyword_hash(keyword_id: str) -> bool:
+    """해시 ID(소문자 hex 20자)인지. Firestore 자동 ID(대소문자+숫자 20자)와 구분된다."""
+    return len(keyword_id) == 20 and all(c in "0123456789abcdef" for c in keyword_id)
+
+
 def delete_keyword(user_id: str, keyword_id: str):
-    ref = db.collection("users").document(user_id).collection("keywords").document(keyword_id)
-    if not ref.get().exists:
-        raise ValueError("Keyword not found")
-    ref.delete()
+    """키워드 문서·RSS 커서를 지우고 역색인에서 뺀다(batch commit 1회, 읽기 없음).
+
+    문서가 없으면 exists precondition 이 batch 전체를 실패시킨다. 해시 ID 는 역색인 ID,
+    커서 ID 와 같다(정규화 키워드는 앞뒤 공백이 없어 `cursor_id` 와 같은 해시).
+    색인 문서가 없어도(색인 이전 키워드) batch 가 실패한다 — 그때만 읽어서 어느 쪽인지 가리고,
+    색인 문서가 없으면 색인은 건드리지 않고 다시 지운다.
+    구독자가 0 이 된 색인 문서는 남는다(count 0) — trigger 가 건너뛰고 백필이 지운다.
+    """
+    user_ref = get_db().collection("users").document(user_id)
+    keyword_ref = user_ref.collection("keywords").document(keyword_id)
+    if _is_keyword_hash(keyword_id):
+        index_id = feed_cursor_id = keyword_id
+    else:
+        # 해시 ID 이전(자동 ID) 문서: 한 번 읽어 키워드로 색인/커서 ID 를 찾는다.
+        snapshot = keyword_ref.get()
+        if not snapshot.exists:
+            raise ValueError("Keyword not found")
+        keyword = (snapshot.to_dict() or {}).get("keyword") or ""
+        index_id, feed_cursor_id = keyword_index_id(keyword), cursor_id(keyword)
+
+    indexed = True
+    for _attempt in range(_BATCH_ATTEMPTS):
+        batch = get_db().batch()
+        _queue_delete(batch, user_ref, keyword_id, index_id, feed_cursor_id, indexed)
+        try:
+            batch.commit()
+            return
+        except Exception as e:
+            if _status(e) != _NOT_FOUND:
+                raise
+        # 키워드 문서가 없거나 색인 문서가 없다.
+        if not keyword_ref.get().exists:
+            raise ValueError("Keyword not found")
+        indexed = not _missing_index_ids([index_id])
+    raise RuntimeError("Keyword changed concurrently, please retry")
+
+
+def delete_keywords(user_id: str, keyword_ids: Iterable[str]) -> Dict[str, List[str]]:
+    """여러 키워드를 batch 한 번으로 지운다.
+
+    없는 ID 는 `get_all` 한 번으로 걸러 `missing` 으로 돌려준다(batch 전체를 실패시키지
+    않도록). 읽은 키워드 원문으로 색인/커서 ID 를 찾으므로 자동 ID 문서도 같이 지운다.
+    확인과 commit 사이에 다른 요청이 지웠거나 색인 문서가 없으면(색인 이전 키워드) NOT_FOUND →
+    키워드와 색인 문서를 다시 확인하고, 없는 색인은 건드리지 않고 재시도.
+
+    Returns:
+        {"deleted": [id], "missing": [id]}
+    """
+    ids = list(dict.fromkeys(keyword_ids))
+    if len(ids) > KEYWORD_BATCH_LIMIT:
+        raise ValueError(f"At most {KEYWORD_BATCH_LIMIT} keywords per request")
+    if not ids:
+        return {"deleted": [], "missing": []}
 
+    user_ref = get_db().collection("users").document(user_id)
+    keywords_ref = user_ref.collection("keywords")
+    unindexed: Set[str] = set()
+    check_index = False
+    for _attempt in range(_BATCH_ATTEMPTS):
+        found = {
+            snapshot.id: (snapshot.to_dict() or {}).get("keyword") or ""
+            for snapshot in get_db().get_all([keywords_ref.document(keyword_id) for keyword_id in ids])
+            if snapshot.exists
+        }
+        if found:
+            if check_index:
+                unindexed = _missing_index_ids(keyword_index_id(keyword) for keyword in found.values())
+            batch = get_db().batch()
+            for keyword_id, keyword in found.items():
+                index_id = keyword_index_id(keyword)
+                _queue_delete(
+                    batch, user_ref, keyword_id, index_id, cursor_id(keyword), index_id not in unindexed
+                )
+            try:
+                batch.commit()
+            except Exception as e:
+                if _status(e) == _NOT_FOUND:
+                    check_index = True
+                    continue
+                raise
+        return {
+            "deleted": [keyword_id for keyword_id in ids if keyword_id in found],
+            "missing": [keyword_id for keyword_id in ids if keyword_id not in found],
+        }
+    raise RuntimeError("Keywords changed concurrently, please retry")
@@ -0,0 +1,113 @@
+"""Gemini 분석 지시문(정적 프롬프트) 재사용.
+
+기사마다 같은 지시문을 다시 보내지 않도록 지시문을 모델 쪽에 한 번 올려 두고, 그
+handle(지시문이 붙은 모델)을 프로세스 전역에서 재사용한다 — job 안의 모든 기사와
+warm 인스턴스의 다음 호출이 같은 handle 을 쓴다. 만료가 있는 handle 은 만료
+REFRESH_MARGIN 전에 갱신한다.
+
+backend (pluggable, `create()` / `refresh()` 만 구현하면 된다):
+    - SystemInstructionBackend: `system_instruction` 으로 모델을 만든다. 만료 없음. 기본값.
+    - CachedContentBackend: Gemini context cache (`caching.CachedContent`). 캐시된 토큰은
+      할인 과금되지만 모델별 최소 크기(수천 토큰) 미만이면 Gemini 가 거절한다 — 그때는
+      system instruction 으로 대신한다.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+# context cache TTL / 만료 몇 분 전에 갱신할지
+CACHE_TTL = timedelta(hours=1)
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class CacheHandle:
+    """지시문이 붙은 모델. expires_at 이 None 이면 만료 없음."""
+
+    model: Any
+    expires_at: Optional[datetime] = None
+    cache: Any = None
+
+
+class SystemInstructionBackend:
+    def __init__(self, sdk, model_name: str, instruction: str, generation_config: Dict[str, Any]):
+        self.sdk = sdk
+        self.model_name = model_name
+        self.instruction = instruction
+        self.generation_config = generation_config
+
+    def create(self, now: datetime) -> CacheHandle:
+        model = self.sdk.GenerativeModel(
+            self.model_name,
+            system_instruction=self.instruction,
+            generation_config=self.generation_config,
+        )
+        return CacheHandle(model)
+
+    def refresh(self, handle: CacheHandle, now: datetime) -> CacheHandle:
+        return handle
+
+
+class CachedContentBackend(SystemInstructionBackend):
+    def __init__(self, *args, ttl: timedelta = CACHE_TTL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ttl = ttl
+
+    def create(self, now: datetime) -> CacheHandle:
+        try:
+            cache = self.sdk.caching.CachedContent.create(
+                model=self.model_name,
+                system_instruction=self.instruction,
+                ttl=self.ttl,
+            )
+        except Exception as e:
+            print(f"[Gemini Cache] context cache 생성 실패, system instruction 사용: {e}")
+            return super().create(now)
+        model = self.sdk.GenerativeModel.from_cached_content(
+            cached_content=cache, generation_config=self.generation_config
+        )
+        return CacheHandle(model, now + self.ttl, cache)
+
+    def refresh(self, handle: CacheHandle, now: datetime) -> CacheHandle:
+        """TTL 연장. 캐시가 이미 사라졌으면 새로 만든다."""
+        try:
+            handle.cache.update(ttl=self.ttl)
+        except Exception as e:
+            print(f"[Gemini Cache] TTL 연장 실패, 재생성: {e}")
+            return self.create(now)
+        return CacheHandle(handle.model, now + self.ttl, handle.cache)
+
+
+class InstructionCache:
+    """backend handle 을 캐시하고 만료 전에 갱신한다(스레드 안전)."""
+
+    def __init__(self, backend, refresh_margin: timedelta = REFRESH_MARGIN, clock: Callable[[], datetime] = _utcnow):
+        self.backend = backend
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self._handle: Optional[CacheHandle] = None
+        self._lock = threading.Lock()
+        self.created = 0
+        self.refreshed = 0
+
+    def model(self) -> Any:
+        with self._lock:
+            now = self._clock()
+            if self._handle is None:
+                self._handle = self.backend.create(now)
+                self.created += 1
+            elif self._handle.expires_at is not None and now >= self._handle.expires_at - self.refresh_margin:
+                self._handle = self.backend.refresh(self._handle, now)
+                self.refreshed += 1
+            return self._handle.model
+
+    def invalidate(self) -> None:
+        """다음 호출에서 handle 을 새로 만든다(예: 캐시가 서버에서 사라졌을 때)."""
+        with self._lock:
+            self._handle = None
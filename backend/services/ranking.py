@@ -0,0 +1,101 @@
+"""RSS 후보 로컬 사전 랭킹 (Gemini 분석 전).
+
+Google News 피드 상위 항목에는 같은 통신사 기사를 옮겨 실은 거의 같은 제목이
+여럿 섞인다. 더 큰 후보 집합을 받아 다음 순서로 top-k 만 남긴다.
+
+    1. 관련도: 키워드 문자 bigram 이 제목에 얼마나 들어있는지 + 피드 순서 prior
+    2. 중복 제거: 제목 bigram Jaccard 가 임계값 이상이면 near-duplicate 로 제외
+       (이미 저장된 기사와 비슷한 것도 제외)
+    3. 다양성: MMR — 이미 고른 제목과 비슷할수록 감점
+
+문자 n-gram 은 띄어쓰기·조사 변화가 잦은 한국어 제목에 형태소 분석 없이도 잘 맞는다.
+"""
+
+import re
+from typing import FrozenSet, List, Sequence, Tuple
+
+# 피드에서 받아 올 후보 수 = max_results * RANKING_CANDIDATE_FACTOR
+RANKING_CANDIDATE_FACTOR = 4
+
+# 제목 bigram Jaccard 가 이 값 이상이면 같은 기사로 본다.
+NEAR_DUPLICATE_THRESHOLD = 0.6
+
+# MMR 관련도/다양성 가중치 (1.0 이면 관련도만)
+MMR_LAMBDA = 0.7
+
+# 관련도 점수 중 피드 순서 prior 비중 (Google News 순서 자체도 관련도 신호)
+POSITION_WEIGHT = 0.3
+
+_SOURCE_SUFFIX = re.compile(r"\s+-\s+[^-]+$")
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    """' - 출처' 접미사, 공백, 문장부호를 떼고 소문자로."""
+    return _NON_WORD.sub("", _SOURCE_SUFFIX.sub("", title or "")).lower()
+
+
+def char_ngrams(text: str, n: int = 2) -> FrozenSet[str]:
+    if len(text) < n:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def relevance(keyword_grams: FrozenSet[str], title_grams: FrozenSet[str]) -> float:
+    """키워드 bigram 중 제목에 있는 비율 (0~1)."""
+    if not keyword_grams:
+        return 0.0
+    return len(keyword_grams & title_grams) / len(keyword_grams)
+
+
+def select_candidates(
+    keyword: str,
+    articles: Sequence[dict],
+    k: int,
+    already: Sequence[dict] = (),
+) -> Tuple[List[dict], List[dict]]:
+    """(분석할 top-k, near-duplicate 로 제외한 항목) 을 반환한다.
+
+    `already` 는 이미 저장된 기사 — 고르지는 않지만 중복/다양성 비교 기준이 된다.
+    top-k 에 들지 못한 나머지는 어느 쪽에도 넣지 않는다. 다시 후보가 되지는 않는다 — 피드
+    커서(`feed_cursor`)가 이번 실행에서 처리한 가장 새 pubDate 까지 전진하므로, 그보다 오래된
+    미선택 항목은 다음 실행의 `filter_new` 에서 버려진다.
+    """
+    keyword_grams = char_ngrams(normalize_title(keyword))
+    grams = [char_ngrams(normalize_title(a["title"])) for a in articles]
+    total = max(1, len(articles))
+    scores = [
+        (1 - POSITION_WEIGHT) * relevance(keyword_grams, g) + POSITION_WEIGHT * (1 - i / total)
+        for i, g in enumerate(grams)
+    ]
+
+    chosen: List[FrozenSet[str]] = [char_ngrams(normalize_title(a["title"])) for a in already]
+    selected: List[int] = []
+    duplicates: List[dict] = []
+    remaining = list(range(len(articles)))
+
+    while remaining and len(selected) < k:
+        best, best_value = None, None
+        for i in list(remaining):
+            similarity = max((jaccard(grams[i], c) for c in chosen), default=0.0)
+            if similarity >= NEAR_DUPLICATE_THRESHOLD:
+                duplicates.append(articles[i])
+                remaining.remove(i)
+                continue
+            value = MMR_LAMBDA * scores[i] - (1 - MMR_LAMBDA) * similarity
+            if best_value is None or value > best_value:
+                best, best_value = i, value
+        if best is None:
+            break
+        selected.append(best)
+        chosen.append(grams[best])
+        remaining.remove(best)
+
+    # 분석/저장 순서는 피드 순서를 유지한다.
+    return [articles[i] for i in sorted(selected)], duplicates
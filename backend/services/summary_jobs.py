@@ -0,0 +1,78 @@
+"""요약 job 발행 (backend → worker).
+
+새 키워드의 첫 요약을 backend 프로세스에서 돌리지 않고, trigger 와 같은 worker 토픽
+(`worker-news-summary`)에 (user_id, keyword) job 으로 발행한다. Cloud Run 은 응답을 보낸 뒤
+CPU 를 줄이고 인스턴스를 내릴 수 있어 요청 안의 background 작업은 유실될 수 있다 — Pub/Sub 에
+넣으면 worker 가 처리하고, 실패하면 재배달(`--retry`)한다.
+
+메시지 형식은 worker `job_queue.parse_job` 과 같다. slot 은 넣지 않는다: 스케줄 실행이 아니므로
+원장(`job_ledger`)은 메시지 ID 로 재배달을 알아본다.
+
+일괄 추가 한 번의 job 들은 키워드마다 메시지 하나지만, publisher client 가 묶어 publish 요청
+하나로 보낸다(batch 설정 기본 100 건 = `KEYWORD_BATCH_LIMIT`). 키워드 목록을 메시지 하나에
+넣지 않는 것은 batch worker 가 메시지를 키워드별로 묶어 사용자들이 RSS·분석을 공유하고,
+ack·원장·재시도가 (사용자, 키워드) job 단위이기 때문이다 — 한 키워드 실패가 다른 키워드의
+재처리를 부르지 않는다.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List
+
+from services.clients import pubsub_publisher
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ID = os.getenv("GCP_PROJECT_ID", "gcpnewsportal")
+TOPIC_ID = os.getenv("SUMMARY_TOPIC_ID", "worker-news-summary")
+# 발행 확인을 기다리는 최대 시간(초). 넘은 job 은 확인되지 않은 것으로 센다.
+PUBLISH_TIMEOUT_SECONDS = 10
+
+
+def publish_summary_jobs(user_id: str, keywords: List[str]) -> int:
+    """키워드마다 job 메시지 하나를 발행하고, 발행이 확인된 수를 반환한다.
+
+    확인되지 않은 job 은 경고만 남긴다 — 키워드는 이미 저장됐으므로 다음 스케줄 실행이 요약한다.
+    publisher client 를 만들지 못하면 예외를 그대로 던진다.
+    """
+    publisher = pubsub_publisher()
+    topic_path = publisher.topic_path(PROJECT_ID, TOPIC_ID)
+
+    # publish 는 client 안에서 묶여 보내진다. 확인은 모두 보낸 뒤 한 번에 기다린다.
+    futures = [
+        (
+            keyword,
+            publisher.publish(
+                topic_path,
+                json.dumps({"user_id": user_id, "keyword": keyword}).encode("utf-8"),
+            ),
+        )
+        for keyword in keywords
+    ]
+    confirmed = 0
+    for keyword, future in futures:
+        try:
+            future.result(timeout=PUBLISH_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"summary job not published for {user_id=} {keyword=}: {e}")
+            continue
+        confirmed += 1
+    return confirmed
+
+
+def queue_first_summaries(user_id: str, keywords: List[str]) -> Dict[str, object]:
+    """새 키워드들의 첫 요약 job 을 발행하고 응답에 넣을 요약 상태를 반환한다.
+
+    {"summary": "none", "queued": 0}: 새 키워드가 없어 발행하지 않았다.
+    {"summary": "queued", "queued": n}: 모든 job 의 발행이 확인됐다.
+    {"summary": "deferred", "queued": n}: n 개만 확인됐다(0 일 수 있다). 나머지는 다음 스케줄 실행이 요약한다.
+    """
+    if not keywords:
+        return {"summary": "none", "queued": 0}
+    try:
+        queued = publish_summary_jobs(user_id, keywords)
+    except Exception as e:
+        logger.warning(f"first-run summary deferred for {len(keywords)} keywords: {e}")
+        queued = 0
+    return {"summary": "queued" if queued == len(keywords) else "deferred", "queued": queued}
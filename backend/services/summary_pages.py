@@ -0,0 +1,62 @@
+"""키워드별 요약 목록의 커서 페이지네이션.
+
+`users/{uid}/summaries` 를 `where(keyword ==) + order_by(created_at desc, __name__ desc)`
+로 읽는다. 이 쿼리는 복합 색인(repo 루트 `firestore.indexes.json`)이 필요하다.
+offset 대신 마지막 항목 뒤에서 시작하므로 깊은 페이지도 limit 만큼만 읽는다.
+
+커서는 마지막 항목의 (created_at, 문서 ID) 를 base64url JSON 으로 감싼 불투명 문자열이다.
+"""
+
+import base64
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+def encode_page_cursor(created_at: str, doc_id: str) -> str:
+    """마지막 항목 (created_at, 문서 ID) → 페이지 커서 문자열."""
+    raw = json.dumps([created_at, doc_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor: str) -> Tuple[str, str]:
+    """encode_page_cursor 의 역. 형식이 틀리면 ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, doc_id = json.loads(raw.decode("utf-8"))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(created_at, str) or not isinstance(doc_id, str):
+        raise ValueError("Invalid cursor")
+    return created_at, doc_id
+
+
+def keyword_page(
+    summaries_ref, keyword: str, cursor: Optional[str] = None, limit: int = 10
+) -> Tuple[List[Dict], Optional[str]]:
+    """한 키워드의 요약 한 페이지(최신순)와 다음 페이지 커서(없으면 None).
+
+    limit + 1 건을 읽어 다음 페이지가 있을 때만 커서를 준다.
+    """
+    # 호출 시점 import — summaries_ref 를 만든 쪽이 이미 불러 두었다(cold start 비용 없음).
+    from google.cloud import firestore
+
+    query = (
+        summaries_ref
+        .where("keyword", "==", keyword)
+        .order_by("created_at", direction=firestore.Query.DESCENDING)
+        .order_by("__name__", direction=firestore.Query.DESCENDING)
+    )
+    if cursor:
+        created_at, doc_id = decode_page_cursor(cursor)
+        query = query.start_after({"created_at": created_at, "__name__": doc_id})
+
+    results = []
+    for doc in query.limit(limit + 1).stream():
+        data = doc.to_dict()
+        data["id"] = doc.id
+        results.append(data)
+
+    if len(results) <= limit:
+        return results, None
+    results = results[:limit]
+    return results, encode_page_cursor(results[-1]["created_at"], results[-1]["id"])
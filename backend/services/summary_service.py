@@ -1,25 +1,71 @@
-from google.cloud import firestore
 from models.summary_model import NewsSummary
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime, timezone
-from services.google_news import get_google_news, summarize_with_gemini
-from services.gemini_service import fetch_grounded_news
+from services.analysis_retry import RETRY_FIELD, RetryQueue
+from services.clients import firestore_client
+from services.feed_cursor import CURSOR_COLLECTION, FeedCursor, cursor_id
+from services.gemini_service import SharedFetch, fetch_grounded_news
+from services.instrumentation import JobTrace
+from services.search_index import SEARCH_INDEX_COLLECTION, index_writes, search
+from services.keyword_index import normalize_keyword
+from services.story_index import (
+    STORY_INDEX_COLLECTION,
+    STORY_INDEX_DOC,
+    StoryIndex,
+    content_signature,
+    title_signature,
+)
+from services.summary_pages import keyword_page
+from services.text_utils import display_title_fields
+from services.user_feed import FEED_COLLECTION, FEED_DOC, FEED_LIMIT, UserFeed
+
+# 첫 사용 때 만든다(cold start 단축). 테스트/벤치마크는 이 속성을 바꿔 끼운다.
+db = None
+firestore = None
+
+
+def get_db():
+    global db
+    if db is None:
+        db = firestore_client()
+    return db
+
+
+def _firestore():
+    """ArrayUnion sentinel·transactional·Query 를 가진 `google.cloud.firestore` 모듈."""
+    global firestore
+    if firestore is None:
+        from google.cloud import firestore as firestore_module
+
+        firestore = firestore_module
+    return firestore
+
+
+# Firestore `in` 필터 한 번에 넣을 수 있는 값 상한
+_IN_QUERY_LIMIT = 30
 
-db = firestore.Client()
 
 def save_summary(user_id: str, summary: NewsSummary):
     # ✅ 사용자 문서가 Firestore에 존재하도록 보장
-    db.collection("users").document(user_id).set({}, merge=True)
+    get_db().collection("users").document(user_id).set({}, merge=True)
 
-    doc_ref = db.collection("users").document(user_id).collection("summaries").document()
+    doc_ref = get_db().collection("users").document(user_id).collection("summaries").document()
     doc_ref.set(summary.dict())
+    # 피드 문서를 거치지 않는 저장 — 지워 두면 다음 worker 실행이 최신 목록으로 다시 만든다.
+    get_db().collection("users").document(user_id).collection(FEED_COLLECTION).document(FEED_DOC).delete()
 
 def fetch_summaries_by_user(user_id: str, skip: int = 0, limit: int = 10) -> List[Dict]:
+    # 피드 문서가 담고 있는 범위(첫 페이지들)는 문서 한 번 read 로 끝낸다.
+    if skip + limit <= FEED_LIMIT:
+        page = _fetch_feed_page(user_id, skip, limit)
+        if page is not None:
+            return page
+
     summaries_ref = (
-        db.collection("users")
+        get_db().collection("users")
         .document(user_id)
         .collection("summaries")
-        .order_by("created_at", direction=firestore.Query.DESCENDING)
+        .order_by("created_at", direction=_firestore().Query.DESCENDING)
         .offset(skip)
         .limit(limit)
     )
@@ -34,53 +80,323 @@ def fetch_summaries_by_user(user_id: str, skip: int = 0, limit: int = 10) -> Lis
     return results
 
 
-def summarize_and_store(user_id: str, keyword: str):
+def _fetch_feed_page(user_id: str, skip: int, limit: int) -> Optional[List[Dict]]:
+    """사용자 피드 문서로 채울 수 있는 페이지면 반환, 아니면 None (구 사용자 포함)."""
+    snapshot = (
+        get_db().collection("users").document(user_id).collection(FEED_COLLECTION).document(FEED_DOC).get()
+    )
+    if not snapshot.exists:
+        return None
+    return UserFeed.from_dict(snapshot.to_dict()).page(skip, limit)
+
+
+def fetch_summaries_by_keyword(
+    user_id: str, keyword: str, cursor: Optional[str] = None, limit: int = 10
+) -> Tuple[List[Dict], Optional[str]]:
+    """한 키워드의 요약을 최신순으로 커서 페이지네이션한다 (`services.summary_pages`).
+
+    Returns:
+        (요약 목록, 다음 페이지 커서 또는 None). 커서 형식이 틀리면 ValueError.
+    """
+    summaries_ref = get_db().collection("users").document(user_id).collection("summaries")
+    return keyword_page(summaries_ref, normalize_keyword(keyword), cursor=cursor, limit=limit)
+
+
+def search_summaries(user_id: str, query: str, limit: int = 10) -> List[Dict]:
+    """사용자 요약을 bigram 검색 색인으로 찾아 점수순으로 반환한다 (`services.search_index`).
+
+    빈 질의는 ValueError.
+    """
+    user_ref = get_db().collection("users").document(user_id)
+    return search(get_db(), user_ref, query, limit=limit)
+
+
+def summarize_and_store(
+    user_id: str, keyword: str, shared: Optional[SharedFetch] = None, ensure_user: bool = True
+):
+    """(사용자, 키워드) 하나를 처리한다. 반환 시점에 모든 쓰기가 commit 돼 있다.
+
+    shared: 같은 키워드를 여러 사용자에게 연달아 처리할 때 RSS·분석 재사용 (batch worker).
+    ensure_user: False 면 사용자 문서 보장 쓰기를 건너뛴다(호출 측이 묶어서 한 경우).
+    """
     print(f"[🔍] Summary 요청: {user_id=}, {keyword=}")
-    
+    trace = JobTrace(keyword, user_id)
+    try:
+        _summarize_and_store(user_id, keyword, trace, shared, ensure_user)
+    except Exception as e:
+        trace.summary(status="error", error=type(e).__name__)
+        raise
+    trace.summary(status="ok")
+
+
+def _summarize_and_store(
+    user_id: str, keyword: str, trace: JobTrace, shared: Optional[SharedFetch] = None, ensure_user: bool = True
+):
+    user_ref = get_db().collection("users").document(user_id)
+
     # ✅ 사용자 문서가 Firestore에 존재하도록 보장
-    db.collection("users").document(user_id).set({}, merge=True)
+    if ensure_user:
+        with trace.phase("firestore_write", op="ensure_user"):
+            user_ref.set({}, merge=True)
+
+    # (user, keyword) high-water mark: 지난 실행 이후 새 RSS 항목만 처리한다.
+    # 분석 실패 기사 재시도 큐도 같은 커서 문서에 있다(services/analysis_retry.py).
+    cursor_ref = user_ref.collection(CURSOR_COLLECTION).document(cursor_id(keyword))
+    with trace.phase("firestore_read", op="cursor"):
+        snapshot = cursor_ref.get()
+        data = snapshot.to_dict() if snapshot.exists else None
+        cursor = FeedCursor.from_dict(data)
+        retries = RetryQueue.from_dict(data)
+
+    _collect_and_store(user_id, keyword, user_ref, cursor, trace, shared, retries)
 
+    cursor.commit()
+    if cursor.dirty or retries.dirty:
+        with trace.phase("firestore_write", op="cursor"):
+            cursor_ref.set({**cursor.to_dict(keyword), RETRY_FIELD: retries.to_dict()})
+
+
+def _collect_and_store(
+    user_id: str,
+    keyword: str,
+    user_ref,
+    cursor: FeedCursor,
+    trace: JobTrace,
+    shared: Optional[SharedFetch] = None,
+    retries: Optional[RetryQueue] = None,
+):
     # 컬렉션 경로
-    collection_ref = db.collection("users").document(user_id).collection("summaries")
+    collection_ref = user_ref.collection("summaries")
+
+    # 분석 전 사전 dedup: RSS 링크를 한 번에 조회해 이미 저장된 기사는 Gemini 에 보내지 않는다.
+    unseen_urls: Set[str] = set()
+
+    def seen_links(links: List[str]) -> Set[str]:
+        with trace.phase("dedup_lookup", op="bulk", items=len(links)) as record:
+            stored = _find_stored_urls(collection_ref, links)
+            record["hit"] = len(stored)
+        unseen_urls.update(set(links) - stored)
+        trace.incr("skipped_before_analysis", len(stored))
+        return stored
+
+    # 매체 간 같은 기사: 최근 요약 SimHash 인덱스(필요할 때 한 번만 읽는다)와
+    # 기존 요약에 붙일 추가 출처 {doc_id: [source, ...]}.
+    index_ref = user_ref.collection(STORY_INDEX_COLLECTION).document(STORY_INDEX_DOC)
+    loaded: List[StoryIndex] = []
+    attachments: Dict[str, List[dict]] = {}
+    # 이번 실행에 저장한 요약 [(doc_id, 문서)] — 사용자 피드 문서에 반영한다.
+    saved: List[Tuple[str, dict]] = []
+
+    def story_index() -> StoryIndex:
+        if not loaded:
+            with trace.phase("firestore_read", op="story_index"):
+                snapshot = index_ref.get()
+                loaded.append(StoryIndex.from_dict(snapshot.to_dict() if snapshot.exists else None))
+        return loaded[0]
+
+    def known_story(article: dict) -> bool:
+        match = story_index().match_title(title_signature(article["title"]))
+        if match is None:
+            return False
+        attachments.setdefault(match["id"], []).append(
+            {"title": article["title"], "url": article["link"], "source_name": article["source"]}
+        )
+        return True
 
     # Grounding을 이용한 뉴스 수집 및 요약 (2-Phase)
-    news_items = fetch_grounded_news(keyword)
-    
+    news_items = fetch_grounded_news(
+        keyword,
+        trace=trace,
+        seen_links=seen_links,
+        cursor=cursor,
+        known_story=known_story,
+        shared=shared,
+        retries=retries,
+    )
+    trace.incr("analyzed", len(news_items or []))
+
+    for item in news_items or []:
+        _store_item(user_id, keyword, collection_ref, item, unseen_urls, story_index, attachments, saved, trace)
+
+    extra_sources = _attach_sources(collection_ref, attachments, trace) if attachments else {}
+    if saved or extra_sources:
+        _update_feed(user_ref, collection_ref, saved, extra_sources, trace)
+    if saved:
+        _update_search_index(user_ref, saved, trace)
+    if loaded and loaded[0].dirty:
+        _update_story_index(index_ref, loaded[0], trace)
+
     if not news_items:
         print(f"[WARN] {user_id} 뉴스 수집 실패 또는 결과 없음: {keyword}")
+
+
+def _store_item(user_id, keyword, collection_ref, item, unseen_urls, story_index, attachments, saved, trace: JobTrace):
+    """분석 결과 하나를 URL/내용 중복 검사 후 저장(또는 기존 요약에 출처로 첨부)한다."""
+    title = item.get("title")
+    url = item.get("url")
+    summary = item.get("summary")
+    # 추가 메타데이터
+    published_at = item.get("published_at")
+    source_name = item.get("source_name")
+
+    if not title or not url:
+        return
+
+    # 중복 여부 체크 (사전 bulk 조회에서 미저장으로 확인된 URL 은 재조회 생략)
+    if url in unseen_urls:
+        exists = False
+    else:
+        with trace.phase("dedup_lookup") as record:
+            query = collection_ref.where("url", "==", url).limit(1).stream()
+            exists = any(True for _ in query)
+            record["hit"] = exists
+
+    if exists:
+        print(f"[SKIP] {user_id} 이미 존재하는 URL: {url}")
+        trace.incr("skipped_duplicate")
+        return
+
+    # 다른 매체의 같은 기사면 새 요약 대신 기존 요약의 추가 출처로
+    title_sig = title_signature(title)
+    content_sig = content_signature(title, summary)
+    match = story_index().match_content(title_sig, content_sig)
+    if match is not None:
+        print(f"[ATTACH] {user_id} 같은 기사 {match['id']} 에 출처 추가: {url}")
+        attachments.setdefault(match["id"], []).append(
+            {"title": title, "url": url, "source_name": source_name}
+        )
+        trace.incr("attached_duplicate")
         return
 
-    for item in news_items:
-        title = item.get("title")
-        url = item.get("url")
-        summary = item.get("summary")
-        
-        # 추가 메타데이터
-        published_at = item.get("published_at")
-        source_name = item.get("source_name")
-
-        if not title or not url:
-            continue
-
-        # 중복 여부 체크
-        query = collection_ref.where("url", "==", url).limit(1).stream()
-        exists = any(True for _ in query)
-
-        if exists:
-            print(f"[SKIP] {user_id} 이미 존재하는 URL: {url}")
-            continue
-
-        doc = {
-            "title": title,
-            "url": url,
-            "summary": summary,
-            "keyword": keyword,
-            "published_at": published_at,
-            "source_name": source_name,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "summaryTokens": len(summary.split()) if summary else 0,
-            "type": "grounding_v1"
-        }
-        collection_ref.add(doc)
-
-        print(f"[SAVE] {user_id} 저장 완료: {title}")
\ No newline at end of file
+    doc = {
+        "title": title,
+        "url": url,
+        "summary": summary,
+        "keyword": keyword,
+        "published_at": published_at,
+        "source_name": source_name,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "summaryTokens": len(summary.split()) if summary else 0,
+        **display_title_fields(title),  # 조회 시 문자열 작업 없이 그대로 내려준다
+        "simhash": f"{content_sig:016x}",
+        "type": "grounding_v1" # 버전/타입 구분용
+    }
+    with trace.phase("firestore_write", op="add_summary"):
+        _, doc_ref = collection_ref.add(doc)
+    story_index().add(doc_ref.id, title_sig, content_sig, doc["created_at"])
+    saved.append((doc_ref.id, doc))
+    unseen_urls.discard(url)
+    trace.incr("saved")
+
+    print(f"[SAVE] {user_id} 저장 완료: {title}")
+
+
+def _attach_sources(collection_ref, attachments: Dict[str, List[dict]], trace: JobTrace) -> Dict[str, List[dict]]:
+    """기존 요약의 `extra_sources` 에 같은 기사의 다른 출처를 붙인다(best-effort).
+
+    갱신한 문서의 새 `extra_sources` 를 {doc_id: sources} 로 반환한다.
+    """
+    updated: Dict[str, List[dict]] = {}
+    for doc_id, sources in attachments.items():
+        ref = collection_ref.document(doc_id)
+        try:
+            with trace.phase("firestore_write", op="attach_source"):
+                snapshot = ref.get()
+                if not snapshot.exists:
+                    continue
+                existing = (snapshot.to_dict() or {}).get("extra_sources") or []
+                known = {source.get("url") for source in existing}
+                added = [source for source in sources if source["url"] not in known]
+                if added:
+                    ref.update({"extra_sources": existing + added})
+                    updated[doc_id] = existing + added
+        except Exception as e:
+            print(f"[WARN] 출처 첨부 실패 {doc_id}: {e}")
+    return updated
+
+
+def _transact(fn):
+    """fn(transaction) 을 Firestore 트랜잭션으로 실행한다(다른 쓰기와 충돌하면 SDK 가 다시 실행)."""
+    return _firestore().transactional(fn)(get_db().transaction())
+
+
+def _update_story_index(index_ref, index: StoryIndex, trace: JobTrace):
+    """이번 실행에 더한 시그니처를 인덱스 문서에 반영한다.
+
+    같은 사용자의 job 들이 동시에 돌므로 최신 문서를 다시 읽어 그 위에 얹는다(트랜잭션).
+    """
+    def _merge(transaction):
+        snapshot = index_ref.get(transaction=transaction)
+        current = index.rebase(snapshot.to_dict() if snapshot.exists else None)
+        transaction.set(index_ref, current.to_dict())
+
+    with trace.phase("firestore_write", op="story_index"):
+        _transact(_merge)
+
+
+def _update_feed(user_ref, collection_ref, saved, extra_sources: Dict[str, List[dict]], trace: JobTrace):
+    """사용자 피드 문서에 이번 실행 결과를 반영한다(없으면 summaries 최신 K건으로 만든다).
+
+    같은 사용자의 job 들이 동시에 돌므로 읽기-병합-쓰기를 트랜잭션으로 한다 — 마지막 쓰기가
+    다른 job 의 새 요약을 지우지 않는다.
+    """
+    feed_ref = user_ref.collection(FEED_COLLECTION).document(FEED_DOC)
+
+    def _merge(transaction):
+        snapshot = feed_ref.get(transaction=transaction)
+        if snapshot.exists:
+            feed = UserFeed.from_dict(snapshot.to_dict())
+        else:
+            descending = _firestore().Query.DESCENDING
+            query = collection_ref.order_by("created_at", direction=descending).limit(FEED_LIMIT + 1)
+            feed = UserFeed.from_summaries((doc.id, doc.to_dict()) for doc in query.stream())
+        for doc_id, doc in saved:
+            feed.add(doc_id, doc)
+        for doc_id, sources in extra_sources.items():
+            feed.set_extra_sources(doc_id, sources)
+        if feed.dirty:
+            transaction.set(feed_ref, feed.to_dict())
+
+    try:
+        with trace.phase("firestore_write", op="feed"):
+            _transact(_merge)
+    except Exception as e:
+        # 피드 문서는 캐시 — 갱신에 실패하면 지워서 조회가 서브컬렉션으로 돌아가게 한다.
+        print(f"[WARN] 피드 문서 갱신 실패: {e}")
+        try:
+            feed_ref.delete()
+        except Exception as delete_error:
+            print(f"[WARN] 피드 문서 삭제 실패: {delete_error}")
+
+
+def _update_search_index(user_ref, saved, trace: JobTrace):
+    """이번 실행에 저장한 요약의 bigram posting 을 검색 색인 shard 에 더한다(batch 1회, 읽기 없음).
+
+    실패해도 요약 저장은 유지한다 — 빠진 요약은 `tools/backfill_search_index.py` 로 채운다.
+    """
+    updated_at = datetime.now(timezone.utc).isoformat()
+    try:
+        fs = _firestore()
+        index_ref = user_ref.collection(SEARCH_INDEX_COLLECTION)
+        writes = index_writes(saved)
+        batch = get_db().batch()
+        for shard, grams in writes.items():
+            batch.set(index_ref.document(shard), {
+                "grams": {gram: fs.ArrayUnion(postings) for gram, postings in grams.items()},
+                "updated_at": updated_at,
+            }, merge=True)
+        with trace.phase("firestore_write", op="search_index", items=len(writes)):
+            batch.commit()
+    except Exception as e:
+        print(f"[WARN] 검색 색인 갱신 실패: {e}")
+
+
+def _find_stored_urls(collection_ref, urls: List[str]) -> Set[str]:
+    """urls 중 collection_ref 에 이미 저장된 것을 `in` 쿼리 묶음으로 조회한다."""
+    stored: Set[str] = set()
+    unique = list(dict.fromkeys(urls))
+    for i in range(0, len(unique), _IN_QUERY_LIMIT):
+        chunk = unique[i:i + _IN_QUERY_LIMIT]
+        for doc in collection_ref.where("url", "in", chunk).stream():
+            stored.add(doc.to_dict().get("url"))
+    return stored
@@ -0,0 +1,41 @@
+"""표시 제목 계산 (US-007).
+
+worker 는 요약 저장 시 `display_title` 을 한 번 계산해 함께 저장하고, backend
+`app.text_utils` 는 저장된 값을 그대로 내려준다(레거시 문서/다른 길이만 런타임 계산).
+순수 함수 — 외부 의존 없음. 원본 `title` 은 변형하지 않는다(AC-007-1).
+"""
+
+# 저장되는 display_title 의 길이 기준 (= 조회 API 기본 max_len)
+DISPLAY_TITLE_MAX_LEN = 60
+_ELLIPSIS = " … "
+
+
+def truncate_middle(text, max_len=DISPLAY_TITLE_MAX_LEN, ellipsis=_ELLIPSIS, tail_ratio=0.35):
+    """길이 초과 시 앞 head + 중간 생략 + 뒤 tail 로 제목을 정규화한다.
+
+    - "헤드라인 - 출처" 형태에서 앞(주제)과 뒤(출처)를 보존한다.
+    - 문자(code point) 단위 슬라이스라 CJK 문자 중간이 깨지지 않는다.
+    - text 가 None 이면 그대로, max_len 이하면 trim 만 하여 반환한다.
+    - 결과 길이는 항상 max_len 이하다.
+    """
+    if text is None:
+        return text
+    text = text.strip()
+    if len(text) <= max_len:
+        return text
+    budget = max_len - len(ellipsis)
+    if budget <= 0:
+        return text[:max_len]
+    tail_len = max(1, int(budget * tail_ratio))
+    head_len = max(1, budget - tail_len)
+    head = text[:head_len].rstrip()
+    tail = text[-tail_len:].lstrip()
+    return f"{head}{ellipsis}{tail}"
+
+
+def display_title_fields(title):
+    """요약 문서에 함께 저장할 표시 제목 필드."""
+    return {
+        "display_title": truncate_middle(title, DISPLAY_TITLE_MAX_LEN),
+        "display_title_max_len": DISPLAY_TITLE_MAX_LEN,
+    }
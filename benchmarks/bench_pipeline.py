@@ -0,0 +1,326 @@
+"""오프라인 end-to-end 파이프라인 벤치마크.
+
+네트워크/자격증명 없이 fake(Gemini, RSS, Firestore)로 다음을 측정한다.
+
+    - summarize_and_store : cold(첫 실행) / steady(같은 피드 재실행) 두 패스
+    - batch_worker        : 같은 job 들을 pull batch worker 로 (cold / steady, 새 DB)
+    - trigger_news_summary: 전체 사용자 키워드 팬아웃 1회
+    - cleanup_old_summaries: 보존 기간 경과 요약 삭제 1회
+
+출력: jobs/sec, p50/p95/p99 지연, job 당 Firestore RPC·문서 read·Gemini·RSS 호출 수.
+
+Usage (repo root):
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --users 50 --keywords 3 --feed-size 20 \\
+        --gemini-latency 0.05 --gemini-error-rate 0.05 --json benchmarks/results/pipeline.json
+
+각 함수 디렉터리의 requirements(google-cloud-firestore, google-cloud-pubsub,
+google-generativeai, functions-framework)가 설치돼 있어야 import 된다.
+"""
+
+import argparse
+import base64
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from benchmarks import fakes
+from benchmarks.fakes import FakeGemini, FakePublisher, InMemoryFirestore, RssServer
+from benchmarks.stats import print_table, save_json, summarize
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 모듈 import 시점의 firestore.Client()/PublisherClient() 가 자격증명을 찾지 않도록
+# 에뮬레이터 모드로 만든다(실제 연결은 하지 않는다 — 클라이언트는 곧바로 fake 로 교체).
+os.environ.setdefault("FIRESTORE_EMULATOR_HOST", "127.0.0.1:0")
+os.environ.setdefault("PUBSUB_EMULATOR_HOST", "127.0.0.1:0")
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "bench")
+
+
+def _load(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------------------------------------------
+# Wiring
+# ---------------------------------------------------------------------------
+def wire_worker(db: InMemoryFirestore, gemini: FakeGemini, rss: RssServer):
+    """news_summarizer 의 services 를 import 하고 fake 를 꽂아 반환한다."""
+    worker_dir = os.path.join(ROOT, "news_summarizer")
+    if worker_dir not in sys.path:
+        sys.path.insert(0, worker_dir)
+    import services.gemini_service as gemini_service
+    import services.instrumentation as instrumentation
+    import services.summary_service as summary_service
+
+    gemini_service.api_key = "bench"
+    gemini_service.genai = gemini
+    gemini_service.GOOGLE_NEWS_RSS_URL = rss.url
+    summary_service.db = db
+    instrumentation.logger.setLevel(logging.WARNING)
+    return summary_service
+
+
+def wire_deadlines(hedge: bool, job_budget=None, call_timeout=None) -> None:
+    """worker 의 Gemini 호출 기한/hedge 설정을 바꾼다(wire_worker 다음에)."""
+    import services.deadlines as deadlines
+    import services.gemini_service as gemini_service
+
+    gemini_service.GEMINI_HEDGE = hedge
+    if job_budget is not None:
+        deadlines.JOB_BUDGET_SECONDS = job_budget
+    if call_timeout is not None:
+        deadlines.CALL_TIMEOUT_MAX = call_timeout
+        deadlines.CALL_TIMEOUT_MIN = min(deadlines.CALL_TIMEOUT_MIN, call_timeout / 10)
+
+
+def wire_circuits(enabled: bool) -> None:
+    """upstream circuit breaker 를 새로 시작한다. 끄면 몇 번을 실패해도 open 하지 않는다."""
+    import services.circuit_breaker as circuit_breaker
+
+    circuit_breaker._breakers.clear()
+    if not enabled:
+        circuit_breaker.FAILURE_THRESHOLD = 10 ** 9
+
+
+def wire_trigger(db: InMemoryFirestore):
+    trigger_dir = os.path.join(ROOT, "trigger_function")
+    if trigger_dir not in sys.path:
+        sys.path.insert(0, trigger_dir)
+    trigger_main = _load("bench_trigger_main", os.path.join(trigger_dir, "main.py"))
+    keywords_service = sys.modules["utils.keywords_service"]
+    keywords_service.firestore = SimpleNamespace(Client=lambda: db)
+    trigger_main.publisher = FakePublisher()
+    return trigger_main
+
+
+def wire_cleanup(db: InMemoryFirestore):
+    cleanup_main = _load(
+        "bench_cleanup_main", os.path.join(ROOT, "cleanup_function", "main.py")
+    )
+    cleanup_main.firestore = SimpleNamespace(
+        Client=lambda: db,
+        ArrayRemove=fakes.ArrayRemove,
+        Query=fakes.FIRESTORE.Query,
+    )
+    cleanup_main.logger.setLevel(logging.WARNING)
+    return cleanup_main
+
+
+def seed_keywords(db: InMemoryFirestore, users: int, keywords: int) -> List[Dict[str, str]]:
+    """사용자 키워드와, backend 가 함께 유지하는 keyword_index 역색인을 채운다."""
+    from services.keyword_index import KEYWORD_INDEX_COLLECTION, index_entry, keyword_index_id
+
+    jobs = []
+    for u in range(users):
+        uid = f"user-{u:04d}"
+        db.collection("users").document(uid).set({})
+        for k in range(keywords):
+            keyword = f"키워드 {k}"
+            db.collection("users").document(uid).collection("keywords").document(keyword_index_id(keyword)).set(
+                {"keyword": keyword, "created_at": "2026-10-01T00:00:00+00:00"}
+            )
+            jobs.append({"user_id": uid, "keyword": keyword})
+    uids = [f"user-{u:04d}" for u in range(users)]
+    for k in range(keywords):
+        keyword = f"키워드 {k}"
+        db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id(keyword)).set(index_entry(keyword, uids))
+    return jobs
+
+
+def seed_old_summaries(db: InMemoryFirestore, users: int, per_user: int, days: int = 60) -> None:
+    now = datetime.utcnow()
+    for u in range(users):
+        user_ref = db.collection("users").document(f"user-{u:04d}")
+        user_ref.set({})
+        summaries = user_ref.collection("summaries")
+        for i in range(per_user):
+            created = now - timedelta(days=days * i / max(1, per_user))
+            summaries.document().set({"title": f"old {i}", "url": f"https://old/{u}/{i}", "created_at": created.isoformat()})
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+def run_jobs(name: str, summary_service, jobs, db, gemini, rss, workers: int) -> Dict[str, Any]:
+    from services.circuit_breaker import CircuitOpenError
+
+    db.reset_calls()
+    gemini_calls, rss_requests = gemini.calls, rss.requests
+    latencies: List[float] = []
+    deferred: List[str] = []
+
+    def run(job):
+        start = time.perf_counter()
+        try:
+            summary_service.summarize_and_store(user_id=job["user_id"], keyword=job["keyword"])
+        except CircuitOpenError:
+            deferred.append(job["user_id"])  # push 엔트리라면 재배달을 기다린다
+        latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(run, jobs))
+        else:
+            for job in jobs:
+                run(job)
+    wall = time.perf_counter() - started
+
+    row = summarize(
+        name,
+        latencies,
+        wall,
+        {
+            "firestore_rpc": sum(db.calls.values()),
+            "firestore_reads": db.reads,
+            "gemini": gemini.calls - gemini_calls,
+            "rss": rss.requests - rss_requests,
+        },
+    )
+    row["deferred"] = len(deferred)
+    return row
+
+
+def run_batch_worker(name: str, batch_worker, jobs, db, gemini, rss, workers: int) -> Dict[str, Any]:
+    """jobs 를 메모리 큐에 넣고 batch worker 로 비울 때까지 처리한다(지연 = 전체 / job 수)."""
+    from services.job_queue import InMemoryQueue, encode_job
+
+    queue = InMemoryQueue()
+    for job in jobs:
+        queue.publish(encode_job(job["user_id"], job["keyword"]))
+    db.reset_calls()
+    gemini_calls, rss_requests = gemini.calls, rss.requests
+
+    started = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        totals = batch_worker.serve(queue, concurrency=workers, once=True)
+    wall = time.perf_counter() - started
+
+    row = summarize(
+        name,
+        [wall / max(1, len(jobs))] * len(jobs),
+        wall,
+        {
+            "firestore_rpc": sum(db.calls.values()),
+            "firestore_reads": db.reads,
+            "gemini": gemini.calls - gemini_calls,
+            "rss": rss.requests - rss_requests,
+        },
+    )
+    row["acked"] = totals.get("acked", 0)
+    row["deferred"] = totals.get("deferred", 0)
+    return row
+
+
+def run_trigger(trigger_main, db) -> Dict[str, Any]:
+    from flask import Flask
+
+    db.reset_calls()
+    start = time.perf_counter()
+    with Flask("bench").test_request_context(), redirect_stdout(StringIO()):
+        trigger_main.trigger_news_summary(SimpleNamespace(headers={}, method="POST"))
+    elapsed = time.perf_counter() - start
+    row = summarize(
+        "trigger_news_summary",
+        [elapsed],
+        elapsed,
+        {"firestore_rpc": sum(db.calls.values()), "firestore_reads": db.reads},
+    )
+    row["published"] = len(trigger_main.publisher.published)
+    return row
+
+
+def run_cleanup(cleanup_main, db) -> Dict[str, Any]:
+    db.reset_calls()
+    payload = base64.b64encode(json.dumps({"retention_days": 30}).encode()).decode()
+    event = SimpleNamespace(data={"message": {"data": payload}})
+    start = time.perf_counter()
+    result = cleanup_main.cleanup_old_summaries(event)
+    elapsed = time.perf_counter() - start
+    row = summarize(
+        "cleanup_old_summaries",
+        [elapsed],
+        elapsed,
+        {"firestore_rpc": sum(db.calls.values()), "firestore_reads": db.reads},
+    )
+    row["deleted"] = result.get("total_deleted")
+    return row
+
+
+def main(argv=None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--keywords", type=int, default=3, help="keywords per user")
+    parser.add_argument("--feed-size", type=int, default=20, help="RSS items per response")
+    parser.add_argument("--new-per-fetch", type=int, default=0, help="new RSS items per refetch")
+    parser.add_argument("--rss-latency", type=float, default=0.0)
+    parser.add_argument("--rss-duplicate-every", type=int, default=0, help="every Nth RSS item is a near-duplicate")
+    parser.add_argument("--gemini-latency", type=float, default=0.0)
+    parser.add_argument("--gemini-jitter", type=float, default=0.0)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0)
+    parser.add_argument("--gemini-straggler-rate", type=float, default=0.0, help="share of calls that straggle")
+    parser.add_argument("--gemini-straggler-latency", type=float, default=0.0)
+    parser.add_argument("--gemini-hedge", action="store_true", help="hedge calls slower than p95")
+    parser.add_argument("--job-budget", type=float, help="per-job time budget in seconds (default: worker's)")
+    parser.add_argument("--call-timeout", type=float, help="per-call deadline cap in seconds (default: worker's)")
+    parser.add_argument("--no-circuit-breaker", action="store_true", help="never open the upstream circuits")
+    parser.add_argument("--old-summaries", type=int, default=100, help="seeded summaries per user for cleanup")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent jobs")
+    parser.add_argument("--json", help="save results to this JSON path")
+    args = parser.parse_args(argv)
+
+    db = InMemoryFirestore()
+    gemini = FakeGemini(
+        args.gemini_latency,
+        args.gemini_jitter,
+        args.gemini_error_rate,
+        straggler_rate=args.gemini_straggler_rate,
+        straggler_latency=args.gemini_straggler_latency,
+    )
+    rows = []
+    with RssServer(args.feed_size, args.new_per_fetch, args.rss_latency, args.rss_duplicate_every) as rss:
+        summary_service = wire_worker(db, gemini, rss)
+        wire_deadlines(args.gemini_hedge, args.job_budget, args.call_timeout)
+        wire_circuits(not args.no_circuit_breaker)
+        jobs = seed_keywords(db, args.users, args.keywords)
+        rows.append(run_jobs("summarize_and_store[cold]", summary_service, jobs, db, gemini, rss, args.workers))
+        rows.append(run_jobs("summarize_and_store[steady]", summary_service, jobs, db, gemini, rss, args.workers))
+
+        batch_db = InMemoryFirestore()
+        summary_service.db = batch_db
+        batch_worker = _load("bench_batch_worker", os.path.join(ROOT, "news_summarizer", "batch_worker.py"))
+        batch_worker.logger.setLevel(logging.WARNING)
+        batch_jobs = seed_keywords(batch_db, args.users, args.keywords)
+        rows.append(run_batch_worker("batch_worker[cold]", batch_worker, batch_jobs, batch_db, gemini, rss, args.workers))
+        rows.append(run_batch_worker("batch_worker[steady]", batch_worker, batch_jobs, batch_db, gemini, rss, args.workers))
+        summary_service.db = db
+
+    rows.append(run_trigger(wire_trigger(db), db))
+
+    cleanup_db = InMemoryFirestore()
+    seed_old_summaries(cleanup_db, args.users, args.old_summaries)
+    rows.append(run_cleanup(wire_cleanup(cleanup_db), cleanup_db))
+
+    print_table(rows)
+    if args.json:
+        print(f"\nsaved: {save_json(args.json, 'pipeline', rows, vars(args))}")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
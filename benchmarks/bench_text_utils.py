@@ -0,0 +1,99 @@
+"""`with_display_titles` / `truncate_middle` 마이크로벤치마크.
+
+ASCII / CJK / 혼합 제목을 리스트 크기별로 만들어, 항목마다 `truncate_middle` 을
+다시 부르는 기존 방식(baseline)과 bulk 경로(`with_display_titles` →
+`display_title`, 짧은 제목 무할당 통과 + (title, max_len) LRU), worker 가 저장한
+`display_title` 을 그대로 내려주는 경로(stored)를 비교한다.
+피드 캐시를 흉내 내도록 같은 리스트를 반복 정규화한다(매 반복 dict 는 새로 복사).
+
+Usage (repo root):
+    python -m benchmarks.bench_text_utils
+    python -m benchmarks.bench_text_utils --sizes 10 50 100 --repeat 200 --json benchmarks/results/text.json
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from typing import Any, Dict, List
+
+from benchmarks.stats import print_table, save_json
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR = os.path.join(ROOT, "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app import text_utils  # noqa: E402
+from services.text_utils import display_title_fields  # noqa: E402
+
+_ASCII_WORDS = ["market", "dollar", "rally", "AI", "chip", "exports", "record", "bonds", "Fed", "outlook"]
+_CJK_CHARS = "강달러약세엔화환율반도체수출인공지능시장전망기록최저치금리인상"
+_SOURCES = ["연합뉴스", "Reuters", "조선비즈", "Bloomberg", "한국경제"]
+
+
+def make_titles(kind: str, n: int, seed: int = 0) -> List[str]:
+    """kind 별 제목 n 개. 절반은 60자 이하, 절반은 초과 — 실제 피드 분포에 가깝게."""
+    rng = random.Random(seed)
+    titles = []
+    for i in range(n):
+        length = rng.randint(20, 55) if i % 2 else rng.randint(70, 140)
+        if kind == "ascii":
+            body = " ".join(rng.choice(_ASCII_WORDS) for _ in range(length // 5))
+        elif kind == "cjk":
+            body = "".join(rng.choice(_CJK_CHARS) for _ in range(length))
+        else:
+            body = " ".join(
+                rng.choice(_ASCII_WORDS) if rng.random() < 0.4 else "".join(rng.sample(_CJK_CHARS, 3))
+                for _ in range(length // 4)
+            )
+        titles.append(f"{body[:length]} - {rng.choice(_SOURCES)}")
+    return titles
+
+
+def _baseline(results, max_len=60):
+    for item in results:
+        if isinstance(item, dict) and item.get("title") is not None:
+            item["title"] = text_utils.truncate_middle(item["title"], max_len)
+    return results
+
+
+def bench(kind: str, size: int, repeat: int) -> Dict[str, Any]:
+    items = [{"title": t, "url": f"u{i}"} for i, t in enumerate(make_titles(kind, size))]
+    stored_items = [{**item, **display_title_fields(item["title"])} for item in items]
+
+    def run(fn, source=items):
+        return min(timeit.repeat(lambda: fn([dict(d) for d in source]), number=repeat, repeat=3)) / repeat
+
+    copy_only = min(timeit.repeat(lambda: [dict(d) for d in items], number=repeat, repeat=3)) / repeat
+    text_utils._cached_display_title.cache_clear()
+    baseline = run(_baseline) - copy_only
+    bulk = run(text_utils.with_display_titles) - copy_only
+    stored = run(text_utils.with_display_titles, stored_items) - copy_only
+    return {
+        "titles": kind,
+        "size": size,
+        "baseline_us": round(baseline * 1e6, 2),
+        "bulk_us": round(bulk * 1e6, 2),
+        "stored_us": round(stored * 1e6, 2),
+        "speedup": round(baseline / bulk, 2) if bulk > 0 else float("inf"),
+    }
+
+
+def main(argv=None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", help="save results to this JSON path")
+    args = parser.parse_args(argv)
+
+    rows = [bench(kind, size, args.repeat) for kind in ("ascii", "cjk", "mixed") for size in args.sizes]
+    print_table(rows)
+    if args.json:
+        print(f"\nsaved: {save_json(args.json, 'text_utils', rows, vars(args))}")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,724 @@
+"""오프라인 벤치마크용 재사용 fake 모음.
+
+- `InMemoryFirestore`: 코드가 쓰는 Firestore API 부분집합(collection/document/
+  where/order_by/offset/limit/stream/add/set/get/delete/batch)을 메모리로 구현하고,
+  실제 RPC 에 해당하는 호출 수를 `calls` 에 센다.
+- `RssServer`: 로컬 HTTP 서버로 Google News RSS 형식의 피드를 크기 조절해 내려준다.
+- `FakeGemini`: `google.generativeai` 모듈 자리에 끼우는 fake. 지연/오류율 조절 가능,
+  `system_instruction` 과 context cache(`caching.CachedContent`) 토큰 집계 포함.
+- `FakePublisher`: `pubsub_v1.PublisherClient` 대용. 발행한 메시지 본문을 `published` 에 모은다.
+
+네트워크·자격증명 없이 파이프라인 처리량을 측정하기 위한 것이며 프로덕션 코드는
+이 모듈을 import 하지 않는다.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+
+# ---------------------------------------------------------------------------
+# In-memory Firestore
+# ---------------------------------------------------------------------------
+class InMemoryFirestore:
+    """`google.cloud.firestore.Client` 대용. 문서는 경로 → dict 로 보관한다.
+
+    `calls` 는 RPC 단위 카운터다: stream/get/get_all/add/set/update/delete/create 와
+    batch commit 이 각각 1회. `reads` 는 과금 기준 문서 읽기 수로, Firestore 처럼
+    offset 으로 건너뛴 문서도 읽기로 센다.
+    """
+
+    def __init__(self):
+        # collection 경로 → {doc id → data}. 쿼리가 해당 컬렉션만 훑도록 나눠 둔다.
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+        self.calls: Counter = Counter()
+        self.reads = 0
+
+    # --- client surface ---
+    def collection(self, name: str) -> "CollectionRef":
+        return CollectionRef(self, name)
+
+    def document(self, path: str) -> "DocumentRef":
+        return DocumentRef(self, path)
+
+    def batch(self) -> "WriteBatch":
+        return WriteBatch(self)
+
+    def get_all(self, references: List["DocumentRef"]):
+        """`Client.get_all` 대용: 한 RPC 로 여러 문서를 읽는다(문서마다 read 1)."""
+        references = list(references)
+        self._count("get_all", reads=len(references))
+        return iter([DocumentSnapshot(ref, self._read(ref.path)) for ref in references])
+
+    def transaction(self) -> "Transaction":
+        return Transaction(self)
+
+    def write_option(self, exists: Optional[bool] = None) -> SimpleNamespace:
+        """`Client.write_option(exists=...)` 대용 precondition."""
+        return SimpleNamespace(exists=exists)
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+        self.reads = 0
+
+    # --- internals ---
+    def _count(self, op: str, reads: int = 0) -> None:
+        with self._lock:
+            self.calls[op] += 1
+            self.reads += reads
+
+    def _children(self, collection_path: str) -> List["DocumentSnapshot"]:
+        with self._lock:
+            docs = self._collections.get(collection_path, {})
+            return [
+                DocumentSnapshot(DocumentRef(self, f"{collection_path}/{doc_id}"), dict(data))
+                for doc_id, data in docs.items()
+            ]
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        parent, doc_id = path.rsplit("/", 1)
+        with self._lock:
+            data = self._collections.get(parent, {}).get(doc_id)
+            return dict(data) if data is not None else None
+
+    def _check(self, op: str, path: str, option: Optional[SimpleNamespace] = None) -> None:
+        """쓰기 precondition. 실패 시 Firestore 와 같은 HTTP code 의 예외."""
+        exists = self._read(path) is not None
+        if op == "create" and exists:
+            raise Conflict(f"Document already exists: {path}")
+        if op == "update" and not exists:
+            raise NotFound(f"No document to update: {path}")
+        if option is not None and option.exists is not None and option.exists != exists:
+            raise NotFound(f"Precondition failed (exists={option.exists}): {path}")
+
+    def _write(self, path: str, data: Optional[Dict[str, Any]], merge: bool = False, update: bool = False) -> None:
+        parent, doc_id = path.rsplit("/", 1)
+        with self._lock:
+            docs = self._collections.setdefault(parent, {})
+            if data is None:
+                docs.pop(doc_id, None)
+                return
+            if update:  # update() 는 최상위 필드 단위로 바꾼다(중첩 map 은 통째로)
+                current = docs[doc_id]
+                docs[doc_id] = {**current, **{
+                    field: _merge_fields(None, value, False) if isinstance(value, dict)
+                    else _apply_transform(current.get(field), value)
+                    for field, value in data.items()
+                }}
+            else:
+                docs[doc_id] = _merge_fields(docs.get(doc_id), data, merge)
+
+    def count_documents(self, collection_path: str) -> int:
+        """컬렉션 경로의 문서 수(호출 수에 잡히지 않는 검사용)."""
+        with self._lock:
+            return len(self._collections.get(collection_path, {}))
+
+
+class Conflict(Exception):
+    """`google.api_core.exceptions.AlreadyExists` 대용 (같은 HTTP code)."""
+
+    code = 409
+
+
+class NotFound(KeyError):
+    """`google.api_core.exceptions.NotFound` 대용 (같은 HTTP code)."""
+
+    code = 404
+
+
+class ArrayUnion:
+    """`firestore.ArrayUnion` 대용. 아래 변환은 실제 sentinel 도 클래스 이름으로 받는다."""
+
+    def __init__(self, values: List[Any]):
+        self.values = list(values)
+
+
+class ArrayRemove(ArrayUnion):
+    """`firestore.ArrayRemove` 대용."""
+
+
+class Increment:
+    """`firestore.Increment` 대용."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+def _apply_transform(current: Any, value: Any) -> Any:
+    kind = type(value).__name__
+    if kind == "ArrayUnion":
+        merged = list(current) if isinstance(current, list) else []
+        return merged + [v for v in value.values if v not in merged]
+    if kind == "ArrayRemove":
+        return [v for v in (current if isinstance(current, list) else []) if v not in value.values]
+    if kind == "Increment":
+        return (current if isinstance(current, (int, float)) else 0) + value.value
+    return value
+
+
+def _merge_fields(current: Any, data: Dict[str, Any], merge: bool) -> Dict[str, Any]:
+    """set 결과. merge 면 실제 Firestore 처럼 중첩 map 도 필드 단위로 합친다(변환 포함)."""
+    result = dict(current) if merge and isinstance(current, dict) else {}
+    for field, value in data.items():
+        if isinstance(value, dict) and value:
+            result[field] = _merge_fields(result.get(field), value, merge)
+        else:
+            result[field] = _apply_transform(result.get(field), value)
+    return result
+
+
+class DocumentSnapshot:
+    def __init__(self, reference: "DocumentRef", data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field: str) -> Any:
+        return (self._data or {}).get(field)
+
+
+class DocumentRef:
+    def __init__(self, db: InMemoryFirestore, path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str) -> "CollectionRef":
+        return CollectionRef(self._db, f"{self.path}/{name}")
+
+    def get(self, transaction: Optional["Transaction"] = None) -> DocumentSnapshot:
+        self._db._count("get", reads=1)
+        return DocumentSnapshot(self, self._db._read(self.path))
+
+    def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        self._db._count("set")
+        self._db._write(self.path, data, merge=merge)
+
+    def create(self, data: Dict[str, Any]) -> None:
+        self._db._count("create")
+        with self._db._lock:
+            self._db._check("create", self.path)
+            self._db._write(self.path, data)
+
+    def update(self, data: Dict[str, Any]) -> None:
+        self._db._count("update")
+        with self._db._lock:
+            self._db._check("update", self.path)
+            self._db._write(self.path, data, update=True)
+
+    def delete(self, option: Optional[SimpleNamespace] = None) -> None:
+        self._db._count("delete")
+        with self._db._lock:
+            self._db._check("delete", self.path, option)
+            self._db._write(self.path, None)
+
+
+_OPS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+    "array_contains": lambda a, b: isinstance(a, list) and b in a,
+}
+
+
+class Query:
+    def __init__(self, db: InMemoryFirestore, collection_path: str):
+        self._db = db
+        self._path = collection_path
+        self._filters: List[tuple] = []
+        self._orders: List[tuple] = []
+        self._offset = 0
+        self._limit: Optional[int] = None
+        self._start_after: Optional[Dict[str, Any]] = None
+
+    def _copy(self) -> "Query":
+        q = Query(self._db, self._path)
+        q._filters = list(self._filters)
+        q._orders = list(self._orders)
+        q._offset = self._offset
+        q._limit = self._limit
+        q._start_after = self._start_after
+        return q
+
+    def where(self, field: str, op: str, value: Any) -> "Query":
+        q = self._copy()
+        q._filters.append((field, _OPS[op], value))
+        return q
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "Query":
+        q = self._copy()
+        q._orders.append((field, direction == "DESCENDING"))
+        return q
+
+    def offset(self, n: int) -> "Query":
+        q = self._copy()
+        q._offset = n
+        return q
+
+    def limit(self, n: int) -> "Query":
+        q = self._copy()
+        q._limit = n
+        return q
+
+    def start_after(self, fields: Dict[str, Any]) -> "Query":
+        """order_by 필드 → 값 dict 커서 (`__name__` 은 문서 ID)."""
+        q = self._copy()
+        q._start_after = dict(fields)
+        return q
+
+    @staticmethod
+    def _value(doc: DocumentSnapshot, field: str) -> Any:
+        return doc.id if field == "__name__" else doc.get(field)
+
+    def _after_cursor(self, doc: DocumentSnapshot) -> bool:
+        for field, descending in self._orders:
+            if field not in self._start_after:
+                break
+            value, cursor = self._value(doc, field), self._start_after[field]
+            if value != cursor:
+                return value < cursor if descending else value > cursor
+        return False
+
+    def _run(self) -> List[DocumentSnapshot]:
+        docs = self._db._children(self._path)
+        for field, fn, value in self._filters:
+            docs = [d for d in docs if fn(d.get(field), value)]
+        for field, descending in reversed(self._orders):
+            docs.sort(key=lambda d: (self._value(d, field) is None, self._value(d, field)), reverse=descending)
+        if self._start_after is not None:
+            docs = [d for d in docs if self._after_cursor(d)]
+        end = None if self._limit is None else self._offset + self._limit
+        scanned = docs[:end]
+        # 최소 1 read 과금(빈 결과 포함), offset 으로 건너뛴 문서도 read.
+        self._db._count("stream", reads=max(1, len(scanned)))
+        return scanned[self._offset:]
+
+    def stream(self):
+        return iter(self._run())
+
+    def get(self) -> List[DocumentSnapshot]:
+        return self._run()
+
+
+class CollectionRef(Query):
+    def __init__(self, db: InMemoryFirestore, path: str):
+        super().__init__(db, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, doc_id: Optional[str] = None) -> DocumentRef:
+        return DocumentRef(self._db, f"{self._path}/{doc_id or uuid.uuid4().hex[:20]}")
+
+    def add(self, data: Dict[str, Any]):
+        self._db._count("add")
+        ref = self.document()
+        self._db._write(ref.path, data)
+        return datetime.now(timezone.utc), ref
+
+
+class WriteBatch:
+    def __init__(self, db: InMemoryFirestore):
+        self._db = db
+        self._ops: List[tuple] = []
+
+    def set(self, ref: DocumentRef, data: Dict[str, Any], merge: bool = False) -> None:
+        self._ops.append(("set", ref, data, merge, None))
+
+    def create(self, ref: DocumentRef, data: Dict[str, Any]) -> None:
+        self._ops.append(("create", ref, data, False, None))
+
+    def update(self, ref: DocumentRef, data: Dict[str, Any]) -> None:
+        self._ops.append(("update", ref, data, True, None))
+
+    def delete(self, ref: DocumentRef, option: Optional[SimpleNamespace] = None) -> None:
+        self._ops.append(("delete", ref, None, False, option))
+
+    def commit(self) -> None:
+        """원자적 commit: precondition 하나라도 실패하면 아무것도 쓰지 않는다."""
+        self._db._count("commit")
+        ops, self._ops = self._ops, []
+        with self._db._lock:
+            for op, ref, _data, _merge, option in ops:
+                self._db._check(op, ref.path, option)
+            for op, ref, data, merge, _option in ops:
+                self._db._write(ref.path, data, merge=merge, update=op == "update")
+
+
+class Transaction(WriteBatch):
+    """`db.transaction()` 대용. 서버 SDK 트랜잭션처럼 비관적 잠금으로 동작한다 —
+    시작부터 commit/rollback 까지 DB 잠금을 잡으므로 트랜잭션끼리 직렬화된다.
+
+    `firestore.transactional` 데코레이터가 쓰는 내부 프로토콜(_begin/_commit/_rollback
+    등)을 구현해 두어 실제 데코레이터로도, 아래 `transactional` 로도 감쌀 수 있다.
+    """
+
+    _read_only = False
+    _max_attempts = 5
+
+    def __init__(self, db: InMemoryFirestore):
+        super().__init__(db)
+        self._id: Optional[str] = None
+
+    def get(self, ref: DocumentRef) -> DocumentSnapshot:
+        return ref.get(transaction=self)
+
+    def _clean_up(self) -> None:
+        self._ops = []
+
+    def _begin(self, retry_id: Optional[str] = None) -> None:
+        self._db._lock.acquire()
+        self._id = uuid.uuid4().hex
+
+    def _commit(self) -> None:
+        try:
+            self.commit()
+        finally:
+            self._release()
+
+    def _rollback(self) -> None:
+        self._ops = []
+        self._release()
+
+    def _release(self) -> None:
+        if self._id is not None:
+            self._id = None
+            self._db._lock.release()
+
+
+def transactional(fn):
+    """`firestore.transactional` 대용(google-cloud-firestore 없이 돌릴 때)."""
+
+    def run(transaction: Transaction, *args, **kwargs):
+        transaction._clean_up()
+        transaction._begin()
+        try:
+            result = fn(transaction, *args, **kwargs)
+            transaction._commit()
+            return result
+        except BaseException:
+            transaction._rollback()
+            raise
+
+    return run
+
+
+# `google.cloud.firestore` 중 sentinel·트랜잭션·정렬 방향 부분 (lib 없이 서비스 모듈에 끼울 때)
+FIRESTORE = SimpleNamespace(
+    ArrayUnion=ArrayUnion,
+    ArrayRemove=ArrayRemove,
+    Increment=Increment,
+    transactional=transactional,
+    Query=SimpleNamespace(ASCENDING="ASCENDING", DESCENDING="DESCENDING"),
+)
+
+
+# ---------------------------------------------------------------------------
+# Pub/Sub publisher
+# ---------------------------------------------------------------------------
+class FakePublisher:
+    def __init__(self):
+        self.published: List[bytes] = []
+
+    def topic_path(self, project: str, topic: str) -> str:
+        return f"projects/{project}/topics/{topic}"
+
+    def publish(self, topic_path: str, data: bytes, **_attrs):
+        self.published.append(data)
+        return SimpleNamespace(result=lambda timeout=None: str(len(self.published)))
+
+
+# ---------------------------------------------------------------------------
+# Local RSS server
+# ---------------------------------------------------------------------------
+class RssServer:
+    """Google News RSS 형식 피드를 내려주는 로컬 HTTP 서버.
+
+    Args:
+        items: 응답당 item 수.
+        new_per_fetch: 같은 키워드를 다시 요청할 때마다 새로 "발행"되는 기사 수.
+            0 이면 매번 같은 피드(steady-state 반복 실행 모사).
+        latency: 응답 지연(초).
+        duplicate_every: N 번째 기사마다 바로 앞 기사를 다른 매체가 옮겨 실은
+            near-duplicate 로 만든다(통신사 기사 전재 모사). 0 이면 없음.
+    """
+
+    def __init__(self, items: int = 20, new_per_fetch: int = 0, latency: float = 0.0, duplicate_every: int = 0):
+        self.items = items
+        self.new_per_fetch = new_per_fetch
+        self.latency = latency
+        self.duplicate_every = duplicate_every
+        self.requests = 0
+        self._fetches: Counter = Counter()
+        self._base_time = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/rss/search"
+
+    def start(self) -> "RssServer":
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                keyword = query.get("q", [""])[0].replace("+", " ")
+                body = owner.render(keyword).encode("utf-8")
+                if owner.latency:
+                    time.sleep(owner.latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> "RssServer":
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+    def render(self, keyword: str) -> str:
+        """keyword 피드를 만든다. 최신 기사가 먼저 오는 Google News 순서를 따른다."""
+        self.requests += 1
+        fetch = self._fetches[keyword]
+        self._fetches[keyword] += 1
+        newest = fetch * self.new_per_fetch + self.items
+        slug = hashlib.sha1(keyword.encode("utf-8")).hexdigest()[:8]
+        entries = []
+        for seq in range(newest - 1, newest - 1 - self.items, -1):
+            published = self._base_time + timedelta(minutes=10 * seq)
+            duplicate = self.duplicate_every and seq % self.duplicate_every == 0
+            headline = _headline(keyword, seq + 1 if duplicate else seq)
+            source = "전재통신" if duplicate else "테스트일보"
+            entries.append(
+                "<item>"
+                f"<title>{escape(headline)} - {source}</title>"
+                f"<link>https://news.example.com/{slug}/{seq}</link>"
+                f"<pubDate>{format_datetime(published, usegmt=True)}</pubDate>"
+                f"<source url=\"https://news.example.com\">{source}</source>"
+                "</item>"
+            )
+        return f'<rss version="2.0"><channel>{"".join(entries)}</channel></rss>'
+
+
+_HEADLINE_WORDS = [
+    "수출", "반도체", "금리", "환율", "물가", "전망", "정부", "발표", "시장", "투자",
+    "기업", "실적", "규제", "협상", "증가", "감소", "역대", "최대", "우려", "회복",
+]
+
+
+def _headline(keyword: str, seq: int) -> str:
+    """seq 마다 다른 단어 조합의 제목 (키워드 포함, 결정적)."""
+    rng = random.Random(seq)
+    return f"{keyword} {' '.join(rng.sample(_HEADLINE_WORDS, 4))} {seq}호"
+
+
+# ---------------------------------------------------------------------------
+# Fake Gemini (google.generativeai stand-in)
+# ---------------------------------------------------------------------------
+class ServiceUnavailable(RuntimeError):
+    """`google.api_core.exceptions.ServiceUnavailable` 대용(SDK 예외처럼 HTTP `code` 를 가진다)."""
+
+    code = 503
+
+
+class FakeGemini:
+    """`google.generativeai` 모듈을 대신하는 fake.
+
+    `gemini_service.genai` 자리에 꽂아 쓴다. `GenerativeModel(...).generate_content`
+    는 프롬프트에서 제목을 뽑아 `{"summary", "published_at"}` JSON 응답과
+    `usage_metadata` 를 돌려준다. `system_instruction` 은 매 호출 prompt 토큰에
+    더해지고, `caching.CachedContent` 로 올린 지시문은 `cached_content_token_count`
+    로도 집계된다(실제 API 처럼 prompt 토큰에 포함).
+
+    Args:
+        latency: 호출당 평균 지연(초).
+        jitter: 지연 표준편차(초, 정규분포, 음수는 0).
+        error_rate: 호출이 `ServiceUnavailable`(503)을 던질 확률.
+        seed: 재현성을 위한 난수 시드.
+        min_cache_tokens: 이보다 짧은 지시문의 context cache 생성은 거절한다(모델 최소 크기).
+        straggler_rate: 호출이 straggler_latency 만큼 늦는 확률(꼬리 지연).
+        straggler_latency: straggler 호출의 지연(초).
+
+    `generate_content(..., request_options={"timeout": t})` 는 지연이 t 를 넘으면 t 초 뒤
+    `TimeoutError` 를 던진다(SDK 의 DeadlineExceeded 자리).
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        min_cache_tokens: int = 0,
+        straggler_rate: float = 0.0,
+        straggler_latency: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.min_cache_tokens = min_cache_tokens
+        self.straggler_rate = straggler_rate
+        self.straggler_latency = straggler_latency
+        self.calls = 0
+        self.errors = 0
+        self.stragglers = 0
+        self.timeouts = 0
+        self.models_created = 0
+        self.caches: List["_FakeCachedContent"] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.GenerativeModel = _FakeModelFactory(self)  # noqa: N815 — SDK 이름
+        self.caching = SimpleNamespace(CachedContent=_FakeCachedContentFactory(self))
+
+    def configure(self, **_kwargs) -> None:
+        pass
+
+    def _generate(
+        self, prompt: str, instruction: str = "", cached: bool = False, timeout: Optional[float] = None
+    ) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._rng.gauss(self.latency, self.jitter)) if self.jitter else self.latency
+            if self.straggler_rate and self._rng.random() < self.straggler_rate:
+                self.stragglers += 1
+                delay = self.straggler_latency
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            timed_out = timeout is not None and delay > timeout
+            if timed_out:
+                self.timeouts += 1
+        if timed_out:
+            time.sleep(timeout)
+            raise TimeoutError(f"FakeGemini deadline exceeded ({timeout:.2f}s)")
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise ServiceUnavailable("FakeGemini injected error")
+
+        title = _search(r"Title:\s*(.+)", prompt)
+        summary = f"{title} 에 대한 요약입니다." if title else "요약입니다."
+        # 프로덕션 프롬프트처럼 summary 와 (보정 시에만) published_at 만 돌려준다.
+        text = json.dumps({"summary": summary, "published_at": None}, ensure_ascii=False)
+        instruction_tokens = len(instruction) // 4
+        prompt_tokens = max(1, len(prompt) // 4) + instruction_tokens
+        output_tokens = max(1, len(text) // 4)
+        usage = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+        if cached:
+            usage.cached_content_token_count = instruction_tokens
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class _FakeModelFactory:
+    """`genai.GenerativeModel` — 호출하면 모델, `from_cached_content` 는 캐시 기반 모델."""
+
+    def __init__(self, owner: FakeGemini):
+        self._owner = owner
+
+    def __call__(self, model_name: str, system_instruction: str = "", **kwargs) -> "_FakeModel":
+        with self._owner._lock:
+            self._owner.models_created += 1
+        return _FakeModel(self._owner, model_name, kwargs, system_instruction or "")
+
+    def from_cached_content(self, cached_content: "_FakeCachedContent", **kwargs) -> "_FakeModel":
+        with self._owner._lock:
+            self._owner.models_created += 1
+        return _FakeModel(self._owner, cached_content.model, kwargs, cached_content.system_instruction, cached_content)
+
+
+class _FakeCachedContent:
+    def __init__(self, name: str, model: str, system_instruction: str, ttl: timedelta):
+        self.name = name
+        self.model = model
+        self.system_instruction = system_instruction
+        self.expire_time = datetime.now(timezone.utc) + ttl
+        self.updates = 0
+
+    def update(self, ttl: timedelta) -> None:
+        self.expire_time = datetime.now(timezone.utc) + ttl
+        self.updates += 1
+
+
+class _FakeCachedContentFactory:
+    """`genai.caching.CachedContent` — `create(model=, system_instruction=, ttl=)`."""
+
+    def __init__(self, owner: FakeGemini):
+        self._owner = owner
+
+    def create(self, model: str, system_instruction: str = "", ttl: timedelta = timedelta(hours=1), **_kwargs):
+        if len(system_instruction) // 4 < self._owner.min_cache_tokens:
+            raise ValueError("Cached content is too small")
+        with self._owner._lock:
+            cache = _FakeCachedContent(f"cachedContents/{len(self._owner.caches)}", model, system_instruction, ttl)
+            self._owner.caches.append(cache)
+        return cache
+
+
+class _FakeModel:
+    def __init__(
+        self,
+        owner: FakeGemini,
+        model_name: str,
+        options: Dict[str, Any],
+        instruction: str = "",
+        cache: Optional[_FakeCachedContent] = None,
+    ):
+        self._owner = owner
+        self.model_name = model_name
+        self.options = options
+        self.instruction = instruction
+        self.cache = cache
+
+    def generate_content(self, prompt, request_options: Optional[Dict[str, Any]] = None, **_kwargs) -> SimpleNamespace:
+        text = prompt if isinstance(prompt, str) else " ".join(map(str, prompt))
+        timeout = (request_options or {}).get("timeout")
+        return self._owner._generate(text, self.instruction, cached=self.cache is not None, timeout=timeout)
+
+
+def _search(pattern: str, text: str) -> str:
+    match = re.search(pattern, text)
+    return match.group(1).strip() if match else ""
@@ -0,0 +1,291 @@
+"""백엔드 API 부하 테스트 (in-process, 오프라인).
+
+`backend/app/main.py` 앱을 프로세스 안에서 띄우고 Firestore 는 `InMemoryFirestore`,
+토큰 검증은 `firebase_admin.auth.verify_id_token` stub(토큰 문자열 = uid)으로 바꾼다.
+`POST /keywords` 가 동기로 부르는 요약 파이프라인은 `FakeGemini` + `RssServer` 로 돈다.
+
+시나리오:
+    - feed_poll        : `GET /summaries` 반복 (앱 열기/새로고침)
+    - pagination_walk  : `GET /summaries/paginated` 를 skip=0 부터 끝까지 (offset 비용 절벽)
+    - keyword_burst    : `POST /keywords` 연속 추가 후 `DELETE /keywords/{id}` 연속 삭제
+    - keyword_batch    : 같은 수의 키워드를 사용자당 `POST /keywords:batch` / `DELETE /keywords:batch`
+                         한 번씩 (첫 요약 job 은 `FakePublisher` 에 발행만 한다 — worker 몫)
+    - mix              : 섞은 재생 (feed poll 80 / 임의 깊이 page 15 / `GET /keywords` 5)
+
+출력: 시나리오별 처리량·p50/p95/p99·요청당 Firestore RPC/read 표, 페이지 깊이별 표.
+`--json` 으로 저장해 커밋 간 비교한다.
+
+Usage (repo root):
+    python -m benchmarks.load_backend --users 20 --summaries 200 --concurrency 4 \\
+        --json benchmarks/results/backend.json
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.fakes import FIRESTORE, FakeGemini, FakePublisher, InMemoryFirestore, RssServer
+from benchmarks.stats import percentile, print_table, save_json, summarize
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("FIRESTORE_EMULATOR_HOST", "127.0.0.1:0")
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "bench")
+
+Request = Tuple[str, str, Dict[str, Any]]  # (method, url, kwargs)
+
+
+def wire_backend(db: InMemoryFirestore, gemini: FakeGemini, rss: RssServer):
+    """backend 앱을 import 하고 fake 를 꽂아 FastAPI app 을 반환한다."""
+    backend_dir = os.path.join(ROOT, "backend")
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+    import app.main as main
+    import services.auth_service as auth_service
+    import services.gemini_service as gemini_service
+    import services.instrumentation as instrumentation
+    import services.keyword_service as keyword_service
+    import services.summary_jobs as summary_jobs
+    import services.summary_service as summary_service
+
+    summary_service.db = db
+    keyword_service.db = db
+    auth_service.auth = SimpleNamespace(verify_id_token=lambda token: {"uid": token})
+    gemini_service.api_key = "bench"
+    gemini_service.genai = gemini
+    gemini_service.GOOGLE_NEWS_RSS_URL = rss.url
+    publisher = FakePublisher()
+    summary_jobs.pubsub_publisher = lambda: publisher
+    instrumentation.logger.setLevel(logging.WARNING)
+    return main.app
+
+
+def seed_summaries(db: InMemoryFirestore, users: int, per_user: int, feed: bool = True) -> List[str]:
+    """사용자별 요약을 채운다. feed=True 면 worker 가 유지하는 피드 문서도 함께 만든다."""
+    from services.user_feed import FEED_COLLECTION, FEED_DOC, FEED_LIMIT, UserFeed
+
+    uids = []
+    now = datetime.now(timezone.utc)
+    for u in range(users):
+        uid = f"user-{u:04d}"
+        uids.append(uid)
+        user_ref = db.collection("users").document(uid)
+        user_ref.set({})
+        summaries = user_ref.collection("summaries")
+        for i in range(per_user):
+            summaries.document().set(
+                {
+                    "title": f"시드 기사 {i} 에 관한 꽤 긴 헤드라인 문자열 예시입니다 - 테스트일보",
+                    "url": f"https://seed.example.com/{uid}/{i}",
+                    "summary": "요약 " * 40,
+                    "keyword": f"키워드 {i % 3}",
+                    "published_at": "2026-10-01 09:00",
+                    "source_name": "테스트일보",
+                    "created_at": (now - timedelta(minutes=i)).isoformat(),
+                }
+            )
+        if feed:
+            latest = summaries.order_by("created_at", direction=FIRESTORE.Query.DESCENDING).limit(FEED_LIMIT + 1).stream()
+            user_feed = UserFeed.from_summaries((doc.id, doc.to_dict()) for doc in latest)
+            user_ref.collection(FEED_COLLECTION).document(FEED_DOC).set(user_feed.to_dict())
+    return uids
+
+
+class LoadRunner:
+    """요청 목록을 동시성 N 으로 재생하고 지연·Firestore 호출을 집계한다."""
+
+    def __init__(self, app, db: InMemoryFirestore, concurrency: int):
+        from fastapi.testclient import TestClient
+
+        self._db = db
+        self._concurrency = concurrency
+        self._local = threading.local()
+        self._client_factory = lambda: TestClient(app)
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._client_factory()
+        return client
+
+    def replay(self, name: str, requests: List[Request], on_response: Callable = None) -> Dict[str, Any]:
+        self._db.reset_calls()
+        latencies: List[float] = []
+        errors = [0]
+        lock = threading.Lock()
+
+        def send(req: Request):
+            method, url, kwargs = req
+            start = time.perf_counter()
+            res = self._client().request(method, url, **kwargs)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if res.status_code >= 400:
+                    errors[0] += 1
+            if on_response:
+                on_response(req, res, elapsed)
+
+        started = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            if self._concurrency > 1:
+                with ThreadPoolExecutor(max_workers=self._concurrency) as pool:
+                    list(pool.map(send, requests))
+            else:
+                for req in requests:
+                    send(req)
+        wall = time.perf_counter() - started
+
+        row = summarize(
+            name,
+            latencies,
+            wall,
+            {"firestore_rpc": sum(self._db.calls.values()), "firestore_reads": self._db.reads},
+        )
+        row["errors"] = errors[0]
+        return row
+
+
+def _auth(uid: str) -> Dict[str, Any]:
+    return {"headers": {"Authorization": f"Bearer {uid}"}}
+
+
+def feed_poll_requests(uids: List[str], rounds: int) -> List[Request]:
+    return [("GET", "/summaries", _auth(uid)) for _ in range(rounds) for uid in uids]
+
+
+def pagination_requests(uids: List[str], per_user: int, limit: int) -> List[Request]:
+    return [
+        ("GET", f"/summaries/paginated?skip={skip}&limit={limit}", _auth(uid))
+        for uid in uids
+        for skip in range(0, per_user, limit)
+    ]
+
+
+def keyword_burst(runner: LoadRunner, uids: List[str], per_user: int) -> List[Dict[str, Any]]:
+    created: Dict[str, List[str]] = defaultdict(list)
+    lock = threading.Lock()
+
+    def remember(req, res, _elapsed):
+        if res.status_code == 200:
+            uid = req[2]["headers"]["Authorization"].split(" ")[1]
+            with lock:
+                created[uid].append(res.json()["id"])
+
+    adds = [
+        ("POST", "/keywords", {**_auth(uid), "json": {"keyword": f"버스트 {k}"}})
+        for uid in uids
+        for k in range(per_user)
+    ]
+    add_row = runner.replay("keyword_add_burst", adds, remember)
+    deletes = [
+        ("DELETE", f"/keywords/{kid}", _auth(uid)) for uid, ids in created.items() for kid in ids
+    ]
+    delete_row = runner.replay("keyword_delete_burst", deletes)
+    return [add_row, delete_row]
+
+
+def keyword_batch(runner: LoadRunner, uids: List[str], per_user: int) -> List[Dict[str, Any]]:
+    created: Dict[str, List[str]] = {}
+
+    def remember(req, res, _elapsed):
+        if res.status_code == 200:
+            uid = req[2]["headers"]["Authorization"].split(" ")[1]
+            created[uid] = [item["id"] for item in res.json()["added"]]
+
+    adds = [
+        ("POST", "/keywords:batch", {**_auth(uid), "json": {"keywords": [f"일괄 {k}" for k in range(per_user)]}})
+        for uid in uids
+    ]
+    add_row = runner.replay("keyword_batch_add", adds, remember)
+    deletes = [("DELETE", "/keywords:batch", {**_auth(uid), "json": {"ids": ids}}) for uid, ids in created.items()]
+    delete_row = runner.replay("keyword_batch_delete", deletes)
+    return [add_row, delete_row]
+
+
+def mix_requests(uids: List[str], per_user: int, limit: int, total: int, seed: int) -> List[Request]:
+    rng = random.Random(seed)
+    requests: List[Request] = []
+    for _ in range(total):
+        uid = rng.choice(uids)
+        roll = rng.random()
+        if roll < 0.80:
+            requests.append(("GET", "/summaries", _auth(uid)))
+        elif roll < 0.95:
+            skip = rng.randrange(0, max(1, per_user), limit)
+            requests.append(("GET", f"/summaries/paginated?skip={skip}&limit={limit}", _auth(uid)))
+        else:
+            requests.append(("GET", "/keywords", _auth(uid)))
+    return requests
+
+
+def depth_table(runner: LoadRunner, uid: str, per_user: int, limit: int) -> List[Dict[str, Any]]:
+    """페이지 깊이별 단건 요청의 지연과 문서 read 수 (offset 비용 절벽)."""
+    rows = []
+    depths = sorted({0, per_user // 4, per_user // 2, (per_user * 3) // 4, max(0, per_user - limit)})
+    for skip in depths:
+        latencies = []
+        reads = 0
+        for _ in range(5):
+            row = runner.replay(
+                "depth", [("GET", f"/summaries/paginated?skip={skip}&limit={limit}", _auth(uid))]
+            )
+            latencies.append(row["p50_ms"])
+            reads = row["firestore_reads_per_op"]
+        rows.append({"skip": skip, "limit": limit, "p50_ms": percentile(latencies, 50), "reads_per_request": reads})
+    return rows
+
+
+def main(argv=None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--summaries", type=int, default=200, help="seeded summaries per user")
+    parser.add_argument("--rounds", type=int, default=5, help="feed polls per user")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--keyword-burst", type=int, default=3, help="keywords added/deleted per user")
+    parser.add_argument("--mix", type=int, default=500, help="requests in the mixed replay")
+    parser.add_argument("--gemini-latency", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--no-feed", action="store_true", help="seed without per-user feed documents")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="save results to this JSON path")
+    args = parser.parse_args(argv)
+
+    db = InMemoryFirestore()
+    gemini = FakeGemini(latency=args.gemini_latency, seed=args.seed)
+    with RssServer(items=20) as rss:
+        app = wire_backend(db, gemini, rss)
+        uids = seed_summaries(db, args.users, args.summaries, feed=not args.no_feed)
+        runner = LoadRunner(app, db, args.concurrency)
+
+        rows = [
+            runner.replay("feed_poll", feed_poll_requests(uids, args.rounds)),
+            runner.replay("pagination_walk", pagination_requests(uids, args.summaries, args.page_size)),
+            *keyword_burst(runner, uids, args.keyword_burst),
+            *keyword_batch(runner, uids, args.keyword_burst),
+            runner.replay("mix", mix_requests(uids, args.summaries, args.page_size, args.mix, args.seed)),
+        ]
+        depths = depth_table(runner, uids[0], args.summaries, args.page_size)
+
+    print_table(rows)
+    print()
+    print_table(depths)
+    if args.json:
+        payload_rows = rows + [{"scenario": "pagination_depth", **d} for d in depths]
+        print(f"\nsaved: {save_json(args.json, 'backend_load', payload_rows, vars(args))}")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""엔트리 포인트별 import 시간 리포트 (cold start).
+
+엔트리 모듈을 새 인터프리터에서 `python -X importtime` 으로 import 하고, 최상위
+패키지별 self 시간 합과 전체 import 시간을 출력한다. Cloud Run / Cloud Functions
+cold start 에서 요청 전에 치르는 비용이 어디서 오는지 커밋 간 비교한다.
+
+    - backend : backend/app/main.py (FastAPI, Cloud Run)
+    - worker  : news_summarizer/main.py (Pub/Sub worker)
+    - trigger : trigger_function/main.py
+    - cleanup : cleanup_function/main.py
+
+의존성이 설치되지 않은 엔트리는 import 오류를 표에 남기고 넘어간다.
+
+Usage (repo root):
+    python -m benchmarks.startup_report
+    python -m benchmarks.startup_report --entry backend worker --top 8 --json benchmarks/results/startup.json
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.stats import print_table, save_json
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 이름: (실행 디렉터리, import 할 모듈)
+ENTRY_POINTS = {
+    "backend": ("backend", "app.main"),
+    "worker": ("news_summarizer", "main"),
+    "trigger": ("trigger_function", "main"),
+    "cleanup": ("cleanup_function", "main"),
+}
+
+# import 시점에 있으면 안 되는(첫 사용 때 불러야 하는) 무거운 모듈
+DEFERRED_MODULES = (
+    "google.cloud.firestore",
+    "google.cloud.pubsub_v1",
+    "google.generativeai",
+    "bs4",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(round((time.perf_counter() - start) * 1000, 1))\n"
+    "print(','.join(m for m in {deferred!r} if m in sys.modules))\n"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """`-X importtime` 출력 → [(모듈, self_us, cumulative_us, 깊이)]."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def by_package(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """최상위 패키지별 self 시간 합(us). `google.*` 는 두 단계까지 묶는다."""
+    totals: Dict[str, int] = defaultdict(int)
+    for module, self_us, _cumulative, _depth in rows:
+        parts = module.split(".")
+        key = ".".join(parts[:2]) if parts[0] == "google" and len(parts) > 1 else parts[0]
+        totals[key] += self_us
+    return dict(totals)
+
+
+def measure(name: str) -> Dict[str, Any]:
+    directory, module = ENTRY_POINTS[name]
+    cwd = os.path.join(ROOT, directory)
+    env = {**os.environ, "PYTHONPATH": cwd, "PYTHONWARNINGS": "ignore"}
+    env.setdefault("GOOGLE_CLOUD_PROJECT", "startup-report")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    result: Dict[str, Any] = {"entry": name, "module": f"{directory}/{module}", "modules": len(rows)}
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        result["error"] = errors[-1] if errors else f"exit {proc.returncode}"
+        return result
+    wall_ms, loaded = proc.stdout.splitlines()[-2:]
+    result["import_ms"] = float(wall_ms)
+    result["packages"] = by_package(rows)
+    result["deferred_loaded"] = loaded or "-"
+    return result
+
+
+def main(argv=None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entry", nargs="+", choices=sorted(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument("--top", type=int, default=6, help="packages listed per entry point")
+    parser.add_argument("--json", help="save results to this JSON path")
+    args = parser.parse_args(argv)
+
+    results = [measure(name) for name in args.entry]
+    print_table([
+        {
+            "entry": r["entry"],
+            "module": r["module"],
+            "import_ms": r.get("import_ms", "-"),
+            "modules": r["modules"],
+            "deferred_loaded": r.get("deferred_loaded", "-"),
+            "error": r.get("error", ""),
+        }
+        for r in results
+    ])
+    for r in results:
+        if "packages" not in r:
+            continue
+        total = sum(r["packages"].values()) or 1
+        top = sorted(r["packages"].items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+        print(f"\n[{r['entry']}]")
+        print_table([
+            {"package": package, "self_ms": round(us / 1000, 1), "share": f"{us / total:.0%}"}
+            for package, us in top
+        ])
+    if args.json:
+        print(f"\nsaved: {save_json(args.json, 'startup', results, vars(args))}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
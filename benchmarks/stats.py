@@ -0,0 +1,87 @@
+"""벤치마크 결과 집계/출력 헬퍼 (처리량, 지연 백분위, 표, JSON 저장)."""
+
+import json
+import math
+import os
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """nearest-rank 백분위. 빈 입력이면 0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(
+    name: str,
+    latencies: Sequence[float],
+    wall_seconds: float,
+    calls: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """지연 목록(초)과 총 소요 시간으로 결과 행을 만든다.
+
+    `calls` 는 {이름: 총 호출 수} — 작업(job/request)당 평균으로 나눠 싣는다.
+    """
+    count = len(latencies)
+    row: Dict[str, Any] = {
+        "scenario": name,
+        "count": count,
+        "throughput_per_s": round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0,
+    }
+    for key, total in (calls or {}).items():
+        row[f"{key}_per_op"] = round(total / count, 2) if count else 0.0
+    return row
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    """결과 행들을 고정폭 표로 출력한다(행마다 컬럼이 달라도 합집합으로)."""
+    if not rows:
+        return
+    columns: List[str] = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def save_json(path: str, suite: str, rows: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """커밋 간 비교용으로 결과를 JSON 으로 저장하고 경로를 반환한다."""
+    payload = {
+        "suite": suite,
+        "revision": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "params": params,
+        "results": rows,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
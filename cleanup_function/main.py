@@ -20,6 +20,7 @@ import functions_framework
 from google.cloud import firestore
 from datetime import datetime, timedelta
 import base64
+import heapq
 import json
 import logging
 from typing import Dict, Any, Optional, Tuple
@@ -37,6 +38,20 @@ MIN_RETENTION_DAYS = 7
 MAX_RETENTION_DAYS = 365
 FIRESTORE_BATCH_LIMIT = 500
 
+# Per-user feed document maintained by the summarizer worker
+# (news_summarizer/services/user_feed.py — keep these values in sync)
+FEED_COLLECTION = 'feed'
+FEED_DOC = 'latest'
+FEED_LIMIT = 50
+
+# Per-user search index shards maintained by the summarizer worker
+# (news_summarizer/services/search_index.py — keep in sync). Postings are
+# "YYYYMMDD:<summary id>" strings grouped by character bigram. The worker only
+# appends, so this job keeps each shard at SEARCH_SHARD_POSTINGS_LIMIT postings
+# or fewer (SHARD_POSTINGS_LIMIT there, about 600 KB of the 1 MiB document limit).
+SEARCH_INDEX_COLLECTION = 'search_index'
+SEARCH_SHARD_POSTINGS_LIMIT = 20000
+
 
 def parse_pubsub_message(cloud_event: Any) -> int:
     """
@@ -221,6 +236,93 @@ def delete_old_summaries_for_user(
         raise
 
 
+def rebuild_user_feed(db: firestore.Client, user_id: str) -> bool:
+    """
+    Rebuild the per-user feed document from the summaries subcollection.
+
+    The worker keeps `users/{uid}/feed/latest` holding the newest FEED_LIMIT
+    summaries so that the first page of `GET /summaries` is a single document
+    read. After old summaries are deleted the document may still list them,
+    and concurrent worker runs can race on it, so the cleanup job rewrites it
+    from the subcollection. Users without a feed document are left alone
+    (the API falls back to querying the subcollection).
+
+    Args:
+        db: Initialized Firestore client
+        user_id: User document ID
+
+    Returns:
+        bool: True if the feed document existed and was rewritten
+    """
+    user_ref = db.collection('users').document(user_id)
+    feed_ref = user_ref.collection(FEED_COLLECTION).document(FEED_DOC)
+    if not feed_ref.get().exists:
+        return False
+
+    latest = (
+        user_ref.collection('summaries')
+        .order_by('created_at', direction=firestore.Query.DESCENDING)
+        .limit(FEED_LIMIT + 1)
+        .stream()
+    )
+    entries = [{**doc.to_dict(), 'id': doc.id} for doc in latest]
+    feed_ref.set({
+        'entries': entries[:FEED_LIMIT],
+        'has_more': len(entries) > FEED_LIMIT,
+        'updated_at': datetime.utcnow().isoformat(),
+    })
+    logger.info(f"User {user_id}: Rebuilt feed document ({min(len(entries), FEED_LIMIT)} entries)")
+    return True
+
+
+def prune_search_index(db: firestore.Client, user_id: str, cutoff_date: str) -> int:
+    """
+    Remove expired postings from the user's search index shards and trim
+    shards that are over the size limit.
+
+    Each posting starts with the creation day of its summary, so postings
+    from days before the cutoff day can be dropped without reading the
+    summaries. Removal uses ArrayRemove in a set-merge, so postings the worker
+    adds concurrently are kept. Postings from the cutoff day itself stay until
+    the next run (search skips summaries that no longer exist).
+
+    A shard still holding more than SEARCH_SHARD_POSTINGS_LIMIT postings
+    loses its oldest ones (by day, then summary ID) down to the limit, so
+    the worker's appends until the next run stay under the document limit.
+
+    Args:
+        db: Initialized Firestore client
+        user_id: User document ID
+        cutoff_date: ISO 8601 formatted cutoff date
+
+    Returns:
+        int: Number of postings removed (expired and trimmed)
+    """
+    cutoff_day = cutoff_date[:10].replace('-', '')
+    shards = db.collection('users').document(user_id).collection(SEARCH_INDEX_COLLECTION).stream()
+
+    batch = db.batch()
+    removed = 0
+    for shard in shards:
+        grams = (shard.to_dict() or {}).get('grams') or {}
+        postings = [(p, gram) for gram, values in grams.items() for p in values]
+        expired = sum(1 for p, _ in postings if p.split(':', 1)[0] < cutoff_day)
+        over_limit = max(len(postings) - expired - SEARCH_SHARD_POSTINGS_LIMIT, 0)
+        # Postings sort by day first, so the expired ones are the oldest
+        old = {}
+        for p, gram in heapq.nsmallest(expired + over_limit, postings):
+            old.setdefault(gram, []).append(p)
+        if old:
+            batch.set(shard.reference, {'grams': {g: firestore.ArrayRemove(ps) for g, ps in old.items()}}, merge=True)
+            removed += expired + over_limit
+
+    # At most one write per shard, well under the batch limit
+    if removed:
+        batch.commit()
+        logger.info(f"User {user_id}: Removed {removed} expired or trimmed search postings")
+    return removed
+
+
 @functions_framework.cloud_event
 def cleanup_old_summaries(cloud_event: Any) -> Dict[str, Any]:
     """
@@ -235,7 +337,8 @@ def cleanup_old_summaries(cloud_event: Any) -> Dict[str, Any]:
         2. Calculate cutoff date based on retention period
         3. Initialize Firestore client
         4. Iterate through all users
-        5. For each user, delete old summaries using batch operations
+        5. For each user, delete old summaries using batch operations,
+           rebuild the user's feed document and prune the search index
         6. Log comprehensive execution summary
         7. Return structured result
 
@@ -250,6 +353,8 @@ def cleanup_old_summaries(cloud_event: Any) -> Dict[str, Any]:
                 'users_processed': int,
                 'users_with_deletions': int,
                 'total_deleted': int,
+                'feeds_rebuilt': int,
+                'search_postings_pruned': int,
                 'cutoff_date': str (ISO 8601),
                 'retention_days': int,
                 'error': str (only if status='error')
@@ -292,6 +397,8 @@ def cleanup_old_summaries(cloud_event: Any) -> Dict[str, Any]:
         total_deleted = 0
         users_processed = 0
         users_with_deletions = 0
+        feeds_rebuilt = 0
+        search_postings_pruned = 0
         failed_users = []
 
         # Step 5: Query all users
@@ -320,6 +427,15 @@ def cleanup_old_summaries(cloud_event: Any) -> Dict[str, Any]:
                 if deleted_count > 0:
                     users_with_deletions += 1
 
+                if rebuild_user_feed(db=db, user_id=user_id):
+                    feeds_rebuilt += 1
+
+                search_postings_pruned += prune_search_index(
+                    db=db,
+                    user_id=user_id,
+                    cutoff_date=cutoff_date
+                )
+
             except Exception as user_error:
                 # Log error but continue processing other users
                 failed_users.append(user_id)
@@ -339,6 +455,8 @@ def cleanup_old_summaries(cloud_event: Any) -> Dict[str, Any]:
             'users_processed': users_processed,
             'users_with_deletions': users_with_deletions,
             'total_deleted': total_deleted,
+            'feeds_rebuilt': feeds_rebuilt,
+            'search_postings_pruned': search_postings_pruned,
             'cutoff_date': cutoff_date,
             'retention_days': retention_days,
             'execution_time_seconds': round(duration, 2),
@@ -361,6 +479,8 @@ def cleanup_old_summaries(cloud_event: Any) -> Dict[str, Any]:
         logger.info(f"  - Total users processed: {users_processed}")
         logger.info(f"  - Users with deletions: {users_with_deletions}")
         logger.info(f"  - Total documents deleted: {total_deleted}")
+        logger.info(f"  - Feed documents rebuilt: {feeds_rebuilt}")
+        logger.info(f"  - Search postings pruned: {search_postings_pruned}")
         logger.info(f"  - Cutoff date: {cutoff_date}")
         logger.info(f"  - Retention period: {retention_days} days")
         logger.info(f"  - Execution time: {duration:.2f} seconds")
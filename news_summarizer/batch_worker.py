@@ -0,0 +1,381 @@
+"""Pull 구독 batch worker — `main.summarize_news`(메시지당 함수 1회)의 대안 엔트리.
+
+오래 떠 있는 프로세스가 구독에서 메시지를 최대 N 개씩 pull 해서 처리한다.
+
+    1. 잘못된 메시지는 ack 해서 버린다(다시 와도 처리할 수 없다).
+    2. 같은 (사용자, 키워드) 중복 메시지는 한 번만 처리한다.
+    3. 사용자 문서 보장(`set({}, merge=True)`)을 batch 하나로 묶는다.
+    4. 키워드별로 묶어 동시에 최대 concurrency 묶음을 처리한다. 한 묶음 안의 사용자들은
+       RSS 응답과 기사 분석을 공유한다(`SharedFetch`) — 사용자별 dedup/커서/저장은 그대로.
+    5. 사용자 처리가 끝나(쓰기 commit 후) 그 메시지를 ack 하고, 실패한 메시지는 nack 해서
+       다시 배달되게 한다.
+
+pull 직후 받은 메시지 전체의 ack 기한을 늘리고, batch 가 끝날 때까지 아직 끝나지 않은
+메시지의 기한을 주기적으로 다시 늘린다(차례를 기다리는 키워드 묶음이 재배달되지 않도록).
+
+Gemini·Google News circuit breaker(`services.circuit_breaker`)가 open 이면 키워드 묶음의
+메시지를 처리하지 않고 retry_after 뒤로 미룬다(defer — 재배달). 처리 도중 open 되면 남은
+사용자의 메시지도 같이 미룬다.
+
+원장(`services.job_ledger`)을 켜면 키워드 묶음 처리 시작 때 묶음의 job 을 모두 claim 한다.
+이미 끝난 job 은 RSS·Gemini 호출 없이 ack 하고, 다른 worker 가 처리 중인 job 은 그 lease 가
+끝난 뒤로 미룬다(그 worker 가 죽으면 재배달된 메시지가 처리한다).
+
+로컬 실행:
+    # Pub/Sub 에뮬레이터 (gcloud beta emulators pubsub start)
+    PUBSUB_EMULATOR_HOST=localhost:8085 python batch_worker.py \\
+        --subscription projects/<project>/subscriptions/<name>
+    # 에뮬레이터 없이 메모리 큐로 job 몇 개만
+    python batch_worker.py --in-memory --job user-1:반도체 --job user-2:반도체 --once --no-ledger
+"""
+
+import argparse
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from services.circuit_breaker import GEMINI, GOOGLE_NEWS, CircuitOpenError, ensure_closed
+from services.gemini_service import SharedFetch
+from services.job_ledger import CLAIMED, COMPLETED, LEASED, JobLedger, Lease, job_key
+from services.job_queue import (
+    ACK_DEADLINE_SECONDS,
+    InMemoryQueue,
+    Job,
+    Message,
+    PubSubPullSource,
+    encode_job,
+    parse_job,
+)
+import services.summary_service as summary_service
+
+logger = logging.getLogger(__name__)
+
+# pull 1회에 받을 메시지 수 / 동시에 처리할 키워드 묶음 수
+DEFAULT_MAX_MESSAGES = 100
+DEFAULT_CONCURRENCY = 8
+# 큐가 비었을 때 다음 pull 까지 쉬는 시간(초)
+IDLE_SLEEP_SECONDS = 2.0
+# Firestore batch 쓰기 상한
+_FIRESTORE_BATCH_LIMIT = 500
+# 아직 끝나지 않은 메시지의 ack 기한을 이 주기(초)로 다시 늘린다(ACK_DEADLINE_SECONDS 보다 짧게).
+ACK_RENEW_SECONDS = 240
+
+
+# (ack_id, 원장 key, job) — key 는 slot·메시지 ID 가 없으면 None
+_Delivery = Tuple[str, Optional[str], Job]
+
+
+class _AckKeeper:
+    """pull 한 batch 가 끝날 때까지 아직 ack/nack/defer 하지 않은 메시지의 ack 기한을 늘린다.
+
+    키워드 묶음은 worker 스레드 수만큼만 동시에 돈다 — 차례를 기다리는 묶음의 메시지도
+    기한이 지나 재배달되지 않도록 ACK_RENEW_SECONDS 마다 남은 메시지 전체를 연장한다.
+    ack/nack/defer 는 이 객체를 거쳐 source 로 가고, 끝난 메시지는 연장 대상에서 빠진다.
+    """
+
+    def __init__(self, source, ack_ids: List[str], interval: Optional[float] = None):
+        self._source = source
+        self._open = set(ack_ids)
+        self._interval = interval or ACK_RENEW_SECONDS
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew, name="ack-keeper", daemon=True)
+
+    def __enter__(self) -> "_AckKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _renew(self) -> None:
+        while not self._stop.wait(self._interval):
+            with self._lock:
+                ack_ids = sorted(self._open)
+            if not ack_ids:
+                continue
+            try:
+                self._source.extend(ack_ids, ACK_DEADLINE_SECONDS)
+            except Exception as e:
+                logger.warning(f"Ack deadline renewal failed for {len(ack_ids)} messages: {e}")
+
+    def _settle(self, ack_ids: List[str]) -> None:
+        with self._lock:
+            self._open.difference_update(ack_ids)
+
+    def ack(self, ack_ids: List[str]) -> None:
+        self._settle(ack_ids)
+        self._source.ack(ack_ids)
+
+    def nack(self, ack_ids: List[str]) -> None:
+        self._settle(ack_ids)
+        self._source.nack(ack_ids)
+
+    def defer(self, ack_ids: List[str], seconds: float) -> None:
+        self._settle(ack_ids)
+        self._source.defer(ack_ids, seconds)
+
+    def extend(self, ack_ids: List[str], seconds: int) -> None:
+        self._source.extend(ack_ids, seconds)
+
+
+def _group(source, messages: List[Message]) -> Dict[str, Dict[str, List[_Delivery]]]:
+    """{keyword: {user_id: [(ack_id, key, job), ...]}}. 형식이 틀린 메시지는 바로 ack 한다."""
+    groups: Dict[str, Dict[str, List[_Delivery]]] = {}
+    invalid = []
+    for message in messages:
+        try:
+            job = parse_job(message.data)
+        except ValueError as e:
+            logger.warning(f"Dropping invalid message {message.ack_id}: {e}")
+            invalid.append(message.ack_id)
+            continue
+        delivery = (message.ack_id, job_key(job, message.message_id), job)
+        groups.setdefault(job.keyword, {}).setdefault(job.user_id, []).append(delivery)
+    source.ack(invalid)
+    return groups
+
+
+def _ensure_users(user_ids: List[str]) -> None:
+    db = summary_service.get_db()
+    for i in range(0, len(user_ids), _FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for user_id in user_ids[i:i + _FIRESTORE_BATCH_LIMIT]:
+            batch.set(db.collection("users").document(user_id), {}, merge=True)
+        batch.commit()
+
+
+class _Claim(NamedTuple):
+    """사용자 한 명의 claim 결과. status: CLAIMED(처리) / COMPLETED(ack) / LEASED(retry_after 초 뒤로 미룸)."""
+
+    status: str
+    leases: List[Lease] = []
+    retry_after: float = 0.0
+
+
+def _claim(ledger: Optional[JobLedger], deliveries: List[_Delivery]) -> _Claim:
+    """사용자 한 명의 job 을 claim 한다. 원장이 없거나 key 가 없으면 lease 없이 처리한다.
+
+    같은 (사용자, 키워드)가 다른 key 로 여러 번 왔으면(다른 slot) 하나라도 claim 되면 처리한다.
+    claim 된 것이 없고 다른 실행이 lease 중인 job 이 있으면, 그 lease 가 끝날 때까지 미룬다.
+    """
+    jobs = {key: job for _, key, job in deliveries if key}
+    if ledger is None or not jobs:
+        return _Claim(CLAIMED)
+    leases = [ledger.claim(key, job) for key, job in sorted(jobs.items())]
+    claimed = [lease for lease in leases if lease.claimed]
+    if claimed:
+        return _Claim(CLAIMED, claimed)
+    busy = [lease.lease_until for lease in leases if lease.status == LEASED]
+    if not busy:
+        return _Claim(COMPLETED)
+    return _Claim(LEASED, retry_after=max((max(busy) - datetime.now(timezone.utc)).total_seconds(), 1.0))
+
+
+def _process_keyword(
+    source, keyword: str, users: Dict[str, List[_Delivery]], ledger: Optional[JobLedger] = None
+) -> Dict[str, int]:
+    """한 키워드의 사용자들을 RSS·분석을 공유하며 차례로 처리하고 메시지를 ack/nack/defer 한다."""
+    try:
+        ensure_closed(GOOGLE_NEWS, GEMINI)
+    except CircuitOpenError as e:
+        deferred = [ack_id for deliveries in users.values() for ack_id, _, _ in deliveries]
+        _defer(source, keyword, deferred, e)
+        return {"acked": 0, "nacked": 0, "skipped": 0, "deferred": len(deferred)}
+
+    # lease 는 처리 전에 한꺼번에 잡는다 — 이 worker 가 죽으면 메시지가 재배달(ack 기한)되기
+    # 전에 lease 가 먼저 만료돼야 재배달된 메시지가 claim 할 수 있다. 그래서 claim 직전에
+    # ack 기한을 한 번 더 늘린다(pull 직후 연장·주기 연장은 그보다 이를 수 있다).
+    source.extend([ack_id for deliveries in users.values() for ack_id, _, _ in deliveries], ACK_DEADLINE_SECONDS)
+    pending, done, failed, skipped, deferred = [], [], [], [], []
+    for user_id, deliveries in users.items():
+        ack_ids = [ack_id for ack_id, _, _ in deliveries]
+        try:
+            claim = _claim(ledger, deliveries)
+        except Exception as e:
+            logger.warning(f"Ledger claim failed, will be redelivered: {user_id=} {keyword=}: {e}")
+            failed.extend(ack_ids)
+            source.nack(ack_ids)
+            continue
+        if claim.status == COMPLETED:
+            skipped.extend(ack_ids)
+        elif claim.status == LEASED:
+            # 다른 worker 가 처리 중 — ack 하면 그 worker 가 죽었을 때 job 이 사라진다
+            logger.info(f"Job leased by another run, retry in {claim.retry_after:.0f}s: {user_id=} {keyword=}")
+            deferred.extend(ack_ids)
+            source.defer(ack_ids, claim.retry_after)
+        else:
+            pending.append((user_id, ack_ids, claim.leases))
+    source.ack(skipped)
+
+    shared = SharedFetch()
+    for n, (user_id, ack_ids, leases) in enumerate(pending):
+        try:
+            summary_service.summarize_and_store(user_id, keyword, shared=shared, ensure_user=False)
+        except CircuitOpenError as e:
+            # 업스트림 장애: 이 사용자와 남은 사용자를 모두 미룬다
+            rest = []
+            for _, rest_ack_ids, rest_leases in pending[n:]:
+                _release(ledger, rest_leases)
+                rest.extend(rest_ack_ids)
+            _defer(source, keyword, rest, e)
+            deferred.extend(rest)
+            break
+        except Exception as e:
+            logger.warning(f"Job failed, will be redelivered: {user_id=} {keyword=}: {e}")
+            _release(ledger, leases)
+            failed.extend(ack_ids)
+            source.nack(ack_ids)
+            continue
+        _complete(ledger, leases)
+        done.extend(ack_ids)
+    source.ack(done)
+    return {"acked": len(done), "nacked": len(failed), "skipped": len(skipped), "deferred": len(deferred)}
+
+
+def _defer(source, keyword: str, ack_ids: List[str], error: CircuitOpenError) -> None:
+    logger.warning(f"Deferring {len(ack_ids)} jobs for {keyword=}: {error}")
+    source.defer(ack_ids, error.retry_after)
+
+
+def _complete(ledger: Optional[JobLedger], leases: List[Lease]) -> None:
+    for lease in leases:
+        try:
+            ledger.complete(lease)
+        except Exception as e:
+            # 요약은 이미 저장됐다 — 메시지는 그대로 ack 한다. done 이 빠진 job 이 다시 오면
+            # lease 만료 뒤 처리되지만 URL dedup 이 같은 요약을 다시 저장하지 않는다.
+            logger.warning(f"Ledger complete failed: {lease.key}: {e}")
+
+
+def _release(ledger: Optional[JobLedger], leases: List[Lease]) -> None:
+    for lease in leases:
+        try:
+            ledger.release(lease)
+        except Exception as e:
+            # 풀지 못한 lease 는 만료된 뒤 재배달된 메시지가 claim 한다
+            logger.warning(f"Ledger release failed: {lease.key}: {e}")
+
+
+def run_batch(
+    source,
+    max_messages: int = DEFAULT_MAX_MESSAGES,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ledger: Optional[JobLedger] = None,
+) -> Dict[str, int]:
+    """pull 1회분을 처리하고 {pulled, jobs, keywords, acked, nacked, skipped, deferred, invalid} 건수를 반환한다.
+
+    acked 는 처리해서 ack 한 메시지, skipped 는 원장에 이미 끝나 처리 없이 ack 한 메시지,
+    deferred 는 circuit open 이나 다른 실행의 lease 때문에 미룬 메시지.
+    """
+    messages = source.pull(max_messages)
+    stats = {
+        "pulled": len(messages), "jobs": 0, "keywords": 0,
+        "acked": 0, "nacked": 0, "skipped": 0, "deferred": 0, "invalid": 0,
+    }
+    if not messages:
+        return stats
+
+    # 구독 기본 ack 기한(보통 10초)으로는 차례를 기다리는 키워드 묶음이 재배달된다 — 받자마자
+    # 전부 늘리고, batch 가 끝날 때까지 주기적으로 다시 늘린다.
+    ack_ids = [message.ack_id for message in messages]
+    source.extend(ack_ids, ACK_DEADLINE_SECONDS)
+    with _AckKeeper(source, ack_ids) as keeper:
+        return _run_groups(keeper, messages, stats, concurrency, ledger)
+
+
+def _run_groups(source, messages: List[Message], stats: Dict[str, int], concurrency: int, ledger) -> Dict[str, int]:
+    """run_batch 본체 — 받은 메시지를 키워드로 묶어 처리하고 stats 를 채운다."""
+    groups = _group(source, messages)
+    stats["invalid"] = len(messages) - sum(len(ids) for users in groups.values() for ids in users.values())
+    stats["keywords"] = len(groups)
+    stats["jobs"] = sum(len(users) for users in groups.values())
+    if not groups:
+        return stats
+
+    pending = [ack_id for users in groups.values() for deliveries in users.values() for ack_id, _, _ in deliveries]
+    try:
+        _ensure_users(sorted({user_id for users in groups.values() for user_id in users}))
+    except Exception as e:
+        logger.warning(f"Ensuring user documents failed, redelivering batch: {e}")
+        source.nack(pending)
+        stats["nacked"] = len(pending)
+        return stats
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(lambda item: _process_keyword(source, *item, ledger=ledger), groups.items()))
+    for result in results:
+        for key in ("acked", "nacked", "skipped", "deferred"):
+            stats[key] += result[key]
+    return stats
+
+
+def serve(
+    source,
+    max_messages: int = DEFAULT_MAX_MESSAGES,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    stop: Optional[threading.Event] = None,
+    once: bool = False,
+    ledger: Optional[JobLedger] = None,
+) -> Dict[str, int]:
+    """stop 이 설정될 때까지 pull → 처리를 반복한다. 누적 건수를 반환한다.
+
+    once 면 큐가 비거나 한 batch 가 아무것도 ack 하지 못하면 끝낸다.
+    """
+    stop = stop or threading.Event()
+    totals: Dict[str, int] = {}
+    while not stop.is_set():
+        try:
+            stats = run_batch(source, max_messages, concurrency, ledger)
+        except Exception as e:
+            # pull 자체의 실패(네트워크, 빈 구독의 deadline 초과 등) — 잠시 뒤 다시 시도
+            logger.warning(f"Pull failed: {e}")
+            stats = {"pulled": 0}
+        for key, value in stats.items():
+            totals[key] = totals.get(key, 0) + value
+        if stats["pulled"]:
+            logger.info(f"Batch done: {stats}")
+        if once and not (stats.get("acked") or stats.get("skipped") or stats.get("invalid")):
+            break  # 큐가 비었거나 진척이 없다(nack 한 메시지만 되돌아온다)
+        if not stats["pulled"]:
+            stop.wait(IDLE_SLEEP_SECONDS)
+    return totals
+
+
+def main(argv=None) -> Dict[str, int]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscription", default=os.getenv("SUMMARY_SUBSCRIPTION"),
+                        help="projects/<project>/subscriptions/<name> (env SUMMARY_SUBSCRIPTION)")
+    parser.add_argument("--in-memory", action="store_true", help="use an in-memory queue instead of Pub/Sub")
+    parser.add_argument("--job", action="append", default=[], help="user_id:keyword to enqueue (with --in-memory)")
+    parser.add_argument("--max-messages", type=int, default=DEFAULT_MAX_MESSAGES)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--once", action="store_true", help="exit when the queue is empty or stops making progress")
+    parser.add_argument("--no-ledger", action="store_true", help="process redeliveries without the job ledger")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.in_memory:
+        source = InMemoryQueue()
+        for job in args.job:
+            user_id, _, keyword = job.partition(":")
+            source.publish(encode_job(user_id, keyword))
+    elif args.subscription:
+        source = PubSubPullSource(args.subscription)
+    else:
+        parser.error("--subscription (or SUMMARY_SUBSCRIPTION) or --in-memory is required")
+
+    started = time.perf_counter()
+    ledger = None if args.no_ledger else JobLedger(summary_service.get_db())
+    totals = serve(source, args.max_messages, args.concurrency, once=args.once, ledger=ledger)
+    logger.info(f"Worker done: {totals} in {time.perf_counter() - started:.1f}s")
+    return totals
+
+
+if __name__ == "__main__":
+    main()
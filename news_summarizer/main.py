@@ -1,16 +1,49 @@
 import base64
-import json
-from services.summary_service import summarize_and_store
+import logging
+from services.circuit_breaker import CircuitOpenError
+from services.job_ledger import COMPLETED, LEASED, JobInProgress, JobLedger, job_key
+from services.job_queue import parse_job
+from services.summary_service import get_db, summarize_and_store
+
+logger = logging.getLogger(__name__)
+
+# 첫 사용 때 만든다(cold start 단축).
+ledger = None
 
-def summarize_news(event, context):
-    message = base64.b64decode(event['data']).decode('utf-8')
-    payload = json.loads(message)
 
-    user_id = payload.get("user_id")
-    keyword = payload.get("keyword")
+def _ledger() -> JobLedger:
+    global ledger
+    if ledger is None:
+        ledger = JobLedger(get_db())
+    return ledger
+
+
+def summarize_news(event, context):
+    job = parse_job(base64.b64decode(event['data']))
+    user_id, keyword = job.user_id, job.keyword
 
-    if not user_id or not keyword:
-        raise ValueError("Invalid message")
+    logger.info(f"received {user_id} {keyword}")
+    # Pub/Sub 재배달·trigger 재발행이면 이미 끝났거나 처리 중인 job 이다.
+    key = job_key(job, getattr(context, "event_id", None))
+    lease = _ledger().claim(key, job) if key else None
+    if lease is not None and lease.status == COMPLETED:
+        logger.info(f"skip {user_id} {keyword}: {lease.status}")
+        return
+    if lease is not None and lease.status == LEASED:
+        # 다른 실행이 처리 중이다 — ack 하면 그 실행이 죽었을 때 job 이 사라진다. 던져서
+        # 재배달(--retry)을 받고, lease 가 끝난 뒤 done 이면 건너뛰고 아니면 처리한다.
+        logger.info(f"wait {user_id} {keyword}: leased until {lease.lease_until}")
+        raise JobInProgress(lease)
 
-    print(f"received {user_id} {keyword}")
-    summarize_and_store(user_id=user_id, keyword=keyword)
+    try:
+        summarize_and_store(user_id=user_id, keyword=keyword)
+    except Exception as e:
+        # 업스트림 장애(circuit open)도 실패로 던진다 — 함수는 --retry 로 배포돼 Pub/Sub 이
+        # backoff 뒤 다시 배달한다(최대 10회, 이후 dead-letter topic. deploy.yml).
+        if isinstance(e, CircuitOpenError):
+            logger.warning(f"defer {user_id} {keyword}: {e}")
+        if lease is not None:
+            _ledger().release(lease)
+        raise
+    if lease is not None:
+        _ledger().complete(lease)
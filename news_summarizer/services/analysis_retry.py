@@ -0,0 +1,119 @@
+"""(user, keyword) 별 기사 분석 재시도 큐.
+
+Gemini 분석이 실패한 기사를 시도 횟수·다음 시도 시각과 함께 보관한다. 다음 실행들은
+새 기사를 고르고 남은 분석 예산(`max_results` 중 빈자리)으로 시도 시각이 된 항목을
+다시 분석한다. MAX_ATTEMPTS 번 실패한 항목은 dead-letter(`dead`)로 남기고 더 시도하지
+않는다.
+
+큐는 feed cursor 문서(`users/{uid}/feed_cursors/{cursor_id(keyword)}`)의 `retries`
+필드에 들어간다 — job 마다 이미 읽고 쓰는 문서라 읽기/쓰기가 늘지 않고, 키워드를
+지우면 커서와 함께 지워진다. 실패를 큐에 넣으면 커서는 그 기사를 처리한 것으로 보고
+전진한다(키워드 전체를 다시 훑지 않는다).
+
+Firestore 에 의존하지 않는다 — 문서 dict 변환만 하고 읽기/쓰기는 호출 측이 한다.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from services.feed_cursor import link_hash
+
+RETRY_FIELD = "retries"
+
+# 이 횟수만큼 실패하면 dead-letter
+MAX_ATTEMPTS = 5
+# 다음 시도까지의 대기: BACKOFF_BASE × 2^(시도 횟수 - 1), 최대 BACKOFF_MAX
+BACKOFF_BASE = timedelta(minutes=15)
+BACKOFF_MAX = timedelta(hours=6)
+# 큐에 둘 항목 수 상한. 넘치면 오래된 대기 항목부터 dead-letter 로 보낸다.
+PENDING_LIMIT = 20
+DEAD_LETTER_LIMIT = 20
+
+PENDING = "pending"
+DEAD = "dead"
+
+# 재시도에 다시 넘길 RSS 항목 필드
+_ARTICLE_FIELDS = ("title", "link", "pub_date", "source")
+
+
+def backoff(attempts: int) -> timedelta:
+    return min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+
+
+class RetryQueue:
+    """분석 실패 기사를 기록하고, 시도 시각이 된 항목을 꺼내 준다."""
+
+    def __init__(self, items: Optional[Dict[str, Dict[str, Any]]] = None, now: Optional[datetime] = None):
+        self.items: Dict[str, Dict[str, Any]] = {key: dict(item) for key, item in (items or {}).items()}
+        self.now = now or datetime.now(timezone.utc)
+        self.dirty = False
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> "RetryQueue":
+        """커서 문서 dict(`retries` 필드를 가진) → RetryQueue."""
+        return cls((data or {}).get(RETRY_FIELD), now)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return self.items
+
+    def _due(self, item: Dict[str, Any]) -> bool:
+        return item["state"] == PENDING and datetime.fromisoformat(item["next_attempt_at"]) <= self.now
+
+    def due(self, limit: int, exclude: Optional[List[str]] = None) -> List[dict]:
+        """시도 시각이 된 대기 항목의 RSS 기사를 오래 기다린 순으로 최대 limit 개."""
+        if limit <= 0:
+            return []
+        skip = set(exclude or [])
+        ready = sorted(
+            (item for item in self.items.values() if self._due(item) and item["article"]["link"] not in skip),
+            key=lambda item: item["next_attempt_at"],
+        )
+        return [dict(item["article"]) for item in ready[:limit]]
+
+    def failed(self, article: dict, reason: str = "analysis_failed") -> str:
+        """분석 실패를 기록하고 항목 상태(pending / dead)를 반환한다."""
+        key = link_hash(article["link"])
+        item = self.items.get(key) or {
+            "article": {field: article.get(field) for field in _ARTICLE_FIELDS},
+            "attempts": 0,
+            "first_failed_at": self.now.isoformat(),
+        }
+        item["attempts"] += 1
+        item["last_error"] = reason
+        item["updated_at"] = self.now.isoformat()
+        if item["attempts"] >= MAX_ATTEMPTS:
+            item["state"] = DEAD
+            item["next_attempt_at"] = None
+        else:
+            item["state"] = PENDING
+            item["next_attempt_at"] = (self.now + backoff(item["attempts"])).isoformat()
+        self.items[key] = item
+        self._trim()
+        self.dirty = True
+        return item["state"]
+
+    def succeeded(self, article: dict) -> None:
+        if self.items.pop(link_hash(article["link"]), None) is not None:
+            self.dirty = True
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for item in self.items.values() if item["state"] == PENDING)
+
+    @property
+    def dead(self) -> List[Dict[str, Any]]:
+        return [item for item in self.items.values() if item["state"] == DEAD]
+
+    def _trim(self) -> None:
+        pending = sorted(
+            (key for key, item in self.items.items() if item["state"] == PENDING),
+            key=lambda key: self.items[key]["first_failed_at"],
+        )
+        for key in pending[:max(len(pending) - PENDING_LIMIT, 0)]:
+            self.items[key].update(state=DEAD, next_attempt_at=None, last_error="queue_full")
+        dead = sorted(
+            (key for key, item in self.items.items() if item["state"] == DEAD),
+            key=lambda key: self.items[key]["updated_at"],
+        )
+        for key in dead[:max(len(dead) - DEAD_LETTER_LIMIT, 0)]:
+            del self.items[key]
@@ -0,0 +1,192 @@
+"""업스트림(Gemini, Google News)별 circuit breaker.
+
+장애 중에는 job 마다 모든 기사를 호출해 보고 기한까지 기다리느라 실행 시간만 쓴다.
+업스트림마다 프로세스 전역 breaker 하나를 두고 연속 실패를 센다.
+
+    - closed   : 호출한다. 연속 장애(5xx·429·unavailable·연결 오류·기한 초과)가
+                 FAILURE_THRESHOLD 번이면 open.
+    - open     : 호출하지 않고 바로 CircuitOpenError. OPEN_SECONDS 가 지나면 half-open.
+    - half-open: probe 호출 하나만 보낸다. 성공하면 closed, 실패하면 다시 open
+                 (대기 시간 2배, 최대 MAX_OPEN_SECONDS).
+
+job 은 시작 전에 `ensure_closed` 로 확인하고, open 이면 기사 하나 호출하지 않고
+CircuitOpenError 로 끝난다 — worker 는 그 메시지를 큐로 미룬다(batch worker 는 retry_after
+뒤 재배달). 상태는 프로세스(인스턴스)마다 따로다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+GEMINI = "gemini"
+GOOGLE_NEWS = "google_news"
+
+# 연속 실패 몇 번에 open 할지
+FAILURE_THRESHOLD = 5
+# open 유지 시간(초). half-open probe 가 실패할 때마다 두 배, 최대 MAX_OPEN_SECONDS.
+OPEN_SECONDS = 30.0
+MAX_OPEN_SECONDS = 300.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """breaker 가 open 이라 호출하지 않았다. retry_after 초 뒤 probe 가 가능하다."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"{upstream} circuit open, retry after {retry_after:.0f}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class UpstreamError(Exception):
+    """업스트림이 장애 상태 코드(5xx, 429)로 응답했다."""
+
+
+def check_status(status_code: int) -> None:
+    """5xx/429 면 UpstreamError — `guard` 안에서 부르면 실패로 센다(그 밖의 응답은 성공)."""
+    if status_code >= 500 or status_code == 429:
+        raise UpstreamError(f"HTTP {status_code}")
+
+
+# SDK 예외(`google.api_core.exceptions`)의 `code` 중 장애로 세는 것. 504(DeadlineExceeded)도
+# 센다 — 응답 없이 멈춘 업스트림이 이 breaker 가 막으려는 장애다.
+OUTAGE_CODES = frozenset({429, 500, 502, 503, 504})
+
+# requests 예외는 builtin ConnectionError / TimeoutError 하위가 아니다(IOError 하위) —
+# 이 모듈이 requests 에 의존하지 않도록 클래스 이름으로 알아본다.
+_OUTAGE_CLASS_NAMES = frozenset({"ConnectionError", "Timeout"})
+
+
+def is_outage(error: BaseException) -> bool:
+    """업스트림 장애로 볼 예외인가 — 장애 응답(5xx·429), unavailable, 연결 오류, 기한 초과.
+
+    기한 초과는 호출 하나가 기한 전체를 넘겼을 때다 — hedge 에서 진 요청은 `Hedger.call` 이
+    삼키고 이긴 응답을 돌려주므로 여기까지 오지 않는다. 차단된 응답의 ValueError, 파싱 오류
+    같은 건 업스트림이 살아 있어도 나므로 circuit 을 열지 않는다.
+    """
+    if isinstance(error, (UpstreamError, ConnectionError, TimeoutError)):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in OUTAGE_CODES
+    return any(cls.__name__ in _OUTAGE_CLASS_NAMES for cls in type(error).__mro__)
+
+
+class CircuitBreaker:
+    """업스트림 하나의 closed / open / half-open 상태."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        open_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or FAILURE_THRESHOLD
+        self.base_open_seconds = open_seconds or OPEN_SECONDS
+        self.open_seconds = self.base_open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._clock = clock
+        self._opened_at = 0.0
+        self._probe_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _retry_after(self, now: float) -> float:
+        if self.state == OPEN:
+            return max(self.open_seconds - (now - self._opened_at), 0.0)
+        if self.state == HALF_OPEN and self._probe_at is not None:
+            return max(self.open_seconds - (now - self._probe_at), 0.0)
+        return 0.0
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return self._retry_after(self._clock())
+
+    def rejects(self) -> bool:
+        """지금 호출하면 거절되는가. probe 자리는 잡지 않는다(job 시작 전 확인용)."""
+        with self._lock:
+            return self.state != CLOSED and self._retry_after(self._clock()) > 0
+
+    def check(self) -> None:
+        """호출해도 되면 반환하고(half-open 이면 이 호출이 probe), 아니면 CircuitOpenError."""
+        with self._lock:
+            now = self._clock()
+            if self.state == OPEN and now - self._opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probe_at = None
+            # probe 결과가 open_seconds 안에 오지 않으면 다음 호출이 다시 probe 한다
+            if self.state == HALF_OPEN and (self._probe_at is None or now - self._probe_at >= self.open_seconds):
+                self._probe_at = now
+                return
+            if self.state != CLOSED:
+                raise CircuitOpenError(self.name, self._retry_after(now))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                print(f"[Circuit] {self.name} closed (probe succeeded)")
+                self.state = CLOSED
+                self.open_seconds = self.base_open_seconds
+                self._probe_at = None
+            if self.state == CLOSED:
+                self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open(min(self.open_seconds * 2, MAX_OPEN_SECONDS), "probe failed")
+            elif self.state == CLOSED:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self._open(self.base_open_seconds, f"{self.failures} consecutive failures")
+
+    def _open(self, seconds: float, reason: str) -> None:
+        self.state = OPEN
+        self.open_seconds = seconds
+        self._opened_at = self._clock()
+        self._probe_at = None
+        self.opened += 1
+        print(f"[Circuit] {self.name} open for {seconds:.0f}s ({reason})")
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """check 후 블록을 실행한다. 장애 예외(`is_outage`)면 실패, 정상 종료면 성공으로 센다.
+
+        그 밖의 예외는 세지 않고 그대로 던진다(연속 실패 수도, half-open probe 도 그대로).
+        """
+        self.check()
+        try:
+            yield
+        except Exception as e:
+            if is_outage(e):
+                self.record_failure()
+            raise
+        self.record_success()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit(name: str) -> CircuitBreaker:
+    """업스트림의 프로세스 전역 breaker."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def ensure_closed(*names: str) -> None:
+    """하나라도 open 이면 CircuitOpenError — job 을 시작하기 전에 부른다."""
+    for name in names:
+        breaker = circuit(name)
+        if breaker.rejects():
+            raise CircuitOpenError(name, breaker.retry_after())
@@ -0,0 +1,51 @@
+"""지연 생성 GCP 클라이언트.
+
+`google.cloud.firestore` import 와 `firestore.Client()` 생성은 gRPC/인증 초기화 때문에
+cold start 에서 수백 ms 가 든다. 모듈 import 시점이 아니라 첫 사용 때 한 번만 만들고
+프로세스 안에서 공유한다(모듈별로 따로 만들던 client 를 하나로).
+
+생성 직후 훅(예: backend 의 Firestore 호출 수 계측)은 `on_firestore_client` 로 건다.
+Pub/Sub 발행 client(`pubsub_publisher`)도 같은 방식으로 만든다.
+"""
+
+import threading
+from typing import Callable, List
+
+_firestore_client = None
+_pubsub_publisher = None
+_firestore_hooks: List[Callable] = []
+_lock = threading.Lock()
+
+
+def firestore_client():
+    """프로세스 공유 `firestore.Client` (첫 호출 때 import + 생성)."""
+    global _firestore_client
+    if _firestore_client is None:
+        with _lock:
+            if _firestore_client is None:
+                from google.cloud import firestore
+
+                client = firestore.Client()
+                for hook in _firestore_hooks:
+                    hook(client)
+                _firestore_client = client
+    return _firestore_client
+
+
+def pubsub_publisher():
+    """프로세스 공유 `pubsub_v1.PublisherClient` (첫 호출 때 import + 생성)."""
+    global _pubsub_publisher
+    if _pubsub_publisher is None:
+        with _lock:
+            if _pubsub_publisher is None:
+                from google.cloud import pubsub_v1
+
+                _pubsub_publisher = pubsub_v1.PublisherClient()
+    return _pubsub_publisher
+
+
+def on_firestore_client(hook: Callable) -> None:
+    """client 가 만들어질 때(이미 있으면 즉시) hook(client) 를 부른다."""
+    _firestore_hooks.append(hook)
+    if _firestore_client is not None:
+        hook(_firestore_client)
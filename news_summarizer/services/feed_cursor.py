@@ -0,0 +1,113 @@
+"""(user, keyword) 별 RSS high-water mark.
+
+`users/{uid}/feed_cursors/{cursor_id(keyword)}` 문서 하나에 마지막으로 처리한
+기사의 `pubDate`(UTC ISO) 와 최근 링크 해시를 보관한다. 다음 실행의 RSS 단계는
+커서보다 새로운 항목만 남기므로, 새 기사가 없으면 dedup 조회·Gemini 호출 없이
+job 이 끝난다.
+
+Firestore 에 의존하지 않는다 — 문서 dict 변환만 하고 읽기/쓰기는 호출 측이 한다.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+# 커서 문서에 남길 최근 링크 해시 수 (같은 pubDate 묶음/재정렬 흡수용)
+RECENT_LINKS_LIMIT = 50
+
+CURSOR_COLLECTION = "feed_cursors"
+
+
+def cursor_id(keyword: str) -> str:
+    """키워드 → 커서 문서 ID (공백/슬래시가 있어도 안전한 고정 길이)."""
+    return hashlib.sha1(keyword.strip().encode("utf-8")).hexdigest()[:20]
+
+
+def link_hash(link: str) -> str:
+    return hashlib.sha1(link.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_pub_date(value: Optional[str]) -> Optional[datetime]:
+    """RSS `pubDate`(RFC 822) → aware UTC datetime. 파싱 실패 시 None."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class FeedCursor:
+    """RSS 항목을 커서 기준으로 거르고, 처리한 항목으로 커서를 전진시킨다."""
+
+    def __init__(self, latest_pub_date: Optional[datetime] = None, recent_links: Optional[List[str]] = None):
+        self.latest_pub_date = latest_pub_date
+        self.recent_links: List[str] = list(recent_links or [])
+        self.dirty = False
+        self._pending_latest: Optional[datetime] = None
+        self._hold_date = False
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "FeedCursor":
+        if not data:
+            return cls()
+        latest = data.get("latest_pub_date")
+        return cls(
+            latest_pub_date=datetime.fromisoformat(latest) if latest else None,
+            recent_links=data.get("recent_links") or [],
+        )
+
+    def to_dict(self, keyword: str) -> Dict[str, Any]:
+        return {
+            "keyword": keyword,
+            "latest_pub_date": self.latest_pub_date.isoformat() if self.latest_pub_date else None,
+            "recent_links": self.recent_links,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def filter_new(self, articles: List[dict]) -> List[dict]:
+        """커서 이후 항목만 반환한다.
+
+        최근 링크 해시에 있으면 제외. pubDate 가 커서보다 이전이면 제외(같은 시각은
+        해시로 판단). pubDate 를 읽을 수 없는 항목은 해시로만 판단한다.
+        """
+        recent = set(self.recent_links)
+        fresh = []
+        for article in articles:
+            if link_hash(article["link"]) in recent:
+                continue
+            published = parse_pub_date(article.get("pub_date"))
+            if self.latest_pub_date and published and published < self.latest_pub_date:
+                continue
+            fresh.append(article)
+        return fresh
+
+    def mark_processed(self, articles: List[dict]) -> None:
+        """처리 완료(저장 또는 이미 저장됨)된 항목을 커서에 반영한다."""
+        if not articles:
+            return
+        hashes = [link_hash(article["link"]) for article in articles]
+        merged = list(dict.fromkeys(hashes + self.recent_links))[:RECENT_LINKS_LIMIT]
+        if merged != self.recent_links:
+            self.recent_links = merged
+            self.dirty = True
+        for article in articles:
+            published = parse_pub_date(article.get("pub_date"))
+            if published and (self._pending_latest is None or published > self._pending_latest):
+                self._pending_latest = published
+
+    def hold_date(self) -> None:
+        """이번 실행에서 실패한 항목이 있으면 pubDate 는 전진시키지 않는다(다음 실행에 재시도)."""
+        self._hold_date = True
+
+    def commit(self) -> None:
+        """이번 실행 결과로 high-water mark 를 확정한다."""
+        if self._hold_date or self._pending_latest is None:
+            return
+        if self.latest_pub_date is None or self._pending_latest > self.latest_pub_date:
+            self.latest_pub_date = self._pending_latest
+            self.dirty = True
@@ -0,0 +1,148 @@
+"""요약 job 원장 — Pub/Sub 재배달로 같은 job 이 두 번 돌지 않게 한다.
+
+Pub/Sub 은 at-least-once 라 이미 끝난 job 의 메시지가 다시 올 수 있다. 그대로 처리하면
+RSS·Gemini 호출을 처음부터 다시 한다(저장은 dedup 으로 막히지만 모델 비용은 두 배).
+
+`job_ledger/{key}` 문서 하나가 job 하나다.
+
+    - key: (사용자, 키워드, 스케줄 slot) 해시. slot 이 없는 메시지(구 trigger)는 메시지 ID 해시.
+      trigger 가 재시도돼 같은 slot 을 다시 발행해도, Pub/Sub 이 같은 메시지를 다시 줘도 같은 key.
+    - claim   : 트랜잭션으로 읽고 `leased`(lease_until = 지금 + LEASE_SECONDS)로 쓴다.
+                이미 `done` 이면 건너뛴다(ack). 다른 실행의 lease 가 살아 있으면 ack 하지
+                않고 lease 가 끝난 뒤로 미룬다 — 그 실행이 죽으면 재배달된 메시지가 처리한다.
+    - complete: 쓰기가 끝난 뒤 `done` 으로 바꾼다(읽기 없음).
+    - release : 실패하면 내 lease 를 풀어(`failed`) 재배달이 바로 claim 할 수 있게 한다.
+                release 도 못 하고 죽으면 lease 가 만료된 뒤 claim 된다.
+
+문서는 `expire_at`(TTL 정책, `firestore.indexes.json`)이 지나면 Firestore 가 지운다.
+"""
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from services.job_queue import Job
+
+LEDGER_COLLECTION = "job_ledger"
+# lease 유효 시간(초). 함수 최대 실행 시간(540초) 안에 끝난 job 의 lease 가 살아 있도록 하고,
+# pull 메시지 ack 기한(ACK_DEADLINE_SECONDS = 600)보다 짧게 둔다 — 처리 중 죽은 worker 의
+# 메시지가 재배달될 때는 lease 가 이미 만료돼 있어야 한다.
+LEASE_SECONDS = 540
+# 원장 문서 보존 기간. Pub/Sub 메시지 보존 기간(기본 7일)보다 길 필요는 없다 — 재배달은
+# 대부분 몇 분 안에 온다.
+LEDGER_TTL_DAYS = 3
+
+# claim 결과
+CLAIMED = "claimed"
+COMPLETED = "completed"
+LEASED = "leased"
+
+
+def job_key(job: Job, message_id: Optional[str] = None) -> Optional[str]:
+    """원장 문서 ID. slot 도 메시지 ID 도 없으면 None(원장 없이 처리)."""
+    if job.slot:
+        basis = f"slot\n{job.user_id}\n{job.keyword}\n{job.slot}"
+    elif message_id:
+        basis = f"message\n{message_id}"
+    else:
+        return None
+    return hashlib.blake2b(basis.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class JobInProgress(Exception):
+    """다른 실행이 job 을 lease 하고 있다. 메시지를 ack 하지 않고 lease 가 끝난 뒤 재배달을 받는다."""
+
+    def __init__(self, lease: "Lease"):
+        super().__init__(f"job {lease.key} leased until {lease.lease_until}")
+        self.lease = lease
+
+
+@dataclass
+class Lease:
+    key: str
+    status: str
+    token: Optional[str] = None
+    # status 가 LEASED 일 때 다른 실행의 lease 만료 시각
+    lease_until: Optional[datetime] = None
+
+    @property
+    def claimed(self) -> bool:
+        return self.status == CLAIMED
+
+
+class JobLedger:
+    """`job_ledger` 컬렉션 위의 claim / complete / release.
+
+    firestore: `google.cloud.firestore` 모듈(transactional). None 이면 첫 claim 때 import 한다.
+    """
+
+    def __init__(self, db, firestore=None, lease_seconds: int = LEASE_SECONDS):
+        self.db = db
+        self._firestore = firestore
+        self.lease_seconds = lease_seconds
+
+    def _ref(self, key: str):
+        return self.db.collection(LEDGER_COLLECTION).document(key)
+
+    def _transactional(self, fn):
+        if self._firestore is None:
+            from google.cloud import firestore
+
+            self._firestore = firestore
+        return self._firestore.transactional(fn)
+
+    def claim(self, key: str, job: Job, now: Optional[datetime] = None) -> Lease:
+        """job 을 lease 한다. 이미 끝났으면 COMPLETED, 다른 실행이 lease 중이면 LEASED(lease_until) Lease."""
+        now = now or datetime.now(timezone.utc)
+        token = uuid.uuid4().hex
+        ref = self._ref(key)
+
+        def _claim(transaction):
+            snapshot = ref.get(transaction=transaction)
+            current = snapshot.to_dict() if snapshot.exists else {}
+            if current.get("state") == "done":
+                return Lease(key, COMPLETED)
+            lease_until = current.get("lease_until")
+            if current.get("state") == "leased" and lease_until is not None and lease_until > now:
+                return Lease(key, LEASED, lease_until=lease_until)
+            transaction.set(ref, {
+                "state": "leased",
+                "token": token,
+                "lease_until": now + timedelta(seconds=self.lease_seconds),
+                "attempts": current.get("attempts", 0) + 1,
+                "user_id": job.user_id,
+                "keyword": job.keyword,
+                "slot": job.slot,
+                "updated_at": now,
+                "expire_at": now + timedelta(days=LEDGER_TTL_DAYS),
+            })
+            return Lease(key, CLAIMED, token)
+
+        return self._transactional(_claim)(self.db.transaction())
+
+    def complete(self, lease: Lease, now: Optional[datetime] = None) -> None:
+        """쓰기가 끝난 job 을 done 으로 남긴다. lease 가 만료돼 다른 실행이 가져갔어도 done 이 맞다."""
+        now = now or datetime.now(timezone.utc)
+        self._ref(lease.key).set({
+            "state": "done",
+            "token": lease.token,
+            "lease_until": None,
+            "completed_at": now,
+            "updated_at": now,
+        }, merge=True)
+
+    def release(self, lease: Lease, now: Optional[datetime] = None) -> None:
+        """실패한 job 의 lease 를 푼다. 그새 다른 실행이 lease 했으면 건드리지 않는다."""
+        now = now or datetime.now(timezone.utc)
+        ref = self._ref(lease.key)
+
+        def _release(transaction):
+            snapshot = ref.get(transaction=transaction)
+            current = snapshot.to_dict() if snapshot.exists else {}
+            if current.get("state") != "leased" or current.get("token") != lease.token:
+                return
+            transaction.update(ref, {"state": "failed", "lease_until": None, "updated_at": now})
+
+        self._transactional(_release)(self.db.transaction())
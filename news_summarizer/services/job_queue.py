@@ -0,0 +1,186 @@
+"""요약 job 메시지와 pull 방식 메시지 소스.
+
+trigger 는 (user_id, keyword) job 을 Pub/Sub 토픽에 발행한다. push 구독(`main.summarize_news`)은
+메시지마다 함수를 한 번 부르고, batch worker(`batch_worker.py`)는 pull 구독에서 여러 개를
+한 번에 받아 처리한다. 두 경로가 같은 메시지 형식(`parse_job`)을 쓴다.
+
+메시지 본문은 `{"user_id", "keyword", "slot"}` JSON 이다. slot 은 trigger 실행의 스케줄 구간
+(예: `20261019T0900`)으로, 원장(`services.job_ledger`)이 재배달·재발행을 알아보는 데 쓴다.
+slot 이 없는 메시지(구 trigger)도 받는다.
+
+소스는 pull / ack / nack / extend / defer 다섯 가지만 있으면 된다.
+
+    - PubSubPullSource: 실제 구독 (PUBSUB_EMULATOR_HOST 가 있으면 에뮬레이터로 붙는다)
+    - InMemoryQueue   : 로컬 실행·테스트용 대용 (ack 전 메시지는 nack 하면 다시 나온다)
+
+defer 는 메시지를 ack 하지 않고 seconds 초 뒤 다시 배달되게 한다 — 업스트림 장애(circuit
+open)로 지금 처리할 수 없는 job 을 큐로 돌려보낼 때 쓴다.
+"""
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# pull 로 받은 메시지의 ack 기한(초). 키워드 묶음 처리 시작 때 이만큼 늘린다.
+ACK_DEADLINE_SECONDS = 600
+# Pub/Sub modifyAckDeadline 이 받는 최대값(초) — defer 는 이보다 길게 미룰 수 없다.
+MAX_DEFER_SECONDS = 600
+
+
+class Job(NamedTuple):
+    user_id: str
+    keyword: str
+    slot: Optional[str] = None
+
+
+def parse_job(data: bytes) -> Job:
+    """메시지 본문(JSON) → Job. user_id / keyword 가 없으면 ValueError."""
+    payload = json.loads(data.decode("utf-8"))
+
+    user_id = payload.get("user_id")
+    keyword = payload.get("keyword")
+
+    if not user_id or not keyword:
+        raise ValueError("Invalid message")
+    return Job(user_id, keyword, payload.get("slot") or None)
+
+
+def encode_job(user_id: str, keyword: str, slot: Optional[str] = None) -> bytes:
+    payload = {"user_id": user_id, "keyword": keyword}
+    if slot:
+        payload["slot"] = slot
+    return json.dumps(payload).encode("utf-8")
+
+
+@dataclass
+class Message:
+    ack_id: str
+    data: bytes
+    # Pub/Sub 메시지 ID — 같은 메시지가 재배달되면 ack_id 는 바뀌어도 이 값은 같다.
+    message_id: Optional[str] = None
+
+
+class InMemoryQueue:
+    """Pub/Sub pull 구독 대용. nack 한 메시지는 큐 앞으로 돌아가 같은 메시지 ID 로 다시 배달된다.
+
+    defer 한 메시지는 clock 기준 seconds 초가 지난 뒤의 pull 부터 다시 나온다.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._pending: deque = deque()
+        self._deferred: List[Tuple[float, str, bytes]] = []
+        self._clock = clock
+        self._outstanding: Dict[str, Tuple[str, bytes]] = {}
+        self._ids = itertools.count()
+        self._message_ids = itertools.count()
+        self._lock = threading.Lock()
+        self.acked: List[bytes] = []
+        self.deliveries = 0
+
+    def publish(self, data: bytes) -> str:
+        with self._lock:
+            message_id = f"msg-{next(self._message_ids)}"
+            self._pending.append((message_id, data))
+            return message_id
+
+    def pull(self, max_messages: int) -> List[Message]:
+        with self._lock:
+            now = self._clock()
+            ready = [(message_id, data) for at, message_id, data in self._deferred if at <= now]
+            self._deferred = [item for item in self._deferred if item[0] > now]
+            self._pending.extend(ready)
+            messages = []
+            while self._pending and len(messages) < max_messages:
+                ack_id = f"ack-{next(self._ids)}"
+                message_id, data = self._pending.popleft()
+                self._outstanding[ack_id] = (message_id, data)
+                messages.append(Message(ack_id, data, message_id))
+            self.deliveries += len(messages)
+            return messages
+
+    def ack(self, ack_ids: List[str]) -> None:
+        with self._lock:
+            for ack_id in ack_ids:
+                message = self._outstanding.pop(ack_id, None)
+                if message is not None:
+                    self.acked.append(message[1])
+
+    def nack(self, ack_ids: List[str]) -> None:
+        with self._lock:
+            for ack_id in reversed(ack_ids):
+                message = self._outstanding.pop(ack_id, None)
+                if message is not None:
+                    self._pending.appendleft(message)
+
+    def extend(self, ack_ids: List[str], seconds: int) -> None:
+        """ack 기한 연장 — 메모리 큐에는 기한이 없다."""
+
+    def defer(self, ack_ids: List[str], seconds: float) -> None:
+        with self._lock:
+            at = self._clock() + seconds
+            for ack_id in ack_ids:
+                message = self._outstanding.pop(ack_id, None)
+                if message is not None:
+                    self._deferred.append((at, *message))
+
+    @property
+    def outstanding(self) -> int:
+        with self._lock:
+            return len(self._outstanding)
+
+    @property
+    def deferred(self) -> int:
+        with self._lock:
+            return len(self._deferred)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+class PubSubPullSource:
+    """`google.cloud.pubsub_v1.SubscriberClient` 동기 pull.
+
+    subscription: `projects/{project}/subscriptions/{name}`.
+    """
+
+    def __init__(self, subscription: str, client=None, timeout: float = 30.0):
+        if client is None:
+            from google.cloud import pubsub_v1
+
+            client = pubsub_v1.SubscriberClient()
+        self.subscription = subscription
+        self._client = client
+        self._timeout = timeout
+
+    def pull(self, max_messages: int) -> List[Message]:
+        response = self._client.pull(
+            request={"subscription": self.subscription, "max_messages": max_messages},
+            timeout=self._timeout,
+        )
+        return [
+            Message(received.ack_id, received.message.data, received.message.message_id)
+            for received in response.received_messages
+        ]
+
+    def ack(self, ack_ids: List[str]) -> None:
+        if ack_ids:
+            self._client.acknowledge(request={"subscription": self.subscription, "ack_ids": ack_ids})
+
+    def nack(self, ack_ids: List[str]) -> None:
+        self.extend(ack_ids, 0)
+
+    def defer(self, ack_ids: List[str], seconds: float) -> None:
+        """ack 기한을 seconds 로 바꿔 둔다 — 기한이 지나면 Pub/Sub 이 다시 배달한다."""
+        self.extend(ack_ids, min(max(int(seconds), 1), MAX_DEFER_SECONDS))
+
+    def extend(self, ack_ids: List[str], seconds: int) -> None:
+        if ack_ids:
+            self._client.modify_ack_deadline(
+                request={"subscription": self.subscription, "ack_ids": ack_ids, "ack_deadline_seconds": seconds}
+            )
+
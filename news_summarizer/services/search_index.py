@@ -0,0 +1,173 @@
+"""사용자별 요약 전문 검색: 문자 bigram 역색인.
+
+한국어는 띄어쓰기·조사 변화가 잦아 단어 단위 색인은 잘 안 맞는다. 형태소 분석 없이
+단어 안의 문자 bigram 을 색인하고(1글자 단어는 그대로), 후보를 읽은 뒤 trigram·제목
+일치와 최신성으로 다시 순위를 매긴다.
+
+색인은 `users/{uid}/search_index/{shard}` 문서 SEARCH_INDEX_SHARDS 개에 나뉜다.
+
+    {"grams": {"반도": ["20261019:<summary id>", ...], ...}, "updated_at": ...}
+
+posting 앞의 날짜(YYYYMMDD)로 요약을 읽지 않고도 최신순 정렬과 만료 정리를 한다.
+worker 는 요약 저장 시 `ArrayUnion` set-merge 로 더하고(읽기 없음, 동시 실행에 안전),
+cleanup 은 보존 기간이 지난 posting 을 `ArrayRemove` 한다. 검색은 질의 bigram 이 속한
+shard 문서만 `get_all` 1회로 읽고, 상위 후보 요약을 다시 `get_all` 1회로 읽는다.
+
+shard 문서 크기는 SHARD_POSTINGS_LIMIT 로 묶는다. 쓰기는 읽지 않으므로 상한은 cleanup(하루
+1회)과 backfill 이 `trim_postings` 로 지킨다 — 넘는 만큼 오래된 posting 부터 지운다. 그 사이
+worker 가 더하는 것은 하루치뿐이라 상한을 문서 한도(1 MiB)보다 넉넉히 낮게 잡는다.
+"""
+
+import hashlib
+import heapq
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SEARCH_INDEX_COLLECTION = "search_index"
+SEARCH_INDEX_SHARDS = 64
+# shard 문서 하나의 posting 수 상한. posting ≈ 30 byte 라 ≈ 600 KB — 문서 한도(1 MiB)까지
+# 남은 ≈ 400 KB 가 cleanup 사이 하루치 쓰기의 여유다(사용자당 하루 요약 수천 건).
+SHARD_POSTINGS_LIMIT = 20000
+
+# 질의에서 쓰는 bigram 수 상한 (읽는 shard 수 상한)
+QUERY_GRAM_LIMIT = 24
+# 색인 점수로 고른 뒤 요약을 읽어 다시 순위를 매길 후보 수
+SEARCH_CANDIDATES = 50
+# 질의 bigram 중 이 비율 이상이 들어 있어야 후보
+MIN_COVERAGE = 0.5
+# 최종 점수 중 최신성 비중과 반감기(일)
+RECENCY_WEIGHT = 0.2
+RECENCY_HALF_LIFE_DAYS = 7
+
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def text_grams(text: str, n: int = 2) -> List[str]:
+    """단어(문자·숫자 연속) 안의 문자 n-gram, 등장 순서대로 중복 없이. n 보다 짧은 단어는 그대로."""
+    grams: Dict[str, None] = {}
+    for word in _WORD.findall((text or "").lower()):
+        if len(word) < n:
+            grams[word] = None
+        else:
+            for i in range(len(word) - n + 1):
+                grams[word[i:i + n]] = None
+    return list(grams)
+
+
+def document_grams(doc: Dict[str, Any]) -> List[str]:
+    return text_grams(f"{doc.get('title') or ''} {doc.get('summary') or ''}")
+
+
+def shard_id(gram: str) -> str:
+    h = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "big")
+    return f"{h % SEARCH_INDEX_SHARDS:02d}"
+
+
+def posting(doc_id: str, created_at: str) -> str:
+    return f"{(created_at or '')[:10].replace('-', '')}:{doc_id}"
+
+
+def parse_posting(value: str) -> Tuple[str, str]:
+    """posting → (YYYYMMDD, 요약 ID)."""
+    day, _, doc_id = value.partition(":")
+    return day, doc_id
+
+
+def index_writes(entries: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, List[str]]]:
+    """[(요약 ID, 문서)] → {shard: {gram: [posting, ...]}} (색인에 더할 내용)."""
+    writes: Dict[str, Dict[str, List[str]]] = {}
+    for doc_id, doc in entries:
+        value = posting(doc_id, doc.get("created_at"))
+        for gram in document_grams(doc):
+            writes.setdefault(shard_id(gram), {}).setdefault(gram, []).append(value)
+    return writes
+
+
+def trim_postings(grams: Dict[str, List[str]], limit: Optional[int] = None) -> Dict[str, List[str]]:
+    """shard 의 {gram: [posting, ...]} 가 limit(기본 SHARD_POSTINGS_LIMIT)을 넘으면 지울 posting 을
+    {gram: [posting, ...]} 으로 반환한다. 날짜가 이른 것부터(같은 날이면 요약 ID 순) 고른다.
+    """
+    limit = SHARD_POSTINGS_LIMIT if limit is None else limit
+    total = sum(len(postings) for postings in grams.values())
+    if total <= limit:
+        return {}
+    drop: Dict[str, List[str]] = {}
+    oldest = heapq.nsmallest(total - limit, ((value, gram) for gram, postings in grams.items() for value in postings))
+    for value, gram in oldest:
+        drop.setdefault(gram, []).append(value)
+    return drop
+
+
+def _coverage(query: List[str], grams) -> float:
+    if not query:
+        return 0.0
+    return sum(1 for gram in query if gram in grams) / len(query)
+
+
+def _age_days(created_at: str, now: datetime) -> float:
+    try:
+        created = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return float(RECENCY_HALF_LIFE_DAYS * 10)
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return max(0.0, (now - created).total_seconds() / 86400)
+
+
+def score(query: str, doc: Dict[str, Any], now: datetime) -> float:
+    """관련도(bigram·trigram 일치율, 제목 일치율 평균)와 최신성(반감기 감쇠)의 가중합."""
+    bigrams = text_grams(query)
+    trigrams = text_grams(query, 3)
+    text = f"{doc.get('title') or ''} {doc.get('summary') or ''}"
+    relevance = (
+        _coverage(bigrams, set(text_grams(text)))
+        + _coverage(trigrams, set(text_grams(text, 3)))
+        + _coverage(bigrams, set(text_grams(doc.get("title") or "")))
+    ) / 3
+    recency = 0.5 ** (_age_days(doc.get("created_at"), now) / RECENCY_HALF_LIFE_DAYS)
+    return (1 - RECENCY_WEIGHT) * relevance + RECENCY_WEIGHT * recency
+
+
+def search(db, user_ref, query: str, limit: int = 10, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """사용자 요약 중 query 와 맞는 것을 점수순으로 최대 limit 건. 빈 질의는 ValueError."""
+    grams = text_grams(query)[:QUERY_GRAM_LIMIT]
+    if not grams:
+        raise ValueError("Empty query")
+
+    # 1) 질의 bigram 이 속한 shard 만 읽어 요약별 일치 bigram 수 / 날짜를 센다.
+    index_ref = user_ref.collection(SEARCH_INDEX_COLLECTION)
+    by_shard: Dict[str, List[str]] = {}
+    for gram in grams:
+        by_shard.setdefault(shard_id(gram), []).append(gram)
+    hits: Dict[str, List] = {}
+    for snapshot in db.get_all([index_ref.document(shard) for shard in by_shard]):
+        if not snapshot.exists:
+            continue
+        postings = (snapshot.to_dict() or {}).get("grams") or {}
+        for gram in by_shard.get(snapshot.id, []):
+            for value in postings.get(gram) or []:
+                day, doc_id = parse_posting(value)
+                hit = hits.setdefault(doc_id, [0, day])
+                hit[0] += 1
+
+    candidates = sorted(
+        (hit for hit in hits.items() if hit[1][0] / len(grams) >= MIN_COVERAGE),
+        key=lambda hit: (hit[1][0], hit[1][1]),
+        reverse=True,
+    )[:max(SEARCH_CANDIDATES, limit)]
+    if not candidates:
+        return []
+
+    # 2) 후보 요약을 한 번에 읽어 다시 순위를 매긴다(지워졌지만 아직 정리 전인 posting 은 건너뜀).
+    summaries_ref = user_ref.collection("summaries")
+    now = now or datetime.now(timezone.utc)
+    results = []
+    for snapshot in db.get_all([summaries_ref.document(doc_id) for doc_id, _ in candidates]):
+        if not snapshot.exists:
+            continue
+        data = snapshot.to_dict()
+        data["id"] = snapshot.id
+        results.append((score(query, data, now), data.get("created_at") or "", data))
+    results.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return [data for _, _, data in results[:limit]]
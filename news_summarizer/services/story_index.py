@@ -0,0 +1,119 @@
+"""매체 간 같은 기사(전재/받아쓰기) 감지용 SimHash 와 사용자별 최근 시그니처 인덱스.
+
+URL 이 달라도 같은 이야기면 새 요약을 만들지 않고 기존 요약에 출처로 붙인다.
+
+    - 제목 SimHash: Gemini 분석 *전* 판정 (모델 호출 절감)
+    - 제목+요약 SimHash: 분석 *후* 판정 (제목을 많이 고친 전재 기사)
+
+인덱스는 `users/{uid}/story_index/recent` 문서 하나(최근 STORY_INDEX_LIMIT 건).
+Firestore 에 의존하지 않는다 — 문서 dict 변환만 하고 읽기/쓰기는 호출 측이 한다.
+"""
+
+import hashlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from services.ranking import normalize_title
+
+STORY_INDEX_COLLECTION = "story_index"
+STORY_INDEX_DOC = "recent"
+
+# 인덱스에 남길 최근 요약 수 / 기간 (cleanup 보존 기간보다 짧게 — 붙일 원본이 남아 있도록)
+STORY_INDEX_LIMIT = 200
+STORY_INDEX_MAX_AGE = timedelta(days=7)
+
+# 64-bit SimHash Hamming 거리 임계값
+TITLE_DUPLICATE_BITS = 8
+CONTENT_DUPLICATE_BITS = 10
+# 분석 후 판정 시 제목도 이 정도는 가까워야 같은 이야기로 본다(본문만 비슷한 별개 기사 보호).
+TITLE_RELATED_BITS = 20
+
+_BITS = 64
+
+
+def _features(text: str) -> Counter:
+    normalized = normalize_title(text)
+    if len(normalized) < 3:
+        return Counter([normalized]) if normalized else Counter()
+    return Counter(normalized[i:i + 3] for i in range(len(normalized) - 2))
+
+
+def simhash(text: str) -> int:
+    """문자 trigram(빈도 가중) 64-bit SimHash."""
+    weights = [0] * _BITS
+    for feature, count in _features(text).items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+    return sum(1 << bit for bit in range(_BITS) if weights[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def title_signature(title: str) -> int:
+    return simhash(title)
+
+
+def content_signature(title: str, summary: Optional[str]) -> int:
+    return simhash(f"{normalize_title(title)} {summary or ''}")
+
+
+class StoryIndex:
+    """사용자별 최근 요약 시그니처 목록. 시그니처는 16자리 hex 로 저장한다."""
+
+    def __init__(self, entries: Optional[List[Dict[str, Any]]] = None):
+        self.entries: List[Dict[str, Any]] = list(entries or [])
+        # 이번 실행에 add 한 항목(오래된 것부터) — 저장 시 최신 문서에 다시 얹는다.
+        self.added: List[Dict[str, Any]] = []
+        self.dirty = False
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> "StoryIndex":
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - STORY_INDEX_MAX_AGE).isoformat()
+        entries = [e for e in (data or {}).get("entries", []) if e.get("created_at", "") >= cutoff]
+        return cls(entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"entries": self.entries, "updated_at": datetime.now(timezone.utc).isoformat()}
+
+    def match_title(self, title_sig: int) -> Optional[Dict[str, Any]]:
+        """제목만으로 같은 이야기인 항목 (분석 전 판정)."""
+        return self._closest(lambda e: hamming(title_sig, int(e["title_sig"], 16)), TITLE_DUPLICATE_BITS)
+
+    def match_content(self, title_sig: int, content_sig: int) -> Optional[Dict[str, Any]]:
+        """제목+요약으로 같은 이야기인 항목 (분석 후 판정)."""
+        def distance(entry):
+            if hamming(title_sig, int(entry["title_sig"], 16)) > TITLE_RELATED_BITS:
+                return _BITS
+            return hamming(content_sig, int(entry["sig"], 16))
+        return self._closest(distance, CONTENT_DUPLICATE_BITS)
+
+    def add(self, doc_id: str, title_sig: int, content_sig: int, created_at: str) -> None:
+        entry = {"id": doc_id, "title_sig": f"{title_sig:016x}", "sig": f"{content_sig:016x}", "created_at": created_at}
+        self.entries = [entry] + self.entries[:STORY_INDEX_LIMIT - 1]
+        self.added.append(entry)
+        self.dirty = True
+
+    def rebase(self, data: Optional[Dict[str, Any]]) -> "StoryIndex":
+        """최신 문서(data)에 이번 실행에 add 한 항목을 얹은 인덱스.
+
+        같은 사용자의 다른 job 이 그사이 저장한 항목을 덮어쓰지 않도록 트랜잭션 안에서 쓴다.
+        """
+        current = StoryIndex.from_dict(data)
+        known = {entry["id"] for entry in current.entries}
+        for entry in self.added:
+            if entry["id"] not in known:
+                current.add(entry["id"], int(entry["title_sig"], 16), int(entry["sig"], 16), entry["created_at"])
+        return current
+
+    def _closest(self, distance, threshold: int) -> Optional[Dict[str, Any]]:
+        best, best_distance = None, threshold + 1
+        for entry in self.entries:
+            d = distance(entry)
+            if d < best_distance:
+                best, best_distance = entry, d
+        return best
@@ -0,0 +1,69 @@
+"""사용자별 피드 문서 (fan-out on write).
+
+worker 가 요약을 저장할 때 `users/{uid}/feed/latest` 문서 하나에 최신 FEED_LIMIT 건을
+조회 순서(created_at 내림차순)로 함께 기록한다. `GET /summaries` 첫 페이지는 이 문서
+한 번 read 로 끝나고, 더 깊은 페이지만 summaries 서브컬렉션을 쿼리한다.
+
+`has_more` 는 문서 밖에 더 오래된 요약이 있을 수 있는지 — False 면 문서가 전부다.
+Firestore 에 의존하지 않는다 — 문서 dict 변환만 하고 읽기/쓰기는 호출 측이 한다.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+FEED_COLLECTION = "feed"
+FEED_DOC = "latest"
+
+# 피드 문서에 담을 최신 요약 수 (요약 ~2KB × 50 ≈ 100KB, 문서 상한 1MiB 이내)
+FEED_LIMIT = 50
+
+
+class UserFeed:
+    """최신 요약 목록. 항목은 조회 API 응답과 같은 형태(`id` 포함 요약 문서)다."""
+
+    def __init__(self, entries: Optional[List[Dict[str, Any]]] = None, has_more: bool = False):
+        self.entries: List[Dict[str, Any]] = list(entries or [])
+        self.has_more = has_more
+        self.dirty = False
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "UserFeed":
+        data = data or {}
+        return cls(data.get("entries"), bool(data.get("has_more")))
+
+    @classmethod
+    def from_summaries(cls, docs: Iterable[Tuple[str, Dict[str, Any]]]) -> "UserFeed":
+        """created_at 내림차순 (id, 문서) 최대 FEED_LIMIT + 1 건으로 새 피드를 만든다."""
+        entries = [{**doc, "id": doc_id} for doc_id, doc in docs]
+        feed = cls(entries[:FEED_LIMIT], has_more=len(entries) > FEED_LIMIT)
+        feed.dirty = True
+        return feed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entries": self.entries,
+            "has_more": self.has_more,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def add(self, doc_id: str, doc: Dict[str, Any]) -> None:
+        entries = [e for e in self.entries if e.get("id") != doc_id]
+        entries.append({**doc, "id": doc_id})
+        entries.sort(key=lambda e: e.get("created_at") or "", reverse=True)
+        if len(entries) > FEED_LIMIT:
+            entries = entries[:FEED_LIMIT]
+            self.has_more = True
+        self.entries = entries
+        self.dirty = True
+
+    def set_extra_sources(self, doc_id: str, sources: List[dict]) -> None:
+        for entry in self.entries:
+            if entry.get("id") == doc_id:
+                entry["extra_sources"] = list(sources)
+                self.dirty = True
+
+    def page(self, skip: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """문서로 채울 수 있는 페이지면 항목 복사본, 아니면 None (서브컬렉션 조회 필요)."""
+        if skip + limit > len(self.entries) and self.has_more:
+            return None
+        return [dict(entry) for entry in self.entries[skip:skip + limit]]
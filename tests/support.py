@@ -0,0 +1,57 @@
+"""
+Shared test setup: stub `google.cloud.firestore`, put the repo root and
+`news_summarizer` on sys.path, and load modules by file path.
+
+Importing this module does the first two, so test files import it before any
+production module:
+
+    from tests.support import ROOT, load
+
+The stub only stands in when the real library has not been imported yet. Its
+`Client` is a placeholder; tests swap in `benchmarks.fakes.InMemoryFirestore`.
+`Query` carries the sort directions services read from the module at call time.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+from unittest.mock import MagicMock
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+NEWS_DIR = os.path.join(ROOT, "news_summarizer")
+TRIGGER_DIR = os.path.join(ROOT, "trigger_function")
+
+
+def install_stub_firestore():
+    google_mod = sys.modules.setdefault("google", types.ModuleType("google"))
+    cloud_mod = sys.modules.setdefault("google.cloud", types.ModuleType("google.cloud"))
+    google_mod.cloud = cloud_mod
+    if "google.cloud.firestore" not in sys.modules:
+        firestore_mod = types.ModuleType("google.cloud.firestore")
+        firestore_mod.Client = MagicMock
+        firestore_mod.Query = types.SimpleNamespace(ASCENDING="ASCENDING", DESCENDING="DESCENDING")
+        sys.modules["google.cloud.firestore"] = firestore_mod
+        cloud_mod.firestore = firestore_mod
+
+
+def add_paths(*paths):
+    for path in paths:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def load(name, *parts):
+    """Load `ROOT/<parts>` as module `name`.
+
+    The backend, trigger and worker each have a `services`/`main` of their own,
+    so they are loaded under unique names instead of imported.
+    """
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, *parts))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+install_stub_firestore()
+add_paths(ROOT, NEWS_DIR)
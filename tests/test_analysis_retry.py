@@ -0,0 +1,201 @@
+"""
+Test: retry queue for failed article analyses (`services.analysis_retry`,
+T-20261019-023).
+
+Covers:
+
+    1. RetryQueue: exponential backoff, due items only, dead-letter after
+       MAX_ATTEMPTS, success removes the item, bounded pending/dead lists
+    2. summarize_and_store: a failed analysis is queued in the cursor document
+       and the cursor still advances; the next run drains it with the spare
+       analysis budget without re-walking the feed
+    3. spare budget only: a full batch of fresh articles leaves retries queued
+    4. repeated failures end in the dead state and are not retried
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import tests.support  # noqa: F401
+from benchmarks import fakes
+from benchmarks.fakes import InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+from services.analysis_retry import (
+    DEAD,
+    DEAD_LETTER_LIMIT,
+    MAX_ATTEMPTS,
+    PENDING,
+    PENDING_LIMIT,
+    RETRY_FIELD,
+    RetryQueue,
+    backoff,
+)
+from services.feed_cursor import CURSOR_COLLECTION, cursor_id
+
+T0 = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)
+TOPICS = ["수출 증가", "금리 동결", "배터리 투자", "전기차 판매", "원전 수주", "물가 상승", "고용 회복", "환율 급등"]
+
+
+def _article(n, keyword="반도체"):
+    return {
+        "title": f"{keyword} {TOPICS[n]} 소식 - 매체{n}",
+        "link": f"https://news.example.com/{n}",
+        "pub_date": f"Mon, 19 Oct 2026 0{n}:00:00 GMT",
+        "source": f"매체{n}",
+    }
+
+
+def _analysis(article):
+    return {
+        "title": article["title"],
+        "url": article["link"],
+        "summary": f"{article['title']} 요약",
+        "published_at": "2026-10-19 09:00",
+        "source_name": article["source"],
+    }
+
+
+class TestRetryQueue(unittest.TestCase):
+
+    def test_backoff_and_due(self):
+        queue = RetryQueue(now=T0)
+        self.assertEqual(queue.failed(_article(0), "ResourceExhausted"), PENDING)
+        self.assertEqual(queue.due(5), [])
+        self.assertEqual(backoff(1), timedelta(minutes=15))
+        self.assertEqual(backoff(10), timedelta(hours=6))
+
+        later = RetryQueue.from_dict({RETRY_FIELD: queue.to_dict()}, now=T0 + timedelta(minutes=15))
+        self.assertEqual(later.due(5), [_article(0)])
+        self.assertEqual(later.due(0), [])
+        self.assertEqual(later.due(5, exclude=[_article(0)["link"]]), [])
+
+        later.failed(_article(0))
+        item = next(iter(later.items.values()))
+        self.assertEqual((item["attempts"], item["last_error"]), (2, "analysis_failed"))
+        self.assertEqual(item["next_attempt_at"], (T0 + timedelta(minutes=45)).isoformat())
+
+        later.succeeded(_article(0))
+        self.assertEqual(later.items, {})
+
+    def test_dead_letter(self):
+        queue = RetryQueue(now=T0)
+        states = [queue.failed(_article(0)) for _ in range(MAX_ATTEMPTS)]
+        self.assertEqual(states, [PENDING] * (MAX_ATTEMPTS - 1) + [DEAD])
+        queue.now = T0 + timedelta(days=1)
+        self.assertEqual(queue.due(5), [])
+        self.assertEqual(len(queue.dead), 1)
+
+    def test_bounded(self):
+        queue = RetryQueue(now=T0)
+        for n in range(PENDING_LIMIT + DEAD_LETTER_LIMIT + 5):
+            queue.now = T0 + timedelta(seconds=n)
+            queue.failed({**_article(0), "link": f"https://news.example.com/x{n}"})
+        self.assertEqual(queue.pending, PENDING_LIMIT)
+        self.assertEqual(len(queue.dead), DEAD_LETTER_LIMIT)
+
+
+class _WorkerCase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        self.feed = [_article(n) for n in range(3)]
+        self.failing = set()
+        self.gemini = MagicMock(side_effect=self._analyze)
+        for p in (
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", fakes.FIRESTORE),
+            patch.object(gemini_service, "api_key", "test"),
+            patch.object(gemini_service, "_get_google_news_rss", lambda keyword, n: [dict(a) for a in self.feed][:n]),
+            patch.object(gemini_service, "_analyze_article_with_gemini", self.gemini),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _analyze(self, article, trace=None, timeout=None):
+        return None if article["link"] in self.failing else _analysis(article)
+
+    def run_job(self):
+        summary_service.summarize_and_store("u1", "반도체")
+
+    def cursor_doc(self):
+        return self.db.document(f"users/u1/{CURSOR_COLLECTION}/{cursor_id('반도체')}").get().to_dict()
+
+    def retries(self):
+        return RetryQueue.from_dict(self.cursor_doc())
+
+    def make_due(self):
+        doc = self.cursor_doc()
+        for item in doc[RETRY_FIELD].values():
+            if item["next_attempt_at"]:
+                item["next_attempt_at"] = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+        self.db.document(f"users/u1/{CURSOR_COLLECTION}/{cursor_id('반도체')}").set(doc)
+
+    def saved_links(self):
+        return {doc.to_dict()["url"] for doc in self.db.collection("users/u1/summaries").stream()}
+
+
+class TestWorkerRetry(_WorkerCase):
+
+    def test_failed_article_queued_then_drained(self):
+        failed = self.feed[1]["link"]
+        self.failing = {failed}
+        self.run_job()
+
+        self.assertEqual(self.saved_links(), {self.feed[0]["link"], self.feed[2]["link"]})
+        # 실패를 큐가 맡으므로 커서의 pubDate 는 전진한다
+        self.assertIsNotNone(self.cursor_doc()["latest_pub_date"])
+        self.assertEqual([a["link"] for a in self.retries().due(5)], [])
+        self.assertEqual(self.retries().pending, 1)
+
+        # 시도 시각 전: 새 기사도 재시도도 없다
+        self.failing = set()
+        self.gemini.reset_mock()
+        self.run_job()
+        self.gemini.assert_not_called()
+
+        # 시도 시각 후: 같은 피드에서 실패한 기사만 다시 분석한다
+        self.make_due()
+        self.run_job()
+        self.assertEqual([call.args[0]["link"] for call in self.gemini.call_args_list], [failed])
+        self.assertIn(failed, self.saved_links())
+        self.assertEqual(self.retries().items, {})
+
+    def test_retries_use_spare_budget_only(self):
+        failed = self.feed[0]["link"]
+        self.failing = {failed}
+        self.run_job()
+        self.make_due()
+
+        # 새 기사 5건(max_results)이 자리를 다 채우면 재시도는 다음 실행으로 미룬다
+        self.feed = [_article(n) for n in range(3, 8)]
+        self.gemini.reset_mock()
+        self.run_job()
+        self.assertEqual(self.gemini.call_count, 5)
+        self.assertNotIn(failed, [call.args[0]["link"] for call in self.gemini.call_args_list])
+        self.assertEqual(self.retries().pending, 1)
+
+        # 새 기사가 없는 실행이 남은 자리로 처리한다
+        self.gemini.reset_mock()
+        self.run_job()
+        self.assertEqual([call.args[0]["link"] for call in self.gemini.call_args_list], [failed])
+
+    def test_dead_after_max_attempts(self):
+        failed = self.feed[1]["link"]
+        self.failing = {failed}
+        self.run_job()
+        for _ in range(MAX_ATTEMPTS - 1):
+            self.make_due()
+            self.run_job()
+        self.assertEqual(self.retries().pending, 0)
+        self.assertEqual([item["article"]["link"] for item in self.retries().dead], [failed])
+
+        self.gemini.reset_mock()
+        self.make_due()
+        self.run_job()
+        self.gemini.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
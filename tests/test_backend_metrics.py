@@ -0,0 +1,144 @@
+"""
+Test: backend request metrics (`app.metrics`).
+
+Covers:
+
+    1. Histogram / Counter text exposition (cumulative `le` buckets)
+    2. Middleware records latency + status per route *template*
+    3. Firestore RPCs issued inside a request are counted per request
+    4. `timed` keeps the wrapped dependency's signature for FastAPI
+    5. `/metrics` serves the Prometheus text format, only to the bearer
+       `METRICS_TOKEN` when one is set
+
+Style follows existing tests under `tests/` (unittest). A throwaway FastAPI
+app is used so firebase/firestore are not needed.
+"""
+
+import inspect
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "backend")
+sys.path.insert(0, os.path.abspath(BACKEND_DIR))
+
+from fastapi import FastAPI, Header  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import metrics  # noqa: E402
+
+
+class TestExposition(unittest.TestCase):
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = metrics.Histogram("t_seconds", "test", ("route",), buckets=(0.1, 1.0))
+        hist.observe(0.05, "/a")
+        hist.observe(0.5, "/a")
+        hist.observe(5.0, "/a")
+        text = hist.render()
+        self.assertIn('t_seconds_bucket{route="/a",le="0.1"} 1', text)
+        self.assertIn('t_seconds_bucket{route="/a",le="1"} 2', text)
+        self.assertIn('t_seconds_bucket{route="/a",le="+Inf"} 3', text)
+        self.assertIn('t_seconds_count{route="/a"} 3', text)
+
+    def test_counter_render(self):
+        counter = metrics.Counter("t_total", "test", ("status",))
+        counter.inc("200")
+        counter.inc("200")
+        self.assertIn('t_total{status="200"} 2', counter.render())
+        self.assertIn("# TYPE t_total counter", counter.render())
+
+
+class _FakeApi:
+    def run_query(self):
+        return []
+
+    def commit(self):
+        return None
+
+
+class TestMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.client_stub = SimpleNamespace(_firestore_api=_FakeApi())
+        metrics.instrument_firestore(self.client_stub)
+        api = self.client_stub._firestore_api
+
+        app = FastAPI()
+        metrics.install(app)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: str):
+            api.run_query()
+            api.run_query()
+            api.commit()
+            return {"id": item_id}
+
+        @app.get("/boom")
+        def boom():
+            raise ValueError("boom")
+
+        self.client = TestClient(app, raise_server_exceptions=False)
+
+    def test_latency_and_status_by_route_template(self):
+        before = metrics.REQUEST_COUNT.value("GET", "/items/{item_id}", "200")
+        self.client.get("/items/1")
+        self.client.get("/items/2")
+        self.assertEqual(
+            metrics.REQUEST_COUNT.value("GET", "/items/{item_id}", "200") - before, 2
+        )
+        self.assertGreaterEqual(metrics.REQUEST_LATENCY.count("GET", "/items/{item_id}"), 2)
+
+    def test_unhandled_error_counted_as_500(self):
+        before = metrics.REQUEST_COUNT.value("GET", "/boom", "500")
+        self.client.get("/boom")
+        self.assertEqual(metrics.REQUEST_COUNT.value("GET", "/boom", "500") - before, 1)
+
+    def test_firestore_calls_counted_per_request(self):
+        self.client.get("/items/1")
+        series = metrics.FIRESTORE_CALLS._series[("GET", "/items/{item_id}")]
+        # 3 RPCs -> lands in the le=5 bucket but not le=2.
+        buckets = dict(zip(metrics.FIRESTORE_CALLS.buckets, series["counts"]))
+        self.assertEqual(buckets[5] - buckets[2], series["count"])
+
+    def test_instrument_is_idempotent(self):
+        wrapped = self.client_stub._firestore_api.run_query
+        metrics.instrument_firestore(self.client_stub)
+        self.assertIs(self.client_stub._firestore_api.run_query, wrapped)
+
+    def test_metrics_endpoint(self):
+        self.client.get("/items/1")
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.headers["content-type"].startswith("text/plain"))
+        self.assertIn("http_request_duration_seconds_bucket", res.text)
+        self.assertIn("firestore_calls_per_request_count", res.text)
+
+    def test_metrics_endpoint_requires_token(self):
+        with patch.object(metrics, "METRICS_TOKEN", "scrape-secret"):
+            self.assertEqual(self.client.get("/metrics").status_code, 401)
+            res = self.client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+            self.assertEqual(res.status_code, 401)
+            res = self.client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+            self.assertEqual(res.status_code, 200)
+            self.assertIn("http_requests_total", res.text)
+
+
+class TestTimed(unittest.TestCase):
+
+    def test_signature_preserved_and_time_observed(self):
+        hist = metrics.Histogram("t_verify_seconds", "test")
+
+        def verify(authorization: str = Header(...)) -> str:
+            return "uid"
+
+        wrapped = metrics.timed(hist, verify)
+        self.assertEqual(inspect.signature(wrapped), inspect.signature(verify))
+        self.assertEqual(wrapped(authorization="Bearer x"), "uid")
+        self.assertEqual(hist.count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
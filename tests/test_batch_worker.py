@@ -0,0 +1,230 @@
+"""
+Test: pull-subscription batch worker (`news_summarizer/batch_worker.py`,
+`services.job_queue`, T-20261019-021).
+
+Covers:
+
+    1. parse_job rejects malformed payloads; InMemoryQueue redelivers nacked messages
+    2. run_batch groups by keyword: one RSS fetch + one analysis per article per
+       keyword, every user still gets their own summaries; duplicates and
+       invalid messages are acked; user documents are ensured in one commit
+    3. messages are acked only after that user's writes; a failing job is
+       nacked and redelivered while the rest are acked
+    4. ack deadlines: every pulled message is extended right after pull and
+       unsettled messages (groups still queued) are renewed periodically
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.support import load
+from benchmarks import fakes
+from benchmarks.fakes import InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+from services.job_queue import InMemoryQueue, Job, encode_job, parse_job
+
+batch_worker = load("news_batch_worker", "news_summarizer", "batch_worker.py")
+
+TOPICS = ["수출 증가", "금리 동결", "배터리 투자"]
+
+
+def _feed(keyword, max_results):
+    return [
+        {
+            "title": f"{keyword} {topic} 소식 - 매체{n}",
+            "link": f"https://news.example.com/{keyword}/{n}",
+            "pub_date": f"Mon, 19 Oct 2026 0{n}:00:00 GMT",
+            "source": f"매체{n}",
+        }
+        for n, topic in enumerate(TOPICS)
+    ][:max_results]
+
+
+def _analyze(article, trace=None, timeout=None):
+    return {
+        "title": article["title"],
+        "url": article["link"],
+        "summary": f"{article['title']} 요약",
+        "published_at": "2026-10-19 09:00",
+        "source_name": article["source"],
+    }
+
+
+class _WorkerCase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        self.rss = MagicMock(side_effect=_feed)
+        self.gemini = MagicMock(side_effect=_analyze)
+        for p in (
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", fakes.FIRESTORE),
+            patch.object(gemini_service, "api_key", "test"),
+            patch.object(gemini_service, "_get_google_news_rss", self.rss),
+            patch.object(gemini_service, "_analyze_article_with_gemini", self.gemini),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+        self.queue = InMemoryQueue()
+
+    def publish(self, user_id, keyword):
+        self.queue.publish(encode_job(user_id, keyword))
+
+    def summaries(self, user_id):
+        return self.db.count_documents(f"users/{user_id}/summaries")
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def test_parse_job(self):
+        self.assertEqual(parse_job(encode_job("u1", "반도체")), Job("u1", "반도체", None))
+        self.assertEqual(parse_job(encode_job("u1", "반도체", "20261019T0900")).slot, "20261019T0900")
+        for data in (b'{"user_id": "u1"}', b"{}", b"not json", b""):
+            with self.assertRaises(ValueError):
+                parse_job(data)
+
+    def test_nack_redelivers(self):
+        queue = InMemoryQueue()
+        for n in range(3):
+            queue.publish(encode_job(f"u{n}", "k"))
+        first = queue.pull(2)
+        queue.ack([first[0].ack_id])
+        queue.nack([first[1].ack_id])
+        self.assertEqual([parse_job(m.data)[0] for m in queue.pull(10)], ["u1", "u2"])
+        self.assertEqual(len(queue.acked), 1)
+
+
+class TestRunBatch(_WorkerCase):
+
+    def test_groups_by_keyword(self):
+        for user_id in ("u1", "u2", "u3"):
+            self.publish(user_id, "반도체")
+            self.publish(user_id, "환율")
+        self.publish("u1", "반도체")  # 중복
+        self.queue.publish('{"keyword": "반도체"}'.encode())  # 잘못된 메시지
+
+        stats = batch_worker.run_batch(self.queue, max_messages=100, concurrency=2)
+
+        self.assertEqual(stats, {"pulled": 8, "jobs": 6, "keywords": 2, "acked": 7, "nacked": 0, "skipped": 0, "deferred": 0, "invalid": 1})
+        self.assertEqual(self.rss.call_count, 2)
+        self.assertEqual(self.gemini.call_count, 2 * len(TOPICS))
+        for user_id in ("u1", "u2", "u3"):
+            self.assertEqual(self.summaries(user_id), 2 * len(TOPICS))
+        self.assertEqual(len(self.queue), 0)
+        self.assertEqual(self.queue.outstanding, 0)
+        self.assertEqual(len(self.queue.acked), 8)
+
+    def test_user_docs_in_one_commit(self):
+        for user_id in ("u1", "u2", "u3"):
+            self.publish(user_id, "반도체")
+        with patch.object(summary_service, "summarize_and_store") as summarize:
+            batch_worker.run_batch(self.queue)
+        self.assertEqual(dict(self.db.calls), {"commit": 1})
+        self.assertTrue(all(self.db.document(f"users/{u}").get().exists for u in ("u1", "u2", "u3")))
+        self.assertFalse(any(call.kwargs["ensure_user"] for call in summarize.call_args_list))
+
+    def test_ack_after_writes_and_nack_on_failure(self):
+        for user_id in ("u1", "u2", "u3"):
+            self.publish(user_id, "반도체")
+        real = summary_service.summarize_and_store
+
+        def flaky(user_id, keyword, **kwargs):
+            if user_id == "u2":
+                raise RuntimeError("Firestore unavailable")
+            real(user_id, keyword, **kwargs)
+
+        users_by_ack = {}
+        pulled, ack = self.queue.pull, self.queue.ack
+
+        def pull(n):
+            messages = pulled(n)
+            users_by_ack.update({m.ack_id: parse_job(m.data)[0] for m in messages})
+            return messages
+
+        def checked_ack(ack_ids):
+            for ack_id in ack_ids:  # ack 시점에 그 사용자의 요약이 이미 저장돼 있어야 한다
+                self.assertEqual(self.summaries(users_by_ack[ack_id]), len(TOPICS))
+            ack(ack_ids)
+
+        with patch.object(summary_service, "summarize_and_store", flaky), \
+                patch.object(self.queue, "ack", checked_ack), patch.object(self.queue, "pull", pull):
+            stats = batch_worker.run_batch(self.queue)
+
+        self.assertEqual((stats["acked"], stats["nacked"]), (2, 1))
+        self.assertEqual(self.summaries("u1"), len(TOPICS))
+        self.assertEqual(self.summaries("u2"), 0)
+        self.assertEqual([parse_job(m.data)[0] for m in self.queue.pull(10)], ["u2"])
+
+    def test_serve_once_drains_queue(self):
+        for n in range(25):
+            self.publish(f"u{n}", TOPICS[n % 3])
+        totals = batch_worker.serve(self.queue, max_messages=10, concurrency=3, once=True)
+        self.assertEqual((totals["pulled"], totals["acked"]), (25, 25))
+        self.assertEqual(self.rss.call_count, 9)  # pull 3회 × 키워드 3개
+
+
+class TestAckDeadlines(_WorkerCase):
+
+    def setUp(self):
+        super().setUp()
+        self.events = []
+        self.lock = threading.Lock()
+        extend, ack = self.queue.extend, self.queue.ack
+
+        def recording_extend(ack_ids, seconds):
+            with self.lock:
+                self.events.append(("extend", set(ack_ids)))
+            extend(ack_ids, seconds)
+
+        def recording_ack(ack_ids):
+            with self.lock:
+                self.events.append(("ack", set(ack_ids)))
+            ack(ack_ids)
+
+        for p in (
+            patch.object(self.queue, "extend", recording_extend),
+            patch.object(self.queue, "ack", recording_ack),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_all_extended_right_after_pull(self):
+        for keyword in TOPICS:
+            self.publish("u1", keyword)
+        pulled = []
+        pull = self.queue.pull
+        with patch.object(self.queue, "pull", lambda n: pulled.extend(pull(n)) or pulled):
+            batch_worker.run_batch(self.queue, concurrency=1)
+        self.assertEqual(self.events[0], ("extend", {m.ack_id for m in pulled}))
+
+    def test_queued_groups_renewed_until_settled(self):
+        for keyword in TOPICS:
+            self.publish("u1", keyword)
+        real = summary_service.summarize_and_store
+
+        def slow(user_id, keyword, **kwargs):
+            time.sleep(0.05)
+            real(user_id, keyword, **kwargs)
+
+        with patch.object(summary_service, "summarize_and_store", slow), \
+                patch.object(batch_worker, "ACK_RENEW_SECONDS", 0.01):
+            stats = batch_worker.run_batch(self.queue, concurrency=1)
+
+        self.assertEqual(stats["acked"], len(TOPICS))
+        settled, renewals = set(), []
+        for kind, ack_ids in self.events[1:]:
+            if kind == "ack":
+                settled |= ack_ids
+            elif len(ack_ids) > 1:  # 묶음 시작 연장(메시지 1개)이 아닌 주기 연장
+                renewals.append(ack_ids)
+                self.assertFalse(ack_ids & settled)  # 끝난 메시지는 연장하지 않는다
+        # 마지막 묶음의 메시지는 차례를 기다리는 동안 다시 연장됐다
+        last = [ack_ids for kind, ack_ids in self.events if kind == "ack"][-1]
+        self.assertTrue(any(last <= ack_ids for ack_ids in renewals))
+
+
+if __name__ == "__main__":
+    unittest.main()
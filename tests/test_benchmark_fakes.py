@@ -0,0 +1,108 @@
+"""
+Test: offline benchmark fakes (`benchmarks.fakes`).
+
+The fakes back the benchmark suites, so their Firestore semantics must match
+what the production code relies on:
+
+    1. where / order_by / offset / limit chain like Firestore queries
+    2. offset-skipped documents are still billed as reads
+    3. batch writes apply only on commit (one RPC)
+    4. RssServer feeds parse with the worker's `_get_google_news_rss`
+    5. FakeGemini injects errors at the configured rate
+
+Style follows the existing tests under `tests/` (unittest).
+"""
+
+import json
+import os
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+NEWS_DIR = os.path.join(ROOT, "news_summarizer")
+if NEWS_DIR not in sys.path:
+    sys.path.insert(0, NEWS_DIR)
+
+from benchmarks.fakes import FakeGemini, InMemoryFirestore, RssServer  # noqa: E402
+import services.gemini_service as gemini_service  # noqa: E402
+
+
+class TestInMemoryFirestore(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        coll = self.db.collection("users").document("u1").collection("summaries")
+        for i in range(10):
+            coll.add({"url": f"u{i}", "created_at": f"2026-10-{i + 10:02d}", "keyword": "a" if i % 2 else "b"})
+        self.coll = coll
+        self.db.reset_calls()
+
+    def test_query_chain(self):
+        docs = list(
+            self.coll.where("keyword", "==", "a")
+            .order_by("created_at", direction="DESCENDING")
+            .offset(1)
+            .limit(2)
+            .stream()
+        )
+        self.assertEqual([d.to_dict()["url"] for d in docs], ["u7", "u5"])
+        self.assertEqual(self.db.calls["stream"], 1)
+
+    def test_offset_billed_as_reads(self):
+        list(self.coll.order_by("created_at").offset(6).limit(2).stream())
+        self.assertEqual(self.db.reads, 8)
+
+    def test_batch_applies_on_commit(self):
+        batch = self.db.batch()
+        for doc in self.coll.where("keyword", "==", "a").stream():
+            batch.delete(doc.reference)
+        self.assertEqual(self.db.count_documents(self.coll._path), 10)
+        batch.commit()
+        self.assertEqual(self.db.count_documents(self.coll._path), 5)
+        self.assertEqual(self.db.calls["commit"], 1)
+
+    def test_merge_set(self):
+        ref = self.db.collection("users").document("u1")
+        ref.set({"a": 1})
+        ref.set({"b": 2}, merge=True)
+        self.assertEqual(ref.get().to_dict(), {"a": 1, "b": 2})
+
+
+class TestRssServer(unittest.TestCase):
+
+    def test_feed_parses_with_worker_parser(self):
+        with RssServer(items=7, new_per_fetch=2) as rss:
+            original = gemini_service.GOOGLE_NEWS_RSS_URL
+            gemini_service.GOOGLE_NEWS_RSS_URL = rss.url
+            try:
+                first = gemini_service._get_google_news_rss("인공지능 반도체", 5)
+                second = gemini_service._get_google_news_rss("인공지능 반도체", 5)
+            finally:
+                gemini_service.GOOGLE_NEWS_RSS_URL = original
+        self.assertEqual(len(first), 5)
+        self.assertIn("인공지능 반도체", first[0]["title"])
+        # 재요청 시 새 기사 2건이 맨 앞에 붙는다.
+        self.assertEqual(second[2]["link"], first[0]["link"])
+
+
+class TestFakeGemini(unittest.TestCase):
+
+    def test_error_rate(self):
+        gemini = FakeGemini(error_rate=1.0)
+        with self.assertRaises(RuntimeError):
+            gemini.GenerativeModel("m").generate_content("Title: x")
+        self.assertEqual(gemini.errors, 1)
+
+    def test_response_shape(self):
+        response = FakeGemini().GenerativeModel("m").generate_content(
+            "link: https://a.example/1\nTitle: 제목\nSource: S"
+        )
+        self.assertEqual(set(json.loads(response.text)), {"summary", "published_at"})
+        self.assertIn("제목", json.loads(response.text)["summary"])
+        self.assertGreater(response.usage_metadata.total_token_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,375 @@
+"""
+Test: per-upstream circuit breaker (`services.circuit_breaker`, T-20261019-025).
+
+Covers:
+
+    1. CircuitBreaker: opens after FAILURE_THRESHOLD consecutive failures,
+       fast-fails while open, one half-open probe after OPEN_SECONDS, probe
+       success closes / probe failure re-opens with a doubled wait; 5xx/429,
+       unavailable, connection errors and missed deadlines count as failures,
+       other statuses as successes, other exceptions and a losing hedge attempt
+       are not counted
+    2. fetch_grounded_news: an open circuit raises before RSS; Gemini opening
+       mid-job stops analysis and holds the cursor instead of queueing retries;
+       calls that miss their deadline open it, safety-blocked responses do not
+    3. `_get_google_news_rss` and the legacy `google_news` helpers fast-fail
+       without HTTP requests while open; RSS timeouts open the Google News circuit
+    4. batch worker: an open circuit defers the keyword group (no ledger claim, no
+       RSS) and the messages come back after retry_after; opening mid-group defers
+       the remaining users and releases their leases
+    5. push entry: the job is released and raised for redelivery
+"""
+
+import base64
+import time
+import unittest
+from types import SimpleNamespace
+
+import requests
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from tests.support import load
+from benchmarks import fakes
+from benchmarks.fakes import InMemoryFirestore
+import services.circuit_breaker as circuit_breaker
+import services.gemini_service as gemini_service
+import services.google_news as google_news
+import services.summary_service as summary_service
+from services.analysis_retry import RetryQueue
+from services.circuit_breaker import (
+    CLOSED,
+    FAILURE_THRESHOLD,
+    GEMINI,
+    GOOGLE_NEWS,
+    HALF_OPEN,
+    OPEN,
+    OPEN_SECONDS,
+    CircuitBreaker,
+    CircuitOpenError,
+    check_status,
+    circuit,
+    is_outage,
+)
+from services.deadlines import HEDGE_MIN_SAMPLES, Hedger
+from services.feed_cursor import FeedCursor
+from services.instrumentation import JobTrace
+from services.job_ledger import LEDGER_COLLECTION, JobLedger, job_key
+from services.job_queue import InMemoryQueue, Job, encode_job
+
+
+news_main = load("news_main_circuit", "news_summarizer", "main.py")
+batch_worker = load("batch_worker_circuit", "news_summarizer", "batch_worker.py")
+
+SLOT = "20261019T0900"
+TOPICS = ["수출 증가", "금리 동결", "배터리 투자"]
+
+
+def _feed(keyword, max_results):
+    return [
+        {
+            "title": f"{keyword} {topic} 소식 - 매체{n}",
+            "link": f"https://news.example.com/{keyword}/{n}",
+            "pub_date": f"Mon, 19 Oct 2026 0{n}:00:00 GMT",
+            "source": f"매체{n}",
+        }
+        for n, topic in enumerate(TOPICS)
+    ][:max_results]
+
+
+def _analysis(article, trace=None, timeout=None):
+    return {
+        "title": article["title"],
+        "url": article["link"],
+        "summary": f"{article['title']} 요약",
+        "published_at": "2026-10-19 09:00",
+        "source_name": article["source"],
+    }
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _trip(name=GEMINI):
+    breaker = circuit(name)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    return breaker
+
+
+class _CircuitCase(unittest.TestCase):
+
+    def setUp(self):
+        p = patch.dict(circuit_breaker._breakers, clear=True)
+        p.start()
+        self.addCleanup(p.stop)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_open_half_open_closed(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(GEMINI, clock=clock)
+        for _ in range(FAILURE_THRESHOLD - 1):
+            breaker.record_failure()
+        breaker.record_success()  # 연속 실패만 센다
+        for _ in range(FAILURE_THRESHOLD):
+            breaker.check()
+            breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError) as raised:
+            breaker.check()
+        self.assertEqual(raised.exception.retry_after, OPEN_SECONDS)
+
+        # open 시간이 지나면 probe 하나만 보낸다
+        clock.now = OPEN_SECONDS
+        self.assertFalse(breaker.rejects())
+        breaker.check()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.rejects())
+        with self.assertRaises(CircuitOpenError):
+            breaker.check()
+
+        # probe 실패 → 두 배 대기
+        breaker.record_failure()
+        self.assertEqual((breaker.state, breaker.open_seconds), (OPEN, OPEN_SECONDS * 2))
+        clock.now += OPEN_SECONDS
+        self.assertTrue(breaker.rejects())
+        clock.now += OPEN_SECONDS
+        breaker.check()
+        breaker.record_success()
+        self.assertEqual((breaker.state, breaker.open_seconds, breaker.failures), (CLOSED, OPEN_SECONDS, 0))
+
+    def test_guard_and_status(self):
+        breaker = CircuitBreaker(GOOGLE_NEWS, failure_threshold=2)
+        with breaker.guard():
+            check_status(404)
+        for status in (503, 429):
+            with self.assertRaises(circuit_breaker.UpstreamError), breaker.guard():
+                check_status(status)
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError), breaker.guard():
+            self.fail("blocked call must not run")
+
+    def test_only_outages_counted(self):
+        deadline = RuntimeError("504 Deadline Exceeded")
+        deadline.code = 504
+        for error in (
+            fakes.ServiceUnavailable("503"),
+            circuit_breaker.UpstreamError("HTTP 502"),
+            requests.ConnectionError("refused"),
+            ConnectionResetError("reset"),
+            deadline,
+            TimeoutError("deadline"),
+            requests.ReadTimeout("slow"),
+            requests.ConnectTimeout("slow"),
+        ):
+            self.assertTrue(is_outage(error), error)
+        bad_request = RuntimeError("400 Bad Request")
+        bad_request.code = 400
+        for error in (bad_request, ValueError("blocked"), KeyError("summary")):
+            self.assertFalse(is_outage(error), error)
+
+        breaker = CircuitBreaker(GEMINI, failure_threshold=2)
+        for _ in range(3):
+            with self.assertRaises(ValueError), breaker.guard():
+                raise ValueError("blocked")
+        self.assertEqual((breaker.state, breaker.failures), (CLOSED, 0))
+
+    def test_losing_hedge_attempt_not_counted(self):
+        hedger = Hedger(max_ratio=1.0)
+        for _ in range(HEDGE_MIN_SAMPLES):
+            hedger.latencies.add(0.01)
+        calls = []
+
+        def call():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.2)  # straggler: misses its deadline after the hedge has answered
+                raise TimeoutError("deadline")
+            return "hedge"
+
+        breaker = CircuitBreaker(GEMINI, failure_threshold=1)
+        with breaker.guard():
+            self.assertEqual(hedger.call(call, timeout=2, hedge=True), "hedge")
+        time.sleep(0.3)
+        self.assertEqual((breaker.state, breaker.failures), (CLOSED, 0))
+
+
+class TestFetch(_CircuitCase):
+
+    def setUp(self):
+        super().setUp()
+        self.rss = MagicMock(side_effect=_feed)
+        for p in (
+            patch.object(gemini_service, "api_key", "test"),
+            patch.object(gemini_service, "_get_google_news_rss", self.rss),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_open_circuit_raises_before_rss(self):
+        _trip(GEMINI)
+        with self.assertRaises(CircuitOpenError):
+            gemini_service.fetch_grounded_news("반도체", cursor=FeedCursor())
+        self.rss.assert_not_called()
+
+    def test_opens_mid_job(self):
+        circuit_breaker._breakers[GEMINI] = CircuitBreaker(GEMINI, failure_threshold=2)
+        model = MagicMock()
+        model.generate_content.side_effect = fakes.ServiceUnavailable("503 Service Unavailable")
+        retries, cursor, trace = RetryQueue(), FeedCursor(), JobTrace("반도체")
+        with patch.object(gemini_service, "_analysis_model", return_value=model):
+            news = gemini_service.fetch_grounded_news("반도체", trace=trace, cursor=cursor, retries=retries)
+
+        self.assertEqual(news, [])
+        self.assertEqual(model.generate_content.call_count, 2)
+        self.assertEqual(retries.pending, 2)
+        self.assertEqual((trace.counters["circuit_open"], trace.counters["circuit_deferred"]), (1, 1))
+        cursor.commit()
+        self.assertIsNone(cursor.latest_pub_date)  # 남은 기사는 다음 실행이 다시 본다
+
+    def test_blocked_responses_keep_circuit_closed(self):
+        circuit_breaker._breakers[GEMINI] = CircuitBreaker(GEMINI, failure_threshold=2)
+        blocked = MagicMock()
+        type(blocked).text = PropertyMock(side_effect=ValueError("response blocked"))  # 안전 필터 차단
+        model = MagicMock()
+        model.generate_content.return_value = blocked
+        trace = JobTrace("반도체")
+        with patch.object(gemini_service, "_analysis_model", return_value=model):
+            news = gemini_service.fetch_grounded_news("반도체", trace=trace, retries=RetryQueue())
+
+        self.assertEqual(news, [])
+        self.assertEqual(model.generate_content.call_count, 3)
+        self.assertEqual(circuit(GEMINI).state, CLOSED)
+        self.assertNotIn("circuit_open", trace.counters)
+
+    def test_missed_deadlines_open_circuit(self):
+        circuit_breaker._breakers[GEMINI] = CircuitBreaker(GEMINI, failure_threshold=2)
+        model = MagicMock()
+        model.generate_content.side_effect = TimeoutError("deadline")  # 멈춘 업스트림
+        trace = JobTrace("반도체")
+        with patch.object(gemini_service, "_analysis_model", return_value=model):
+            news = gemini_service.fetch_grounded_news("반도체", trace=trace, retries=RetryQueue())
+
+        self.assertEqual(news, [])
+        self.assertEqual(model.generate_content.call_count, 2)
+        self.assertEqual(circuit(GEMINI).state, OPEN)
+        self.assertEqual(trace.counters["circuit_open"], 1)
+
+
+class TestFastFail(_CircuitCase):
+
+    def test_rss_fast_fails(self):
+        down = MagicMock(return_value=MagicMock(status_code=503))
+        with patch.object(gemini_service.requests, "get", down):
+            for _ in range(FAILURE_THRESHOLD):
+                self.assertEqual(gemini_service._get_google_news_rss("반도체", 5), [])
+            with self.assertRaises(CircuitOpenError):
+                gemini_service._get_google_news_rss("반도체", 5)
+        self.assertEqual(down.call_count, FAILURE_THRESHOLD)
+
+    def test_rss_timeouts_open_circuit(self):
+        hanging = MagicMock(side_effect=requests.ReadTimeout("read timed out"))
+        with patch.object(gemini_service.requests, "get", hanging):
+            for _ in range(FAILURE_THRESHOLD):
+                self.assertEqual(gemini_service._get_google_news_rss("반도체", 5), [])
+            with self.assertRaises(CircuitOpenError):
+                gemini_service._get_google_news_rss("반도체", 5)
+        self.assertEqual(hanging.call_count, FAILURE_THRESHOLD)
+
+    def test_legacy_helpers_fast_fail(self):
+        _trip(GEMINI)
+        _trip(GOOGLE_NEWS)
+        with patch.object(google_news.requests, "post") as post, patch.object(google_news.requests, "get") as get:
+            self.assertEqual(google_news.summarize_with_gemini("제목", "https://news.example.com/0"), "요약 생성에 실패했습니다.")
+            with self.assertRaises(CircuitOpenError):
+                google_news.get_google_news("반도체")
+            self.assertEqual(google_news.run_news_summary("반도체")["구글"][0][0], "수집 실패")
+        post.assert_not_called()
+        get.assert_not_called()
+
+
+class _WorkerCase(_CircuitCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db = InMemoryFirestore()
+        self.rss = MagicMock(side_effect=_feed)
+        self.gemini = MagicMock(side_effect=_analysis)
+        self.ledger = JobLedger(self.db, fakes.FIRESTORE)
+        for p in (
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", fakes.FIRESTORE),
+            patch.object(gemini_service, "api_key", "test"),
+            patch.object(gemini_service, "_get_google_news_rss", self.rss),
+            patch.object(gemini_service, "_analyze_article_with_gemini", self.gemini),
+            patch.object(news_main, "ledger", self.ledger),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def entry(self, job):
+        return self.db.document(f"{LEDGER_COLLECTION}/{job_key(job)}").get().to_dict()
+
+
+class TestBatchWorkerDefer(_WorkerCase):
+
+    def test_open_circuit_defers_group(self):
+        clock = _Clock()
+        queue = InMemoryQueue(clock=clock)
+        for user_id in ("u1", "u2"):
+            queue.publish(encode_job(user_id, "반도체", SLOT))
+        breaker = circuit_breaker._breakers[GOOGLE_NEWS] = CircuitBreaker(GOOGLE_NEWS, clock=clock)
+        _trip(GOOGLE_NEWS)
+
+        stats = batch_worker.run_batch(queue, ledger=self.ledger)
+
+        self.assertEqual((stats["acked"], stats["nacked"], stats["deferred"]), (0, 0, 2))
+        self.rss.assert_not_called()
+        self.assertIsNone(self.entry(Job("u1", "반도체", SLOT)))
+        self.assertEqual((len(queue), queue.outstanding, queue.deferred), (0, 0, 2))
+        self.assertEqual(queue.pull(10), [])
+
+        # retry_after 가 지나면 다시 배달되고 처리된다(RSS 호출이 half-open probe)
+        clock.now = breaker.retry_after()
+        stats = batch_worker.run_batch(queue, ledger=self.ledger)
+        self.assertEqual((stats["acked"], stats["deferred"]), (2, 0))
+
+    def test_opens_mid_group(self):
+        queue = InMemoryQueue()
+        for user_id in ("u1", "u2", "u3"):
+            queue.publish(encode_job(user_id, "반도체", SLOT))
+
+        def analyze_then_trip(article, trace=None, timeout=None):
+            if not circuit(GEMINI).rejects():
+                _trip(GEMINI)  # 첫 사용자 처리 중 장애 시작
+            return _analysis(article)
+
+        self.gemini.side_effect = analyze_then_trip
+        stats = batch_worker.run_batch(queue, ledger=self.ledger)
+
+        self.assertEqual((stats["acked"], stats["deferred"]), (1, 2))
+        self.assertEqual(self.rss.call_count, 1)
+        self.assertEqual(self.entry(Job("u1", "반도체", SLOT))["state"], "done")
+        self.assertEqual(self.entry(Job("u2", "반도체", SLOT))["state"], "failed")
+        self.assertEqual(queue.deferred, 2)
+
+
+class TestPushEntry(_WorkerCase):
+
+    def test_open_circuit_released_and_raised(self):
+        _trip(GEMINI)
+        job = Job("u1", "반도체", SLOT)
+        with self.assertRaises(CircuitOpenError):
+            news_main.summarize_news({"data": base64.b64encode(encode_job(*job))}, SimpleNamespace(event_id="m1"))
+        self.rss.assert_not_called()
+        self.assertEqual(self.entry(job)["state"], "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Test: dedup against stored URLs *before* Gemini analysis.
+
+`summarize_and_store` passes a bulk `seen_links` lookup to
+`fetch_grounded_news`, so RSS items already stored for the user never reach
+Gemini.
+
+Covers:
+
+    1. first run analyzes and stores every RSS item
+    2. re-run over the same feed makes zero Gemini calls
+    3. only newly published items are analyzed on the next run
+    4. the bulk lookup is one `in` query (chunked at 30 values)
+
+Uses the reusable fakes from `benchmarks/fakes.py` (in-memory Firestore,
+fake Gemini); RSS parsing is patched out.
+"""
+
+import unittest
+from unittest.mock import patch
+
+import tests.support  # noqa: F401
+from benchmarks.fakes import FIRESTORE, FakeGemini, InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+
+
+def _articles(seqs):
+    return [
+        {
+            "title": f"기사 {n}",
+            "link": f"https://news.example.com/{n}",
+            "pub_date": "Mon, 09 Feb 2026 06:17:00 GMT",
+            "source": "테스트일보",
+        }
+        for n in seqs
+    ]
+
+
+class TestDedupBeforeAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        self.gemini = FakeGemini()
+        patchers = [
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", FIRESTORE),
+            patch.object(gemini_service, "genai", self.gemini),
+            patch.object(gemini_service, "api_key", "test_key"),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _run(self, seqs):
+        with patch.object(gemini_service, "_get_google_news_rss", return_value=_articles(seqs)):
+            summary_service.summarize_and_store("user-1", "Gemini")
+
+    def _stored(self):
+        return self.db.count_documents("users/user-1/summaries")
+
+    def test_repeat_feed_makes_no_model_calls(self):
+        self._run([1, 2, 3])
+        self.assertEqual(self.gemini.calls, 3)
+        self.assertEqual(self._stored(), 3)
+
+        self._run([1, 2, 3])
+        self.assertEqual(self.gemini.calls, 3, "already-stored items must not reach Gemini")
+        self.assertEqual(self._stored(), 3)
+
+    def test_only_new_items_analyzed(self):
+        self._run([1, 2, 3])
+        self._run([4, 1, 2])
+        self.assertEqual(self.gemini.calls, 4)
+        self.assertEqual(self._stored(), 4)
+
+    def test_bulk_lookup_is_chunked(self):
+        coll = self.db.collection("users").document("user-1").collection("summaries")
+        for n in range(40):
+            coll.add({"url": f"https://news.example.com/{n}"})
+        self.db.reset_calls()
+        urls = [f"https://news.example.com/{n}" for n in range(35, 75)]
+        stored = summary_service._find_stored_urls(coll, urls)
+        self.assertEqual(stored, {f"https://news.example.com/{n}" for n in range(35, 40)})
+        self.assertEqual(self.db.calls["stream"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Test: display titles precomputed at write time (T-20261019-012).
+
+Covers:
+
+    1. the worker stores `display_title` / `display_title_max_len` with each summary
+    2. `tools/backfill_display_titles.py` fills legacy docs, skips current ones,
+       and is a no-op on a second run
+    3. --dry-run counts without writing
+
+Uses the reusable fakes from `benchmarks/fakes.py`.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from tests.support import load
+from benchmarks.fakes import FIRESTORE, FakeGemini, InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+from services.text_utils import DISPLAY_TITLE_MAX_LEN, truncate_middle
+
+backfill = load("backfill_display_titles", "tools", "backfill_display_titles.py")
+
+LONG_TITLE = "원달러 환율 " + "급등 " * 20 + "- 연합뉴스"
+
+
+class TestWorkerStoresDisplayTitle(unittest.TestCase):
+
+    def test_summary_has_display_title(self):
+        db = InMemoryFirestore()
+        article = {"title": LONG_TITLE, "link": "https://a/1", "pub_date": "", "source": "연합뉴스"}
+        with patch.object(summary_service, "db", db), \
+                patch.object(summary_service, "firestore", FIRESTORE), \
+                patch.object(gemini_service, "genai", FakeGemini()), \
+                patch.object(gemini_service, "api_key", "test_key"), \
+                patch.object(gemini_service, "_get_google_news_rss", return_value=[article]):
+            summary_service.summarize_and_store("user-1", "환율")
+
+        (doc,) = db.collection("users").document("user-1").collection("summaries").stream()
+        data = doc.to_dict()
+        self.assertEqual(data["title"], LONG_TITLE)
+        self.assertEqual(data["display_title"], truncate_middle(LONG_TITLE, DISPLAY_TITLE_MAX_LEN))
+        self.assertEqual(data["display_title_max_len"], DISPLAY_TITLE_MAX_LEN)
+
+
+class TestBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        self.summaries = self.db.collection("users").document("u1").collection("summaries")
+        self.summaries.document("legacy").set({"title": LONG_TITLE})
+        self.summaries.document("current").set(
+            {"title": "짧은 제목", "display_title": "짧은 제목", "display_title_max_len": DISPLAY_TITLE_MAX_LEN}
+        )
+        self.summaries.document("untitled").set({"url": "https://a/2"})
+
+    def test_fills_legacy_docs_once(self):
+        self.assertEqual(backfill.backfill_user(self.db, "u1"), 1)
+        legacy = self.summaries.document("legacy").get().to_dict()
+        self.assertEqual(legacy["display_title"], truncate_middle(LONG_TITLE, DISPLAY_TITLE_MAX_LEN))
+        self.assertEqual(legacy["title"], LONG_TITLE)
+
+        self.assertEqual(backfill.backfill_user(self.db, "u1"), 0)
+
+    def test_dry_run_does_not_write(self):
+        self.db.reset_calls()
+        self.assertEqual(backfill.backfill_user(self.db, "u1", dry_run=True), 1)
+        self.assertEqual(self.db.calls["commit"], 0)
+        self.assertNotIn("display_title", self.summaries.document("legacy").get().to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
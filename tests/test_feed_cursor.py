@@ -0,0 +1,122 @@
+"""
+Test: per-(user, keyword) RSS high-water mark (`services.feed_cursor`).
+
+Covers:
+
+    1. filter_new drops items at/under the cursor and recently seen links
+    2. mark_processed keeps the newest link hashes, bounded
+    3. a failed analysis holds the pubDate mark so the item is retried
+    4. summarize_and_store on an unchanged feed ends after the RSS phase
+       (no dedup query, no Gemini call)
+
+Uses the reusable fakes from `benchmarks/fakes.py` for (4).
+"""
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import tests.support  # noqa: F401
+from benchmarks.fakes import FIRESTORE, FakeGemini, InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+from services.feed_cursor import RECENT_LINKS_LIMIT, FeedCursor, link_hash, parse_pub_date
+
+
+def _article(n, pub_date="Mon, 09 Feb 2026 06:17:00 GMT"):
+    return {
+        "title": f"기사 {n}",
+        "link": f"https://news.example.com/{n}",
+        "pub_date": pub_date,
+        "source": "테스트일보",
+    }
+
+
+class TestFeedCursor(unittest.TestCase):
+
+    def test_parse_pub_date_to_utc(self):
+        self.assertEqual(
+            parse_pub_date("Mon, 09 Feb 2026 15:17:00 +0900"),
+            datetime(2026, 2, 9, 6, 17, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(parse_pub_date("not a date"))
+        self.assertIsNone(parse_pub_date(None))
+
+    def test_filter_new(self):
+        cursor = FeedCursor(
+            latest_pub_date=datetime(2026, 2, 9, 6, 17, tzinfo=timezone.utc),
+            recent_links=[link_hash("https://news.example.com/1")],
+        )
+        articles = [
+            _article(1),                                        # seen link
+            _article(2),                                        # same instant, new link
+            _article(3, "Mon, 09 Feb 2026 07:00:00 GMT"),       # newer
+            _article(4, "Sun, 08 Feb 2026 23:00:00 GMT"),       # older than mark
+            _article(5, "garbled"),                             # unparseable -> hash only
+        ]
+        self.assertEqual([a["link"][-1] for a in cursor.filter_new(articles)], ["2", "3", "5"])
+
+    def test_empty_cursor_passes_everything(self):
+        self.assertEqual(len(FeedCursor.from_dict(None).filter_new([_article(1), _article(2)])), 2)
+
+    def test_mark_processed_bounded_and_round_trips(self):
+        cursor = FeedCursor()
+        cursor.mark_processed([_article(n) for n in range(RECENT_LINKS_LIMIT + 10)])
+        cursor.commit()
+        self.assertTrue(cursor.dirty)
+        self.assertEqual(len(cursor.recent_links), RECENT_LINKS_LIMIT)
+        self.assertEqual(cursor.recent_links[0], link_hash("https://news.example.com/0"))
+
+        restored = FeedCursor.from_dict(cursor.to_dict("Gemini"))
+        self.assertEqual(restored.latest_pub_date, cursor.latest_pub_date)
+        self.assertEqual(restored.recent_links, cursor.recent_links)
+
+    def test_failed_item_holds_date(self):
+        cursor = FeedCursor(latest_pub_date=datetime(2026, 2, 9, 6, 17, tzinfo=timezone.utc))
+        cursor.mark_processed([_article(2, "Mon, 09 Feb 2026 08:00:00 GMT")])
+        cursor.hold_date()
+        cursor.commit()
+        self.assertEqual(cursor.latest_pub_date, datetime(2026, 2, 9, 6, 17, tzinfo=timezone.utc))
+        # the failed (older) item is still eligible next run
+        self.assertEqual(len(cursor.filter_new([_article(3, "Mon, 09 Feb 2026 07:00:00 GMT")])), 1)
+
+
+class TestCursorShortCircuit(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        self.gemini = FakeGemini()
+        patchers = [
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", FIRESTORE),
+            patch.object(gemini_service, "genai", self.gemini),
+            patch.object(gemini_service, "api_key", "test_key"),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _run(self, articles):
+        with patch.object(gemini_service, "_get_google_news_rss", return_value=articles):
+            summary_service.summarize_and_store("user-1", "Gemini")
+
+    def test_unchanged_feed_skips_dedup_and_gemini(self):
+        self._run([_article(1), _article(2)])
+        self.assertEqual(self.gemini.calls, 2)
+        self.assertEqual(self.db.count_documents("users/user-1/feed_cursors"), 1)
+
+        self.db.reset_calls()
+        self._run([_article(1), _article(2)])
+        self.assertEqual(self.gemini.calls, 2)
+        self.assertEqual(self.db.calls["stream"], 0, "no dedup query when nothing is new")
+        self.assertEqual(self.db.calls["set"], 1, "only ensure_user; cursor unchanged")
+
+    def test_new_item_after_mark_is_processed(self):
+        self._run([_article(1)])
+        self._run([_article(2, "Mon, 09 Feb 2026 09:00:00 GMT"), _article(1)])
+        self.assertEqual(self.gemini.calls, 2)
+        self.assertEqual(self.db.count_documents("users/user-1/summaries"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
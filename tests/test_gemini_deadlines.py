@@ -0,0 +1,236 @@
+"""
+Test: deadline-bounded and hedged Gemini calls (`services.deadlines`,
+T-20261019-024).
+
+Covers:
+
+    1. JobBudget: per-call deadline = remaining budget / calls left, capped;
+       no call once the budget is spent
+    2. Hedger: no hedge without enough latency samples; a hedge after the p95
+       delay returns the first success; hedges capped at HEDGE_MAX_RATIO of calls;
+       deadline errors counted as `gemini_timeout`
+    3. fetch_grounded_news: generate_content receives `request_options.timeout`,
+       a straggler past its deadline goes to the retry queue while the job stays
+       within budget, a spent budget skips analysis
+    4. GEMINI_HEDGE: a straggling call is answered by the hedge request
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+NEWS_DIR = os.path.join(ROOT, "news_summarizer")
+for path in (ROOT, NEWS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from benchmarks.fakes import FakeGemini  # noqa: E402
+import services.circuit_breaker as circuit_breaker  # noqa: E402
+import services.deadlines as deadlines  # noqa: E402
+import services.gemini_service as gemini_service  # noqa: E402
+from services.analysis_retry import RetryQueue  # noqa: E402
+from services.deadlines import (  # noqa: E402
+    CALL_TIMEOUT_MAX,
+    HEDGE_MIN_SAMPLES,
+    Hedger,
+    JobBudget,
+    LatencyWindow,
+)
+from services.instrumentation import JobTrace  # noqa: E402
+
+TOPICS = ["수출 증가", "금리 동결", "배터리 투자"]
+
+
+def _article(n):
+    return {
+        "title": f"반도체 {TOPICS[n]} 소식 - 매체{n}",
+        "link": f"https://news.example.com/{n}",
+        "pub_date": f"Mon, 19 Oct 2026 0{n}:00:00 GMT",
+        "source": f"매체{n}",
+    }
+
+
+def _warm(hedger, seconds=0.01, samples=HEDGE_MIN_SAMPLES):
+    for _ in range(samples):
+        hedger.latencies.add(seconds)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJobBudget(unittest.TestCase):
+
+    def test_call_timeout(self):
+        clock = _Clock()
+        budget = JobBudget(60, clock=clock)
+        self.assertEqual(budget.call_timeout(5), 12)
+        self.assertEqual(budget.call_timeout(1), CALL_TIMEOUT_MAX)
+
+        # 앞 호출이 빨리 끝나면 남은 시간은 뒤 호출이 쓴다
+        clock.now = 20
+        self.assertEqual(budget.call_timeout(2), 20)
+        clock.now = 59
+        self.assertIsNone(budget.call_timeout(1))
+        clock.now = 100
+        self.assertEqual(budget.remaining(), 0)
+
+
+class TestHedger(unittest.TestCase):
+
+    def test_percentile_needs_samples(self):
+        window = LatencyWindow()
+        for n in range(HEDGE_MIN_SAMPLES - 1):
+            window.add(n)
+        self.assertIsNone(window.percentile(0.95))
+        window.add(100)
+        self.assertEqual(window.percentile(0.95), 100)
+        self.assertEqual(window.percentile(0.5), 10)
+
+    def test_hedge_wins_over_straggler(self):
+        hedger = Hedger(max_ratio=1.0)
+        _warm(hedger)
+        calls = []
+        release = threading.Event()
+
+        def call():
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(2)  # straggler
+                return "primary"
+            return "hedge"
+
+        trace = JobTrace("반도체")
+        start = time.perf_counter()
+        self.assertEqual(hedger.call(call, timeout=2, hedge=True, trace=trace), "hedge")
+        self.assertLess(time.perf_counter() - start, 1)
+        release.set()
+        self.assertEqual(trace.counters, {"gemini_hedged": 1, "gemini_hedge_won": 1})
+
+    def test_hedge_rate_capped(self):
+        hedger = Hedger(max_ratio=0.25)
+        _warm(hedger, 0.001, samples=hedger.latencies.size)
+        trace = JobTrace("반도체")
+        for _ in range(8):
+            hedger.call(lambda: time.sleep(0.02) or "ok", timeout=1, hedge=True, trace=trace)
+        self.assertEqual((hedger.calls, hedger.hedges), (8, 2))
+        self.assertEqual(trace.counters["gemini_hedged"], 2)
+
+    def test_no_hedge_when_disabled_or_cold(self):
+        model = MagicMock(return_value="ok")
+        hedger = Hedger(max_ratio=1.0)
+        self.assertEqual(hedger.call(model, timeout=1, hedge=True), "ok")  # 표본 없음
+        _warm(hedger)
+        self.assertEqual(hedger.call(model, timeout=1, hedge=False), "ok")
+        self.assertEqual(hedger.hedges, 0)
+
+    def test_timeout_counted(self):
+        hedger = Hedger()
+        trace = JobTrace("반도체")
+
+        def deadline_exceeded():
+            raise TimeoutError("504")
+
+        with self.assertRaises(TimeoutError):
+            hedger.call(deadline_exceeded, timeout=1, trace=trace)
+        self.assertEqual(trace.counters, {"gemini_timeout": 1})
+
+
+class _GeminiCase(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = [_article(n) for n in range(3)]
+        self.hedger = Hedger(max_ratio=1.0)
+        for p in (
+            patch.object(gemini_service, "api_key", "test"),
+            patch.object(gemini_service, "_instruction_cache", None),
+            patch.object(gemini_service, "_hedger", self.hedger),
+            patch.object(gemini_service, "_get_google_news_rss", lambda keyword, n: [dict(a) for a in self.feed][:n]),
+            patch.object(deadlines, "CALL_TIMEOUT_MIN", 0.01),
+            patch.dict(circuit_breaker._breakers, clear=True),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def use(self, sdk):
+        p = patch.object(gemini_service, "genai", sdk)
+        p.start()
+        self.addCleanup(p.stop)
+        return sdk
+
+
+class TestDeadlines(_GeminiCase):
+
+    def test_request_timeout_from_budget(self):
+        model = MagicMock()
+        model.generate_content.return_value = MagicMock(text='{"summary": "요약", "published_at": null}')
+        with patch.object(gemini_service, "_analysis_model", return_value=model):
+            news = gemini_service.fetch_grounded_news("반도체", budget=JobBudget(60, clock=_Clock()))
+        self.assertEqual(len(news), 3)
+        timeouts = [call.kwargs["request_options"]["timeout"] for call in model.generate_content.call_args_list]
+        self.assertEqual(len(timeouts), 3)
+        # 첫 호출은 예산/3, 뒤 호출은 남은 예산/남은 기사 수(상한 CALL_TIMEOUT_MAX)
+        self.assertEqual(timeouts, [20, CALL_TIMEOUT_MAX, CALL_TIMEOUT_MAX])
+
+    def test_straggler_bounded_and_queued(self):
+        sdk = self.use(FakeGemini(straggler_rate=1.0, straggler_latency=5))
+        retries = RetryQueue()
+        trace = JobTrace("반도체")
+        start = time.perf_counter()
+        news = gemini_service.fetch_grounded_news("반도체", trace=trace, retries=retries, budget=JobBudget(0.3))
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(news, [])
+        self.assertEqual(sdk.timeouts, 3)
+        self.assertEqual(trace.counters["gemini_timeout"], 3)
+        self.assertEqual(retries.pending, 3)
+
+    def test_spent_budget_skips_analysis(self):
+        sdk = self.use(FakeGemini())
+        clock = _Clock()
+        budget = JobBudget(1, clock=clock)
+        clock.now = 1
+        retries = RetryQueue()
+        trace = JobTrace("반도체")
+        self.assertEqual(gemini_service.fetch_grounded_news("반도체", trace=trace, retries=retries, budget=budget), [])
+        self.assertEqual(sdk.calls, 0)
+        self.assertEqual(trace.counters["deadline_skipped"], 3)
+        self.assertEqual({item["last_error"] for item in retries.items.values()}, {"deadline"})
+
+
+class TestHedgedAnalysis(_GeminiCase):
+
+    def test_hedge_answers_straggler(self):
+        sdk = self.use(FakeGemini())
+        _warm(self.hedger)
+        generate = sdk._generate
+        first = []
+
+        def straggle_once(*args, **kwargs):
+            if not first:
+                first.append(1)
+                time.sleep(0.5)
+            return generate(*args, **kwargs)
+
+        sdk._generate = straggle_once
+        trace = JobTrace("반도체")
+        with patch.object(gemini_service, "GEMINI_HEDGE", True):
+            start = time.perf_counter()
+            result = gemini_service._analyze_article_with_gemini(_article(0), trace, timeout=2)
+
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(result["url"], _article(0)["link"])
+        self.assertEqual(first, [1])
+        self.assertEqual(trace.counters["gemini_hedge_won"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
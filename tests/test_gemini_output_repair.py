@@ -0,0 +1,116 @@
+"""
+Test: schema-constrained Gemini output + local repair pass.
+
+Covers:
+
+    1. repair_json fixes code fences, trailing commas, truncated strings/keys
+    2. valid JSON is returned untouched (no repair counted)
+    3. _analyze_article_with_gemini sends `response_schema`
+    4. repaired / unrecoverable / schema-invalid responses are counted on
+       the job trace (`parse_repaired`, `parse_failed`, `gemini_error`)
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+NEWS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "news_summarizer"))
+if NEWS_DIR not in sys.path:
+    sys.path.insert(0, NEWS_DIR)
+
+import services.gemini_service as gemini_service  # noqa: E402
+from models.analysis_model import RESPONSE_SCHEMA  # noqa: E402
+from services.instrumentation import JobTrace  # noqa: E402
+from services.json_repair import loads_with_repair, repair_json  # noqa: E402
+
+ARTICLE = {
+    "title": "Test Article - Test Source",
+    "link": "http://example.com/a",
+    "pub_date": "Mon, 09 Feb 2026 06:17:00 GMT",
+    "source": "Test Source",
+}
+
+
+class TestRepairJson(unittest.TestCase):
+
+    def _repaired(self, text):
+        return json.loads(repair_json(text))
+
+    def test_code_fence_and_trailing_comma(self):
+        self.assertEqual(self._repaired('```json\n{"summary": "요약",}\n```'), {"summary": "요약"})
+
+    def test_prose_around_object(self):
+        self.assertEqual(self._repaired('Here you go: {"summary": "a"} Hope it helps!'), {"summary": "a"})
+
+    def test_truncated_string_value(self):
+        self.assertEqual(self._repaired('{"summary": "잘린 요약'), {"summary": "잘린 요약"})
+
+    def test_truncated_after_key(self):
+        self.assertEqual(
+            self._repaired('{"summary": "a", "published_at":'),
+            {"summary": "a", "published_at": None},
+        )
+        self.assertEqual(self._repaired('{"summary": "a", "publis'), {"summary": "a"})
+
+    def test_escaped_quotes_kept(self):
+        self.assertEqual(self._repaired('{"summary": "그는 \\"좋다\\"고, 말했다'), {"summary": '그는 "좋다"고, 말했다'})
+
+    def test_valid_json_not_repaired(self):
+        self.assertEqual(loads_with_repair('{"summary": "a"}'), ({"summary": "a"}, False))
+
+    def test_unrecoverable(self):
+        with self.assertRaises(ValueError):
+            loads_with_repair("I cannot summarize this article.")
+
+
+@patch("services.gemini_service.genai")
+class TestAnalyzeWithRepair(unittest.TestCase):
+
+    def _analyze(self, mock_genai, text=None, error=None):
+        model = MagicMock()
+        if error:
+            model.generate_content.side_effect = error
+        else:
+            model.generate_content.return_value = MagicMock(text=text)
+        mock_genai.GenerativeModel.return_value = model
+        trace = JobTrace("Gemini")
+        return gemini_service._analyze_article_with_gemini(dict(ARTICLE), trace), trace.counters
+
+    def test_response_schema_configured(self, mock_genai):
+        self._analyze(mock_genai, '{"summary": "a"}')
+        config = mock_genai.GenerativeModel.call_args.kwargs["generation_config"]
+        self.assertEqual(config["response_schema"], RESPONSE_SCHEMA)
+        self.assertEqual(config["response_mime_type"], "application/json")
+
+    def test_clean_response(self, mock_genai):
+        result, counters = self._analyze(mock_genai, '{"summary": "a", "published_at": null}')
+        self.assertEqual(result["summary"], "a")
+        self.assertEqual(counters, {})
+
+    def test_repaired_response_kept(self, mock_genai):
+        result, counters = self._analyze(mock_genai, '```json\n{"summary": "잘린 요약')
+        self.assertEqual(result["summary"], "잘린 요약")
+        self.assertEqual(result["url"], ARTICLE["link"])
+        self.assertEqual(counters, {"parse_repaired": 1})
+
+    def test_unrecoverable_counted(self, mock_genai):
+        result, counters = self._analyze(mock_genai, "Sorry, I can't.")
+        self.assertIsNone(result)
+        self.assertEqual(counters, {"parse_failed": 1})
+
+    def test_schema_invalid_counted(self, mock_genai):
+        for text in ('{"summary": ""}', '{"title": "no summary"}', '["summary"]'):
+            result, counters = self._analyze(mock_genai, text)
+            self.assertIsNone(result, text)
+            self.assertEqual(counters, {"parse_failed": 1})
+
+    def test_model_error_counted(self, mock_genai):
+        result, counters = self._analyze(mock_genai, error=RuntimeError("429"))
+        self.assertIsNone(result)
+        self.assertEqual(counters, {"gemini_error": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Test: slim Gemini prompt — the model generates only the summary.
+
+`_analyze_article_with_gemini` fills title / url / source_name and the KST
+`published_at` from RSS; the model returns `summary` plus an optional
+corrected date.
+
+Covers:
+
+    1. RFC 822 pubDate -> KST 'YYYY-MM-DD HH:MM'
+    2. metadata comes from RSS even if the model echoes something else
+    3. a well-formed corrected date from the model wins, a malformed one is ignored
+    4. the prompt no longer asks the model to echo url/title/source fields
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+NEWS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "news_summarizer"))
+if NEWS_DIR not in sys.path:
+    sys.path.insert(0, NEWS_DIR)
+
+import services.gemini_service as gemini_service  # noqa: E402
+
+ARTICLE = {
+    "title": "Gemini 1.5 Released - Google Blog",
+    "link": "https://news.google.com/rss/articles/CBMiabc?oc=5",
+    "pub_date": "Mon, 09 Feb 2026 06:17:00 GMT",
+    "source": "Google Blog",
+}
+
+
+class TestPubDateToKst(unittest.TestCase):
+
+    def test_gmt_and_offset(self):
+        self.assertEqual(gemini_service.pub_date_to_kst("Mon, 09 Feb 2026 06:17:00 GMT"), "2026-02-09 15:17")
+        self.assertEqual(gemini_service.pub_date_to_kst("Mon, 09 Feb 2026 20:00:00 +0000"), "2026-02-10 05:00")
+        self.assertEqual(gemini_service.pub_date_to_kst("Tue, 10 Feb 2026 05:00:00 +0900"), "2026-02-10 05:00")
+
+    def test_unparseable(self):
+        self.assertIsNone(gemini_service.pub_date_to_kst(""))
+        self.assertIsNone(gemini_service.pub_date_to_kst("yesterday"))
+
+
+@patch("services.gemini_service.genai")
+class TestSlimAnalysis(unittest.TestCase):
+
+    def _analyze(self, mock_genai, generated):
+        # 분석 모델은 재사용되므로(T-20261019-015) 같은 mock 모델에 응답만 바꿔 끼운다.
+        model = mock_genai.GenerativeModel.return_value
+        model.generate_content.return_value = MagicMock(text=json.dumps(generated))
+        result = gemini_service._analyze_article_with_gemini(dict(ARTICLE))
+        return result, model.generate_content.call_args[0][0]
+
+    def test_metadata_from_rss(self, mock_genai):
+        result, _ = self._analyze(mock_genai, {"summary": "요약", "title": "hallucinated", "url": "https://x"})
+        self.assertEqual(result, {
+            "title": ARTICLE["title"],
+            "source_name": "Google Blog",
+            "published_at": "2026-02-09 15:17",
+            "url": ARTICLE["link"],
+            "summary": "요약",
+        })
+
+    def test_corrected_date(self, mock_genai):
+        result, _ = self._analyze(mock_genai, {"summary": "요약", "published_at": "2026-02-08 23:40"})
+        self.assertEqual(result["published_at"], "2026-02-08 23:40")
+
+        result, _ = self._analyze(mock_genai, {"summary": "요약", "published_at": "Feb 8"})
+        self.assertEqual(result["published_at"], "2026-02-09 15:17")
+
+    def test_prompt_is_slim(self, mock_genai):
+        _, prompt = self._analyze(mock_genai, {"summary": "요약"})
+        self.assertIn("2026-02-09 15:17", prompt)
+        self.assertNotIn('"url"', prompt)
+        self.assertNotIn('"source_name"', prompt)
+        self.assertEqual(prompt.count(ARTICLE["link"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
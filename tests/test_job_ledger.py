@@ -0,0 +1,264 @@
+"""
+Test: idempotent job ledger for Pub/Sub redeliveries (`services.job_ledger`,
+T-20261019-022).
+
+Covers:
+
+    1. job_key: same (user, keyword, slot) → same key across messages; message id
+       fallback; no key without either
+    2. claim / complete / release: a live lease or a done job is not claimed again,
+       an expired lease is, a stale release does not clobber the new holder
+    3. push entry (`main.summarize_news`): a redelivered message does not re-run
+       RSS/Gemini; a failed job is released and the redelivery runs it; a job
+       leased by another run is raised (not acked) and runs once the lease ends
+    4. batch worker: a trigger re-run in the same slot and a redelivery after
+       completion are acked without RSS/Gemini calls; a job leased by another
+       run is deferred, not acked; a failed ledger complete still acks the
+       stored job and does not stop the batch
+    5. trigger publishes the schedule slot
+"""
+
+import base64
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import flask
+
+from tests.support import TRIGGER_DIR, add_paths, load
+from benchmarks import fakes
+from benchmarks.fakes import InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+from services.job_ledger import (
+    CLAIMED,
+    COMPLETED,
+    LEASE_SECONDS,
+    LEASED,
+    LEDGER_COLLECTION,
+    JobInProgress,
+    JobLedger,
+    job_key,
+)
+from services.job_queue import InMemoryQueue, Job, encode_job
+
+
+add_paths(TRIGGER_DIR)  # trigger main imports its own `utils`
+news_main = load("news_main_ledger", "news_summarizer", "main.py")
+batch_worker = load("batch_worker_ledger", "news_summarizer", "batch_worker.py")
+trigger = load("trigger_main_ledger", "trigger_function", "main.py")
+
+T0 = datetime(2026, 10, 19, 9, 5, tzinfo=timezone.utc)
+JOB = Job("u1", "반도체", "20261019T0900")
+TOPICS = ["수출 증가", "금리 동결", "배터리 투자"]
+
+
+def _feed(keyword, max_results):
+    return [
+        {
+            "title": f"{keyword} {topic} 소식 - 매체{n}",
+            "link": f"https://news.example.com/{keyword}/{n}",
+            "pub_date": f"Mon, 19 Oct 2026 0{n}:00:00 GMT",
+            "source": f"매체{n}",
+        }
+        for n, topic in enumerate(TOPICS)
+    ][:max_results]
+
+
+def _analyze(article, trace=None, timeout=None):
+    return {
+        "title": article["title"],
+        "url": article["link"],
+        "summary": f"{article['title']} 요약",
+        "published_at": "2026-10-19 09:00",
+        "source_name": article["source"],
+    }
+
+
+class _LedgerCase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        self.rss = MagicMock(side_effect=_feed)
+        self.gemini = MagicMock(side_effect=_analyze)
+        self.ledger = JobLedger(self.db, fakes.FIRESTORE)
+        for p in (
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", fakes.FIRESTORE),
+            patch.object(gemini_service, "api_key", "test"),
+            patch.object(gemini_service, "_get_google_news_rss", self.rss),
+            patch.object(gemini_service, "_analyze_article_with_gemini", self.gemini),
+            patch.object(news_main, "ledger", self.ledger),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def entry(self, key):
+        return self.db.document(f"{LEDGER_COLLECTION}/{key}").get().to_dict()
+
+
+class TestJobKey(unittest.TestCase):
+
+    def test_keys(self):
+        self.assertEqual(job_key(JOB, "m1"), job_key(JOB, "m2"))
+        self.assertNotEqual(job_key(JOB), job_key(JOB._replace(slot="20261019T1000")))
+        self.assertNotEqual(job_key(JOB), job_key(JOB._replace(user_id="u2")))
+        unslotted = Job("u1", "반도체")
+        self.assertEqual(job_key(unslotted, "m1"), job_key(unslotted, "m1"))
+        self.assertNotEqual(job_key(unslotted, "m1"), job_key(unslotted, "m2"))
+        self.assertIsNone(job_key(unslotted))
+
+
+class TestLedger(_LedgerCase):
+
+    def test_claim_lease_complete(self):
+        key = job_key(JOB)
+        first = self.ledger.claim(key, JOB, now=T0)
+        self.assertEqual(first.status, CLAIMED)
+        self.assertEqual(self.ledger.claim(key, JOB, now=T0 + timedelta(seconds=60)).status, LEASED)
+
+        # 처리 중 죽은 실행의 lease 는 만료 후 다시 claim 된다
+        expired = T0 + timedelta(seconds=LEASE_SECONDS + 1)
+        second = self.ledger.claim(key, JOB, now=expired)
+        self.assertEqual(second.status, CLAIMED)
+        self.assertEqual(self.entry(key)["attempts"], 2)
+
+        # 먼저 죽은 실행의 release 는 새 lease 를 건드리지 않는다
+        self.ledger.release(first, now=expired)
+        self.assertEqual(self.entry(key)["state"], "leased")
+
+        self.ledger.complete(second, now=expired)
+        self.assertEqual(self.ledger.claim(key, JOB, now=expired + timedelta(days=1)).status, COMPLETED)
+        self.assertEqual(self.entry(key)["expire_at"], expired + timedelta(days=3))
+
+    def test_release_allows_retry(self):
+        key = job_key(JOB)
+        lease = self.ledger.claim(key, JOB, now=T0)
+        self.ledger.release(lease, now=T0)
+        self.assertEqual(self.entry(key)["state"], "failed")
+        self.assertEqual(self.ledger.claim(key, JOB, now=T0).status, CLAIMED)
+
+
+class TestPushEntry(_LedgerCase):
+
+    def deliver(self, job, event_id="m1"):
+        event = {"data": base64.b64encode(encode_job(*job))}
+        news_main.summarize_news(event, SimpleNamespace(event_id=event_id))
+
+    def test_redelivery_skipped(self):
+        self.deliver(JOB)
+        calls = (self.rss.call_count, self.gemini.call_count)
+        self.deliver(JOB)                 # Pub/Sub 재배달
+        self.deliver(JOB, event_id="m2")  # 같은 slot 재발행(trigger 재시도)
+        self.assertEqual((self.rss.call_count, self.gemini.call_count), calls)
+        self.assertEqual(self.entry(job_key(JOB))["state"], "done")
+
+        self.deliver(JOB._replace(slot="20261019T1000"))  # 다음 스케줄은 처리
+        self.assertEqual(self.rss.call_count, calls[0] + 1)
+
+    def test_unslotted_message_uses_message_id(self):
+        job = Job("u1", "반도체")
+        self.deliver(job, event_id="m1")
+        self.deliver(job, event_id="m1")
+        self.assertEqual(self.rss.call_count, 1)
+        self.deliver(job, event_id="m2")
+        self.assertEqual(self.rss.call_count, 2)
+
+    def test_leased_job_raised_not_acked(self):
+        self.ledger.claim(job_key(JOB), JOB)  # 다른 실행이 처리 중
+        with self.assertRaises(JobInProgress):
+            self.deliver(JOB)
+        self.rss.assert_not_called()
+
+        # 그 실행이 죽어 lease 가 만료되면 재배달된 메시지가 처리한다
+        self.db.document(f"{LEDGER_COLLECTION}/{job_key(JOB)}").update(
+            {"lease_until": datetime.now(timezone.utc) - timedelta(seconds=1)}
+        )
+        self.deliver(JOB)
+        self.assertEqual(self.rss.call_count, 1)
+        self.assertEqual(self.entry(job_key(JOB))["state"], "done")
+
+    def test_failure_released_for_redelivery(self):
+        self.rss.side_effect = RuntimeError("RSS down")
+        with self.assertRaises(RuntimeError):
+            self.deliver(JOB)
+        self.assertEqual(self.entry(job_key(JOB))["state"], "failed")
+
+        self.rss.side_effect = _feed
+        self.deliver(JOB)
+        self.assertEqual(self.db.count_documents("users/u1/summaries"), len(TOPICS))
+        self.assertEqual(self.entry(job_key(JOB))["attempts"], 2)
+
+
+class TestBatchWorker(_LedgerCase):
+
+    def test_duplicates_acked_without_calls(self):
+        queue = InMemoryQueue()
+        for user_id in ("u1", "u2"):
+            queue.publish(encode_job(user_id, "반도체", "20261019T0900"))
+        stats = batch_worker.run_batch(queue, ledger=self.ledger)
+        self.assertEqual((stats["acked"], stats["skipped"]), (2, 0))
+        calls = (self.rss.call_count, self.gemini.call_count)
+
+        # trigger 재실행(같은 slot) + u1 메시지 재배달
+        for user_id in ("u1", "u2", "u1"):
+            queue.publish(encode_job(user_id, "반도체", "20261019T0900"))
+        stats = batch_worker.run_batch(queue, ledger=self.ledger)
+        self.assertEqual((stats["acked"], stats["skipped"]), (0, 3))
+        self.assertEqual((self.rss.call_count, self.gemini.call_count), calls)
+        self.assertEqual((len(queue), queue.outstanding), (0, 0))
+
+    def test_leased_job_deferred_and_failure_nacked(self):
+        queue = InMemoryQueue()
+        held = JOB._replace(user_id="u2")
+        self.ledger.claim(job_key(held), held)  # 다른 worker 가 처리 중
+        self.rss.side_effect = RuntimeError("RSS down")
+        for user_id in ("u1", "u2"):
+            queue.publish(encode_job(user_id, "반도체", JOB.slot))
+
+        stats = batch_worker.run_batch(queue, ledger=self.ledger)
+
+        # u2 는 ack 하지 않고 lease 가 끝날 때까지 미룬다 — 지금 pull 하면 nack 한 u1 만 나온다
+        self.assertEqual((stats["acked"], stats["nacked"], stats["skipped"], stats["deferred"]), (0, 1, 0, 1))
+        self.assertEqual(self.entry(job_key(JOB))["state"], "failed")
+        self.assertEqual([m.data for m in queue.pull(10)], [encode_job("u1", "반도체", JOB.slot)])
+        self.assertEqual(queue.deferred, 1)
+
+    def test_complete_failure_still_acks(self):
+        queue = InMemoryQueue()
+        for user_id in ("u1", "u2"):
+            queue.publish(encode_job(user_id, "반도체", JOB.slot))
+
+        with patch.object(self.ledger, "complete", side_effect=RuntimeError("Firestore unavailable")):
+            stats = batch_worker.run_batch(queue, ledger=self.ledger)
+
+        # 요약은 저장됐으니 두 메시지 모두 ack — 첫 실패가 나머지 사용자를 막지 않는다
+        self.assertEqual((stats["acked"], stats["nacked"]), (2, 0))
+        self.assertEqual((len(queue), queue.outstanding), (0, 0))
+
+
+class TestTriggerSlot(unittest.TestCase):
+
+    def test_schedule_slot(self):
+        self.assertEqual(trigger.schedule_slot(T0), "20261019T0900")
+        self.assertEqual(trigger.schedule_slot(T0, minutes=15), "20261019T0900")
+        self.assertEqual(trigger.schedule_slot(T0 + timedelta(minutes=40), minutes=15), "20261019T0945")
+        kst = timezone(timedelta(hours=9))
+        self.assertEqual(trigger.schedule_slot(datetime(2026, 10, 20, 0, 30, tzinfo=kst)), "20261019T1500")
+
+    def test_payload_carries_slot(self):
+        publisher = MagicMock()
+        entries = [{"keyword": "반도체", "subscribers": ["u1", "u2"]}]
+        with patch.object(trigger, "fetch_keyword_subscribers", return_value=entries), \
+                patch.object(trigger, "_get_publisher", return_value=publisher), \
+                flask.Flask(__name__).app_context():
+            response = trigger.trigger_news_summary(MagicMock())
+        payloads = [json.loads(call.args[1]) for call in publisher.publish.call_args_list]
+        self.assertEqual(len({p["slot"] for p in payloads}), 1)
+        self.assertEqual(response.get_json()["slot"], payloads[0]["slot"])
+
+
+if __name__ == "__main__":
+    unittest.main()
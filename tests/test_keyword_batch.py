@@ -0,0 +1,188 @@
+"""
+Test: bulk keyword add / delete (`keyword_service.add_keywords` / `delete_keywords`,
+T-20261019-018).
+
+Covers:
+
+    1. add_keywords normalizes + dedupes, skips keywords the user already has,
+       and writes everything in one get_all + one commit
+    2. a concurrent add between the check and the commit is retried, not lost
+    3. delete_keywords reports missing ids, handles auto-ID docs, one commit;
+       keywords without an index document do not create one
+    4. the per-request limit
+    5. first-run summaries are published as worker jobs (`summary_jobs`), one
+       message per new keyword in the worker's message format; the reported
+       summary status counts only confirmed publishes, and nothing is
+       published when no keyword was added
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.support import load
+from benchmarks import fakes
+from benchmarks.fakes import FakePublisher, InMemoryFirestore
+from services.job_queue import Job, parse_job
+from services.keyword_index import KEYWORD_INDEX_COLLECTION, index_entry, keyword_index_id
+
+keyword_service = load("backend_keyword_service_batch", "backend", "services", "keyword_service.py")
+
+summary_jobs = load("backend_summary_jobs", "backend", "services", "summary_jobs.py")
+
+
+class _BatchCase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        for p in (
+            patch.object(keyword_service, "db", self.db),
+            patch.object(keyword_service, "firestore", fakes.FIRESTORE),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def index(self, keyword):
+        return self.db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id(keyword)).get().to_dict()
+
+
+class TestAddKeywords(_BatchCase):
+
+    def test_dedupe_and_skip_existing(self):
+        keyword_service.add_keyword("u1", "날씨")
+        self.db.reset_calls()
+
+        result = keyword_service.add_keywords("u1", ["환율", " 환율 ", "날씨", "", "AI  반도체"])
+
+        self.assertEqual([item["keyword"] for item in result["added"]], ["환율", "AI 반도체"])
+        self.assertEqual(result["existing"], [{"id": keyword_index_id("날씨"), "keyword": "날씨"}])
+        self.assertEqual(dict(self.db.calls), {"get_all": 1, "commit": 1})
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 3)
+        self.assertEqual(self.index("환율")["count"], 1)
+        self.assertEqual(self.index("날씨")["count"], 1)
+
+    def test_nothing_new_does_not_commit(self):
+        keyword_service.add_keyword("u1", "날씨")
+        self.db.reset_calls()
+        self.assertEqual(keyword_service.add_keywords("u1", ["날씨"])["added"], [])
+        self.assertEqual(dict(self.db.calls), {"get_all": 1})
+        self.assertEqual(keyword_service.add_keywords("u1", [" "]), {"added": [], "existing": []})
+
+    def test_concurrent_add_is_retried(self):
+        get_all = self.db.get_all
+        raced = []
+
+        def racing_get_all(refs):
+            snapshots = list(get_all(refs))
+            if not raced:
+                raced.append(True)
+                keyword_service.add_keyword("u1", "환율")
+            return iter(snapshots)
+
+        with patch.object(self.db, "get_all", racing_get_all):
+            result = keyword_service.add_keywords("u1", ["환율", "날씨"])
+
+        self.assertEqual([item["keyword"] for item in result["added"]], ["날씨"])
+        self.assertEqual([item["keyword"] for item in result["existing"]], ["환율"])
+        self.assertEqual(self.index("환율")["count"], 1)
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 2)
+
+    def test_limit(self):
+        too_many = [f"키워드 {n}" for n in range(keyword_service.KEYWORD_BATCH_LIMIT + 1)]
+        with self.assertRaises(ValueError):
+            keyword_service.add_keywords("u1", too_many)
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 0)
+
+
+class TestDeleteKeywords(_BatchCase):
+
+    def test_delete_reports_missing(self):
+        added = keyword_service.add_keywords("u1", ["날씨", "환율"])["added"]
+        legacy = self.db.collection("users").document("u1").collection("keywords").document("LegacyAutoId12345678")
+        legacy.set({"keyword": "반도체"})
+        self.db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id("반도체")).set(
+            index_entry("반도체", ["u1"])
+        )
+        ids = [item["id"] for item in added] + ["LegacyAutoId12345678", keyword_index_id("없음")]
+        self.db.reset_calls()
+
+        result = keyword_service.delete_keywords("u1", ids + ids[:1])
+
+        self.assertEqual(result["deleted"], ids[:3])
+        self.assertEqual(result["missing"], [keyword_index_id("없음")])
+        self.assertEqual(dict(self.db.calls), {"get_all": 1, "commit": 1})
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 0)
+        for keyword in ("날씨", "환율", "반도체"):
+            self.assertEqual(self.index(keyword)["count"], 0)
+
+    def test_unindexed_keywords_do_not_create_index(self):
+        added = keyword_service.add_keywords("u1", ["날씨"])["added"]
+        self.db.collection("users").document("u1").collection("keywords").document(keyword_index_id("환율")).set(
+            {"keyword": "환율"}
+        )
+        ids = [item["id"] for item in added] + [keyword_index_id("환율")]
+
+        result = keyword_service.delete_keywords("u1", ids)
+
+        self.assertEqual(result, {"deleted": ids, "missing": []})
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 0)
+        self.assertEqual(self.index("날씨")["count"], 0)
+        self.assertIsNone(self.index("환율"))
+
+    def test_all_missing_does_not_commit(self):
+        self.db.reset_calls()
+        result = keyword_service.delete_keywords("u1", ["nope"])
+        self.assertEqual(result, {"deleted": [], "missing": ["nope"]})
+        self.assertEqual(dict(self.db.calls), {"get_all": 1})
+
+
+class TestPublishSummaryJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.publisher = FakePublisher()
+        p = patch.object(summary_jobs, "pubsub_publisher", return_value=self.publisher)
+        p.start()
+        self.addCleanup(p.stop)
+
+    def test_one_worker_job_per_keyword(self):
+        count = summary_jobs.publish_summary_jobs("u1", ["환율", "AI 반도체"])
+
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            [parse_job(data) for data in self.publisher.published],
+            [Job("u1", "환율"), Job("u1", "AI 반도체")],
+        )
+
+    def test_unconfirmed_publish_not_counted(self):
+        timed_out = MagicMock()
+        timed_out.result.side_effect = TimeoutError("publish timed out")
+        publish = self.publisher.publish
+
+        def flaky_publish(topic, data):
+            return timed_out if parse_job(data).keyword == "환율" else publish(topic, data)
+
+        with patch.object(self.publisher, "publish", side_effect=flaky_publish):
+            count = summary_jobs.publish_summary_jobs("u1", ["환율", "AI 반도체"])
+
+        self.assertEqual(count, 1)
+        self.assertEqual([parse_job(data) for data in self.publisher.published], [Job("u1", "AI 반도체")])
+
+    def test_summary_status_follows_what_was_queued(self):
+        self.assertEqual(summary_jobs.queue_first_summaries("u1", []), {"summary": "none", "queued": 0})
+        self.assertEqual(self.publisher.published, [])
+
+        self.assertEqual(
+            summary_jobs.queue_first_summaries("u1", ["환율", "AI 반도체"]), {"summary": "queued", "queued": 2}
+        )
+
+        with patch.object(summary_jobs, "publish_summary_jobs", return_value=1):
+            self.assertEqual(
+                summary_jobs.queue_first_summaries("u1", ["환율", "AI 반도체"]), {"summary": "deferred", "queued": 1}
+            )
+        with patch.object(summary_jobs, "pubsub_publisher", side_effect=RuntimeError("no credentials")):
+            self.assertEqual(
+                summary_jobs.queue_first_summaries("u1", ["환율"]), {"summary": "deferred", "queued": 0}
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
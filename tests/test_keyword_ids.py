@@ -0,0 +1,179 @@
+"""
+Test: deterministic keyword document IDs (T-20261019-017).
+
+Covers:
+
+    1. add_keyword: one batch commit, no reads; `create()` conflict is the
+       duplicate check (whitespace variants included) and leaves the index as is;
+       a keyword that normalizes to empty is rejected
+    2. concurrent adds of the same keyword by one user: exactly one succeeds
+    3. delete_keyword: one batch commit guarded by an exists precondition;
+       a missing keyword changes nothing; legacy auto-ID docs still delete;
+       keywords without an index document do not create one
+    4. tools/migrate_keyword_ids.py moves auto-ID docs to hash IDs
+    5. fake batch atomicity / field transforms used by the above
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from tests.support import load
+from benchmarks import fakes
+from benchmarks.fakes import InMemoryFirestore
+from services.feed_cursor import CURSOR_COLLECTION, cursor_id
+from services.keyword_index import KEYWORD_INDEX_COLLECTION, index_entry, keyword_index_id
+
+
+keyword_service = load("backend_keyword_service_ids", "backend", "services", "keyword_service.py")
+migrate = load("migrate_keyword_ids", "tools", "migrate_keyword_ids.py")
+
+
+class _KeywordServiceCase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        for p in (
+            patch.object(keyword_service, "db", self.db),
+            patch.object(keyword_service, "firestore", fakes.FIRESTORE),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def keywords(self, uid):
+        return self.db.collection("users").document(uid).collection("keywords")
+
+    def index(self, keyword):
+        return self.db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id(keyword)).get().to_dict()
+
+
+class TestAddKeyword(_KeywordServiceCase):
+
+    def test_one_commit_no_reads(self):
+        self.db.reset_calls()
+        keyword_id = keyword_service.add_keyword("u1", "반도체")
+        self.assertEqual(dict(self.db.calls), {"commit": 1})
+        self.assertEqual(self.db.reads, 0)
+        self.assertEqual(keyword_id, keyword_index_id("반도체"))
+        self.assertTrue(self.db.document("users/u1").get().exists)
+
+    def test_duplicate_is_conflict(self):
+        keyword_service.add_keyword("u1", "AI 반도체")
+        with self.assertRaisesRegex(ValueError, "already exists"):
+            keyword_service.add_keyword("u1", "  AI   반도체")
+        self.assertEqual(self.index("AI 반도체")["count"], 1)
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 1)
+
+    def test_empty_keyword_rejected(self):
+        for keyword in ("", "   "):
+            with self.assertRaisesRegex(ValueError, "empty"):
+                keyword_service.add_keyword("u1", keyword)
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 0)
+        self.assertEqual(self.db.count_documents(KEYWORD_INDEX_COLLECTION), 0)
+
+    def test_concurrent_same_keyword(self):
+        def add(_):
+            try:
+                keyword_service.add_keyword("u1", "환율")
+                return True
+            except ValueError:
+                return False
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(add, range(16)))
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(self.index("환율")["count"], 1)
+
+
+class TestDeleteKeyword(_KeywordServiceCase):
+
+    def test_one_commit_clears_cursor_and_index(self):
+        keyword_id = keyword_service.add_keyword("u1", "날씨")
+        cursor = self.db.collection("users").document("u1").collection(CURSOR_COLLECTION).document(cursor_id("날씨"))
+        cursor.set({"last_pub_date": "2026-10-19T00:00:00+00:00"})
+
+        self.db.reset_calls()
+        keyword_service.delete_keyword("u1", keyword_id)
+        self.assertEqual(dict(self.db.calls), {"commit": 1})
+        self.assertEqual(self.db.reads, 0)
+        self.assertFalse(self.keywords("u1").document(keyword_id).get().exists)
+        self.assertFalse(cursor.get().exists)
+        self.assertEqual(self.index("날씨")["count"], 0)
+
+    def test_missing_changes_nothing(self):
+        keyword_service.add_keyword("u2", "날씨")
+        with self.assertRaisesRegex(ValueError, "not found"):
+            keyword_service.delete_keyword("u1", keyword_index_id("날씨"))
+        with self.assertRaisesRegex(ValueError, "not found"):
+            keyword_service.delete_keyword("u1", "AutoIdNotThere00000X")
+        self.assertEqual(self.index("날씨")["subscribers"], ["u2"])
+        self.assertEqual(self.index("날씨")["count"], 1)
+
+    def test_legacy_auto_id(self):
+        self.keywords("u1").document("LegacyAutoId12345678").set({"keyword": "환율"})
+        self.db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id("환율")).set(
+            index_entry("환율", ["u1"])
+        )
+        keyword_service.delete_keyword("u1", "LegacyAutoId12345678")
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 0)
+        self.assertEqual(self.index("환율")["subscribers"], [])
+
+    def test_unindexed_keyword_does_not_create_index(self):
+        # 색인 이전 키워드: 자동 ID 문서와 마이그레이션으로 옮긴 해시 ID 문서, 둘 다 색인 문서가 없다.
+        self.keywords("u1").document("LegacyAutoId12345678").set({"keyword": "환율"})
+        self.keywords("u1").document(keyword_index_id("날씨")).set({"keyword": "날씨"})
+
+        keyword_service.delete_keyword("u1", "LegacyAutoId12345678")
+        keyword_service.delete_keyword("u1", keyword_index_id("날씨"))
+
+        self.assertEqual(self.db.count_documents("users/u1/keywords"), 0)
+        self.assertEqual(self.db.count_documents(KEYWORD_INDEX_COLLECTION), 0)
+
+
+class TestMigrateKeywordIds(unittest.TestCase):
+
+    def test_migrate_and_merge_duplicates(self):
+        db = InMemoryFirestore()
+        keywords = db.collection("users").document("u1").collection("keywords")
+        keywords.document("AutoIdA").set({"keyword": " 날씨", "created_at": "2026-01-01"})
+        keywords.document("AutoIdB").set({"keyword": "날씨", "created_at": "2026-02-01"})
+        keywords.document(keyword_index_id("환율")).set({"keyword": "환율"})
+
+        self.assertEqual(migrate.migrate_user(db, "u1", dry_run=True), 2)
+        self.assertEqual(db.count_documents("users/u1/keywords"), 3)
+
+        self.assertEqual(migrate.migrate_user(db, "u1"), 2)
+        docs = {doc.id: doc.to_dict() for doc in keywords.stream()}
+        self.assertEqual(set(docs), {keyword_index_id("날씨"), keyword_index_id("환율")})
+        self.assertEqual(docs[keyword_index_id("날씨")]["keyword"], "날씨")
+        self.assertEqual(migrate.migrate_user(db, "u1"), 0)
+
+
+class TestFakeBatchSemantics(unittest.TestCase):
+
+    def test_failed_precondition_writes_nothing(self):
+        db = InMemoryFirestore()
+        db.document("c/a").set({"n": 1})
+        batch = db.batch()
+        batch.set(db.document("c/b"), {"n": 2})
+        batch.create(db.document("c/a"), {"n": 3})
+        with self.assertRaises(fakes.Conflict):
+            batch.commit()
+        self.assertFalse(db.document("c/b").get().exists)
+
+        batch = db.batch()
+        batch.delete(db.document("c/missing"), option=db.write_option(exists=True))
+        with self.assertRaises(fakes.NotFound):
+            batch.commit()
+
+    def test_transforms(self):
+        db = InMemoryFirestore()
+        ref = db.document("c/a")
+        ref.set({"xs": fakes.ArrayUnion(["a", "b"]), "n": fakes.Increment(2)}, merge=True)
+        ref.set({"xs": fakes.ArrayUnion(["b", "c"]), "n": fakes.Increment(-1)}, merge=True)
+        ref.update({"xs": fakes.ArrayRemove(["a"])})
+        self.assertEqual(ref.get().to_dict(), {"xs": ["b", "c"], "n": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
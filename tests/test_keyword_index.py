@@ -0,0 +1,147 @@
+"""
+Test: keyword → subscribers inverted index (`keyword_index`, T-20261019-016).
+
+Covers:
+
+    1. keyword normalization / document id / entry helpers
+    2. backend keyword_service keeps the index in step with add/delete,
+       including concurrent adds of the same keyword
+    3. the trigger reads the index (reads ∝ unique keywords, not users)
+    4. tools/backfill_keyword_index.py rebuilds the index and is idempotent
+
+Uses the reusable fakes from `benchmarks/fakes.py`.
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tests.support import load
+from benchmarks import fakes
+from benchmarks.fakes import InMemoryFirestore
+from services.keyword_index import (
+    KEYWORD_INDEX_COLLECTION,
+    index_entry,
+    keyword_index_id,
+    normalize_keyword,
+)
+
+
+# The backend `services` package name clashes with the worker's; its shared
+# modules (clients, feed_cursor, keyword_index) are identical copies.
+keyword_service = load("backend_keyword_service", "backend", "services", "keyword_service.py")
+trigger_keywords = load("trigger_keywords_service", "trigger_function", "utils", "keywords_service.py")
+backfill = load("backfill_keyword_index", "tools", "backfill_keyword_index.py")
+
+
+def _index(db, keyword):
+    return db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id(keyword)).get().to_dict()
+
+
+class TestKeywordIndexHelpers(unittest.TestCase):
+
+    def test_normalize_and_id(self):
+        self.assertEqual(normalize_keyword("  AI   반도체 "), "AI 반도체")
+        self.assertEqual(keyword_index_id("AI 반도체"), keyword_index_id(" AI  반도체"))
+        self.assertNotEqual(keyword_index_id("AI"), keyword_index_id("ai"))
+        self.assertNotIn("/", keyword_index_id("TCP/IP"))
+
+    def test_entry(self):
+        entry = index_entry(" 날씨 ", ["u2", "u1", "u2"])
+        self.assertEqual(entry["keyword"], "날씨")
+        self.assertEqual(entry["subscribers"], ["u1", "u2"])
+        self.assertEqual(entry["count"], 2)
+
+
+class TestKeywordServiceMaintainsIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        for p in (
+            patch.object(keyword_service, "db", self.db),
+            patch.object(keyword_service, "firestore", fakes.FIRESTORE),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_add_and_delete(self):
+        first = keyword_service.add_keyword("u1", " 날씨 ")
+        keyword_service.add_keyword("u2", "날씨")
+        self.assertEqual(sorted(_index(self.db, "날씨")["subscribers"]), ["u1", "u2"])
+        self.assertEqual(_index(self.db, "날씨")["count"], 2)
+        self.assertEqual(keyword_service.get_keywords("u1")[0]["keyword"], "날씨")
+
+        with self.assertRaises(ValueError):
+            keyword_service.add_keyword("u1", "날씨")
+        self.assertEqual(_index(self.db, "날씨")["count"], 2)
+
+        keyword_service.delete_keyword("u1", first)
+        self.assertEqual(_index(self.db, "날씨")["subscribers"], ["u2"])
+        second = keyword_service.get_keywords("u2")[0]["id"]
+        keyword_service.delete_keyword("u2", second)
+        self.assertEqual(_index(self.db, "날씨")["count"], 0)
+        self.assertEqual(_index(self.db, "날씨")["subscribers"], [])
+
+    def test_concurrent_adds_keep_every_subscriber(self):
+        users = [f"u{n}" for n in range(20)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda uid: keyword_service.add_keyword(uid, "반도체"), users))
+        entry = _index(self.db, "반도체")
+        self.assertEqual(entry["count"], 20)
+        self.assertEqual(sorted(entry["subscribers"]), sorted(users))
+
+
+class TestTriggerReadsIndex(unittest.TestCase):
+
+    def test_reads_scale_with_keywords(self):
+        db = InMemoryFirestore()
+        uids = [f"u{n}" for n in range(30)]
+        for uid in uids:
+            for keyword in ("날씨", "환율"):
+                db.collection("users").document(uid).set({})
+                db.collection("users").document(uid).collection("keywords").document().set({"keyword": keyword})
+        for keyword in ("날씨", "환율"):
+            db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id(keyword)).set(index_entry(keyword, uids))
+        db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id("지난")).set(index_entry("지난", []))
+
+        with patch.object(trigger_keywords, "firestore", SimpleNamespace(Client=lambda: db)), \
+                patch("builtins.print"):
+            db.reset_calls()
+            entries = trigger_keywords.fetch_keyword_subscribers()
+            index_reads = db.reads
+            db.reset_calls()
+            trigger_keywords.fetch_all_user_keywords()
+            scan_reads = db.reads
+
+        self.assertEqual(sorted(e["keyword"] for e in entries), ["날씨", "환율"])
+        self.assertEqual(sum(len(e["subscribers"]) for e in entries), 60)
+        self.assertEqual(index_reads, 2)
+        self.assertGreater(scan_reads, 30)
+
+
+class TestBackfill(unittest.TestCase):
+
+    def test_rebuild_is_idempotent(self):
+        db = InMemoryFirestore()
+        for uid, keywords in {"u1": ["날씨", " 환율"], "u2": ["날씨"]}.items():
+            for keyword in keywords:
+                db.collection("users").document(uid).collection("keywords").document().set({"keyword": keyword})
+            db.collection("users").document(uid).set({})
+        stale = db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id("삭제됨"))
+        stale.set(index_entry("삭제됨", ["u9"]))
+        db.collection(KEYWORD_INDEX_COLLECTION).document(keyword_index_id("날씨")).set(index_entry("날씨", ["u1"]))
+
+        self.assertEqual(backfill.rebuild_index(db, dry_run=True), {"keywords": 2, "written": 2, "deleted": 1})
+        self.assertEqual(_index(db, "날씨")["subscribers"], ["u1"])
+
+        self.assertEqual(backfill.rebuild_index(db), {"keywords": 2, "written": 2, "deleted": 1})
+        self.assertEqual(_index(db, "날씨")["subscribers"], ["u1", "u2"])
+        self.assertEqual(_index(db, "환율")["subscribers"], ["u1"])
+        self.assertFalse(stale.get().exists)
+
+        self.assertEqual(backfill.rebuild_index(db), {"keywords": 2, "written": 0, "deleted": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Test: lazy client construction and deferred SDK imports (T-20261019-014).
+
+Covers:
+
+    1. importing the worker / backend entry modules loads none of the heavy
+       SDKs (Firestore, Pub/Sub, generativeai, bs4) and needs no credentials
+    2. services.clients builds the Firestore client once, on first use, and
+       runs registered hooks on it
+    3. summary_service.get_db() prefers an injected `db`
+    4. the `-X importtime` parser used by benchmarks/startup_report.py
+"""
+
+import sys
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+import tests.support  # noqa: F401
+from benchmarks import startup_report
+import services.clients as clients
+import services.summary_service as summary_service
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       900 |       1500 |   google.cloud.firestore_v1
+import time:       300 |       2100 | services.summary_service
+"""
+
+
+class TestEntryPointImports(unittest.TestCase):
+
+    def _assert_nothing_heavy(self, name):
+        result = startup_report.measure(name)
+        if "error" in result and "ModuleNotFoundError" in result["error"]:
+            self.skipTest(f"{name} dependencies not installed: {result['error']}")
+        self.assertNotIn("error", result)
+        self.assertEqual(result["deferred_loaded"], "-")
+
+    def test_worker(self):
+        self._assert_nothing_heavy("worker")
+
+    def test_backend(self):
+        self._assert_nothing_heavy("backend")
+
+
+class TestFirestoreClient(unittest.TestCase):
+
+    def setUp(self):
+        self.created = []
+        fake = types.ModuleType("google.cloud.firestore")
+        fake.Client = lambda: self.created.append(object()) or self.created[-1]
+        cloud = sys.modules["google.cloud"]
+        patchers = [
+            patch.object(clients, "_firestore_client", None),
+            patch.object(clients, "_firestore_hooks", []),
+            patch.dict(sys.modules, {"google.cloud.firestore": fake}),
+            patch.object(cloud, "firestore", fake, create=True),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_created_once_on_first_use(self):
+        self.assertEqual(self.created, [])
+        first = clients.firestore_client()
+        self.assertIs(clients.firestore_client(), first)
+        self.assertEqual(len(self.created), 1)
+
+    def test_hooks_run_on_creation_and_late_registration(self):
+        seen = []
+        clients.on_firestore_client(seen.append)
+        client = clients.firestore_client()
+        clients.on_firestore_client(seen.append)
+        self.assertEqual(seen, [client, client])
+
+    def test_summary_service_uses_injected_db(self):
+        injected = MagicMock()
+        with patch.object(summary_service, "db", injected):
+            self.assertIs(summary_service.get_db(), injected)
+        self.assertEqual(self.created, [])
+
+
+class TestImportTimeParser(unittest.TestCase):
+
+    def test_parse_and_group(self):
+        rows = startup_report.parse_importtime(IMPORTTIME)
+        self.assertEqual(rows[0], ("_io", 120, 120, 2))
+        self.assertEqual(rows[-1][3], 0)
+        self.assertEqual(
+            startup_report.by_package(rows),
+            {"_io": 120, "google.cloud": 900, "services": 300},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Test: reusable analysis instruction (`services.prompt_cache`, T-20261019-015).
+
+Covers:
+
+    1. InstructionCache creates the handle once, refreshes it before expiry,
+       never refreshes a handle without expiry, and rebuilds after invalidate()
+    2. CachedContentBackend: context cache creation, TTL refresh, and fallback
+       to a system instruction when Gemini rejects a too-small cache
+    3. gemini_service sends the static instruction once per process (not per
+       article) and only the article fields in each prompt
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+NEWS_DIR = os.path.join(ROOT, "news_summarizer")
+for path in (ROOT, NEWS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from benchmarks.fakes import FakeGemini  # noqa: E402
+import services.gemini_service as gemini_service  # noqa: E402
+from services.instrumentation import JobTrace  # noqa: E402
+from services.prompt_cache import (  # noqa: E402
+    CacheHandle,
+    CachedContentBackend,
+    InstructionCache,
+    SystemInstructionBackend,
+)
+
+T0 = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = T0
+
+    def __call__(self):
+        return self.now
+
+
+class _ExpiringBackend:
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.created = 0
+        self.refreshed = 0
+
+    def create(self, now):
+        self.created += 1
+        return CacheHandle(f"model-{self.created}", now + self.ttl)
+
+    def refresh(self, handle, now):
+        self.refreshed += 1
+        return CacheHandle(handle.model, now + self.ttl)
+
+
+class TestInstructionCache(unittest.TestCase):
+
+    def test_refresh_before_expiry(self):
+        clock = _Clock()
+        backend = _ExpiringBackend(timedelta(minutes=60))
+        cache = InstructionCache(backend, refresh_margin=timedelta(minutes=5), clock=clock)
+
+        self.assertEqual(cache.model(), "model-1")
+        clock.now = T0 + timedelta(minutes=54)
+        cache.model()
+        self.assertEqual(backend.refreshed, 0)
+        clock.now = T0 + timedelta(minutes=55)
+        self.assertEqual(cache.model(), "model-1")
+        self.assertEqual((backend.created, backend.refreshed), (1, 1))
+
+    def test_invalidate_rebuilds(self):
+        backend = _ExpiringBackend(timedelta(minutes=60))
+        cache = InstructionCache(backend, clock=_Clock())
+        cache.model()
+        cache.invalidate()
+        self.assertEqual(cache.model(), "model-2")
+
+    def test_system_instruction_never_refreshed(self):
+        sdk = FakeGemini()
+        clock = _Clock()
+        cache = InstructionCache(SystemInstructionBackend(sdk, "m", "지시문", {}), clock=clock)
+        model = cache.model()
+        clock.now = T0 + timedelta(days=30)
+        self.assertIs(cache.model(), model)
+        self.assertEqual(sdk.models_created, 1)
+
+
+class TestCachedContentBackend(unittest.TestCase):
+
+    INSTRUCTION = "You are a professional news analyst. " * 20
+
+    def test_cached_tokens_and_refresh(self):
+        sdk = FakeGemini()
+        backend = CachedContentBackend(sdk, "m", self.INSTRUCTION, {}, ttl=timedelta(minutes=10))
+        handle = backend.create(T0)
+        self.assertEqual(handle.expires_at, T0 + timedelta(minutes=10))
+        usage = handle.model.generate_content("Title: x").usage_metadata
+        self.assertEqual(usage.cached_content_token_count, len(self.INSTRUCTION) // 4)
+
+        refreshed = backend.refresh(handle, T0 + timedelta(minutes=8))
+        self.assertIs(refreshed.model, handle.model)
+        self.assertEqual(sdk.caches[0].updates, 1)
+
+    def test_too_small_falls_back_to_system_instruction(self):
+        sdk = FakeGemini(min_cache_tokens=4096)
+        handle = CachedContentBackend(sdk, "m", "short", {}).create(T0)
+        self.assertIsNone(handle.expires_at)
+        self.assertEqual(sdk.caches, [])
+        self.assertEqual(handle.model.instruction, "short")
+
+
+class TestAnalysisUsesSharedInstruction(unittest.TestCase):
+
+    def setUp(self):
+        self.gemini = FakeGemini()
+        patchers = [
+            patch.object(gemini_service, "genai", self.gemini),
+            patch.object(gemini_service, "_instruction_cache", None),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    @staticmethod
+    def _article(n):
+        return {
+            "title": f"기사 {n} - 테스트일보",
+            "link": f"https://news.example/{n}",
+            "pub_date": "Mon, 19 Oct 2026 01:00:00 GMT",
+            "source": "테스트일보",
+        }
+
+    def test_one_model_per_process(self):
+        prompts = []
+        original = self.gemini._generate
+        self.gemini._generate = lambda prompt, *a, **kw: prompts.append(prompt) or original(prompt, *a, **kw)
+
+        for n in range(3):
+            self.assertIsNotNone(gemini_service._analyze_article_with_gemini(self._article(n)))
+
+        self.assertEqual(self.gemini.models_created, 1)
+        model = gemini_service._instruction_cache.model()
+        self.assertEqual(model.instruction, gemini_service.ANALYSIS_INSTRUCTION)
+        for prompt in prompts:
+            self.assertNotIn("professional news analyst", prompt)
+            self.assertIn("Title:", prompt)
+
+    def test_context_cache_counts_cached_tokens(self):
+        trace = JobTrace("키워드")
+        with patch.object(gemini_service, "GEMINI_CONTEXT_CACHE", True):
+            for n in range(2):
+                gemini_service._analyze_article_with_gemini(self._article(n), trace)
+        self.assertEqual(len(self.gemini.caches), 1)
+        self.assertEqual(trace.tokens["cached_tokens"], 2 * (len(gemini_service.ANALYSIS_INSTRUCTION) // 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
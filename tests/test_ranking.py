@@ -0,0 +1,100 @@
+"""
+Test: local pre-ranking of RSS candidates (`services.ranking`).
+
+Covers:
+
+    1. title normalization strips the ' - source' suffix and punctuation
+    2. wire copies of the same story are dropped as near-duplicates
+    3. items similar to already-stored articles are dropped too
+    4. keyword relevance beats feed position when k is small
+    5. selected items keep feed order
+    6. fetch_grounded_news pulls a larger candidate set but analyzes top-k
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+NEWS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "news_summarizer"))
+if NEWS_DIR not in sys.path:
+    sys.path.insert(0, NEWS_DIR)
+
+import services.gemini_service as gemini_service  # noqa: E402
+from services.ranking import (  # noqa: E402
+    RANKING_CANDIDATE_FACTOR,
+    char_ngrams,
+    jaccard,
+    normalize_title,
+    select_candidates,
+)
+
+
+def _item(n, title):
+    return {"title": title, "link": f"https://news.example.com/{n}", "pub_date": "", "source": "S"}
+
+
+class TestRanking(unittest.TestCase):
+
+    def test_normalize_title(self):
+        self.assertEqual(normalize_title("삼성전자, HBM 공급 확대 - 연합뉴스"), "삼성전자hbm공급확대")
+        self.assertEqual(normalize_title("no suffix here"), "nosuffixhere")
+
+    def test_wire_copy_is_near_duplicate(self):
+        a = char_ngrams(normalize_title("삼성전자, HBM 공급 확대…엔비디아와 계약 - 연합뉴스"))
+        b = char_ngrams(normalize_title("삼성전자 HBM 공급 확대, 엔비디아와 계약 - 뉴시스"))
+        c = char_ngrams(normalize_title("SK하이닉스 1분기 실적 발표 - 조선비즈"))
+        self.assertGreaterEqual(jaccard(a, b), 0.6)
+        self.assertLess(jaccard(a, c), 0.6)
+
+    def test_drops_near_duplicates(self):
+        articles = [
+            _item(1, "반도체 수출 석 달 연속 증가 - 연합뉴스"),
+            _item(2, "반도체 수출, 석 달 연속 증가 - 뉴시스"),
+            _item(3, "반도체 장비 국산화 속도 - 전자신문"),
+        ]
+        selected, duplicates = select_candidates("반도체", articles, k=3)
+        self.assertEqual([a["link"][-1] for a in selected], ["1", "3"])
+        self.assertEqual([a["link"][-1] for a in duplicates], ["2"])
+
+    def test_already_stored_seeds_dedup(self):
+        stored = [_item(0, "반도체 수출 석 달 연속 증가 - 연합뉴스")]
+        articles = [_item(2, "반도체 수출 석 달 연속 증가 - 뉴시스"), _item(3, "반도체 장비 국산화 - 전자신문")]
+        selected, duplicates = select_candidates("반도체", articles, k=2, already=stored)
+        self.assertEqual([a["link"][-1] for a in selected], ["3"])
+        self.assertEqual(len(duplicates), 1)
+
+    def test_relevance_over_position(self):
+        articles = [
+            _item(1, "주말 날씨 맑고 포근 - 기상일보"),
+            _item(2, "프로야구 개막전 매진 - 스포츠일보"),
+            _item(3, "인공지능 반도체 투자 확대 - 테크일보"),
+        ]
+        selected, _ = select_candidates("인공지능 반도체", articles, k=1)
+        self.assertEqual(selected[0]["link"][-1], "3")
+
+    def test_keeps_feed_order(self):
+        articles = [_item(n, f"반도체 뉴스 {word}") for n, word in enumerate(["가격", "공장", "인력", "수출"])]
+        selected, _ = select_candidates("반도체", articles, k=4)
+        self.assertEqual(selected, articles)
+
+
+class TestFetchUsesRanking(unittest.TestCase):
+
+    @patch("services.gemini_service.genai")
+    @patch("services.gemini_service._get_google_news_rss")
+    def test_candidate_pool_and_top_k(self, mock_rss, mock_genai):
+        mock_rss.return_value = [_item(n, f"반도체 소식 {n}번째 {'가나다라마바사아자차'[n % 10]}") for n in range(8)]
+        mock_genai.GenerativeModel.return_value = MagicMock(
+            generate_content=MagicMock(return_value=MagicMock(text=json.dumps({"summary": "요약"})))
+        )
+        with patch.object(gemini_service, "api_key", "test_key"):
+            results = gemini_service.fetch_grounded_news("반도체", max_results=3)
+
+        mock_rss.assert_called_once_with("반도체", 3 * RANKING_CANDIDATE_FACTOR)
+        self.assertEqual(len(results), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+Test: per-user full-text search over summaries (`services.search_index`,
+T-20261019-020).
+
+Covers:
+
+    1. text_grams: bigrams inside words, one-letter words kept, punctuation split
+    2. the worker adds postings for saved summaries in one batch without reads,
+       and concurrent runs for the same user do not lose postings
+    3. search: coverage filter, title/recency ranking, deleted summaries
+       skipped, two get_all calls per query, empty query rejected
+    4. cleanup prunes postings older than the cutoff day, and trims shards
+       over the posting limit oldest first
+    5. tools/backfill_search_index.py rebuilds what the worker would have written,
+       within the same per-shard limit
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from tests.support import load
+from benchmarks import fakes
+from benchmarks.fakes import InMemoryFirestore
+import services.summary_service as summary_service
+from services.instrumentation import JobTrace
+import services.search_index as search_index
+from services.search_index import SEARCH_INDEX_COLLECTION, search, text_grams, trim_postings
+
+
+cleanup = load("cleanup_main_search", "cleanup_function", "main.py")
+backfill = load("backfill_search_index", "tools", "backfill_search_index.py")
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+SUMMARIES = {
+    "chip-title": ("반도체 수출 역대 최대", "9월 수출이 늘었다.", "2026-10-18T09:00:00+00:00"),
+    "chip-body": ("9월 무역수지 흑자", "반도체 수출 호조가 이어졌다.", "2026-10-18T09:00:00+00:00"),
+    "chip-old": ("반도체 수출 역대 최대", "8월 수출이 늘었다.", "2026-09-10T09:00:00+00:00"),
+    "rate": ("기준금리 동결", "한국은행이 기준금리를 동결했다.", "2026-10-19T08:00:00+00:00"),
+}
+
+
+class _SearchCase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        for p in (
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", fakes.FIRESTORE),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+        self.user_ref = self.db.collection("users").document("u1")
+
+    def save(self, doc_ids=None):
+        saved = []
+        for doc_id in doc_ids or SUMMARIES:
+            title, summary, created_at = SUMMARIES[doc_id]
+            doc = {"title": title, "summary": summary, "created_at": created_at, "keyword": "경제"}
+            self.user_ref.collection("summaries").document(doc_id).set(doc)
+            saved.append((doc_id, doc))
+        summary_service._update_search_index(self.user_ref, saved, JobTrace("경제", "u1"))
+
+    def ids(self, query, **kwargs):
+        return [doc["id"] for doc in search(self.db, self.user_ref, query, now=NOW, **kwargs)]
+
+    def shards(self):
+        return {doc.id: doc.to_dict()["grams"] for doc in self.user_ref.collection(SEARCH_INDEX_COLLECTION).stream()}
+
+
+class TestTextGrams(unittest.TestCase):
+
+    def test_grams(self):
+        self.assertEqual(text_grams("반도체, 수출!"), ["반도", "도체", "수출"])
+        self.assertEqual(text_grams("금 값 AI"), ["금", "값", "ai"])
+        self.assertEqual(text_grams("반도체", 3), ["반도체"])
+        self.assertEqual(text_grams(" ,. "), [])
+
+
+class TestWorkerIndexing(_SearchCase):
+
+    def test_one_batch_no_reads(self):
+        self.db.reset_calls()
+        self.save()
+        # 요약 문서 4건 + 색인 batch commit 1회
+        self.assertEqual(dict(self.db.calls), {"set": 4, "commit": 1})
+        self.assertEqual(self.db.reads, 0)
+        shard = next(self.user_ref.collection(SEARCH_INDEX_COLLECTION).stream()).to_dict()
+        days = {p.split(":")[0] for postings in shard["grams"].values() for p in postings}
+        self.assertLessEqual(days, {"20261018", "20260910", "20261019"})
+
+    def test_concurrent_runs_keep_all_postings(self):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda doc_id: self.save([doc_id]), SUMMARIES))
+        self.assertEqual(set(self.ids("수출")), {"chip-title", "chip-body", "chip-old"})
+        self.assertEqual(self.ids("기준금리"), ["rate"])
+
+
+class TestSearch(_SearchCase):
+
+    def test_ranking(self):
+        self.save()
+        # 같은 일치면 최신이 먼저, 제목 일치는 한 달 차이보다 크다, 무관한 요약은 없음
+        self.assertEqual(self.ids("반도체 수출"), ["chip-title", "chip-old", "chip-body"])
+        self.assertEqual(self.ids("반도체 수출", limit=1), ["chip-title"])
+        self.assertEqual(self.ids("부동산 대출"), [])
+
+    def test_partial_query_coverage(self):
+        self.save()
+        # 질의 bigram 절반 이상이 맞아야 후보 ("금리 인상": 금리 ✓, 인상 ✗)
+        self.assertEqual(self.ids("금리 인상"), ["rate"])
+        self.assertEqual(self.ids("금리 인상 전망"), [])
+
+    def test_reads_and_deleted_summary(self):
+        self.save()
+        self.user_ref.collection("summaries").document("chip-body").delete()
+        self.db.reset_calls()
+        self.assertNotIn("chip-body", self.ids("반도체 수출"))
+        self.assertEqual(dict(self.db.calls), {"get_all": 2})
+
+    def test_empty_query(self):
+        with self.assertRaises(ValueError):
+            search(self.db, self.user_ref, " ?! ")
+
+
+class TestCleanupPrune(_SearchCase):
+
+    def test_prune_before_cutoff_day(self):
+        self.save()
+        with patch.object(cleanup, "firestore", fakes.FIRESTORE):
+            removed = cleanup.prune_search_index(self.db, "u1", "2026-10-01T00:00:00")
+            self.assertGreater(removed, 0)
+            self.assertEqual(cleanup.prune_search_index(self.db, "u1", "2026-10-01T00:00:00"), 0)
+
+        postings = [
+            p for doc in self.user_ref.collection(SEARCH_INDEX_COLLECTION).stream()
+            for ps in doc.to_dict()["grams"].values() for p in ps
+        ]
+        self.assertFalse(any(p.endswith(":chip-old") for p in postings))
+        self.assertEqual(set(self.ids("반도체 수출")), {"chip-title", "chip-body"})
+
+
+class TestShardLimit(_SearchCase):
+    LIMIT = 2
+
+    def test_trim_postings_oldest_first(self):
+        grams = {"반도": ["20261018:a", "20260910:b"], "수출": ["20261018:a", "20261019:c", "20260910:b"]}
+        self.assertEqual(trim_postings(grams, limit=5), {})
+        self.assertEqual(trim_postings(grams, limit=3), {"반도": ["20260910:b"], "수출": ["20260910:b"]})
+
+    def test_cleanup_trims_shards_to_limit(self):
+        self.save()
+        before = self.shards()
+        over = sum(max(sum(map(len, grams.values())) - self.LIMIT, 0) for grams in before.values())
+        self.assertGreater(over, 0)
+
+        with patch.object(cleanup, "firestore", fakes.FIRESTORE), \
+                patch.object(cleanup, "SEARCH_SHARD_POSTINGS_LIMIT", self.LIMIT):
+            # 만료된 posting 이 없어도(cutoff 이전 요약 없음) 상한을 넘는 만큼 지운다
+            self.assertEqual(cleanup.prune_search_index(self.db, "u1", "2026-09-01T00:00:00"), over)
+            self.assertEqual(cleanup.prune_search_index(self.db, "u1", "2026-09-01T00:00:00"), 0)
+
+        for shard, grams in self.shards().items():
+            kept = sorted(p for postings in grams.values() for p in postings)
+            old = sorted(p for postings in before[shard].values() for p in postings)
+            self.assertEqual(kept, old[len(old) - len(kept):])
+            self.assertLessEqual(len(kept), self.LIMIT)
+
+    def test_backfill_writes_within_limit(self):
+        self.save()
+        expected = {
+            shard: sorted(p for postings in grams.values() for p in postings)[-self.LIMIT:]
+            for shard, grams in self.shards().items()
+        }
+        with patch.object(search_index, "SHARD_POSTINGS_LIMIT", self.LIMIT):
+            backfill.rebuild_user(self.db, "u1")
+        self.assertEqual(
+            {shard: sorted(p for postings in grams.values() for p in postings) for shard, grams in self.shards().items()},
+            expected,
+        )
+
+
+class TestBackfill(_SearchCase):
+
+    def test_rebuild_matches_incremental(self):
+        self.save()
+        index = self.user_ref.collection(SEARCH_INDEX_COLLECTION)
+        incremental = {doc.id: doc.to_dict()["grams"] for doc in index.stream()}
+        index.document("99").set({"grams": {"stale": ["20260101:gone"]}})
+
+        self.assertEqual(backfill.rebuild_user(self.db, "u1", dry_run=True)["deleted"], 1)
+        result = backfill.rebuild_user(self.db, "u1")
+        self.assertEqual(result, {"summaries": 4, "shards": len(incremental), "deleted": 1})
+        rebuilt = {doc.id: doc.to_dict()["grams"] for doc in index.stream()}
+        self.assertEqual(
+            {shard: {g: sorted(ps) for g, ps in grams.items()} for shard, grams in rebuilt.items()},
+            {shard: {g: sorted(ps) for g, ps in grams.items()} for shard, grams in incremental.items()},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
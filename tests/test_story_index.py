@@ -0,0 +1,143 @@
+"""
+Test: cross-outlet near-duplicate stories (`services.story_index`).
+
+Covers:
+
+    1. SimHash: syndicated titles land within the title threshold,
+       unrelated titles do not
+    2. StoryIndex: round trip, size bound, age cut-off, rebase onto a document
+       another job wrote in the meantime
+    3. match_content needs both a close summary signature *and* a related title
+    4. summarize_and_store attaches a syndicated copy to the stored story as
+       an extra source instead of summarizing it again
+"""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import tests.support  # noqa: F401
+from benchmarks.fakes import FIRESTORE, FakeGemini, InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+from services.story_index import (
+    STORY_INDEX_LIMIT,
+    STORY_INDEX_MAX_AGE,
+    TITLE_DUPLICATE_BITS,
+    StoryIndex,
+    hamming,
+    title_signature,
+)
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+class TestSimHash(unittest.TestCase):
+
+    def test_syndicated_titles_close(self):
+        pairs = [
+            ("삼성전자, HBM 공급 확대…엔비디아와 계약 - 연합뉴스", "삼성전자 HBM 공급 확대, 엔비디아와 계약 - 뉴시스"),
+            ("[속보] 한은 기준금리 0.25%p 인하…연 2.50% - 연합뉴스", "한은, 기준금리 0.25%p 인하 연 2.50% - 매일경제"),
+        ]
+        for a, b in pairs:
+            self.assertLessEqual(hamming(title_signature(a), title_signature(b)), TITLE_DUPLICATE_BITS, a)
+
+    def test_unrelated_titles_far(self):
+        a = title_signature("삼성전자 HBM 공급 확대 - 연합뉴스")
+        b = title_signature("SK하이닉스 1분기 실적 발표 - 조선비즈")
+        self.assertGreater(hamming(a, b), TITLE_DUPLICATE_BITS)
+
+
+class TestStoryIndex(unittest.TestCase):
+
+    def test_round_trip_and_bound(self):
+        index = StoryIndex()
+        for n in range(STORY_INDEX_LIMIT + 5):
+            index.add(f"doc{n}", n, n, NOW.isoformat())
+        self.assertEqual(len(index.entries), STORY_INDEX_LIMIT)
+        self.assertEqual(index.entries[0]["id"], f"doc{STORY_INDEX_LIMIT + 4}")
+
+        restored = StoryIndex.from_dict(index.to_dict(), now=NOW)
+        self.assertEqual(restored.entries, index.entries)
+        self.assertFalse(restored.dirty)
+
+    def test_old_entries_dropped(self):
+        old = (NOW - STORY_INDEX_MAX_AGE - timedelta(hours=1)).isoformat()
+        data = {"entries": [
+            {"id": "old", "title_sig": "0" * 16, "sig": "0" * 16, "created_at": old},
+            {"id": "new", "title_sig": "0" * 16, "sig": "0" * 16, "created_at": NOW.isoformat()},
+        ]}
+        self.assertEqual([e["id"] for e in StoryIndex.from_dict(data, now=NOW).entries], ["new"])
+
+    def test_rebase_keeps_concurrent_entries(self):
+        now = datetime.now(timezone.utc).isoformat()
+        index = StoryIndex.from_dict(None)
+        index.add("mine", 1, 1, now)
+
+        # 그사이 같은 사용자의 다른 job 이 인덱스 문서를 저장했다
+        other = StoryIndex()
+        other.add("theirs", 2, 2, now)
+        rebased = index.rebase(other.to_dict())
+
+        self.assertEqual([e["id"] for e in rebased.entries], ["mine", "theirs"])
+        self.assertTrue(rebased.dirty)
+        self.assertEqual([e["id"] for e in index.rebase(rebased.to_dict()).entries], ["mine", "theirs"])
+
+    def test_match_content_requires_related_title(self):
+        index = StoryIndex()
+        index.add("doc", title_sig=0, content_sig=0, created_at=NOW.isoformat())
+        close_body = (1 << 5) - 1            # 5 bits away
+        related_title = (1 << 12) - 1        # 12 bits away
+        unrelated_title = (1 << 40) - 1      # 40 bits away
+        self.assertEqual(index.match_content(related_title, close_body)["id"], "doc")
+        self.assertIsNone(index.match_content(unrelated_title, close_body))
+        self.assertIsNone(index.match_content(0, (1 << 30) - 1))
+
+
+class TestAttachSyndicatedCopy(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        self.gemini = FakeGemini()
+        patchers = [
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", FIRESTORE),
+            patch.object(gemini_service, "genai", self.gemini),
+            patch.object(gemini_service, "api_key", "test_key"),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _run(self, link, title, source):
+        article = {"title": title, "link": link, "pub_date": "Mon, 19 Oct 2026 01:00:00 GMT", "source": source}
+        with patch.object(gemini_service, "_get_google_news_rss", return_value=[article]):
+            summary_service.summarize_and_store("user-1", "HBM")
+
+    def _summaries(self):
+        coll = self.db.collection("users").document("user-1").collection("summaries")
+        return [doc.to_dict() for doc in coll.stream()]
+
+    def test_second_outlet_attached_without_model_call(self):
+        self._run("https://yna.example/1", "삼성전자, HBM 공급 확대…엔비디아와 계약 - 연합뉴스", "연합뉴스")
+        self._run("https://newsis.example/9", "삼성전자 HBM 공급 확대, 엔비디아와 계약 - 뉴시스", "뉴시스")
+
+        self.assertEqual(self.gemini.calls, 1)
+        (story,) = self._summaries()
+        self.assertEqual(story["url"], "https://yna.example/1")
+        self.assertEqual(len(story["simhash"]), 16)
+        self.assertEqual(
+            story["extra_sources"],
+            [{"title": "삼성전자 HBM 공급 확대, 엔비디아와 계약 - 뉴시스",
+              "url": "https://newsis.example/9", "source_name": "뉴시스"}],
+        )
+
+    def test_different_story_stored(self):
+        self._run("https://yna.example/1", "삼성전자, HBM 공급 확대…엔비디아와 계약 - 연합뉴스", "연합뉴스")
+        self._run("https://cb.example/2", "SK하이닉스 HBM4 양산 돌입 - 조선비즈", "조선비즈")
+        self.assertEqual(self.gemini.calls, 2)
+        self.assertEqual(len(self._summaries()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -54,8 +54,12 @@ import services.summary_service as summary_service  # noqa: E402
 # subset of the API summary_service uses:
 #
 #     db.collection("users").document(uid).set({}, merge=True)
+#     db.collection("users").document(uid).collection("feed_cursors"|"story_index"|"feed"|"search_index").document(id).get()/.set()
+#     db.batch().set(ref, data, merge=True) / .commit()
+#     firestore.transactional(fn)(db.transaction()) -> fn(transaction); transaction.set(ref, data)
 #     coll = db.collection("users").document(uid).collection("summaries")
 #     coll.where("url", "==", url).limit(1).stream()  -> iterable of docs
+#     coll.order_by("created_at", direction=...).limit(n).stream()  -> snapshots
 #     coll.add({...})
 # ---------------------------------------------------------------------------
 class _InMemoryCollection:
@@ -69,6 +73,10 @@ class _InMemoryCollection:
         matches = [d for d in self.docs if d.get(field) == value]
         return _Query(matches)
 
+    def order_by(self, field, direction="ASCENDING"):
+        ordered = sorted(self.docs, key=lambda d: d.get(field) or "", reverse=direction == "DESCENDING")
+        return _Query([MagicMock(id=f"doc-{i}", to_dict=lambda d=d: dict(d)) for i, d in enumerate(ordered)])
+
     # --- write side ---
     def add(self, doc):
         with self.add_lock:
@@ -87,14 +95,35 @@ class _Query:
         return iter(self._matches)
 
 
+class _SingleDocs:
+    """`users/{uid}/feed_cursors/{id}`, `story_index/recent`, `feed/latest` — 문서 get/set/delete 만 흉내 낸다."""
+
+    def __init__(self):
+        self.data = {}
+
+    def document(self, doc_id):
+        store = self.data
+        return MagicMock(
+            get=lambda transaction=None: MagicMock(exists=doc_id in store, to_dict=lambda: store.get(doc_id)),
+            set=lambda data, merge=False: store.__setitem__(doc_id, dict(data)),
+            delete=lambda: store.pop(doc_id, None),
+        )
+
+
 class _Document:
     def __init__(self, summaries_collection):
         self._summaries = summaries_collection
+        self._singles = {
+            "feed_cursors": _SingleDocs(), "story_index": _SingleDocs(), "feed": _SingleDocs(),
+            "search_index": _SingleDocs(),
+        }
 
     def set(self, _data, merge=False):  # noqa: D401 — Firestore API
         return None
 
     def collection(self, name):
+        if name in self._singles:
+            return self._singles[name]
         assert name == "summaries"
         return self._summaries
 
@@ -108,11 +137,45 @@ class _DBStub:
         assert name == "users"
         return _UsersCollection(self._doc)
 
+    def batch(self):
+        return _Batch()
+
+    def transaction(self):
+        return _Transaction()
+
     @property
     def summaries(self):
         return self._summaries
 
 
+class _Batch:
+    """검색 색인 갱신용 `db.batch()` — set 을 모았다가 commit 때 적용한다."""
+
+    def __init__(self):
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append((ref, data, merge))
+
+    def commit(self):
+        for ref, data, merge in self._ops:
+            ref.set(data, merge=merge)
+
+
+class _Transaction:
+    """피드·스토리 인덱스 갱신용 `db.transaction()` — 동시 실행 없이 set 을 바로 적용한다."""
+
+    def set(self, ref, data, merge=False):
+        ref.set(data, merge=merge)
+
+
+# `firestore.transactional` 대용 — 충돌이 없으니 한 번 실행한다. Query 는 피드 재구성 정렬 방향.
+_FIRESTORE = types.SimpleNamespace(
+    transactional=lambda fn: fn,
+    Query=types.SimpleNamespace(ASCENDING="ASCENDING", DESCENDING="DESCENDING"),
+)
+
+
 class _UsersCollection:
     def __init__(self, doc):
         self._doc = doc
@@ -131,8 +194,11 @@ class TestArticleDeduplication(unittest.TestCase):
         self.db_stub = _DBStub()
         self._db_patcher = patch.object(summary_service, "db", self.db_stub)
         self._db_patcher.start()
+        self._firestore_patcher = patch.object(summary_service, "firestore", _FIRESTORE)
+        self._firestore_patcher.start()
 
     def tearDown(self):
+        self._firestore_patcher.stop()
         self._db_patcher.stop()
 
     @staticmethod
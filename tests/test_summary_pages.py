@@ -0,0 +1,110 @@
+"""
+Test: keyword-filtered summary listing with cursor pagination
+(`services.summary_pages`, T-20261019-019).
+
+Covers:
+
+    1. page cursors round-trip and malformed cursors raise ValueError
+    2. walking every page returns each summary of the keyword exactly once,
+       newest first, with created_at ties broken by document id
+    3. each page reads limit + 1 documents however deep it is
+    4. firestore.indexes.json declares the composite index the query needs,
+       and tools/deploy_firestore_indexes.py turns it into a gcloud command
+"""
+
+import json
+import os
+import unittest
+
+from tests.support import ROOT, load
+from benchmarks.fakes import InMemoryFirestore
+from services.summary_pages import decode_page_cursor, encode_page_cursor, keyword_page
+
+deploy_indexes = load("deploy_firestore_indexes", "tools", "deploy_firestore_indexes.py")
+
+
+def _seed(db, per_keyword=23):
+    summaries = db.collection("users").document("u1").collection("summaries")
+    for n in range(per_keyword):
+        for keyword in ("날씨", "환율"):
+            # 세 건씩 같은 created_at (ID 로 순서가 갈린다)
+            summaries.document(f"{keyword}-{n:03d}").set(
+                {"keyword": keyword, "title": f"{keyword} {n}", "created_at": f"2026-10-19T00:{n // 3:02d}:00+00:00"}
+            )
+    return summaries
+
+
+class TestPageCursor(unittest.TestCase):
+
+    def test_round_trip(self):
+        cursor = encode_page_cursor("2026-10-19T00:00:00+00:00", "doc/1")
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_page_cursor(cursor), ("2026-10-19T00:00:00+00:00", "doc/1"))
+
+    def test_malformed(self):
+        for cursor in ("not-a-cursor", encode_page_cursor("x", "y")[:-3], "W1sxXV0"):
+            with self.assertRaises(ValueError):
+                decode_page_cursor(cursor)
+
+
+class TestKeywordPage(unittest.TestCase):
+
+    def test_walk_all_pages(self):
+        db = InMemoryFirestore()
+        summaries = _seed(db)
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = keyword_page(summaries, "날씨", cursor=cursor, limit=5)
+            seen.extend(page)
+            pages += 1
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, 5)
+        self.assertEqual(len(seen), 23)
+        self.assertEqual(len({item["id"] for item in seen}), 23)
+        self.assertTrue(all(item["keyword"] == "날씨" for item in seen))
+        order = [(item["created_at"], item["id"]) for item in seen]
+        self.assertEqual(order, sorted(order, reverse=True))
+
+    def test_exact_multiple_has_no_empty_last_page(self):
+        db = InMemoryFirestore()
+        summaries = _seed(db, per_keyword=10)
+        page, cursor = keyword_page(summaries, "환율", limit=5)
+        page, cursor = keyword_page(summaries, "환율", cursor=cursor, limit=5)
+        self.assertEqual(len(page), 5)
+        self.assertIsNone(cursor)
+
+    def test_reads_do_not_grow_with_depth(self):
+        db = InMemoryFirestore()
+        summaries = _seed(db)
+        cursor, reads = None, []
+        for _ in range(4):
+            db.reset_calls()
+            _page, cursor = keyword_page(summaries, "날씨", cursor=cursor, limit=5)
+            reads.append(db.reads)
+        self.assertEqual(reads, [6, 6, 6, 6])
+
+
+class TestCompositeIndex(unittest.TestCase):
+
+    def test_index_matches_query(self):
+        with open(os.path.join(ROOT, "firestore.indexes.json"), encoding="utf-8") as f:
+            indexes = json.load(f)["indexes"]
+        fields = [
+            (field["fieldPath"], field["order"])
+            for index in indexes if index["collectionGroup"] == "summaries"
+            for field in index["fields"]
+        ]
+        self.assertEqual(fields, [("keyword", "ASCENDING"), ("created_at", "DESCENDING")])
+
+    def test_gcloud_command(self):
+        command = deploy_indexes.gcloud_command(deploy_indexes.load_indexes()[0], "demo")
+        self.assertEqual(command[:5], ["gcloud", "firestore", "indexes", "composite", "create"])
+        self.assertIn("--collection-group=summaries", command)
+        self.assertIn("--field-config=field-path=keyword,order=ascending", command)
+        self.assertIn("--field-config=field-path=created_at,order=descending", command)
+
+
+if __name__ == "__main__":
+    unittest.main()
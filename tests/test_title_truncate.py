@@ -4,6 +4,8 @@ Covers the acceptance criteria:
   - AC-007-2 길이 ≤ L 원본 그대로, 초과 시 앞 head … 뒤 tail 중간 생략, 결과 ≤ L
   - AC-007-3 "헤드라인 - 출처" 앞/뒤 보존, CJK 문자 경계 안전
   - with_display_titles 는 응답 dict 만 정규화(원본 필드 보존, 결측/빈 처리)
+  - display_title bulk 경로: 짧은 제목 무복사 통과, truncate_middle 과 동일 결과, LRU 재사용
+  - 저장된 display_title(같은 max_len)은 그대로, 레거시/다른 max_len 만 런타임 계산
 
 Style follows existing tests under `tests/` (unittest).
 `app.text_utils` 는 외부 의존이 없어 firestore/firebase stub 없이 import 된다.
@@ -16,7 +18,8 @@ import unittest
 BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "backend")
 sys.path.insert(0, os.path.abspath(BACKEND_DIR))
 
-from app.text_utils import truncate_middle, with_display_titles  # noqa: E402
+from app import text_utils  # noqa: E402
+from app.text_utils import display_title, truncate_middle, with_display_titles  # noqa: E402
 
 
 class TestTruncateMiddle(unittest.TestCase):
@@ -94,5 +97,52 @@ class TestWithDisplayTitles(unittest.TestCase):
         self.assertIsNone(with_display_titles(None))
 
 
+class TestDisplayTitleFastPath(unittest.TestCase):
+    def test_short_title_returned_without_copy(self):
+        title = "짧은 제목 - 출처"
+        self.assertIs(display_title(title, max_len=60), title)
+
+    def test_matches_truncate_middle(self):
+        for title in ["  hi  ", "가" * 100 + " - 출처", "x" * 61, "円" * 200]:
+            self.assertEqual(display_title(title, 40), truncate_middle(title, 40))
+
+    def test_none_passthrough(self):
+        self.assertIsNone(display_title(None))
+
+    def test_repeated_titles_hit_cache(self):
+        text_utils._cached_display_title.cache_clear()
+        long_title = "제목 " + "가" * 100 + " - 출처"
+        for _ in range(3):
+            with_display_titles([{"title": long_title}], max_len=30)
+        info = text_utils._cached_display_title.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+
+class TestStoredDisplayTitle(unittest.TestCase):
+    LONG = "제목 " + "가" * 100 + " - 출처"
+
+    def _stored(self, max_len=60):
+        return {"title": self.LONG, "display_title": "저장된 표시 제목", "display_title_max_len": max_len}
+
+    def test_stored_value_served_without_recompute(self):
+        text_utils._cached_display_title.cache_clear()
+        (item,) = with_display_titles([self._stored()])
+        self.assertEqual(item, {"title": "저장된 표시 제목"})
+        self.assertEqual(text_utils._cached_display_title.cache_info().misses, 0)
+
+    def test_other_max_len_recomputed(self):
+        (item,) = with_display_titles([self._stored()], max_len=30)
+        self.assertEqual(item["title"], truncate_middle(self.LONG, 30))
+        self.assertNotIn("display_title", item)
+
+    def test_stale_stored_length_recomputed(self):
+        (item,) = with_display_titles([self._stored(max_len=80)])
+        self.assertEqual(item["title"], truncate_middle(self.LONG, 60))
+
+    def test_legacy_doc_recomputed(self):
+        (item,) = with_display_titles([{"title": self.LONG}])
+        self.assertEqual(item["title"], truncate_middle(self.LONG, 60))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -95,6 +95,7 @@ _utils_pkg = types.ModuleType("utils")
 _utils_pkg.__path__ = []  # mark as package
 _kw_mod = types.ModuleType("utils.keywords_service")
 _kw_mod.fetch_all_user_keywords = lambda: []
+_kw_mod.fetch_keyword_subscribers = lambda: []
 sys.modules["utils"] = _utils_pkg
 sys.modules["utils.keywords_service"] = _kw_mod
 
@@ -169,7 +170,7 @@ class TestTriggerNewsSummaryAuth(unittest.TestCase):
         AUTH_IMPLEMENTED,
         "Auth not yet implemented in trigger_function/main.py.",
     )
-    @patch("utils.keywords_service.fetch_all_user_keywords", return_value=[])
+    @patch("utils.keywords_service.fetch_keyword_subscribers", return_value=[])
     @patch("firebase_admin.auth.verify_id_token")
     def test_valid_token_returns_success(self, mock_verify, _mock_fetch):
         mock_verify.return_value = {"uid": "user-123", "email": "u@example.com"}
@@ -182,7 +183,7 @@ class TestTriggerNewsSummaryAuth(unittest.TestCase):
         AUTH_IMPLEMENTED,
         "Auth not yet implemented in trigger_function/main.py.",
     )
-    @patch("utils.keywords_service.fetch_all_user_keywords", return_value=[])
+    @patch("utils.keywords_service.fetch_keyword_subscribers", return_value=[])
     @patch("firebase_admin.auth.verify_id_token")
     def test_token_claims_extracted(self, mock_verify, _mock_fetch):
         claims = {"uid": "user-xyz", "email": "x@example.com", "admin": True}
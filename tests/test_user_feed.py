@@ -0,0 +1,165 @@
+"""
+Test: per-user feed document (`services.user_feed`, T-20261019-013).
+
+Covers:
+
+    1. UserFeed keeps entries newest-first, bounded, and flags `has_more`
+    2. page() serves a page from the document only when it holds every entry
+       of that page
+    3. summarize_and_store seeds the document from existing summaries on first
+       use and then keeps it identical to the subcollection's first page
+    4. overlapping jobs of one user both land in the document (transaction)
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+import tests.support  # noqa: F401
+from benchmarks.fakes import FIRESTORE, FakeGemini, InMemoryFirestore
+import services.gemini_service as gemini_service
+import services.summary_service as summary_service
+from services.instrumentation import JobTrace
+from services.user_feed import FEED_COLLECTION, FEED_DOC, FEED_LIMIT, UserFeed
+
+TOPICS = ["반도체 수출", "기준금리 동결", "전기차 배터리", "원달러 환율", "부동산 대출", "AI 데이터센터"]
+
+
+def _created(n):
+    return f"2026-10-19T{n // 60:02d}:{n % 60:02d}:00+00:00"
+
+
+class TestUserFeed(unittest.TestCase):
+
+    def test_add_keeps_newest_first_and_bounded(self):
+        feed = UserFeed()
+        for n in range(FEED_LIMIT + 3):
+            feed.add(f"doc{n}", {"created_at": _created(n)})
+        self.assertEqual(len(feed.entries), FEED_LIMIT)
+        self.assertTrue(feed.has_more)
+        self.assertEqual(feed.entries[0]["id"], f"doc{FEED_LIMIT + 2}")
+        self.assertTrue(feed.dirty)
+
+    def test_add_same_id_replaces(self):
+        feed = UserFeed()
+        feed.add("doc", {"created_at": _created(1), "title": "old"})
+        feed.add("doc", {"created_at": _created(1), "title": "new"})
+        self.assertEqual([e["title"] for e in feed.entries], ["new"])
+
+    def test_page_only_when_covered(self):
+        feed = UserFeed([{"id": f"doc{n}"} for n in range(20)], has_more=True)
+        self.assertEqual([e["id"] for e in feed.page(0, 10)], [f"doc{n}" for n in range(10)])
+        self.assertIsNone(feed.page(15, 10))
+        # 문서가 전부면(has_more=False) 범위를 넘어도 문서로 답한다.
+        feed.has_more = False
+        self.assertEqual(len(feed.page(15, 10)), 5)
+        self.assertEqual(feed.page(30, 10), [])
+
+    def test_from_summaries_flags_more(self):
+        docs = [(f"doc{n}", {"created_at": _created(100 - n)}) for n in range(FEED_LIMIT + 1)]
+        feed = UserFeed.from_summaries(docs)
+        self.assertEqual(len(feed.entries), FEED_LIMIT)
+        self.assertTrue(feed.has_more)
+        self.assertFalse(UserFeed.from_summaries(docs[:3]).has_more)
+
+
+class TestWorkerMaintainsFeed(unittest.TestCase):
+
+    def setUp(self):
+        self.db = InMemoryFirestore()
+        patchers = [
+            patch.object(summary_service, "db", self.db),
+            patch.object(summary_service, "firestore", FIRESTORE),
+            patch.object(gemini_service, "genai", FakeGemini()),
+            patch.object(gemini_service, "api_key", "test_key"),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        self.user_ref = self.db.collection("users").document("user-1")
+
+    def _run(self, start, count):
+        articles = [
+            {
+                "title": f"{TOPICS[n % len(TOPICS)]} 관련 {n}번째 소식 - 테스트일보",
+                "link": f"https://news.example/{n}",
+                "pub_date": "Mon, 19 Oct 2026 01:00:00 GMT",
+                "source": "테스트일보",
+            }
+            for n in range(start, start + count)
+        ]
+        with patch.object(gemini_service, "_get_google_news_rss", return_value=articles):
+            summary_service.summarize_and_store("user-1", f"키워드 {start}")
+
+    def _feed(self):
+        snapshot = self.user_ref.collection(FEED_COLLECTION).document(FEED_DOC).get()
+        self.assertTrue(snapshot.exists)
+        return UserFeed.from_dict(snapshot.to_dict())
+
+    def _first_page(self, limit):
+        query = self.user_ref.collection("summaries").order_by("created_at", direction="DESCENDING").limit(limit)
+        return [{**doc.to_dict(), "id": doc.id} for doc in query.stream()]
+
+    def test_seeds_from_existing_summaries(self):
+        legacy = self.user_ref.collection("summaries")
+        for n in range(3):
+            legacy.document(f"legacy{n}").set({"title": f"구 요약 {n}", "url": f"u{n}", "created_at": _created(n)})
+
+        self._run(0, 2)
+
+        feed = self._feed()
+        self.assertEqual(len(feed.entries), 5)
+        self.assertFalse(feed.has_more)
+        self.assertEqual(feed.page(0, 10), self._first_page(10))
+
+    def test_later_runs_prepend(self):
+        self._run(0, 2)
+        self._run(10, 2)
+
+        feed = self._feed()
+        self.assertEqual(len(feed.entries), 4)
+        self.assertEqual(feed.page(0, 10), self._first_page(10))
+
+    def test_first_page_is_one_read(self):
+        self._run(0, 3)
+        self.db.reset_calls()
+        self._feed().page(0, 10)
+        self.assertEqual(self.db.reads, 1)
+
+    def test_overlapping_jobs_keep_both(self):
+        self._run(0, 1)
+        summaries = self.user_ref.collection("summaries")
+        other_doc = {"title": "다른 job 의 요약", "url": "https://other/1", "created_at": _created(30)}
+        summaries.document("other").set(other_doc)
+        add = UserFeed.add
+        other = []
+
+        def add_while_other_job_updates(feed, doc_id, doc):
+            # 이 job 이 피드 문서를 읽은 뒤 같은 사용자의 다른 job 이 피드를 갱신한다
+            if not other:
+                other.append(threading.Thread(target=summary_service._update_feed, args=(
+                    self.user_ref, summaries, [("other", other_doc)], {}, JobTrace("다른 키워드", "user-1"),
+                )))
+                other[0].start()
+                other[0].join(0.2)
+            add(feed, doc_id, doc)
+
+        with patch.object(UserFeed, "add", add_while_other_job_updates):
+            self._run(10, 1)
+        other[0].join()
+
+        feed = self._feed()
+        self.assertIn("other", [entry["id"] for entry in feed.entries])
+        self.assertEqual(len(feed.entries), 3)
+        self.assertEqual(feed.page(0, 10), self._first_page(10))
+
+    def test_failed_update_drops_feed(self):
+        self._run(0, 1)
+        with patch.object(UserFeed, "to_dict", side_effect=RuntimeError("too large")):
+            self._run(10, 1)
+        snapshot = self.user_ref.collection(FEED_COLLECTION).document(FEED_DOC).get()
+        self.assertFalse(snapshot.exists)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Test: per-phase instrumentation of the summarization worker
+(`services.instrumentation.JobTrace`).
+
+Covers:
+
+    1. phase() emits one JSON record with latency and caller fields
+    2. exceptions inside a phase are recorded and re-raised
+    3. token usage is read from `response.usage_metadata` and summed
+    4. summary() closes out the job with per-phase aggregates
+    5. fetch_grounded_news records rss_fetch + gemini_analyze phases
+
+Style follows the existing tests under `tests/` (unittest + mock).
+"""
+
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+NEWS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "news_summarizer"))
+if NEWS_DIR not in sys.path:
+    sys.path.insert(0, NEWS_DIR)
+
+import services.gemini_service as gemini_service  # noqa: E402
+from services.instrumentation import JobTrace, logger as trace_logger  # noqa: E402
+
+
+def _records(log_ctx):
+    return [json.loads(line.split(":", 2)[2]) for line in log_ctx.output]
+
+
+def _usage(prompt, output):
+    return SimpleNamespace(
+        prompt_token_count=prompt,
+        candidates_token_count=output,
+        total_token_count=prompt + output,
+    )
+
+
+class TestJobTrace(unittest.TestCase):
+
+    def test_phase_emits_json_record(self):
+        trace = JobTrace("Gemini", "user-1")
+        with self.assertLogs(trace_logger, level="INFO") as logs:
+            with trace.phase("rss_fetch") as record:
+                record["items"] = 3
+        (rec,) = _records(logs)
+        self.assertEqual(rec["event"], "phase")
+        self.assertEqual(rec["phase"], "rss_fetch")
+        self.assertEqual(rec["keyword"], "Gemini")
+        self.assertEqual(rec["user_id"], "user-1")
+        self.assertEqual(rec["items"], 3)
+        self.assertGreaterEqual(rec["latency_ms"], 0)
+
+    def test_phase_records_error_and_reraises(self):
+        trace = JobTrace("Gemini", "user-1")
+        with self.assertLogs(trace_logger, level="INFO") as logs:
+            with self.assertRaises(RuntimeError):
+                with trace.phase("firestore_write"):
+                    raise RuntimeError("boom")
+        (rec,) = _records(logs)
+        self.assertEqual(rec["error"], "RuntimeError")
+        self.assertEqual(rec["severity"], "ERROR")
+        self.assertEqual(trace.phases["firestore_write"]["errors"], 1)
+
+    def test_token_usage_is_summed(self):
+        trace = JobTrace("Gemini", "user-1")
+        with self.assertLogs(trace_logger, level="INFO"):
+            for prompt, output in [(100, 20), (50, 10)]:
+                with trace.phase("gemini_analyze") as record:
+                    trace.add_usage(record, SimpleNamespace(usage_metadata=_usage(prompt, output)))
+        self.assertEqual(
+            trace.tokens,
+            {"prompt_tokens": 150, "output_tokens": 30, "total_tokens": 180},
+        )
+
+    def test_missing_usage_metadata_is_ignored(self):
+        trace = JobTrace("Gemini")
+        with self.assertLogs(trace_logger, level="INFO"):
+            with trace.phase("gemini_analyze") as record:
+                trace.add_usage(record, SimpleNamespace())
+        self.assertEqual(trace.tokens, {})
+
+    def test_summary_closes_out_job(self):
+        trace = JobTrace("Gemini", "user-1")
+        with self.assertLogs(trace_logger, level="INFO") as logs:
+            with trace.phase("dedup_lookup"):
+                pass
+            with trace.phase("dedup_lookup"):
+                pass
+            trace.incr("saved")
+            trace.summary(status="ok")
+        rec = _records(logs)[-1]
+        self.assertEqual(rec["event"], "job_summary")
+        self.assertEqual(rec["status"], "ok")
+        self.assertEqual(rec["phases"]["dedup_lookup"]["calls"], 2)
+        self.assertEqual(rec["counters"], {"saved": 1})
+
+
+class TestFetchGroundedNewsTracing(unittest.TestCase):
+
+    RSS = b"""
+    <rss version="2.0"><channel>
+        <item>
+            <title>A</title><link>https://example.com/a</link>
+            <pubDate>Mon, 09 Feb 2026 06:17:00 GMT</pubDate><source>S</source>
+        </item>
+    </channel></rss>
+    """
+
+    @patch.object(gemini_service, "api_key", "test_key")
+    @patch("services.gemini_service.genai")
+    @patch("services.gemini_service.requests.get")
+    def test_phases_recorded(self, mock_get, mock_genai):
+        mock_get.return_value = MagicMock(status_code=200, content=self.RSS)
+        response = MagicMock()
+        response.text = json.dumps({"title": "A", "url": "https://example.com/a", "summary": "s"})
+        response.usage_metadata = _usage(120, 30)
+        mock_genai.GenerativeModel.return_value.generate_content.return_value = response
+
+        trace = JobTrace("Gemini", "user-1")
+        with self.assertLogs(trace_logger, level="INFO"):
+            results = gemini_service.fetch_grounded_news("Gemini", max_results=1, trace=trace)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(trace.phases["rss_fetch"]["calls"], 1)
+        self.assertEqual(trace.phases["gemini_analyze"]["calls"], 1)
+        self.assertEqual(trace.tokens["total_tokens"], 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
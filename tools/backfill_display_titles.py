@@ -0,0 +1,68 @@
+"""기존 요약 문서에 `display_title` / `display_title_max_len` 을 채운다 (T-20261019-012).
+
+worker 는 새 요약에 표시 제목을 함께 저장한다. 이 스크립트는 그 이전에 저장된 문서를
+한 번 채워, 조회 API 가 런타임 truncate 없이 내려주도록 한다. 여러 번 돌려도 안전하다
+(이미 같은 기준으로 채워진 문서는 건너뛴다).
+
+Usage (repo root, GOOGLE_APPLICATION_CREDENTIALS 또는 gcloud ADC 필요):
+    python tools/backfill_display_titles.py --dry-run
+    python tools/backfill_display_titles.py --user <uid>
+"""
+
+import argparse
+import os
+import sys
+
+from google.cloud import firestore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from services.text_utils import DISPLAY_TITLE_MAX_LEN, display_title_fields  # noqa: E402
+
+FIRESTORE_BATCH_LIMIT = 500
+
+
+def backfill_user(db, user_id: str, dry_run: bool = False) -> int:
+    """한 사용자의 요약 중 표시 제목이 없거나 기준이 다른 문서를 채우고 건수를 반환한다."""
+    summaries = db.collection("users").document(user_id).collection("summaries").stream()
+    batch = db.batch()
+    pending = updated = 0
+    for doc in summaries:
+        data = doc.to_dict() or {}
+        title = data.get("title")
+        if title is None or data.get("display_title_max_len") == DISPLAY_TITLE_MAX_LEN:
+            continue
+        updated += 1
+        if dry_run:
+            continue
+        batch.update(doc.reference, display_title_fields(title))
+        pending += 1
+        if pending >= FIRESTORE_BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+    if pending:
+        batch.commit()
+    return updated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", help="only this user id")
+    parser.add_argument("--dry-run", action="store_true", help="count documents without writing")
+    args = parser.parse_args(argv)
+
+    db = firestore.Client()
+    user_ids = [args.user] if args.user else [doc.id for doc in db.collection("users").stream()]
+    total = 0
+    for user_id in user_ids:
+        count = backfill_user(db, user_id, dry_run=args.dry_run)
+        total += count
+        if count:
+            print(f"{user_id}: {count} {'to update' if args.dry_run else 'updated'}")
+    print(f"✅ {'Would update' if args.dry_run else 'Updated'} {total} summaries across {len(user_ids)} users")
+    return total
+
+
+if __name__ == "__main__":
+    main()
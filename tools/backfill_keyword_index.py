@@ -0,0 +1,115 @@
+"""사용자 키워드로 `keyword_index` 역색인을 다시 만든다 (T-20261019-016).
+
+backend 는 키워드 추가/삭제 때 역색인을 갱신하고 trigger 는 역색인만 읽는다. 이
+스크립트는 그 이전에 등록된 키워드를 색인에 채우고, 색인과 사용자 키워드가 어긋났을 때
+(예: 키워드 저장 후 색인 갱신 전에 실패) 맞춘다. 여러 번 돌려도 안전하다(이미 같은
+구독자 집합인 문서는 건너뛰고, 구독자가 없는 색인 문서는 지운다).
+
+trigger 를 역색인 버전으로 배포하기 전에 한 번 돌린다(`Migrate keywords` workflow, 수동).
+훑은 결과로 색인 문서를 덮어쓰고 지우므로 돌리는 동안의 키워드 추가·삭제와 경합한다 —
+배포마다 자동으로 돌리지 않고, 트래픽이 적을 때 돌린다.
+
+Usage (repo root, GOOGLE_APPLICATION_CREDENTIALS 또는 gcloud ADC 필요):
+    python tools/backfill_keyword_index.py --dry-run
+    python tools/backfill_keyword_index.py
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from typing import Dict, Set, Tuple
+
+from google.cloud import firestore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from services.keyword_index import (  # noqa: E402
+    KEYWORD_INDEX_COLLECTION,
+    index_entry,
+    keyword_index_id,
+    normalize_keyword,
+    subscribers,
+)
+
+FIRESTORE_BATCH_LIMIT = 500
+
+
+def collect_subscribers(db) -> Dict[str, Tuple[str, Set[str]]]:
+    """users/*/keywords 를 훑어 {색인 문서 ID: (정규화 키워드, uid 집합)} 을 만든다."""
+    index: Dict[str, Tuple[str, Set[str]]] = {}
+    members: Dict[str, Set[str]] = defaultdict(set)
+    for user in db.collection("users").stream():
+        for doc in db.collection("users").document(user.id).collection("keywords").stream():
+            keyword = normalize_keyword((doc.to_dict() or {}).get("keyword") or "")
+            if not keyword:
+                continue
+            doc_id = keyword_index_id(keyword)
+            members[doc_id].add(user.id)
+            index[doc_id] = (keyword, members[doc_id])
+    return index
+
+
+def rebuild_index(db, dry_run: bool = False) -> Dict[str, int]:
+    """역색인을 사용자 키워드와 맞추고 {keywords, written, deleted} 건수를 반환한다."""
+    expected = collect_subscribers(db)
+    collection = db.collection(KEYWORD_INDEX_COLLECTION)
+    batch = db.batch()
+    pending = written = deleted = 0
+
+    def queue(op: str, *args) -> None:
+        nonlocal batch, pending
+        if dry_run:
+            return
+        getattr(batch, op)(*args)
+        pending += 1
+        if pending >= FIRESTORE_BATCH_LIMIT:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+
+    existing = set()
+    for doc in collection.stream():
+        existing.add(doc.id)
+        if doc.id not in expected:
+            deleted += 1
+            queue("delete", doc.reference)
+            continue
+        keyword, uids = expected[doc.id]
+        data = doc.to_dict() or {}
+        if (
+            data.get("keyword") == keyword
+            and sorted(subscribers(data)) == sorted(uids)
+            and data.get("count") == len(uids)
+        ):
+            continue
+        written += 1
+        queue("set", doc.reference, index_entry(keyword, uids))
+
+    for doc_id, (keyword, uids) in expected.items():
+        if doc_id not in existing:
+            written += 1
+            queue("set", collection.document(doc_id), index_entry(keyword, uids))
+
+    if pending:
+        batch.commit()
+    return {"keywords": len(expected), "written": written, "deleted": deleted}
+
+
+def main(argv=None) -> Dict[str, int]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="count documents without writing")
+    args = parser.parse_args(argv)
+
+    result = rebuild_index(firestore.Client(), dry_run=args.dry_run)
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(
+        f"✅ {verb} {result['written']} and "
+        f"{'would delete' if args.dry_run else 'deleted'} {result['deleted']} index documents "
+        f"({result['keywords']} unique keywords)"
+    )
+    return result
+
+
+if __name__ == "__main__":
+    main()
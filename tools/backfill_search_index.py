@@ -0,0 +1,82 @@
+"""사용자 요약으로 `search_index` 검색 색인을 다시 만든다 (T-20261019-020).
+
+worker 는 요약 저장 때 색인에 posting 을 더하고 cleanup 은 만료 posting 을 지운다. 이
+스크립트는 그 이전에 저장된 요약을 색인에 채우고, 색인 갱신이 실패한 요약(worker 는
+best-effort)을 맞춘다. 사용자별로 shard 문서를 통째로 다시 쓰므로 여러 번 돌려도 안전하다.
+shard 마다 posting 상한(`SHARD_POSTINGS_LIMIT`)을 넘으면 오래된 것부터 빼고 쓴다.
+
+색인 기능을 배포한 직후 한 번 돌린다. 사용자 한 명을 다시 쓰는 사이 같은 사용자의 worker
+실행이 더한 posting 은 덮일 수 있다 — 스케줄 사이 한가한 시간에 돌린다.
+
+Usage (repo root, GOOGLE_APPLICATION_CREDENTIALS 또는 gcloud ADC 필요):
+    python tools/backfill_search_index.py --dry-run
+    python tools/backfill_search_index.py [--user <uid>]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Dict
+
+from google.cloud import firestore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from services.search_index import SEARCH_INDEX_COLLECTION, index_writes, trim_postings  # noqa: E402
+
+
+def rebuild_user(db, uid: str, dry_run: bool = False) -> Dict[str, int]:
+    """한 사용자의 색인 shard 를 summaries 로 다시 쓰고 {summaries, shards, deleted} 건수를 반환한다."""
+    user_ref = db.collection("users").document(uid)
+    summaries = [(doc.id, doc.to_dict() or {}) for doc in user_ref.collection("summaries").stream()]
+    writes = index_writes(summaries)
+    # worker 가 더한 것과 같되, shard 마다 상한을 넘는 오래된 posting 은 빼고 쓴다
+    for grams in writes.values():
+        for gram, dropped in trim_postings(grams).items():
+            dropped = set(dropped)
+            kept = [value for value in grams[gram] if value not in dropped]
+            if kept:
+                grams[gram] = kept
+            else:
+                del grams[gram]
+    index_ref = user_ref.collection(SEARCH_INDEX_COLLECTION)
+    stale = [doc.reference for doc in index_ref.stream() if doc.id not in writes]
+
+    if not dry_run:
+        # shard 는 최대 SEARCH_INDEX_SHARDS(64) 개 — batch 하나에 들어간다.
+        batch = db.batch()
+        updated_at = datetime.now(timezone.utc).isoformat()
+        for shard, grams in writes.items():
+            batch.set(index_ref.document(shard), {"grams": grams, "updated_at": updated_at})
+        for ref in stale:
+            batch.delete(ref)
+        if writes or stale:
+            batch.commit()
+    return {"summaries": len(summaries), "shards": len(writes), "deleted": len(stale)}
+
+
+def main(argv=None) -> Dict[str, int]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="count documents without writing")
+    parser.add_argument("--user", help="only this uid")
+    args = parser.parse_args(argv)
+
+    db = firestore.Client()
+    uids = [args.user] if args.user else [user.id for user in db.collection("users").stream()]
+    total = {"users": 0, "summaries": 0, "shards": 0, "deleted": 0}
+    for uid in uids:
+        result = rebuild_user(db, uid, dry_run=args.dry_run)
+        total["users"] += 1
+        for key, value in result.items():
+            total[key] += value
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(
+        f"✅ {verb} {total['shards']} index shards for {total['summaries']} summaries "
+        f"({total['users']} users, {total['deleted']} stale shards)"
+    )
+    return total
+
+
+if __name__ == "__main__":
+    main()
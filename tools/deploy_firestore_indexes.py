@@ -0,0 +1,110 @@
+"""`firestore.indexes.json` 의 복합 색인·필드 색인 설정을 gcloud 로 반영한다 (T-20261019-019).
+
+색인 정의의 정본은 repo 루트의 `firestore.indexes.json` 이다(Firebase CLI 형식 —
+`firebase deploy --only firestore:indexes` 로도 배포된다). 배포 workflow 는 Firebase
+CLI 없이 이 스크립트로 `gcloud firestore indexes composite create` 를 부른다. 이미 있는
+색인은 건너뛰므로 여러 번 돌려도 안전하다. 색인 생성은 비동기(--async)로 요청만 한다.
+
+`fieldOverrides` 중 `indexes` 가 빈 항목은 그 필드의 자동 단일 필드 색인을 끈다
+(`gcloud firestore indexes fields update --disable-indexes`) — 예: 검색 색인 `grams` map 은
+키가 수천 개라 색인하면 쓰기마다 색인 항목이 폭증한다(T-20261019-020). `"ttl": true` 인 항목은
+TTL 정책도 켠다(`gcloud firestore fields ttls update --enable-ttl`) — 예: job 원장 `expire_at`
+(T-20261019-022).
+
+Usage (repo root, gcloud 인증 필요):
+    python tools/deploy_firestore_indexes.py --project <project-id> --dry-run
+    python tools/deploy_firestore_indexes.py --project <project-id>
+"""
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+from typing import Any, Dict, List
+
+INDEXES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "firestore.indexes.json")
+
+
+def load_indexes(path: str = INDEXES_PATH) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("indexes", [])
+
+
+def load_field_overrides(path: str = INDEXES_PATH) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("fieldOverrides", [])
+
+
+def gcloud_command(index: Dict[str, Any], project: str) -> List[str]:
+    """색인 정의 1개 → `gcloud firestore indexes composite create` 인자 목록."""
+    command = [
+        "gcloud", "firestore", "indexes", "composite", "create",
+        f"--project={project}",
+        f"--collection-group={index['collectionGroup']}",
+        f"--query-scope={index.get('queryScope', 'COLLECTION')}",
+        "--async",
+    ]
+    for field in index["fields"]:
+        if "arrayConfig" in field:
+            config = f"array-config={field['arrayConfig'].lower()}"
+        else:
+            config = f"order={field['order'].lower()}"
+        command.append(f"--field-config=field-path={field['fieldPath']},{config}")
+    return command
+
+
+def field_override_command(override: Dict[str, Any], project: str) -> List[str]:
+    """색인을 끄는 필드 설정 1개 → `gcloud firestore indexes fields update` 인자 목록."""
+    if override.get("indexes"):
+        raise ValueError(f"Only index exemptions are supported: {override['fieldPath']}")
+    return [
+        "gcloud", "firestore", "indexes", "fields", "update", override["fieldPath"],
+        f"--project={project}",
+        f"--collection-group={override['collectionGroup']}",
+        "--disable-indexes",
+        "--async",
+        "--quiet",
+    ]
+
+
+def ttl_command(override: Dict[str, Any], project: str) -> List[str]:
+    """TTL 필드 설정 1개 → `gcloud firestore fields ttls update` 인자 목록."""
+    return [
+        "gcloud", "firestore", "fields", "ttls", "update", override["fieldPath"],
+        f"--project={project}",
+        f"--collection-group={override['collectionGroup']}",
+        "--enable-ttl",
+        "--async",
+        "--quiet",
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project", required=True)
+    parser.add_argument("--dry-run", action="store_true", help="print the gcloud commands only")
+    args = parser.parse_args(argv)
+
+    commands = [gcloud_command(index, args.project) for index in load_indexes()]
+    commands += [field_override_command(override, args.project) for override in load_field_overrides()]
+    commands += [ttl_command(override, args.project) for override in load_field_overrides() if override.get("ttl")]
+
+    failed = 0
+    for command in commands:
+        print(f"$ {shlex.join(command)}")
+        if args.dry_run:
+            continue
+        proc = subprocess.run(command, capture_output=True, text=True)
+        if proc.returncode == 0:
+            print("✅ requested")
+        elif "ALREADY_EXISTS" in proc.stderr or "already exists" in proc.stderr:
+            print("✅ already exists")
+        else:
+            failed += 1
+            print(proc.stderr.strip())
+    return failed
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
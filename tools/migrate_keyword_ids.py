@@ -0,0 +1,80 @@
+"""자동 ID 키워드 문서를 해시 ID(`keyword_index_id`)로 옮긴다 (T-20261019-017).
+
+backend 는 키워드 문서를 정규화 키워드의 해시 ID 로 `create()` 해서 중복을 막는다. 그
+이전에 자동 ID 로 저장된 문서는 같은 키워드를 다시 추가하는 것을 막지 못하므로, 이
+스크립트로 한 번 옮긴다: 해시 ID 문서를 만들고(이미 있으면 중복이므로 건너뜀) 옛 문서를
+지운다. 키워드 원문은 정규화해 저장하고 `created_at` 은 보존한다. 여러 번 돌려도 안전하다.
+
+옮긴 뒤 `tools/backfill_keyword_index.py` 로 역색인을 맞춘다(중복이 합쳐진 경우). 둘 다
+`Migrate keywords` workflow(수동 실행)가 차례로 돌린다 — 배포마다 돌리지 않는다.
+
+Usage (repo root, GOOGLE_APPLICATION_CREDENTIALS 또는 gcloud ADC 필요):
+    python tools/migrate_keyword_ids.py --dry-run
+    python tools/migrate_keyword_ids.py --user <uid>
+"""
+
+import argparse
+import os
+import sys
+
+from google.cloud import firestore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from services.keyword_index import keyword_index_id, normalize_keyword  # noqa: E402
+
+FIRESTORE_BATCH_LIMIT = 500
+
+
+def migrate_user(db, user_id: str, dry_run: bool = False) -> int:
+    """한 사용자의 자동 ID 키워드 문서를 해시 ID 로 옮기고 옮긴(또는 합친) 건수를 반환한다."""
+    keywords_ref = db.collection("users").document(user_id).collection("keywords")
+    docs = list(keywords_ref.stream())
+    present = {doc.id for doc in docs}
+    batch = db.batch()
+    pending = migrated = 0
+    for doc in docs:
+        data = doc.to_dict() or {}
+        keyword = normalize_keyword(data.get("keyword") or "")
+        if not keyword:
+            continue
+        target_id = keyword_index_id(keyword)
+        if doc.id == target_id:
+            continue
+        migrated += 1
+        if dry_run:
+            continue
+        if target_id not in present:
+            batch.set(keywords_ref.document(target_id), {**data, "keyword": keyword})
+            present.add(target_id)
+        batch.delete(doc.reference)
+        pending += 2
+        if pending >= FIRESTORE_BATCH_LIMIT - 1:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+    if pending:
+        batch.commit()
+    return migrated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", help="only this user id")
+    parser.add_argument("--dry-run", action="store_true", help="count documents without writing")
+    args = parser.parse_args(argv)
+
+    db = firestore.Client()
+    user_ids = [args.user] if args.user else [doc.id for doc in db.collection("users").stream()]
+    total = 0
+    for user_id in user_ids:
+        count = migrate_user(db, user_id, dry_run=args.dry_run)
+        total += count
+        if count:
+            print(f"{user_id}: {count} {'to migrate' if args.dry_run else 'migrated'}")
+    print(f"✅ {'Would migrate' if args.dry_run else 'Migrated'} {total} keywords across {len(user_ids)} users")
+    return total
+
+
+if __name__ == "__main__":
+    main()
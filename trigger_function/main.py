@@ -1,29 +1,61 @@
-from google.cloud import pubsub_v1
-from utils.keywords_service import fetch_all_user_keywords
+from utils.keywords_service import fetch_keyword_subscribers
 from flask import jsonify
+from datetime import datetime, timezone
 import json
+import os
 import functions_framework
 
-publisher = pubsub_v1.PublisherClient()
-topic_path = publisher.topic_path("gcpnewsportal", "worker-news-summary")
+PROJECT_ID = "gcpnewsportal"
+TOPIC_ID = "worker-news-summary"
+# 스케줄 주기(분). 같은 구간 안의 trigger 재실행은 같은 slot 을 발행하고, worker 의 job
+# 원장이 (사용자, 키워드, slot) 으로 중복 실행을 건너뛴다.
+SLOT_MINUTES = int(os.getenv("TRIGGER_SLOT_MINUTES", "60"))
+
+# 첫 요청 때 만든다(cold start 단축).
+publisher = None
+topic_path = None
+
+
+def _get_publisher():
+    global publisher, topic_path
+    if publisher is None:
+        from google.cloud import pubsub_v1
+
+        publisher = pubsub_v1.PublisherClient()
+    if topic_path is None:
+        topic_path = publisher.topic_path(PROJECT_ID, TOPIC_ID)
+    return publisher
+
+
+def schedule_slot(now: datetime, minutes: int = SLOT_MINUTES) -> str:
+    """now 가 속한 스케줄 구간의 시작 시각(UTC), 예: 20261019T0900."""
+    now = now.astimezone(timezone.utc)
+    minute_of_day = (now.hour * 60 + now.minute) // minutes * minutes
+    return f"{now:%Y%m%d}T{minute_of_day // 60:02d}{minute_of_day % 60:02d}"
+
 
 @functions_framework.http
 def trigger_news_summary(request):
     print(f"[🔍] trigger_news_summary")
     try:
-        user_keywords_list = fetch_all_user_keywords()
+        keyword_entries = fetch_keyword_subscribers()
+        publisher = _get_publisher()
+        slot = schedule_slot(datetime.now(timezone.utc))
 
-        for entry in user_keywords_list:
-            user_id = entry["user_id"]
-            for keyword in entry["keywords"]:
+        users = set()
+        for entry in keyword_entries:
+            keyword = entry["keyword"]
+            for user_id in entry["subscribers"]:
                 print(f"[🔍] publish topic {user_id} {keyword}")
                 payload = {
                     "user_id": user_id,
-                    "keyword": keyword
+                    "keyword": keyword,
+                    "slot": slot,
                 }
                 publisher.publish(topic_path, json.dumps(payload).encode("utf-8"))
+                users.add(user_id)
 
-        return jsonify({"status": "triggered", "users": len(user_keywords_list)})
+        return jsonify({"status": "triggered", "users": len(users), "keywords": len(keyword_entries), "slot": slot})
     except Exception as e:
         print("Error occurred:", str(e))
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -1,5 +1,8 @@
 from google.cloud import firestore
 
+# backend/services/keyword_index.py 의 KEYWORD_INDEX_COLLECTION 과 같은 값
+KEYWORD_INDEX_COLLECTION = "keyword_index"
+
 
 def fetch_all_user_keywords():
     db = firestore.Client()
@@ -16,3 +19,21 @@ def fetch_all_user_keywords():
     
     print(f"result {result}")
     return result
+
+
+def fetch_keyword_subscribers():
+    """키워드 역색인(`keyword_index`)을 읽어 [{keyword, subscribers}] 를 반환한다.
+
+    사용자마다 keywords 서브컬렉션을 훑는 fetch_all_user_keywords 와 달리 읽기 수가
+    고유 키워드 수에 비례한다. 색인은 backend 의 키워드 추가/삭제가 유지한다.
+    """
+    db = firestore.Client()
+    result = []
+    # 구독자가 0 이 된 문서(삭제는 count 만 줄인다)는 읽지 않는다.
+    for doc in db.collection(KEYWORD_INDEX_COLLECTION).where("count", ">", 0).stream():
+        data = doc.to_dict() or {}
+        if data.get("keyword") and data.get("subscribers"):
+            result.append({"keyword": data["keyword"], "subscribers": data["subscribers"]})
+
+    print(f"[🔍] {len(result)} keywords in index")
+    return result